@@ -5,7 +5,7 @@ a = Analysis(
     ['uocm/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('translations', 'translations'), ('templates', 'templates'), ('plugins', 'plugins')],
+    datas=[('translations', 'translations'), ('templates', 'templates'), ('plugins', 'plugins'), ('uocm/core/opencore_hashes.json', 'uocm/core')],
     hiddenimports=['PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'sqlalchemy', 'uocm', 'uocm.core', 'uocm.ui', 'uocm.db', 'uocm.detector', 'uocm.engine_generator', 'uocm.plist_editor', 'uocm.kext_manager', 'uocm.acpi_manager', 'uocm.debugger', 'uocm.plugins'],
     hookspath=[],
     hooksconfig={},
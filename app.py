@@ -16,6 +16,7 @@ def main() -> int:
     engine.addImportPath(str(qml_path))
     
     backend = AppController()
+    app.aboutToQuit.connect(backend.shutdown)
     engine.rootContext().setContextProperty("backend", backend)
     
     main_qml = qml_path / "Main.qml"
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark headless (Qt offscreen) da árvore do editor de config.plist
+
+Gera um config.plist sintético com ~N nós (DeviceProperties, Kernel.Add,
+Kernel.Patch, NVRAM) e mede o tempo até a árvore estar pronta na tela com o
+preenchimento antigo (um QTreeWidgetItem por nó, tudo expandido) e com o
+PlistTreeModel preguiçoso do EditorWidget, além do tempo de uma edição e de
+um undo. O parse do XML (igual nos dois casos) é medido à parte, junto com
+o load_plist completo. Também mede a prévia da coluna Valor e o load_plist
+com --blobs blobs de --blob-kb KB embutidos (firmware/EDID). Falha
+(código 1) se a árvore passar de --target-ms.
+
+Uso: python scripts/bench_editor.py [--nodes 10000] [--runs 5] [--target-ms 20] [--blobs 16] [--blob-kb 512]
+"""
+
+import argparse
+import base64
+import os
+import plistlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItem  # noqa: E402
+
+from uocm.ui.editor_widget import EditorWidget  # noqa: E402
+from uocm.ui.plist_model import COLUMN_VALUE, preview  # noqa: E402
+
+
+def build_config(nodes: int) -> Dict[str, Any]:
+    """Gera config.plist com aproximadamente `nodes` nós"""
+    config: Dict[str, Any] = {
+        "ACPI": {"Add": [], "Patch": []},
+        "DeviceProperties": {"Add": {}},
+        "Kernel": {"Add": [], "Patch": [], "Quirks": {"XhciPortLimit": False}},
+        "NVRAM": {"Add": {"7C436110-AB2A-4BBB-A880-FE41995C9F82": {"boot-args": "-v"}}},
+        "PlatformInfo": {"Generic": {"SystemProductName": "iMac19,1"}},
+    }
+    count = 0
+    i = 0
+    while count < nodes:
+        config["DeviceProperties"]["Add"][f"PciRoot(0x0)/Pci(0x{i:x},0x0)"] = {
+            "AAPL,ig-platform-id": os.urandom(4),
+            "device-id": os.urandom(4),
+            "model": f"Device {i}",
+        }
+        config["Kernel"]["Add"].append({
+            "Arch": "Any",
+            "BundlePath": f"Kext{i}.kext",
+            "Comment": "",
+            "Enabled": True,
+            "ExecutablePath": f"Contents/MacOS/Kext{i}",
+            "PlistPath": "Contents/Info.plist",
+        })
+        config["Kernel"]["Patch"].append({
+            "Comment": f"Patch {i}",
+            "Find": os.urandom(16),
+            "Replace": os.urandom(16),
+        })
+        count += 4 + 7 + 4
+        i += 1
+    return config
+
+
+def legacy_populate(tree: QTreeWidget, parent: QTreeWidgetItem, data: Any) -> None:
+    """Preenchimento antigo: um item por nó, dicts expandidos, blobs em base64 completo"""
+    items = data.items() if isinstance(data, dict) else ((f"[{i}]", v) for i, v in enumerate(data))
+    for key, value in items:
+        item = QTreeWidgetItem(parent)
+        item.setText(0, str(key))
+        if isinstance(value, dict):
+            item.setText(1, "dict")
+            legacy_populate(tree, item, value)
+        elif isinstance(value, list):
+            item.setText(1, "array")
+            legacy_populate(tree, item, value)
+        elif isinstance(value, bytes):
+            item.setText(1, "data")
+            item.setText(2, base64.b64encode(value).decode()[:50] + "...")
+        else:
+            item.setText(1, type(value).__name__)
+            item.setText(2, str(value))
+        if isinstance(data, dict):
+            item.setExpanded(True)
+
+
+def timed(func, runs: int) -> float:
+    total = 0.0
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / runs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=20.0)
+    parser.add_argument("--blobs", type=int, default=16)
+    parser.add_argument("--blob-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    config = build_config(args.nodes)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "config.plist"
+        with open(path, "wb") as f:
+            plistlib.dump(config, f)
+
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["Chave", "Tipo", "Valor"])
+        tree.show()
+
+        def parse() -> Dict[str, Any]:
+            with open(path, "rb") as f:
+                return plistlib.load(f)
+
+        data = parse()
+
+        def legacy_tree() -> None:
+            tree.clear()
+            legacy_populate(tree, tree.invisibleRootItem(), data)
+            app.processEvents()
+
+        widget = EditorWidget()
+        widget.resize(1200, 800)
+        widget.show()
+        widget.editor.data = data
+
+        def model_tree() -> None:
+            widget._populate_tree()
+            app.processEvents()
+
+        def full_load() -> None:
+            widget.load_plist(path)
+            app.processEvents()
+
+        parse_time = timed(parse, args.runs)
+        legacy = timed(legacy_tree, args.runs)
+        lazy = timed(model_tree, args.runs)
+        full = timed(full_load, args.runs)
+
+        counter = iter(range(sys.maxsize))
+
+        def edit() -> None:
+            index = widget.model.index_for_path(("Kernel", "Add", 0, "Comment"), COLUMN_VALUE)
+            widget.model.setData(index, f"edit {next(counter)}")
+            app.processEvents()
+
+        edit_time = timed(edit, args.runs)
+        undo_time = timed(lambda: (widget._undo(), app.processEvents()), args.runs)
+
+        # Blobs grandes embutidos em DeviceProperties
+        blobs = [os.urandom(args.blob_kb * 1024) for _ in range(args.blobs)]
+        for i, blob in enumerate(blobs):
+            config["DeviceProperties"]["Add"][f"PciRoot(0x0)/Pci(0x{i:x},0x0)"]["ROM"] = blob
+        blob_path = Path(tmpdir) / "config_blobs.plist"
+        with open(blob_path, "wb") as f:
+            plistlib.dump(config, f)
+
+        legacy_preview = timed(lambda: [base64.b64encode(b).decode()[:50] for b in blobs], args.runs)
+        lazy_preview = timed(lambda: [preview(b) for b in blobs], args.runs)
+        blob_load = timed(lambda: (widget.load_plist(blob_path), app.processEvents()), args.runs)
+
+    print(f"config.plist: ~{args.nodes} nós")
+    print(f"parse do XML:          {parse_time * 1000:8.2f} ms")
+    print(f"árvore legada:         {legacy * 1000:8.2f} ms")
+    print(f"árvore PlistTreeModel: {lazy * 1000:8.2f} ms")
+    print(f"speedup da árvore:     {legacy / lazy:8.1f}x")
+    print(f"load_plist completo:   {full * 1000:8.2f} ms (parse + histórico + índice de busca + árvore)")
+    print(f"edição:                {edit_time * 1000:8.3f} ms")
+    print(f"undo:                  {undo_time * 1000:8.3f} ms")
+    print(f"blobs: {args.blobs} x {args.blob_kb} KB")
+    print(f"prévia legada:         {legacy_preview * 1000:8.3f} ms")
+    print(f"prévia preguiçosa:     {lazy_preview * 1000:8.3f} ms")
+    print(f"load_plist com blobs:  {blob_load * 1000:8.2f} ms")
+
+    if lazy * 1000 > args.target_ms:
+        print(f"FALHA: árvore acima da meta de {args.target_ms:.0f} ms")
+        return 1
+    print(f"OK: árvore abaixo da meta de {args.target_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
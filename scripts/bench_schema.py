@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo fixo por chamada de validate_config
+
+Compara o caminho antigo (reler e reparsear opencore_schema.json do cache e
+construir um Draft202012Validator novo a cada chamada) com o schema carregado
+uma vez e o validador compilado por versão do schema. Usa um config.plist
+mínimo, em que o custo fixo domina, e mede também a recompilação após
+force_refresh.
+
+Uso: python scripts/bench_schema.py [--runs 2000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jsonschema import Draft202012Validator  # noqa: E402
+
+from universal_oc_manager.core.validator.schema_validator import get_validator, validate_config  # noqa: E402
+from universal_oc_manager.infra.schemas import schema_manager  # noqa: E402
+
+MINIMAL_CONFIG: Dict[str, Any] = {
+    "ACPI": {},
+    "Booter": {},
+    "DeviceProperties": {},
+    "Kernel": {},
+    "Misc": {},
+    "NVRAM": {},
+    "PlatformInfo": {},
+    "UEFI": {},
+}
+
+
+def legacy_validate(schema_path: Path, config: Dict[str, Any]) -> int:
+    """Caminho antigo: lê o schema do disco e cria o validador a cada chamada"""
+    with schema_path.open("r", encoding="utf-8") as fp:
+        schema = json.load(fp)
+    return sum(1 for _ in Draft202012Validator(schema).iter_errors(config))
+
+
+def bench(func, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    manager = schema_manager._SCHEMA_MANAGER
+    manager._fetch_official_schema = lambda: None
+    schema = schema_manager.get_schema()
+    schema_path = manager._schema_path
+    if not schema_path.exists():
+        with schema_path.open("w", encoding="utf-8") as fp:
+            json.dump(schema, fp)
+
+    validator = get_validator()
+    legacy = bench(lambda: legacy_validate(schema_path, MINIMAL_CONFIG), args.runs)
+    cached = bench(lambda: validate_config(MINIMAL_CONFIG), args.runs)
+    floor = bench(lambda: sum(1 for _ in validator.iter_errors(MINIMAL_CONFIG)), args.runs)
+    get = bench(schema_manager.get_schema, args.runs)
+
+    def refresh() -> None:
+        schema_manager.get_schema(force_refresh=True)
+        get_validator()
+
+    recompile = bench(refresh, max(1, args.runs // 20))
+
+    print(f"legacy:      {legacy * 1e6:8.1f} µs/chamada (reler schema + novo validador)")
+    print(f"cached:      {cached * 1e6:8.1f} µs/chamada")
+    print(f"iter_errors: {floor * 1e6:8.1f} µs/chamada (só a validação)")
+    print(f"overhead:    {(legacy - floor) * 1e6:8.1f} -> {(cached - floor) * 1e6:.1f} µs/chamada")
+    print(f"get_schema:  {get * 1e6:8.2f} µs/chamada")
+    print(f"refresh:     {recompile * 1e6:8.1f} µs (force_refresh + recompilação)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca no editor de config.plist
+
+Usa o mesmo config.plist sintético de bench_editor.py (~N nós) e mede:
+a construção do índice, buscas por substring, busca exata, regex e blobs
+em hex, comparadas a uma busca ingênua que percorre o documento e converte
+cada valor para texto a cada consulta; e também a atualização do índice
+após uma edição e um replace_all.
+
+Uso: python scripts/bench_search.py [--nodes 10000] [--runs 20]
+"""
+
+import argparse
+import base64
+import sys
+import time
+from pathlib import Path
+from typing import Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_editor import build_config  # noqa: E402
+
+from uocm.plist_editor.editor import PlistEditor  # noqa: E402
+from uocm.plist_editor.search import PlistSearchIndex  # noqa: E402
+
+
+def naive_find(data: Any, query: str) -> List[tuple]:
+    """Busca sem índice: percorre o documento a cada consulta"""
+    needle = query.lower()
+    results = []
+    stack = [((), data)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            if isinstance(node, bytes):
+                texts = [node.hex(), base64.b64encode(node).decode()]
+            else:
+                texts = [str(node)]
+            if any(needle in text.lower() for text in texts):
+                results.append(path)
+            continue
+        for key, child in items:
+            child_path = (*path, key)
+            if needle in str(key).lower():
+                results.append(child_path)
+            stack.append((child_path, child))
+    return results
+
+
+def timed(func, runs: int) -> float:
+    total = 0.0
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / runs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    editor = PlistEditor()
+    editor.data = build_config(args.nodes)
+    editor._save_to_history()
+    data = editor.data
+
+    build = timed(lambda: PlistSearchIndex().rebuild(data), max(1, args.runs // 4))
+    print(f"config.plist: ~{args.nodes} nós, {len(editor.search)} linhas indexadas")
+    print(f"{'construir índice':<32} {build * 1000:8.2f} ms")
+
+    queries = [
+        ("substring 'kext42'", "kext42", {}),
+        ("substring rara 'keepsyms'", "keepsyms", {}),
+        ("substring comum 'contents'", "contents", {}),
+        ("chave exata 'Enabled'", "enabled", {"whole": True}),
+        ("regex", r"^Kext\d*7\.kext$", {"regex": True}),
+        ("hex em blobs 'deadbeef'", "deadbeef", {}),
+    ]
+    for label, query, options in queries:
+        indexed = timed(lambda: editor.find(query, **options), args.runs)
+        count = len(editor.find(query, **options))
+        line = f"{label:<32} {indexed * 1000:8.2f} ms  ({count} resultado(s))"
+        if not options:
+            naive = timed(lambda: naive_find(data, query), max(1, args.runs // 4))
+            line += f"  ingênua {naive * 1000:8.2f} ms ({naive / indexed:.0f}x)"
+        print(line)
+
+    counter = iter(range(sys.maxsize))
+    path = ("Kernel", "Patch", 0, "Comment")
+
+    def edit_and_find() -> None:
+        editor.set_at(path, f"edit {next(counter)}")
+        editor.find("edit")
+
+    print(f"{'edição + busca':<32} {timed(edit_and_find, args.runs) * 1000:8.2f} ms")
+
+    start = time.perf_counter()
+    count = editor.replace_all(r"Contents/MacOS/", "Contents/MacOS/x", regex=True)
+    replace = time.perf_counter() - start
+    print(f"{'replace_all':<32} {replace * 1000:8.2f} ms  ({count} valor(es))")
+
+    start = time.perf_counter()
+    editor.undo()
+    print(f"{'undo do replace_all':<32} {(time.perf_counter() - start) * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
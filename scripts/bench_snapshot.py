@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark do OC Snapshot em pastas OC sintéticas com milhares de kexts
+
+Gera uma pasta OC temporária com N kexts (cadeias de dependências via
+OSBundleLibraries), ACPI e Tools, e mede o snapshot completo: com cache de
+Info.plist frio, com cache quente, e sobre um config.plist que já contém
+todas as entradas (pior caso do merge antigo).
+
+Uso: python scripts/bench_snapshot.py [--kexts 250 500 1000 2000] [--runs 3]
+"""
+
+import argparse
+import plistlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uocm.plist_editor.kext_scanner import KextScanner  # noqa: E402
+from uocm.plist_editor.oc_snapshot import OCSnapshot  # noqa: E402
+
+
+def build_oc_folder(oc_path: Path, kext_count: int) -> None:
+    """Cria pasta OC sintética com kexts, SSDTs e tools"""
+    kexts = oc_path / "Kexts"
+    for i in range(kext_count):
+        contents = kexts / f"Kext{i:05d}.kext" / "Contents"
+        contents.mkdir(parents=True)
+        # Cada kext depende de até 3 kexts com nome "maior" (ordem reversa)
+        libraries = {
+            f"com.bench.kext{j}": "1.0.0"
+            for j in range(i + 1, min(i + 4, kext_count))
+        }
+        with open(contents / "Info.plist", "wb") as f:
+            plistlib.dump({
+                "CFBundleIdentifier": f"com.bench.kext{i}",
+                "CFBundleExecutable": f"Kext{i:05d}",
+                "OSBundleLibraries": libraries,
+            }, f)
+
+    for folder, suffix in (("ACPI", ".aml"), ("Tools", ".efi"), ("Drivers", ".efi")):
+        (oc_path / folder).mkdir()
+        for i in range(kext_count):
+            (oc_path / folder / f"Item{i:05d}{suffix}").write_bytes(b"")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--kexts", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'kexts':>6} {'cold (ms)':>12} {'warm (ms)':>12} {'merge (ms)':>12}")
+    for kext_count in args.kexts:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            oc_path = Path(tmpdir) / "OC"
+            build_oc_folder(oc_path, kext_count)
+            cache_path = Path(tmpdir) / "kext_scan.json"
+
+            start = time.perf_counter()
+            OCSnapshot(oc_path, KextScanner(cache_path)).perform_snapshot({}, clean=True)
+            cold = time.perf_counter() - start
+
+            # Nova instância: cache carregado do disco, nenhum Info.plist relido
+            snapshot = OCSnapshot(oc_path, KextScanner(cache_path))
+            config: Dict[str, Any] = {}
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                config, _ = snapshot.perform_snapshot({}, clean=True)
+            warm = (time.perf_counter() - start) / args.runs
+
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                snapshot.perform_snapshot(config, clean=False)
+            merge = (time.perf_counter() - start) / args.runs
+
+            print(f"{kext_count:>6} {cold * 1000:>12.1f} {warm * 1000:>12.1f} {merge * 1000:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark da inicialização do banco (migrações + dados iniciais)
+
+Mede, em um diretório temporário, o que main() faz antes de abrir a janela:
+abrir o banco, aplicar migrações e rodar init_database. Compara o caminho
+antigo (uma consulta por linha antes de cada insert) com o upsert em lote,
+tanto em um banco vazio quanto em um já populado, e o caso comum de uma
+inicialização com o carimbo em dia.
+
+Uso: python scripts/bench_startup.py [--runs 20]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uocm.core.config import Config  # noqa: E402
+from uocm.db import database  # noqa: E402
+from uocm.db.init_data import KEXTS, SMBIOS_PROFILES, SSDT_TEMPLATES, init_database  # noqa: E402
+from uocm.db.models import KextInfo, SMBIOSProfile, SSDTTemplate  # noqa: E402
+
+
+def legacy_seed() -> None:
+    """Caminho antigo: query(...).filter(name).first() por linha e add se não existir"""
+    session = database.get_db_session()
+    try:
+        for model, rows in ((SMBIOSProfile, SMBIOS_PROFILES), (KextInfo, KEXTS), (SSDTTemplate, SSDT_TEMPLATES)):
+            for row in rows:
+                existing = session.query(model).filter(model.name == row["name"]).first()
+                if not existing:
+                    session.add(model(**row))
+        session.commit()
+    finally:
+        session.close()
+
+
+_app_paths = []
+
+
+def fresh_app_path() -> Path:
+    path = Path(tempfile.mkdtemp(prefix="uocm_bench_"))
+    _app_paths.append(path)
+    Config.set_app_path(path)
+    database.reset_database()
+    return path
+
+
+def bench(label: str, setup, func, runs: int) -> float:
+    total = 0.0
+    for _ in range(runs):
+        setup()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    elapsed = total / runs
+    print(f"{label:<40} {elapsed * 1000:8.2f} ms")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    def open_db() -> None:
+        database.get_database()
+
+    def stale_stamp() -> None:
+        # Banco já populado, mas com carimbo antigo (ex: após atualizar o app)
+        fresh_app_path()
+        init_database()
+        database.reset_database()
+        with database.get_database().engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM app_meta")
+        database.reset_database()
+
+    def populated() -> None:
+        fresh_app_path()
+        init_database()
+        database.reset_database()
+
+    bench("abrir banco + migrações (vazio)", fresh_app_path, open_db, args.runs)
+    legacy_cold = bench("legado, banco vazio", fresh_app_path, lambda: (open_db(), legacy_seed()), args.runs)
+    bulk_cold = bench("upsert em lote, banco vazio", fresh_app_path, init_database, args.runs)
+    legacy_warm = bench("legado, banco populado", populated, lambda: (open_db(), legacy_seed()), args.runs)
+    bench("upsert em lote, carimbo antigo", stale_stamp, init_database, args.runs)
+    skip = bench("carimbo em dia (inicialização comum)", populated, init_database, args.runs)
+
+    print(f"speedup banco vazio:    {legacy_cold / bulk_cold:6.1f}x")
+    print(f"speedup banco populado: {legacy_warm / skip:6.1f}x")
+
+    database.reset_database()
+    for path in _app_paths:
+        shutil.rmtree(path, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput do PlistValidator em um config.plist de ~1 MB
+
+Compara o caminho antigo (novo Draft7Validator + conversão para JSON a cada
+chamada) com o validador compilado que valida os tipos nativos do plistlib,
+e mede a revalidação incremental após uma edição (PlistEditor.set_value).
+
+Uso: python scripts/bench_validator.py [--size-mb 1.0] [--runs 50]
+"""
+
+import argparse
+import os
+import plistlib
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jsonschema  # noqa: E402
+
+from uocm.plist_editor.editor import PlistEditor  # noqa: E402
+from uocm.plist_editor.validator import PlistValidator  # noqa: E402
+
+
+def build_config(size_mb: float) -> Dict[str, Any]:
+    """Gera config.plist sintético com blobs de DeviceProperties e Kernel.Patch"""
+    target = int(size_mb * 1024 * 1024)
+    config: Dict[str, Any] = {
+        "ACPI": {"Add": [], "Patch": []},
+        "Booter": {},
+        "DeviceProperties": {"Add": {}},
+        "Kernel": {"Add": [], "Patch": []},
+        "Misc": {},
+        "NVRAM": {"Add": {}},
+        "PlatformInfo": {},
+        "UEFI": {"Drivers": []},
+    }
+    size = 0
+    i = 0
+    while size < target:
+        config["DeviceProperties"]["Add"][f"PciRoot(0x0)/Pci(0x{i:x},0x0)"] = {
+            "AAPL,ig-platform-id": os.urandom(4),
+            "device-id": os.urandom(4),
+            "model": f"Device {i}",
+            "edid": os.urandom(256),
+        }
+        config["Kernel"]["Patch"].append({
+            "Comment": f"Patch {i}",
+            "Enabled": True,
+            "Find": os.urandom(16),
+            "Replace": os.urandom(16),
+            "Identifier": "kernel",
+            "Count": 1,
+        })
+        size += 256 + 4 + 4 + 32 + 32 + 64
+        i += 1
+    return config
+
+
+def legacy_validate(validator: PlistValidator, config: Dict[str, Any]) -> bool:
+    """Caminho antigo: conversão completa para JSON + validador novo por chamada"""
+    def to_json(data: Any) -> Any:
+        if isinstance(data, dict):
+            return {k: to_json(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [to_json(item) for item in data]
+        elif isinstance(data, bytes):
+            return data.hex()
+        return data
+
+    json_data = to_json(config)
+    schema_validator = jsonschema.Draft7Validator(validator.schema)
+    return not list(schema_validator.iter_errors(json_data))
+
+
+def bench(func, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    config = build_config(args.size_mb)
+    encoded = len(plistlib.dumps(config))
+    validator = PlistValidator()
+
+    legacy = bench(lambda: legacy_validate(validator, config), args.runs)
+    compiled = bench(lambda: validator.validate_dict(config), args.runs)
+
+    editor = PlistEditor()
+    editor.data = config
+    editor._save_to_history()
+    editor.validate()
+    counter = iter(range(sys.maxsize))
+
+    def edit_and_validate() -> None:
+        editor.set_value("Kernel.Patch.3.Count", next(counter))
+        editor.validate_incremental()
+
+    incremental = bench(edit_and_validate, args.runs)
+
+    print(f"config.plist: {encoded / 1024 / 1024:.2f} MB (XML)")
+    print(f"legacy:      {legacy * 1000:8.3f} ms/validação")
+    print(f"compiled:    {compiled * 1000:8.3f} ms/validação")
+    print(f"speedup:     {legacy / compiled:8.1f}x")
+    print(f"incremental: {incremental * 1000:8.3f} ms/edição (set_value + revalidação)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
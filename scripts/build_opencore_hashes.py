@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Adiciona hashes de uma release oficial do OpenCorePkg ao banco de hashes
+
+Uso: python scripts/build_opencore_hashes.py 1.0.2 /caminho/OpenCore-1.0.2-RELEASE.zip
+     [--variant RELEASE] [--db uocm/core/opencore_hashes.json]
+
+A release pode ser o ZIP baixado do OpenCorePkg ou o ZIP já extraído; são
+indexados X64/EFI/OC/OpenCore.efi, X64/EFI/OC/Drivers/*.efi e
+X64/EFI/OC/Tools/*.efi. O banco embutido é distribuído vazio: rode este
+script para as releases suportadas antes de empacotar.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uocm.core.hashing import KNOWN_HASHES_PATH, hash_files  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("version", help="Versão do OpenCore (ex: 1.0.2)")
+    parser.add_argument("release", type=Path, help="ZIP da release do OpenCorePkg (ou pasta extraída)")
+    parser.add_argument("--variant", default="RELEASE", choices=["RELEASE", "DEBUG"])
+    parser.add_argument("--db", type=Path, default=KNOWN_HASHES_PATH)
+    args = parser.parse_args()
+
+    if zipfile.is_zipfile(args.release):
+        with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(args.release) as archive:
+            members = [name for name in archive.namelist() if name.startswith("X64/EFI/OC/")]
+            archive.extractall(tmp, members)
+            return add_release(args, Path(tmp))
+    return add_release(args, args.release)
+
+
+def add_release(args: argparse.Namespace, release_dir: Path) -> int:
+    """Indexa os binários de uma release extraída no banco de hashes"""
+    oc_path = release_dir / "X64" / "EFI" / "OC"
+    if not (oc_path / "OpenCore.efi").exists():
+        print(f"Erro: OpenCore.efi não encontrado em {oc_path}")
+        return 1
+
+    files = [oc_path / "OpenCore.efi"]
+    files += sorted((oc_path / "Drivers").glob("*.efi"))
+    files += sorted((oc_path / "Tools").glob("*.efi"))
+    digests = hash_files(files)
+
+    with open(args.db, "r", encoding="utf-8") as f:
+        db = json.load(f)
+
+    known = {(e["version"], e["variant"], e["file"]) for e in db["entries"]}
+    added = 0
+    for path in files:
+        relative = path.relative_to(oc_path).as_posix()
+        if (args.version, args.variant, relative) in known:
+            continue
+        digest = digests[path]
+        db["entries"].append({
+            "version": args.version,
+            "variant": args.variant,
+            "file": relative,
+            "md5": digest.md5,
+            "sha256": digest.sha256,
+        })
+        added += 1
+
+    db["entries"].sort(key=lambda e: (e["file"], e["version"], e["variant"]))
+    with open(args.db, "w", encoding="utf-8") as f:
+        json.dump(db, f, indent=2)
+        f.write("\n")
+
+    print(f"✓ {added} hash(es) adicionados para OpenCore {args.version} ({args.variant})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
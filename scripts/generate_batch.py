@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Gera EFIs em lote a partir de um arquivo de perfis de hardware (JSON/YAML)
+
+Uso: python scripts/generate_batch.py perfis.yaml [-o saida/] [--modes standard aggressive] [-j 4]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uocm.engine_generator.batch import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Captura e reprodução de dumps de hardware
+
+capture: salva system_profiler e ioreg desta máquina (macOS), anonimizados,
+em um diretório de dump.
+replay: roda a detecção sobre todos os dumps de um corpus, compara com
+expected.json e mede o tempo de detecção (e, com --generate, de geração
+do EFI) por dump.
+
+Uso:
+    python scripts/hardware_dump.py capture tests/fixtures/hardware/minha_maquina
+    python scripts/hardware_dump.py replay tests/fixtures/hardware [--runs 20] [--generate saida/]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uocm.detector.replay import (  # noqa: E402
+    EXPECTED_FILE,
+    capture_dump,
+    discover_dumps,
+    hardware_to_dict,
+)
+
+
+def capture(args: argparse.Namespace) -> int:
+    dump = capture_dump(args.dest)
+    hardware = dump.detect()
+    print(json.dumps(hardware_to_dict(hardware), indent=2))
+    print(f"\nDump salvo em {dump.path}. Revise a detecção acima e salve-a como {EXPECTED_FILE}.")
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    dumps = discover_dumps(args.root)
+    if not dumps:
+        print(f"Nenhum dump em {args.root}")
+        return 1
+
+    generator = None
+    if args.generate:
+        from uocm.engine_generator.efi_generator import EFIGenerator
+        from uocm.engine_generator.modes import GenerationMode
+        generator = EFIGenerator()
+
+    failures = 0
+    print(f"{'dump':<40} {'detect (ms)':>12} {'generate (ms)':>14}  result")
+    for dump in dumps:
+        detector = dump.detector()
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            hardware = detector.detect_all()
+        detect_ms = (time.perf_counter() - start) / args.runs * 1000
+
+        generate_ms = 0.0
+        if generator is not None:
+            start = time.perf_counter()
+            generator.generate_efi(hardware, GenerationMode.STANDARD, args.generate / dump.name)
+            generate_ms = (time.perf_counter() - start) * 1000
+
+        expected = dump.load_expected()
+        if expected is None:
+            result = "no expected.json"
+        elif expected == hardware_to_dict(hardware):
+            result = "ok"
+        else:
+            result = "MISMATCH"
+            failures += 1
+        print(f"{dump.name:<40} {detect_ms:>12.2f} {generate_ms:>14.1f}  {result}")
+
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = subparsers.add_parser("capture", help="Captura um dump desta máquina")
+    capture_parser.add_argument("dest", type=Path)
+    capture_parser.set_defaults(func=capture)
+
+    replay_parser = subparsers.add_parser("replay", help="Reproduz um corpus de dumps")
+    replay_parser.add_argument("root", type=Path)
+    replay_parser.add_argument("--runs", type=int, default=10)
+    replay_parser.add_argument("--generate", type=Path, help="Gerar o EFI de cada dump neste diretório")
+    replay_parser.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from uocm.db.models import Base
-from uocm.db.database import Database
+from uocm.db.database import Database, reset_database
 from uocm.core.config import Config
 
 
@@ -63,6 +63,8 @@ def sample_hardware_info():
 def setup_config(temp_dir):
     """Configura Config para testes"""
     Config.set_app_path(temp_dir)
+    # Banco global aponta para o diretório temporário deste teste
+    reset_database()
     yield
-    # Cleanup se necessário
+    reset_database()
 
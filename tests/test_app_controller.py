@@ -0,0 +1,151 @@
+"""
+Testes da validação assíncrona do AppController (QML)
+"""
+
+import os
+import plistlib
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from universal_oc_manager.ui import backend  # noqa: E402
+from universal_oc_manager.ui.jobs import JobQueue  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def controller(qapp):
+    controller = backend.AppController()
+    controller.results = []
+    controller.states = []
+    controller.validationErrorsChanged.connect(controller.results.append)
+    controller.validatingChanged.connect(controller.states.append)
+    yield controller
+    controller.shutdown()
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def test_job_queue_keeps_latest_per_key():
+    """Testa que um job novo cancela o anterior da mesma chave (na fila ou rodando)"""
+    queue = JobQueue(max_workers=1)
+    release = threading.Event()
+    delivered = []
+
+    def slow(job):
+        release.wait(5)
+        job.check()
+        return job.payload
+
+    callback = lambda job, result, error: delivered.append(result)  # noqa: E731
+    running = queue.submit("a", slow, callback, payload=1)
+    queued = queue.submit("b", slow, callback, payload=2)
+    latest = queue.submit("a", slow, callback, payload=3)
+    assert running.cancelled and not queued.cancelled
+    assert queue.pending() == 2
+
+    release.set()
+    latest.future.result(5)
+    queue.shutdown()
+    assert sorted(delivered) == [2, 3]
+
+
+def test_validation_runs_off_qt_thread(controller, qapp, temp_dir, monkeypatch):
+    """Testa que loadConfig volta na hora e o resultado chega pelo sinal"""
+    threads = []
+    real = backend.validate_config
+
+    def validate(config, schema=None, cancelled=None):
+        threads.append(threading.current_thread())
+        return real(config, schema, cancelled)
+
+    monkeypatch.setattr(backend, "validate_config", validate)
+    path = temp_dir / "config.plist"
+    with open(path, "wb") as f:
+        plistlib.dump({"Misc": {}}, f)
+
+    assert controller.loadConfig(str(path)) is None
+    assert controller.validating
+    wait_until(qapp, lambda: controller.results)
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert controller._current_config == {"Misc": {}}
+    assert controller.states == [True, False]
+    assert isinstance(controller.results[0], list)
+
+    # A validação em fundo recebe uma cópia, não o dict que setConfigValue edita
+    seen = []
+    monkeypatch.setattr(backend, "validate_config", lambda config, schema=None, cancelled=None: seen.append(config) or [])
+    controller.validateCurrentConfig()
+    wait_until(qapp, lambda: len(controller.results) == 2)
+    assert seen == [controller._current_config]
+    assert seen[0] is not controller._current_config
+
+    controller.validateConfigFile(str(temp_dir / "missing.plist"))
+    assert "File not found" in controller.results[-1][0]["message"]
+
+
+def test_stale_validations_are_dropped(controller, qapp, temp_dir, monkeypatch):
+    """Testa coalescência: só a última validação do documento emite resultado"""
+    started = []
+    gates = []
+
+    def validate(config, schema=None, cancelled=None):
+        gate = threading.Event()
+        gates.append(gate)
+        started.append(config["Version"])
+        gate.wait(5)
+        return [backend.ValidationErrorInfo(f"v{config['Version']}", "root", "test")]
+
+    monkeypatch.setattr(backend, "validate_config", validate)
+    paths = []
+    for version in (1, 2, 3):
+        path = temp_dir / f"config{version}.plist"
+        with open(path, "wb") as f:
+            plistlib.dump({"Version": version}, f)
+        paths.append(path)
+
+    controller.loadConfig(str(paths[0]))
+    wait_until(qapp, lambda: started == [1])
+    controller.loadConfig(str(paths[1]))
+    controller.loadConfig(str(paths[2]))
+
+    def release_all():
+        # Libera cada validação assim que ela começa, até a do load 3 terminar
+        for gate in gates:
+            gate.set()
+        return not controller.validating
+
+    wait_until(qapp, release_all)
+    time.sleep(0.05)
+    qapp.processEvents()
+
+    assert 3 in started
+    assert [errors[0]["message"] for errors in controller.results] == ["v3"]
+    assert controller._current_config_path == paths[2]
+
+    # Edição síncrona cancela a validação de fundo do mesmo documento
+    gates.clear()
+    controller.validateCurrentConfig()
+    wait_until(qapp, lambda: gates)
+    edited = controller.setConfigValue("Version", "4")
+    assert not controller.validating
+    gates[0].set()
+    time.sleep(0.05)
+    qapp.processEvents()
+    assert controller.results[-1] == edited
+    assert controller._current_config["Version"] == 4
@@ -0,0 +1,75 @@
+"""
+Testes para a geração de EFIs em lote
+"""
+
+import json
+import plistlib
+
+import yaml
+
+from uocm.engine_generator.batch import BatchGenerator, BatchJob, load_profiles, unique_output_names
+from uocm.engine_generator.modes import GenerationMode
+
+
+def test_batch_generates_profiles_with_manifest(temp_dir):
+    """Testa lote com perfis YAML, modos por perfil e pool de processos"""
+    profiles_path = temp_dir / "profiles.yaml"
+    profiles_path.write_text(yaml.safe_dump({
+        "profiles": [
+            {
+                "name": "Desktop i7",
+                "cpu": {"model": "Intel Core i7-8700K", "vendor": "Intel", "microarchitecture": "Coffee Lake"},
+                "audio": {"codec": "ALC1220"},
+                "modes": ["conservative", "aggressive"],
+            },
+            {
+                "name": "Ryzen",
+                "cpu": {"model": "AMD Ryzen 7 5800X", "vendor": "AMD"},
+            },
+        ]
+    }))
+
+    jobs = load_profiles(profiles_path, [GenerationMode.STANDARD])
+    assert [(job.name, job.mode) for job in jobs] == [
+        ("Desktop i7", GenerationMode.CONSERVATIVE),
+        ("Desktop i7", GenerationMode.AGGRESSIVE),
+        ("Ryzen", GenerationMode.STANDARD),
+    ]
+
+    output = temp_dir / "out"
+    manifest = BatchGenerator(output, max_workers=2).run(jobs)
+
+    assert manifest["succeeded"] == 3
+    assert manifest["failed"] == 0
+    assert json.loads((output / "manifest.json").read_text()) == manifest
+
+    with open(output / "Desktop_i7_aggressive" / "EFI" / "OC" / "config.plist", "rb") as f:
+        config = plistlib.load(f)
+    bundles = [entry["BundlePath"] for entry in config["Kernel"]["Add"]]
+    assert "AppleALC.kext" in bundles
+    assert "USBInjectAll.kext" in bundles
+
+    for result in manifest["results"]:
+        assert result["seconds"] >= 0
+        assert (output / result["output"]).exists()
+
+
+def test_batch_unique_outputs_and_failed_futures(temp_dir, sample_hardware_info):
+    """Testa pastas de saída únicas para nomes repetidos e manifest mesmo com job que não chega ao worker"""
+    jobs = [
+        BatchJob("My Mac", sample_hardware_info),
+        BatchJob("My/Mac", sample_hardware_info),
+        BatchJob("my mac", sample_hardware_info),
+        # Não serializável: o future falha sem derrubar o lote
+        BatchJob("Broken", sample_hardware_info, smbios_override=lambda: None),
+    ]
+    assert unique_output_names(jobs) == ["My_Mac_standard", "My_Mac_standard_2", "my_mac_standard_3", "Broken_standard"]
+
+    output = temp_dir / "out"
+    manifest = BatchGenerator(output, max_workers=2).run(jobs)
+
+    assert manifest["succeeded"] == 3
+    assert [r["status"] for r in manifest["results"]] == ["ok", "ok", "ok", "error"]
+    assert "Broken" in manifest["results"][3]["name"]
+    assert len({r["output"] for r in manifest["results"]}) == 4
+    assert json.loads((output / "manifest.json").read_text()) == manifest
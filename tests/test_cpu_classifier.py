@@ -0,0 +1,77 @@
+"""
+Testes do classificador de CPUs
+"""
+
+import pytest
+
+from uocm.detector.cpu_classifier import (
+    SMBIOS_BY_MICROARCHITECTURE,
+    classify_cpu,
+    normalize_brand,
+    parse_frequency,
+)
+
+
+@pytest.mark.parametrize("name, vendor, microarchitecture, segment, smbios", [
+    ("Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz", "Intel", "Coffee Lake", "desktop", "iMac19,1"),
+    ("Intel Core i5-4690K", "Intel", "Haswell", "desktop", "iMac14,4"),
+    ("Intel Core i9-10900K", "Intel", "Comet Lake", "desktop", "iMac20,1"),
+    ("Intel Core i7-12700K", "Intel", "Alder Lake", "desktop", "MacPro7,1"),
+    ("Intel Core i7-10750H", "Intel", "Comet Lake", "mobile", "MacBookPro16,1"),
+    ("Intel Core i5-8250U", "Intel", "Kaby Lake R", "mobile", "MacBookPro15,2"),
+    ("Intel Core i5-1035G1", "Intel", "Ice Lake", "mobile", "MacBookAir9,1"),
+    ("Intel Core i9-10980XE", "Intel", "Cascade Lake-X", "hedt", "iMacPro1,1"),
+    ("Intel Core i7-5820K", "Intel", "Haswell-E", "hedt", "iMacPro1,1"),
+    ("Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz", "Intel", "Broadwell-EP", "server", "iMacPro1,1"),
+    ("Intel Xeon W-2145", "Intel", "Skylake-W", "server", "iMacPro1,1"),
+    ("AMD Ryzen 7 5800X 8-Core Processor", "AMD", "Zen 3", "desktop", "MacPro7,1"),
+    ("AMD Ryzen 9 7950X3D 16-Core Processor", "AMD", "Zen 4", "desktop", "MacPro7,1"),
+    ("AMD Ryzen 5 3400G", "AMD", "Zen+", "desktop", "MacPro7,1"),
+    ("AMD Ryzen 7 5700U", "AMD", "Zen 2", "mobile", "MacBookPro16,3"),
+    ("AMD Ryzen 7 7840HS", "AMD", "Zen 4", "mobile", "MacBookPro16,3"),
+    ("AMD Ryzen Threadripper 3970X 32-Core Processor", "AMD", "Zen 2", "hedt", "MacPro7,1"),
+])
+def test_classify_cpu(name, vendor, microarchitecture, segment, smbios):
+    """Testa a classificação de CPUs Intel e AMD"""
+    cpu_class = classify_cpu(name)
+    assert cpu_class is not None
+    assert cpu_class.vendor == vendor
+    assert cpu_class.microarchitecture == microarchitecture
+    assert cpu_class.segment == segment
+    assert cpu_class.smbios == smbios
+
+
+def test_classify_cpu_igpu_and_unknown():
+    """Testa iGPU (ausente nos modelos F/KF) e nomes não reconhecidos"""
+    assert classify_cpu("Intel Core i5-9400").igpu == "UHD Graphics 630"
+    assert classify_cpu("Intel Core i5-9400F").igpu is None
+    assert classify_cpu("AMD Ryzen 5 5600G").igpu == "Radeon Vega"
+    assert classify_cpu("6-Core Intel Core i7") is None
+    assert classify_cpu("") is None
+
+
+def test_brand_helpers():
+    """Testa a normalização do brand string e a frequência"""
+    brand = "Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz"
+    assert normalize_brand(brand) == "Intel Core i7-8700K"
+    assert parse_frequency(brand) == 3.7
+    assert parse_frequency("AMD Ryzen 7 5800X 8-Core Processor") is None
+    assert SMBIOS_BY_MICROARCHITECTURE["Coffee Lake"] == "iMac19,1"
+    assert SMBIOS_BY_MICROARCHITECTURE["Zen 3"] == "MacPro7,1"
+
+
+def test_universal_detector_uses_classifier(monkeypatch):
+    """Testa o detector do universal_oc_manager com a mesma tabela"""
+    import json
+    from universal_oc_manager.core.detector import detect
+
+    def fake_check_output(cmd, text=True):
+        if "sysctl" in cmd[0]:
+            return "Intel(R) Core(TM) i9-9900K CPU @ 3.60GHz\n"
+        return json.dumps({"SPHardwareDataType": [{"cpu_type": "8-Core Intel Core i9"}]})
+
+    monkeypatch.setattr(detect.subprocess, "check_output", fake_check_output)
+    profile = detect.detect_hardware()
+    assert profile.cpu == "Intel Core i9-9900K"
+    assert profile.igpu == "UHD Graphics 630"
+    assert profile.smbios_suggestion == "iMac19,1"
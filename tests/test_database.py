@@ -0,0 +1,120 @@
+"""
+Testes da configuração do SQLite, migrações e acesso concorrente
+"""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+from uocm.db.database import Database, get_database, get_db_read_session, get_db_session, reset_database
+from uocm.db.migrations import SCHEMA_VERSION
+from uocm.db.models import KextInfo
+
+
+def test_pragmas_and_indexes(temp_dir):
+    """Testa WAL, pragmas e índices declarados em um banco novo"""
+    db = Database(temp_dir / "novo.db")
+    db.init_db()
+
+    with db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA user_version")).scalar() == SCHEMA_VERSION
+
+    inspector = inspect(db.engine)
+    indexed = {
+        (table, tuple(index["column_names"]))
+        for table in ("hardware_profiles", "kexts", "efi_snapshots")
+        for index in inspector.get_indexes(table)
+    }
+    assert ("hardware_profiles", ("cpu_model",)) in indexed
+    assert ("kexts", ("installed",)) in indexed
+    assert ("kexts", ("github_repo",)) in indexed
+    assert ("efi_snapshots", ("created_at",)) in indexed
+    db.dispose()
+
+
+def test_migrate_old_database(temp_dir):
+    """Testa a migração de um banco criado antes das colunas e índices novos"""
+    path = temp_dir / "antigo.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE kexts (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL UNIQUE)")
+    conn.execute("INSERT INTO kexts (name) VALUES ('Lilu')")
+    conn.commit()
+    conn.close()
+
+    db = Database(path)
+    db.init_db()
+    columns = {column["name"] for column in inspect(db.engine).get_columns("kexts")}
+    assert {"pci_ids", "installed", "github_repo"} <= columns
+    assert any(index["column_names"] == ["installed"] for index in inspect(db.engine).get_indexes("kexts"))
+
+    # Migrações já aplicadas não rodam de novo
+    db.init_db()
+    with db.read_session() as session:
+        assert session.query(KextInfo.name).scalar() == "Lilu"
+    db.dispose()
+
+
+def test_read_session_is_read_only(temp_dir):
+    """Testa que a sessão de leitura não aceita escritas"""
+    db = Database(temp_dir / "leitura.db")
+    db.init_db()
+    with pytest.raises(OperationalError):
+        with db.read_session() as session:
+            session.add(KextInfo(name="Lilu"))
+            session.flush()
+    db.dispose()
+
+
+def test_reset_database_closes_sessions():
+    """Testa que reset_database fecha sessões e conexões (exceto após fork)"""
+    db = get_database()
+    get_db_session().execute(text("SELECT 1"))
+    get_db_read_session().execute(text("SELECT 1"))
+    pools = (db.engine.pool, db.read_engine.pool)
+    assert pools[0].checkedout() == 1
+
+    reset_database()
+    assert [pool.checkedout() for pool in pools] == [0, 0]
+    assert get_database() is not db
+
+
+def test_concurrent_threads(temp_dir):
+    """Testa escritas e leituras simultâneas de várias threads"""
+    db = Database(temp_dir / "threads.db")
+    db.init_db()
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(20):
+                with db.session() as session:
+                    session.add(KextInfo(name=f"kext{n}_{i}"))
+                db.Session.remove()
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(20):
+                with db.read_session() as session:
+                    session.query(KextInfo).count()
+                db.ReadSession.remove()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with db.read_session() as session:
+        assert session.query(KextInfo).count() == 80
+    db.dispose()
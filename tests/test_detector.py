@@ -45,3 +45,86 @@ def test_hardware_detection():
     assert hardware.cpu is not None
     assert hardware.cpu.model is not None
 
+
+
+def _sp_dump() -> list:
+    """Saída de `system_profiler -xml` com vários tipos, como em um Mac real"""
+    return [
+        {
+            "_dataType": "SPHardwareDataType",
+            "_items": [{
+                "cpu_type": "Intel Core i7-8700K",
+                "number_of_cores": 6,
+                "number_of_processors": 2,
+                "model_identifier": "iMac19,1",
+                "physical_memory": "32 GB",
+            }],
+        },
+        {
+            "_dataType": "SPDisplaysDataType",
+            "_items": [{"_name": "Radeon RX 580", "spdisplays_vram": "8 GB"}],
+        },
+        {"_dataType": "SPAudioDataType", "_items": []},
+        {"_dataType": "SPNetworkDataType", "_items": []},
+        {"_dataType": "SPUSBDataType", "_items": []},
+    ]
+
+
+def test_system_profiler_single_invocation(monkeypatch):
+    """Testa que detect_all executa o system_profiler uma única vez"""
+    import plistlib
+    import subprocess
+    from uocm.detector import HardwareDetector, SystemProfilerCollector
+    from uocm.detector import system_profiler
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        if cmd[0] != "system_profiler":
+            raise FileNotFoundError(cmd[0])
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=plistlib.dumps(_sp_dump()), stderr=b"")
+
+    monkeypatch.setattr(system_profiler.subprocess, "run", fake_run)
+
+    collector = SystemProfilerCollector()
+    detector = HardwareDetector(collector=collector)
+    detector.can_detect = True
+    hardware = detector.detect_all()
+
+    assert len(calls) == 1
+    assert calls[0][:2] == ["system_profiler", "-xml"]
+    assert set(calls[0][2:]) == set(system_profiler.DATA_TYPES)
+    assert hardware.cpu.model == "Intel Core i7-8700K"
+    assert hardware.cpu.threads == 12
+    assert hardware.motherboard == "iMac19,1"
+    assert hardware.ram_total_gb == 32
+
+    # Nova detecção, nova coleta
+    detector.detect_all()
+    assert len(calls) == 2
+
+
+def test_system_profiler_replay_from_dump(temp_dir):
+    """Testa a detecção a partir de dumps salvos (XML e JSON) fora do macOS"""
+    import json
+    import plistlib
+    from uocm.detector import HardwareDetector, SystemProfilerCollector
+
+    xml_path = temp_dir / "sp.xml"
+    xml_path.write_bytes(plistlib.dumps(_sp_dump()))
+    json_path = temp_dir / "sp.json"
+    json_path.write_text(json.dumps({node["_dataType"]: node["_items"] for node in _sp_dump()}))
+
+    for path in (xml_path, json_path):
+        collector = SystemProfilerCollector.from_file(path)
+        assert collector.is_replay
+
+        hardware = HardwareDetector(collector=collector).detect_all()
+        assert hardware.cpu.model == "Intel Core i7-8700K"
+        assert hardware.motherboard == "iMac19,1"
+        assert collector.runs == 0
+
+    # Um dump salvo pode ser recarregado
+    saved = SystemProfilerCollector.from_file(xml_path).save(temp_dir / "copy.xml")
+    assert SystemProfilerCollector.from_file(saved).get("SPHardwareDataType") is not None
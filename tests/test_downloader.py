@@ -0,0 +1,223 @@
+"""
+Testes para downloads em streaming, retomáveis e verificados
+"""
+
+import asyncio
+import hashlib
+import io
+import zipfile
+
+import httpx
+import pytest
+
+from uocm.db.database import get_database, get_db_session
+from uocm.db.models import KextInfo
+from uocm.kext_manager.downloader import ChecksumMismatchError, Downloader
+from uocm.kext_manager.github_client import GitHubClient
+from uocm.kext_manager.manager import KextManager
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MB
+
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Entrega parte do corpo e derruba a conexão"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+        raise httpx.ReadError("conexão interrompida")
+
+
+def _range_server(files, requests, fail_first=False, etags=None):
+    """Servidor simulado com suporte a Range/If-Range; opcionalmente falha no meio do primeiro download"""
+    state = {"failed": not fail_first}
+    etags = etags if etags is not None else {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        data = files[request.url.path]
+        etag = etags.get(request.url.path, '"v1"')
+        range_header = request.headers.get("Range")
+        requests.append(range_header)
+        if not state["failed"]:
+            state["failed"] = True
+            return httpx.Response(
+                200,
+                headers={"Content-Length": str(len(data)), "ETag": etag},
+                stream=_BrokenStream(data[:300_000]),
+            )
+        if range_header and request.headers.get("If-Range") == etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            return httpx.Response(
+                206,
+                headers={"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}", "ETag": etag},
+                content=data[start:],
+            )
+        return httpx.Response(200, headers={"ETag": etag}, content=data)
+    return handler
+
+
+async def test_download_resumes_with_range_and_verifies(temp_dir):
+    """Testa retomada via Range após queda e SHA-256 calculado durante o stream"""
+    requests = []
+    transport = httpx.MockTransport(_range_server({"/asset.zip": PAYLOAD}, requests, fail_first=True))
+    progress = []
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        downloader = Downloader(client, retries=1, chunk_size=64 * 1024, retry_delay=0)
+        dest = await downloader.download(
+            "https://example.invalid/asset.zip",
+            temp_dir / "asset.zip",
+            sha256=hashlib.sha256(PAYLOAD).hexdigest(),
+            progress=lambda received, total: progress.append((received, total)),
+        )
+
+        assert dest.read_bytes() == PAYLOAD
+        # Retomada a partir do último bloco gravado antes da queda
+        assert requests == [None, "bytes=262144-"]
+        assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+        assert not (temp_dir / "asset.zip.part").exists()
+
+        with pytest.raises(ChecksumMismatchError):
+            await downloader.download("https://example.invalid/asset.zip", temp_dir / "other.zip", sha256="0" * 64)
+        assert not (temp_dir / "other.zip").exists()
+        assert not (temp_dir / "other.zip.part").exists()
+
+
+async def test_resume_restarts_when_asset_changed(temp_dir):
+    """Testa que If-Range evita emendar o .part de um arquivo que mudou no servidor"""
+    requests = []
+    files = {"/asset.zip": PAYLOAD}
+    etags = {}
+    handler = _range_server(files, requests, fail_first=True, etags=etags)
+    seen_if_range = []
+
+    def changing(request: httpx.Request) -> httpx.Response:
+        seen_if_range.append(request.headers.get("If-Range"))
+        if len(seen_if_range) == 2:
+            # Nova versão publicada entre a queda e a retomada
+            files["/asset.zip"] = PAYLOAD[::-1]
+            etags["/asset.zip"] = '"v2"'
+        return handler(request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(changing)) as client:
+        downloader = Downloader(client, retries=1, chunk_size=64 * 1024, retry_delay=0)
+        dest = await downloader.download("https://example.invalid/asset.zip", temp_dir / "asset.zip")
+
+    assert seen_if_range == [None, '"v1"']
+    assert dest.read_bytes() == PAYLOAD[::-1]
+    assert not (temp_dir / "asset.zip.part.validator").exists()
+
+
+def test_infra_download_asset_uses_if_range(temp_dir):
+    """Testa If-Range na retomada do download_asset de universal_oc_manager"""
+    from uocm.kext_manager.http_cache import HTTPCache
+    from universal_oc_manager.infra.http.github_client import GitHubClient as InfraGitHubClient
+
+    files = {"/asset.zip": PAYLOAD}
+    etags = {}
+    if_range = []
+    handler = _range_server(files, [], etags=etags)
+
+    def recording(request: httpx.Request) -> httpx.Response:
+        if_range.append(request.headers.get("If-Range"))
+        return handler(request)
+
+    client = InfraGitHubClient(cache=HTTPCache(temp_dir / "http"), transport=httpx.MockTransport(recording))
+    dest = temp_dir / "asset.zip"
+    # .part de uma tentativa anterior interrompida, ainda da versão "v1"
+    (temp_dir / "asset.zip.part").write_bytes(PAYLOAD[:300_000])
+    (temp_dir / "asset.zip.part.validator").write_text('"v1"')
+
+    client.download_asset("https://example.invalid/asset.zip", dest)
+    assert dest.read_bytes() == PAYLOAD
+
+    etags["/asset.zip"] = '"v2"'
+    files["/asset.zip"] = PAYLOAD[::-1]
+    (temp_dir / "asset.zip.part").write_bytes(PAYLOAD[:300_000])
+    (temp_dir / "asset.zip.part.validator").write_text('"v1"')
+    client.download_asset("https://example.invalid/asset.zip", dest, sha256=hashlib.sha256(PAYLOAD[::-1]).hexdigest())
+    assert dest.read_bytes() == PAYLOAD[::-1]
+    assert if_range == ['"v1"', '"v1"']
+    assert not (temp_dir / "asset.zip.part.validator").exists()
+
+
+def _kext_zip(name: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(f"Release/{name}.kext/Contents/Info.plist", "<plist/>")
+        zf.writestr(f"Release/{name}.kext/Contents/MacOS/{name}", b"\xcf\xfa\xed\xfe")
+    return buffer.getvalue()
+
+
+async def test_download_kexts_queue_checks_catalog_checksum(temp_dir):
+    """Testa fila de downloads de kexts com checksum do catálogo"""
+    files = {"/Lilu.zip": _kext_zip("Lilu"), "/AppleALC.zip": _kext_zip("AppleALC")}
+    session = get_db_session()
+    session.add_all([
+        KextInfo(name="Lilu", github_repo="acidanthera/Lilu", download_url="https://example.invalid/Lilu.zip",
+                 checksum_sha256=hashlib.sha256(files["/Lilu.zip"]).hexdigest()),
+        KextInfo(name="AppleALC", github_repo="acidanthera/AppleALC", download_url="https://example.invalid/AppleALC.zip",
+                 checksum_sha256="f" * 64),
+    ])
+    session.commit()
+    session.close()
+
+    github = GitHubClient(transport=httpx.MockTransport(_range_server(files, [])))
+    manager = KextManager(github=github)
+    progress = {}
+    async with github:
+        results = await manager.download_kexts(
+            ["Lilu", "AppleALC"],
+            progress=lambda name, received, total: progress.__setitem__(name, received),
+        )
+
+    assert results["Lilu"].name == "Lilu.kext"
+    assert results["AppleALC"] is None
+    assert progress["Lilu"] == len(files["/Lilu.zip"])
+    assert manager.store.resolve("kexts/Lilu") is not None
+
+
+async def test_download_kexts_releases_db_while_downloading(temp_dir):
+    """Testa que outro escritor consegue gravar no banco enquanto um download está em andamento"""
+    files = {"/Lilu.zip": _kext_zip("Lilu")}
+    session = get_db_session()
+    session.add(KextInfo(name="Lilu", github_repo="acidanthera/Lilu", download_url="https://example.invalid/Lilu.zip"))
+    session.commit()
+    session.close()
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    serve = _range_server(files, [])
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await release.wait()
+        return serve(request)
+
+    def write_other_kext() -> None:
+        session = get_db_session()
+        try:
+            session.add(KextInfo(name="AppleALC", github_repo="acidanthera/AppleALC"))
+            session.commit()
+        finally:
+            session.close()
+
+    github = GitHubClient(transport=httpx.MockTransport(handler))
+    manager = KextManager(github=github)
+    async with github:
+        task = asyncio.create_task(manager.download_kexts(["Lilu"]))
+        await started.wait()
+        assert get_database().engine.pool.checkedout() == 0
+        await asyncio.wait_for(asyncio.to_thread(write_other_kext), 5)
+        release.set()
+        results = await task
+
+    assert results["Lilu"].name == "Lilu.kext"
+    session = get_db_session()
+    try:
+        assert session.query(KextInfo).filter(KextInfo.name == "Lilu").one().installed
+        assert session.query(KextInfo).filter(KextInfo.name == "AppleALC").count() == 1
+    finally:
+        session.close()
@@ -0,0 +1,53 @@
+"""
+Testes para o gerador de EFI
+"""
+
+import plistlib
+
+from uocm.engine_generator import efi_generator
+from uocm.engine_generator.context import memoized
+from uocm.engine_generator.efi_generator import EFIGenerator
+from uocm.engine_generator.modes import GenerationMode
+
+
+def test_generate_efi_single_session_and_phases(temp_dir, sample_hardware_info, monkeypatch):
+    """Testa geração com uma única sessão do banco e tempos por fase"""
+    sessions = []
+    original = efi_generator.get_db_read_session
+
+    def counting_session():
+        sessions.append(1)
+        return original()
+
+    monkeypatch.setattr(efi_generator, "get_db_read_session", counting_session)
+
+    calls = []
+
+    def counted(method):
+        def wrapper(self, ctx):
+            calls.append(method.__name__)
+            return method(self, ctx)
+        wrapper.__name__ = method.__name__
+        return memoized(wrapper)
+
+    for name in ("_get_recommended_kexts", "_get_recommended_ssdts"):
+        monkeypatch.setattr(EFIGenerator, name, counted(getattr(EFIGenerator, name).__wrapped__))
+
+    generator = EFIGenerator()
+    phases = {}
+    efi_path = generator.generate_efi(
+        sample_hardware_info,
+        GenerationMode.STANDARD,
+        temp_dir / "EFI_test",
+        progress_callback=phases.__setitem__,
+    )
+
+    assert len(sessions) == 1
+    assert sorted(calls) == ["_get_recommended_kexts", "_get_recommended_ssdts"]
+    assert set(phases) == {"recommendations", "config_plist", "kexts", "drivers", "ssdts"}
+    assert all(seconds >= 0 for seconds in phases.values())
+
+    with open(efi_path / "EFI" / "OC" / "config.plist", "rb") as f:
+        config = plistlib.load(f)
+    assert config["PlatformInfo"]["Generic"]["SystemProductName"] == "iMac19,1"
+    assert [e["Path"] for e in config["ACPI"]["Add"]] == ["SSDT-PLUG.aml", "SSDT-PMC.aml", "SSDT-USB-Reset.aml"]
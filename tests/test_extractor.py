@@ -0,0 +1,79 @@
+"""
+Testes para a extração seletiva de kexts
+"""
+
+import zipfile
+
+from uocm.kext_manager.extractor import extract_kexts, find_kext_bundles
+from uocm.kext_manager.store import ContentStore
+
+
+def _write(zf, name, data=b"", mode=0o644):
+    info = zipfile.ZipInfo(name)
+    info.external_attr = (0o100000 | mode) << 16
+    zf.writestr(info, data)
+
+
+def _symlink(zf, name, target):
+    info = zipfile.ZipInfo(name)
+    info.external_attr = (0o120000 | 0o777) << 16
+    zf.writestr(info, target)
+
+
+def _virtualsmc_zip(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        for variant in ("Release", "Debug"):
+            for kext in ("VirtualSMC", "SMCProcessor"):
+                _write(zf, f"{variant}/Kexts/{kext}.kext/Contents/Info.plist", f"{variant}".encode())
+                _write(zf, f"{variant}/Kexts/{kext}.kext/Contents/MacOS/{kext}", f"{variant}{kext}".encode(), 0o755)
+        _write(zf, "Release/Kexts/VirtualSMC.kext/Contents/PlugIns/Nested.kext/Contents/Info.plist", b"nested")
+        _write(zf, "Release/Kexts/VirtualSMC.kext.dSYM/Contents/Resources/DWARF/VirtualSMC", b"x" * 1024)
+        _write(zf, "__MACOSX/Release/Kexts/._VirtualSMC.kext", b"")
+        _write(zf, "Docs/README.md", b"docs")
+
+
+def test_find_kext_bundles_prefers_release(temp_dir):
+    """Testa seleção de bundles de Release pelo diretório central"""
+    _virtualsmc_zip(temp_dir / "VirtualSMC.zip")
+    with zipfile.ZipFile(temp_dir / "VirtualSMC.zip") as zf:
+        bundles = find_kext_bundles(zf)
+
+    assert [(b.name, b.debug) for b in bundles] == [("SMCProcessor.kext", False), ("VirtualSMC.kext", False)]
+    assert len(bundles[1].members) == 3  # Info.plist, binário e plugin
+
+
+def test_extract_kexts_into_store(temp_dir):
+    """Testa extração direta para o store de todos os bundles do pacote"""
+    _virtualsmc_zip(temp_dir / "VirtualSMC.zip")
+    store = ContentStore(temp_dir / "store")
+
+    trees = extract_kexts(temp_dir / "VirtualSMC.zip", store)
+    assert sorted(trees) == ["SMCProcessor.kext", "VirtualSMC.kext"]
+
+    only = extract_kexts(temp_dir / "VirtualSMC.zip", store, names=["VirtualSMC"])
+    assert only == {"VirtualSMC.kext": trees["VirtualSMC.kext"]}
+
+    kext = store.materialize("tree", trees["VirtualSMC.kext"], temp_dir / "out" / "VirtualSMC.kext")
+    assert (kext / "Contents" / "MacOS" / "VirtualSMC").read_bytes() == b"ReleaseVirtualSMC"
+    assert (kext / "Contents" / "PlugIns" / "Nested.kext" / "Contents" / "Info.plist").exists()
+    assert not (temp_dir / "out" / "VirtualSMC.kext.dSYM").exists()
+
+
+def test_extract_kexts_rejects_symlinks_outside_bundle(temp_dir):
+    """Testa que symlinks absolutos ou que saem do bundle são descartados"""
+    with zipfile.ZipFile(temp_dir / "Evil.zip", "w") as zf:
+        _write(zf, "Evil.kext/Contents/Info.plist", b"plist")
+        _write(zf, "Evil.kext/Contents/MacOS/Evil", b"bin", 0o755)
+        _symlink(zf, "Evil.kext/Contents/MacOS/Current", "Evil")
+        _symlink(zf, "Evil.kext/Contents/Resources", "../../../../OC/config.plist")
+        _symlink(zf, "Evil.kext/Contents/Absolute", "/etc/passwd")
+        _symlink(zf, "Evil.kext/Contents/Sneaky", "MacOS/../../..")
+    store = ContentStore(temp_dir / "store")
+
+    trees = extract_kexts(temp_dir / "Evil.zip", store)
+    kext = store.materialize("tree", trees["Evil.kext"], temp_dir / "out" / "Evil.kext")
+
+    assert (kext / "Contents" / "MacOS" / "Current").is_symlink()
+    assert (kext / "Contents" / "MacOS" / "Current").read_bytes() == b"bin"
+    for name in ("Resources", "Absolute", "Sneaky"):
+        assert not (kext / "Contents" / name).is_symlink()
@@ -0,0 +1,107 @@
+"""
+Testes para o cliente GitHub contra um servidor GitHub simulado
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from uocm.db.database import get_db_session
+from uocm.db.models import KextInfo
+from uocm.kext_manager.github_client import GitHubClient
+from uocm.kext_manager.manager import KextManager
+
+
+def _mock_github(state):
+    """Servidor simulado: releases/latest com atraso e contagem de concorrência"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(0.01)
+            repo = request.url.path.split("/")[3]
+            if state.get("limited", {}).pop(repo, False):
+                return httpx.Response(403, headers={"Retry-After": "0", "X-RateLimit-Remaining": "0"})
+            state["requests"].append(repo)
+            return httpx.Response(
+                200,
+                headers={"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"},
+                content=json.dumps({
+                    "tag_name": "v1.0.0",
+                    "body": f"{repo} release",
+                    "assets": [{"name": f"{repo}-1.0.0-RELEASE.zip", "browser_download_url": f"https://example.invalid/{repo}.zip"}],
+                }),
+            )
+        finally:
+            state["active"] -= 1
+    return handler
+
+
+async def test_catalog_refresh_concurrent_bounded(temp_dir):
+    """Testa refresh do catálogo em paralelo com limite de concorrência"""
+    state = {"active": 0, "max_active": 0, "requests": [], "limited": {"Lilu": True}}
+    github = GitHubClient(max_concurrency=4, transport=httpx.MockTransport(_mock_github(state)))
+    manager = KextManager(github=github)
+
+    async with github:
+        assert await manager.update_kext_catalog()
+
+    assert sorted(state["requests"]) == sorted(repo for _, repo in KextManager.KEXT_REPOS)
+    assert 1 < state["max_active"] <= 4
+    assert github.rate_limit_remaining == 4999
+
+    session = get_db_session()
+    try:
+        lilu = session.query(KextInfo).filter(KextInfo.name == "Lilu").first()
+        assert lilu.version == "1.0.0"
+        assert lilu.download_url == "https://example.invalid/Lilu.zip"
+    finally:
+        session.close()
+
+
+def _etag_handler(calls):
+    """Servidor simulado com ETag: responde 304 quando If-None-Match confere"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"tag_name": "1.6.9"})
+    return handler
+
+
+async def test_release_lookup_conditional_cache_and_offline(temp_dir):
+    """Testa cache com ETag (304 servido do disco) e modo offline"""
+    from uocm.kext_manager.http_cache import HTTPCache
+
+    calls = []
+    cache = HTTPCache(temp_dir / "http")
+    async with GitHubClient(transport=httpx.MockTransport(_etag_handler(calls)), cache=cache) as github:
+        assert (await github.get_release("acidanthera", "Lilu"))["tag_name"] == "1.6.9"
+        assert (await github.get_release("acidanthera", "Lilu"))["tag_name"] == "1.6.9"
+    assert calls == [None, '"v1"']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    offline = GitHubClient(transport=httpx.MockTransport(_etag_handler(calls)), cache=cache, offline=True)
+    assert (await offline.get_release("acidanthera", "Lilu"))["tag_name"] == "1.6.9"
+    assert await offline.get_release("acidanthera", "AppleALC") is None
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_uocm_infra_github_client_cache(temp_dir):
+    """Testa o cache HTTP do cliente GitHub de universal_oc_manager"""
+    from uocm.kext_manager.http_cache import HTTPCache
+    from universal_oc_manager.infra.http.github_client import GitHubClient as InfraGitHubClient
+
+    calls = []
+    cache = HTTPCache(temp_dir / "http")
+    client = InfraGitHubClient(cache=cache, transport=httpx.MockTransport(_etag_handler(calls)))
+    assert client.get_release("acidanthera", "OpenCorePkg")["tag_name"] == "1.6.9"
+    assert client.get_release("acidanthera", "OpenCorePkg")["tag_name"] == "1.6.9"
+    assert calls == [None, '"v1"']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    client.offline = True
+    assert client.get_release("acidanthera", "OpenCorePkg")["tag_name"] == "1.6.9"
+    assert len(calls) == 2
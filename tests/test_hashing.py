@@ -0,0 +1,71 @@
+"""
+Testes do motor de hashing
+"""
+
+import hashlib
+import json
+
+from uocm.core.hashing import DigestCache, OpenCoreHashIndex, hash_file
+
+
+def test_hash_file_md5_sha256(temp_dir):
+    """Testa MD5 e SHA-256 em uma passada, com e sem mmap"""
+    small = temp_dir / "small.efi"
+    small.write_bytes(b"OpenCore" * 100)
+    large = temp_dir / "large.efi"
+    large.write_bytes(bytes(range(256)) * 20000)
+    empty = temp_dir / "empty.efi"
+    empty.write_bytes(b"")
+    
+    for path in (small, large, empty):
+        content = path.read_bytes()
+        digest = hash_file(path)
+        assert digest.md5 == hashlib.md5(content).hexdigest()
+        assert digest.sha256 == hashlib.sha256(content).hexdigest()
+        assert digest.size == len(content)
+
+
+def test_digest_cache_invalidation(temp_dir):
+    """Testa cache de digests por (inode, mtime, tamanho)"""
+    path = temp_dir / "OpenCore.efi"
+    path.write_bytes(b"v1")
+    
+    cache = DigestCache()
+    first = cache.hash_file(path)
+    assert cache.hash_file(path) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    path.write_bytes(b"v2-changed")
+    assert cache.hash_file(path).md5 == hashlib.md5(b"v2-changed").hexdigest()
+    assert cache.misses == 2
+
+
+def test_opencore_hash_index_identify_efi(temp_dir):
+    """Testa identificação de OpenCore.efi, drivers e tools em lote"""
+    oc = temp_dir / "OC"
+    (oc / "Drivers").mkdir(parents=True)
+    (oc / "Tools").mkdir()
+    (oc / "OpenCore.efi").write_bytes(b"opencore-1.0.2")
+    (oc / "Drivers" / "OpenRuntime.efi").write_bytes(b"openruntime-1.0.2")
+    (oc / "Tools" / "Custom.efi").write_bytes(b"desconhecido")
+    
+    db_path = temp_dir / "hashes.json"
+    db_path.write_text(json.dumps({"version": 1, "entries": [
+        {
+            "version": "1.0.2", "variant": "RELEASE", "file": "OpenCore.efi",
+            "md5": hashlib.md5(b"opencore-1.0.2").hexdigest(),
+        },
+        {
+            "version": "1.0.2", "variant": "RELEASE", "file": "Drivers/OpenRuntime.efi",
+            "md5": "0" * 32,
+            "sha256": hashlib.sha256(b"openruntime-1.0.2").hexdigest(),
+        },
+    ]}))
+    
+    index = OpenCoreHashIndex.load(db_path)
+    assert len(index) == 2
+    
+    result = index.identify_efi(oc)
+    assert result["OpenCore.efi"].version == "1.0.2"
+    assert result["Drivers/OpenRuntime.efi"].file == "Drivers/OpenRuntime.efi"
+    assert result["Tools/Custom.efi"] is None
@@ -0,0 +1,62 @@
+"""
+Testes dos dados iniciais do banco
+"""
+
+from sqlalchemy import event
+
+from uocm.db import init_data
+from uocm.db.database import get_database
+from uocm.db.init_data import KEXTS, SMBIOS_PROFILES, init_database
+from uocm.db.models import AppMeta, KextInfo, SMBIOSProfile
+from uocm.db.recommendations import get_recommendation_index
+
+
+def _count_statements(func):
+    statements = []
+    engine = get_database().engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, statements
+
+
+def test_seed_once_then_skip():
+    """Testa o upsert em lote na primeira vez e o carimbo nas seguintes"""
+    get_database()
+    seeded, statements = _count_statements(init_database)
+    assert seeded is True
+    assert sum(1 for s in statements if s.startswith("INSERT INTO")) == 4  # 3 tabelas + carimbo
+
+    with get_database().read_session() as session:
+        assert session.query(SMBIOSProfile).count() == len(SMBIOS_PROFILES)
+        assert session.query(KextInfo).count() == len(KEXTS)
+        assert session.get(AppMeta, init_data.SEED_STAMP_KEY).value == init_data.seed_stamp()
+
+    seeded, statements = _count_statements(init_database)
+    assert seeded is False
+    assert len(statements) == 1
+
+
+def test_reseed_keeps_kext_manager_data(monkeypatch):
+    """Testa que um carimbo novo atualiza os dados iniciais sem apagar os do KextManager"""
+    init_database()
+    with get_database().session() as session:
+        lilu = session.query(KextInfo).filter(KextInfo.name == "Lilu").one()
+        lilu.version = "1.7.1"
+        lilu.local_path = "/store/Lilu.kext"
+    assert get_recommendation_index().kext_paths == {"Lilu": "/store/Lilu.kext"}
+
+    kexts = [dict(row) for row in KEXTS]
+    kexts[0] = dict(kexts[0], category="Core", version="0.0.1")
+    monkeypatch.setattr(init_data, "KEXTS", kexts)
+    assert init_database() is True
+
+    with get_database().read_session() as session:
+        lilu = session.query(KextInfo).filter(KextInfo.name == "Lilu").one()
+        assert lilu.category == "Core"
+        assert lilu.version == "1.7.1"
+        assert lilu.local_path == "/store/Lilu.kext"
+        assert session.query(KextInfo).count() == len(KEXTS)
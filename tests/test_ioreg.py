@@ -0,0 +1,119 @@
+"""
+Testes do parser do ioreg
+"""
+
+from uocm.detector.ioreg import IORegIndex, parse_ioreg
+
+IOREG_DUMP = """\
++-o Root  <class IORegistryEntry, id 0x100000100, retain 30>
+  | {
+  |   "IOKitBuildVersion" = "Darwin Kernel Version 23.4.0"
+  |   "vendor-id" = <ffff0000>
+  | }
+  |
+  +-o PCI0@0  <class IOACPIPlatformDevice, id 0x100000130, registered, matched, active, busy 0 (4 ms), retain 40>
+  | | {
+  | |   "name" = <"PNP0A08">
+  | | }
+  | |
+  | +-o AppleACPIPCI  <class AppleACPIPCI, id 0x1000002a0, registered, matched, active, busy 0 (3 ms), retain 50>
+  | | +-o pci8086,3ec2@0  <class IOPCIDevice, id 0x1000002b0, registered, matched, active, busy 0 (0 ms), retain 12>
+  | | | {
+  | | |   "vendor-id" = <86800000>
+  | | |   "device-id" = <c23e0000>
+  | | |   "class-code" = <00000600>
+  | | |   "acpi-path" = "IOACPIPlane:/_SB/PCI0@0/MCHC@0"
+  | | |   "pcidebug" = "0:0:0"
+  | | | }
+  | | |
+  | | +-o GFX0@2  <class IOPCIDevice, id 0x1000002c0, registered, matched, active, busy 0 (0 ms), retain 20>
+  | | | {
+  | | |   "vendor-id" = <86800000>
+  | | |   "device-id" = <923e0000>
+  | | |   "class-code" = <00000300>
+  | | |   "model" = <"Intel UHD Graphics 630">
+  | | |   "acpi-path" = "IOACPIPlane:/_SB/PCI0@0/GFX0@20000"
+  | | | }
+  | | |
+  | | +-o PEG0@1  <class IOPCIDevice, id 0x1000002d0, registered, matched, active, busy 0 (0 ms), retain 15>
+  | | | {
+  | | |   "vendor-id" = <86800000>
+  | | |   "device-id" = <01190000>
+  | | |   "class-code" = <00040600>
+  | | | }
+  | | | |
+  | | | +-o GFX1@0  <class IOPCIDevice, id 0x1000002e0, registered, matched, active, busy 0 (0 ms), retain 25>
+  | | |   {
+  | | |     "vendor-id" = <02100000>
+  | | |     "device-id" = <df670000>
+  | | |     "class-code" = <00000300>
+  | | |     "model" = <"Radeon RX 580">
+  | | |     "acpi-path" = "IOACPIPlane:/_SB/PCI0@0/PEG0@10000/PEGP@0"
+  | | |   }
+  | | |
+  | | +-o LPCB@1F  <class IOPCIDevice, id 0x1000002f0, registered, matched, active, busy 0 (0 ms), retain 11>
+  | | | {
+  | | |   "vendor-id" = <86800000>
+  | | |   "device-id" = <05a30000>
+  | | |   "class-code" = <00010600>
+  | | | }
+  | | |
+  | | +-o HDEF@1F,3  <class IOPCIDevice, id 0x100000300, registered, matched, active, busy 0 (0 ms), retain 14>
+  | |   {
+  | |     "vendor-id" = <86800000>
+  | |     "device-id" = <c8a30000>
+  | |     "class-code" = <00030400>
+  | |   }
+  | |   |
+  | |   +-o AppleHDAController  <class AppleHDAController, id 0x100000310, registered, matched, active, busy 0 (0 ms), retain 9>
+  | |     +-o IOHDACodecDevice@0  <class IOHDACodecDevice, id 0x100000320, registered, matched, active, busy 0 (0 ms), retain 7>
+  | |       {
+  | |         "IOHDACodecVendorID" = 283906592
+  | |         "vendor-id" = <ffff0000>
+  | |       }
+  | |     +-o IOHDACodecDevice@2  <class IOHDACodecDevice, id 0x100000330, registered, matched, active, busy 0 (0 ms), retain 7>
+  | |       {
+  | |         "IOHDACodecVendorID" = 0x8086280b
+  | |       }
+"""
+
+
+def test_parse_ioreg_pci_devices():
+    """Testa que apenas dispositivos PCI são extraídos, com seus IDs"""
+    index = parse_ioreg(IOREG_DUMP.splitlines(keepends=True))
+
+    assert [d.name for d in index.devices] == [
+        "pci8086,3ec2@0", "GFX0@2", "PEG0@1", "GFX1@0", "LPCB@1F", "HDEF@1F,3",
+    ]
+
+    gpus = index.gpus()
+    assert [g.name for g in gpus] == ["GFX1@0", "GFX0@2"]
+    assert gpus[0].pci_id == "1002:67df"
+    assert gpus[0].model == "Radeon RX 580"
+    assert gpus[0].acpi_path == "IOACPIPlane:/_SB/PCI0@0/PEG0@10000/PEGP@0"
+    assert gpus[1].class_code == 0x030000
+
+    assert index.find(0x8086, 0x3EC2)[0].location == "0:0:0"
+    assert index.chipset() == "Z390"
+    # Codec HDMI da Intel é ignorado
+    assert index.codec_name() == "ALC1220"
+
+
+def test_detector_with_ioreg_dump(temp_dir):
+    """Testa o preenchimento de GPU, áudio e chipset a partir de um dump do ioreg"""
+    from uocm.detector import HardwareDetector, SystemProfilerCollector
+
+    dump_path = temp_dir / "ioreg.txt"
+    dump_path.write_text(IOREG_DUMP)
+    assert len(IORegIndex.from_file(dump_path).devices) == 6
+
+    collector = SystemProfilerCollector(nodes={}, source=temp_dir / "empty.xml")
+    hardware = HardwareDetector(collector=collector, ioreg_dump=dump_path).detect_all()
+
+    assert hardware.chipset == "Z390"
+    assert hardware.gpu.model == "Radeon RX 580"
+    assert hardware.gpu.vendor == "AMD"
+    assert hardware.gpu.device_id == "0x67df"
+    assert hardware.gpu.vendor_id == "0x1002"
+    assert hardware.audio.codec == "ALC1220"
+    assert hardware.audio.device_id == "0xa3c8"
@@ -0,0 +1,124 @@
+"""
+Testes do OC Snapshot
+"""
+
+import plistlib
+from pathlib import Path
+
+from uocm.plist_editor.oc_snapshot import OCSnapshot
+
+
+def _make_kext(kexts_dir: Path, name: str, bundle_id: str, libraries=None) -> Path:
+    """Cria um kext mínimo com Info.plist"""
+    contents = kexts_dir / f"{name}.kext" / "Contents"
+    contents.mkdir(parents=True)
+    with open(contents / "Info.plist", "wb") as f:
+        plistlib.dump({
+            "CFBundleIdentifier": bundle_id,
+            "CFBundleExecutable": name,
+            "OSBundleLibraries": libraries or {},
+        }, f)
+    return contents.parent
+
+
+def test_snapshot_kexts_dependency_order(temp_dir):
+    """Testa ordenação de kexts por dependências"""
+    kexts = temp_dir / "Kexts"
+    _make_kext(kexts, "AppleALC", "as.vit9696.AppleALC", {"as.vit9696.Lilu": "1.2.0"})
+    _make_kext(kexts, "Lilu", "as.vit9696.Lilu")
+    _make_kext(kexts, "SMCProcessor", "ru.joedm.SMCProcessor", {"as.vit9696.VirtualSMC": "1.0.0"})
+    _make_kext(kexts, "VirtualSMC", "as.vit9696.VirtualSMC", {"as.vit9696.Lilu": "1.2.0"})
+    
+    entries, warnings = OCSnapshot(temp_dir).snapshot_kexts(clean=True)
+    order = [e["BundlePath"] for e in entries]
+    
+    assert warnings == []
+    assert order.index("Lilu.kext") < order.index("AppleALC.kext")
+    assert order.index("Lilu.kext") < order.index("VirtualSMC.kext")
+    assert order.index("VirtualSMC.kext") < order.index("SMCProcessor.kext")
+
+
+def test_snapshot_kexts_cycle_report(temp_dir):
+    """Testa relatório de dependências circulares"""
+    kexts = temp_dir / "Kexts"
+    _make_kext(kexts, "A", "com.test.A", {"com.test.B": "1.0"})
+    _make_kext(kexts, "B", "com.test.B", {"com.test.A": "1.0"})
+    _make_kext(kexts, "C", "com.test.C", {"com.test.A": "1.0"})
+    _make_kext(kexts, "D", "com.test.D")
+    
+    entries, warnings = OCSnapshot(temp_dir).snapshot_kexts(clean=True)
+    
+    assert [e["BundlePath"] for e in entries] == ["D.kext", "A.kext", "B.kext", "C.kext"]
+    assert len(warnings) == 1
+    assert "A.kext -> B.kext -> A.kext" in warnings[0]
+
+
+def test_snapshot_keeps_existing_entries(temp_dir):
+    """Testa que o snapshot preserva entradas existentes e remove as ausentes"""
+    (temp_dir / "ACPI").mkdir()
+    (temp_dir / "ACPI" / "SSDT-PLUG.aml").write_bytes(b"")
+    (temp_dir / "ACPI" / "SSDT-EC.aml").write_bytes(b"")
+    _make_kext(temp_dir / "Kexts", "Lilu", "as.vit9696.Lilu")
+    
+    existing_acpi = [
+        {"Enabled": False, "Path": "SSDT-PLUG.aml", "Comment": "manual"},
+        {"Enabled": True, "Path": "SSDT-OLD.aml", "Comment": "removido"},
+    ]
+    existing_kexts = [{"BundlePath": "Lilu.kext", "Enabled": False, "Comment": "manual"}]
+    
+    snapshot = OCSnapshot(temp_dir)
+    acpi = snapshot.snapshot_acpi(existing_add=existing_acpi)
+    kexts, _ = snapshot.snapshot_kexts(existing_add=existing_kexts)
+    
+    assert [e["Path"] for e in acpi] == ["SSDT-PLUG.aml", "SSDT-EC.aml"]
+    assert acpi[0]["Comment"] == "manual"
+    assert kexts == existing_kexts
+
+
+def test_snapshot_kexts_plugins_and_cache(temp_dir):
+    """Testa inclusão de PlugIns e cache de metadados por mtime/tamanho"""
+    from uocm.plist_editor.kext_scanner import KextScanner
+    
+    kexts = temp_dir / "Kexts"
+    _make_kext(kexts, "Lilu", "as.vit9696.Lilu")
+    smc = _make_kext(kexts, "VirtualSMC", "as.vit9696.VirtualSMC", {"as.vit9696.Lilu": "1.2.0"})
+    plugin = _make_kext(
+        smc / "Contents" / "PlugIns", "SMCProcessor", "ru.joedm.SMCProcessor",
+        {"as.vit9696.VirtualSMC": "1.0.0"},
+    )
+    
+    cache_path = temp_dir / "cache" / "kext_scan.json"
+    scanner = KextScanner(cache_path)
+    entries, warnings = OCSnapshot(temp_dir, scanner).snapshot_kexts(clean=True)
+    
+    assert warnings == []
+    assert [e["BundlePath"] for e in entries] == [
+        "Lilu.kext",
+        "VirtualSMC.kext",
+        "VirtualSMC.kext/Contents/PlugIns/SMCProcessor.kext",
+    ]
+    assert scanner.misses == 3 and cache_path.exists()
+    
+    # Nova instância reaproveita o cache em disco
+    scanner = KextScanner(cache_path)
+    OCSnapshot(temp_dir, scanner).snapshot_kexts(clean=True)
+    assert (scanner.hits, scanner.misses) == (3, 0)
+    
+    # Alterar um Info.plist força nova leitura apenas dele
+    with open(plugin / "Contents" / "Info.plist", "wb") as f:
+        plistlib.dump({"CFBundleIdentifier": "ru.joedm.SMCProcessor", "CFBundleExecutable": "X"}, f)
+    entries, _ = OCSnapshot(temp_dir, scanner).snapshot_kexts(clean=True)
+    assert (scanner.hits, scanner.misses) == (2, 1)
+    assert entries[-1]["ExecutablePath"] == "Contents/MacOS/X"
+
+
+def test_versions_gated_without_known_hashes(temp_dir, monkeypatch):
+    """Testa que a identificação de versões fica desativada com o banco de hashes vazio"""
+    from uocm.core.hashing import OpenCoreHashIndex
+
+    (temp_dir / "OpenCore.efi").write_bytes(b"opencore")
+    snapshot = OCSnapshot(temp_dir)
+    monkeypatch.setattr(OCSnapshot, "_hash_index", OpenCoreHashIndex())
+    assert not snapshot.can_identify_versions
+    assert snapshot.get_opencore_version() is None
+    assert snapshot.get_component_versions() == {}
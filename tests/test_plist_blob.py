@@ -0,0 +1,83 @@
+"""
+Testes da exibição e edição de blobs `data` grandes
+"""
+
+import base64
+import os
+
+import pytest
+
+from uocm.plist_editor.blob import (
+    HEX_ROW_BYTES,
+    BlobPager,
+    hexdump,
+    parse_hexdump,
+    preview_base64,
+    preview_hex,
+)
+from uocm.plist_editor.editor import PlistEditor
+from uocm.plist_editor.search import BLOB_TEXT_BYTES, FIELD_HEX
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 37, 38, 4096])
+def test_preview_encodes_only_prefix(size):
+    """Testa que a prévia é igual ao início da codificação completa"""
+    value = os.urandom(size)
+    assert preview_base64(value, 50) == base64.b64encode(value).decode()[:50]
+    assert preview_hex(value, 21) == value.hex()[:21]
+
+
+def test_hexdump_round_trip():
+    """Testa formatação e leitura do hexdump (offset e ASCII ignorados)"""
+    value = b"EDID\x00\xff" + bytes(range(40))
+    text = hexdump(memoryview(value), 0x100)
+    assert text.splitlines()[0].startswith("00000100  45 44 49 44 00 ff")
+    assert text.splitlines()[0].endswith("|EDID............|")
+    assert len(text.splitlines()) == -(-len(value) // HEX_ROW_BYTES)
+    assert parse_hexdump(text) == value
+    assert parse_hexdump("9b 3e\n00 00") == b"\x9b\x3e\x00\x00"
+    # Hex puro com um grupo de 8 dígitos não é confundido com offset
+    assert parse_hexdump("aabbccdd  eeff") == bytes.fromhex("aabbccddeeff")
+    assert parse_hexdump("9b3e0000 00000000") == bytes.fromhex("9b3e000000000000")
+    with pytest.raises(ValueError):
+        parse_hexdump("00000000  zz")
+    with pytest.raises(ValueError):
+        parse_hexdump("0000010  45 44  |ED|")
+
+
+def test_pager_pages_and_replace():
+    """Testa páginas por memoryview e substituição de página (inclusive mudando o tamanho)"""
+    # Sem o byte 0xAA, para o find abaixo só achar a página substituída
+    value = (bytes(range(0xA0)) * 63)[:10000]
+    pager = BlobPager(value, page_bytes=4096)
+    assert pager.page_count == 3
+    assert isinstance(pager.page(2), memoryview)
+    assert pager.page(2).obj is value
+    assert len(pager.page(2)) == 10000 - 8192
+    assert pager.page_of(5000) == 1
+
+    assert not pager.replace_page(1, bytes(pager.page(1)))
+    assert not pager.modified
+    assert pager.replace_page(1, b"\xaa\xbb")
+    assert pager.data == value[:4096] + b"\xaa\xbb" + value[8192:]
+    assert pager.find(b"\xaa\xbb") == 4096
+    assert pager.find(b"\xaa\xbb", 4097) is None
+
+
+def test_search_large_blob_beyond_text_prefix():
+    """Testa que blobs grandes só têm o início em texto mas são achados por bytes"""
+    firmware = bytes(BLOB_TEXT_BYTES * 4) + b"\xde\xad\xbe\xef"
+    editor = PlistEditor()
+    editor.data = {"DeviceProperties": {"Add": {"PciRoot(0x0)": {"ROM": firmware}}}}
+    editor._save_to_history()
+
+    line = editor.search._lines[("DeviceProperties", "Add", "PciRoot(0x0)", "ROM")]
+    assert max(len(text) for _, text in line) <= BLOB_TEXT_BYTES * 2
+
+    matches = editor.find("DEADBEEF")
+    assert [(m.path[-1], m.field) for m in matches] == [("ROM", FIELD_HEX)]
+    assert editor.find("0x de ad be ef") == matches
+
+    assert editor.replace_all("deadbeef", "cafebabe") == 1
+    assert editor.data["DeviceProperties"]["Add"]["PciRoot(0x0)"]["ROM"].endswith(b"\xca\xfe\xba\xbe")
+    assert editor.find("deadbeef") == []
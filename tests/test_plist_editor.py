@@ -62,3 +62,106 @@ def test_plist_editor_undo_redo():
     editor.redo()
     assert editor.data["test"] == "value2"
 
+
+
+def test_plist_editor_undo_structural():
+    """Testa undo/redo incremental com criação de caminhos e checkpoints"""
+    editor = PlistEditor()
+    editor.data = {"Kernel": {"Add": [{"Enabled": False}]}}
+    editor._save_to_history()
+    
+    editor.set_value("Kernel.Add.0.Enabled", True)
+    editor.set_value("Kernel.Add.2.Comment", "novo")
+    assert len(editor.data["Kernel"]["Add"]) == 3
+    
+    # Alteração em massa seguida de checkpoint
+    editor.data["Misc"] = {"Tools": []}
+    editor._save_to_history()
+    
+    assert editor.undo()
+    assert "Misc" not in editor.data
+    assert editor.data["Kernel"]["Add"][2] == {"Comment": "novo"}
+    
+    assert editor.undo()
+    assert editor.data == {"Kernel": {"Add": [{"Enabled": True}]}}
+    
+    assert editor.undo()
+    assert editor.data == {"Kernel": {"Add": [{"Enabled": False}]}}
+    assert not editor.undo()
+    
+    assert editor.redo() and editor.redo() and editor.redo()
+    assert editor.data["Misc"] == {"Tools": []}
+    assert editor.data["Kernel"]["Add"][0]["Enabled"] is True
+
+
+def test_plist_editor_history_budget():
+    """Testa limite de memória do histórico em bytes"""
+    editor = PlistEditor(history_budget_bytes=16 * 1024)
+    editor.data = {"DeviceProperties": {"Add": {"blob": b"\x00" * 8192}}}
+    editor._save_to_history()
+    
+    for i in range(200):
+        editor.set_value("Boot.Arguments", f"debug={i}")
+    
+    assert editor.history.total_size <= 16 * 1024
+    assert len(editor.history) < 201
+    
+    # Desfazer até a base deve sempre resultar em um estado consistente
+    while editor.undo():
+        pass
+    assert editor.data["Boot"]["Arguments"].startswith("debug=")
+    assert editor.data["DeviceProperties"]["Add"]["blob"] == b"\x00" * 8192
+
+
+def test_plist_validator_compiled_native_types():
+    """Testa validador compilado com tipos nativos do plistlib"""
+    from uocm.plist_editor.validator import PlistValidator
+    
+    validator = PlistValidator()
+    assert validator._validator is PlistValidator()._validator
+    
+    is_valid, errors = validator.validate_dict({
+        "DeviceProperties": {"Add": {"PciRoot(0x0)": {"device-id": b"\x9b\x3e\x00\x00"}}},
+    })
+    assert is_valid and errors == []
+    
+    is_valid, errors = validator.validate_dict({"Unknown": {}})
+    assert not is_valid
+    assert len(errors) == 1
+
+
+def test_plist_editor_validate_incremental():
+    """Testa validação incremental após set_value/undo"""
+    editor = PlistEditor()
+    editor.data = {"ACPI": {"Add": []}, "Kernel": {"Add": []}}
+    editor._save_to_history()
+    assert editor.validate_incremental() == (True, [])
+    
+    editor.set_value("Invalido.Chave", 1)
+    is_valid, errors = editor.validate_incremental()
+    assert not is_valid and len(errors) == 1
+    
+    editor.set_value("Kernel.Add.0.Enabled", True)
+    assert editor.validate_incremental() == (False, errors)
+    
+    editor.undo()
+    editor.undo()
+    assert editor.validate_incremental() == (True, [])
+    assert editor.validate_incremental() == editor.validate()
+
+
+def test_plist_editor_set_value_changed_paths_and_none_slots():
+    """Testa last_changed_paths após set_value e edição de posições None de arrays"""
+    editor = PlistEditor()
+    editor.data = {"Kernel": {"Add": []}}
+    editor._save_to_history()
+    editor.set_value("Kernel.Add.2", "x")
+    assert editor.data["Kernel"]["Add"] == [None, None, "x"]
+    assert editor.last_changed_paths[-1] == ("Kernel", "Add", 2)
+    assert ("Kernel", "Add", 0) in editor.last_changed_paths
+
+    assert editor.set_at(("Kernel", "Add", 0), "Lilu.kext")
+    assert editor.last_changed_paths == [("Kernel", "Add", 0)]
+    assert editor.delete_at(("Kernel", "Add", 1))
+    assert editor.data["Kernel"]["Add"] == ["Lilu.kext", "x"]
+    assert not editor.set_at(("Kernel", "Add", 5), "y")
@@ -0,0 +1,166 @@
+"""
+Testes do modelo preguiçoso da árvore do editor de PLIST
+"""
+
+import os
+import plistlib
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import QModelIndex, Qt  # noqa: E402
+
+from uocm.plist_editor.editor import PlistEditor  # noqa: E402
+from uocm.ui.plist_model import (  # noqa: E402
+    COLUMN_TYPE,
+    COLUMN_VALUE,
+    FETCH_BATCH,
+    PathRole,
+    PlistTreeModel,
+)
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def model(qapp):
+    editor = PlistEditor()
+    editor.data = {
+        "Kernel": {"Add": [{"BundlePath": "Lilu.kext", "Enabled": True}], "Quirks": {"XhciPortLimit": False}},
+        "DeviceProperties": {"Add": {"PciRoot(0x0)/Pci(0x2,0x0)": {"device-id": b"\x9b\x3e\x00\x00"}}},
+        "NVRAM": {"Add": {"7C436110-AB2A-4BBB-A880-FE41995C9F82": {"boot-args": "-v"}}},
+        "Big": list(range(FETCH_BATCH * 3)),
+    }
+    editor._save_to_history()
+    return PlistTreeModel(editor)
+
+
+def test_rows_created_lazily(model):
+    """Testa que linhas só existem após fetchMore e em lotes"""
+    assert model.rowCount() == 0
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 4
+
+    big = model.index_for_path(("Big",))
+    assert model.hasChildren(big)
+    assert model.rowCount(big) == 0
+    model.fetchMore(big)
+    assert model.rowCount(big) == FETCH_BATCH
+    assert model.canFetchMore(big)
+
+    blob = model.index_for_path(("DeviceProperties", "Add", "PciRoot(0x0)/Pci(0x2,0x0)", "device-id"))
+    assert blob.siblingAtColumn(COLUMN_TYPE).data() == "data"
+    assert blob.data(PathRole) == ("DeviceProperties", "Add", "PciRoot(0x0)/Pci(0x2,0x0)", "device-id")
+
+
+def test_edit_updates_only_row_and_undo(model):
+    """Testa edição pelo modelo (com histórico) e atualização após undo"""
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append(first.data(PathRole)))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(1))
+
+    quirk = model.index_for_path(("Kernel", "Quirks", "XhciPortLimit"), COLUMN_VALUE)
+    assert model.setData(quirk, "true")
+    assert model.editor.data["Kernel"]["Quirks"]["XhciPortLimit"] is True
+    assert changed == [("Kernel", "Quirks", "XhciPortLimit")]
+    assert not model.setData(model.index_for_path(("Kernel", "Add", 0, "Enabled"), COLUMN_VALUE), "talvez")
+
+    # Chaves com '.' e '/' funcionam (caminho em tupla, não string)
+    boot_args = model.index_for_path(("NVRAM", "Add", "7C436110-AB2A-4BBB-A880-FE41995C9F82", "boot-args"), COLUMN_VALUE)
+    assert model.setData(boot_args, "-v keepsyms=1")
+
+    assert model.editor.undo()
+    model.refresh_paths(model.editor.last_changed_paths)
+    assert boot_args.data() == "-v"
+    assert model.editor.undo()
+    model.refresh_paths(model.editor.last_changed_paths)
+    assert quirk.data() == "False"
+    assert resets == []
+
+
+def test_delete_and_structural_undo(model):
+    """Testa remoção de item de array e undo que recria as linhas"""
+    big = model.index_for_path(("Big", 5))
+    parent = big.parent()
+    assert model.delete(big)
+    assert model.editor.data["Big"][5] == 6
+    assert model.rowCount(parent) == FETCH_BATCH
+
+    assert model.editor.undo()
+    model.refresh_paths(model.editor.last_changed_paths)
+    assert model.index_for_path(("Big", 5)).siblingAtColumn(COLUMN_VALUE).data() == "5"
+    assert len(model.editor.data["Big"]) == FETCH_BATCH * 3
+
+
+def test_editor_widget_load(qapp, temp_dir):
+    """Testa o EditorWidget com o modelo: carga, edição e undo"""
+    from uocm.ui.editor_widget import EditorWidget
+
+    path = temp_dir / "config.plist"
+    with open(path, "wb") as f:
+        plistlib.dump({"Misc": {"Boot": {"Timeout": 5}}, "Booter": {"Quirks": {}}}, f)
+
+    widget = EditorWidget()
+    widget.load_plist(path)
+    assert widget.model.rowCount() == 2
+    assert widget.tree.isExpanded(widget.model.index_for_path(("Misc",)))
+
+    timeout = widget.model.index_for_path(("Misc", "Boot", "Timeout"), COLUMN_VALUE)
+    assert widget.model.setData(timeout, "0x0A")
+    assert widget.editor.data["Misc"]["Boot"]["Timeout"] == 10
+    widget._undo()
+    assert timeout.data() == "5"
+
+
+def test_editor_widget_find_and_replace(qapp):
+    """Testa busca (seleção do resultado na árvore) e substituição com undo"""
+    from uocm.ui.editor_widget import EditorWidget
+
+    widget = EditorWidget()
+    widget.editor.data = {"Kernel": {"Add": [{"BundlePath": f"Kext{i}.kext"} for i in range(FETCH_BATCH * 2)]}}
+    widget._save_to_history()
+    widget._populate_tree()
+
+    assert widget.find("kext300.kext") == 1
+    assert widget.tree.currentIndex().data(PathRole) == ("Kernel", "Add", 300, "BundlePath")
+
+    assert widget.replace_all(r"Kext(\d+)\.kext", r"Plugin\1.kext", regex=True) == FETCH_BATCH * 2
+    path = widget.model.index_for_path(("Kernel", "Add", 300, "BundlePath"), COLUMN_VALUE)
+    assert path.data() == "Plugin300.kext"
+    widget._undo()
+    assert path.data() == "Kext300.kext"
+
+
+def test_large_blob_hex_editor(qapp):
+    """Testa blob grande: prévia curta, sem edição na árvore e edição paginada no editor hex"""
+    from uocm.plist_editor.blob import PAGE_BYTES, hexdump
+    from uocm.ui.editor_widget import HexEditorDialog
+
+    firmware = bytes(PAGE_BYTES * 3)
+    editor = PlistEditor()
+    editor.data = {"DeviceProperties": {"Add": {"PciRoot(0x0)": {"ROM": firmware}}}}
+    editor._save_to_history()
+    model = PlistTreeModel(editor)
+
+    rom = model.index_for_path(("DeviceProperties", "Add", "PciRoot(0x0)", "ROM"), COLUMN_VALUE)
+    assert rom.data().endswith(f"... ({len(firmware)} bytes)")
+    assert len(rom.data()) < 80
+    assert not model.flags(rom) & Qt.ItemFlag.ItemIsEditable
+
+    dialog = HexEditorDialog(None, firmware)
+    assert dialog.show_page(1)
+    page = dialog.hex_text.toPlainText()
+    assert page.startswith(f"{PAGE_BYTES:08x}")
+    dialog.hex_text.selectAll()
+    dialog.hex_text.insertPlainText(hexdump(memoryview(b"\xde\xad" + bytes(PAGE_BYTES - 2)), PAGE_BYTES))
+    assert dialog.show_page(2)
+    dialog.accept()
+    assert dialog.pager.modified
+    assert dialog.get_data()[PAGE_BYTES:PAGE_BYTES + 2] == b"\xde\xad"
+    assert len(dialog.get_data()) == len(firmware)
@@ -0,0 +1,116 @@
+"""
+Testes da busca e substituição no editor de PLIST
+"""
+
+import re
+
+import pytest
+
+from uocm.plist_editor.editor import PlistEditor
+from uocm.plist_editor.search import FIELD_BASE64, FIELD_HEX, FIELD_KEY, FIELD_VALUE, PlistSearchIndex
+
+
+@pytest.fixture
+def editor():
+    editor = PlistEditor()
+    editor.data = {
+        "Kernel": {
+            "Add": [
+                {"BundlePath": "Lilu.kext", "Comment": "Lilu", "Enabled": True},
+                {"BundlePath": "WhateverGreen.kext", "Comment": "WEG", "Enabled": True},
+            ],
+        },
+        "DeviceProperties": {"Add": {"PciRoot(0x0)/Pci(0x2,0x0)": {"device-id": b"\x9b\x3e\x00\x00"}}},
+        "NVRAM": {"Add": {"7C436110-AB2A-4BBB-A880-FE41995C9F82": {"boot-args": "-v keepsyms=1"}}},
+    }
+    editor._save_to_history()
+    return editor
+
+
+def test_find_keys_values_and_blobs(editor):
+    """Testa busca em chaves, valores e visões hex/base64 de data"""
+    paths = {m.path for m in editor.find("lilu")}
+    assert ("Kernel", "Add", 0, "BundlePath") in paths
+    assert ("Kernel", "Add", 0, "Comment") in paths
+
+    blob = ("DeviceProperties", "Add", "PciRoot(0x0)/Pci(0x2,0x0)", "device-id")
+    assert [(m.path, m.field) for m in editor.find("9B3E")] == [(blob, FIELD_HEX)]
+    assert [(m.path, m.field) for m in editor.find("mz4AAA==", case_sensitive=True)] == [(blob, FIELD_BASE64)]
+
+    enabled = editor.find("enabled", whole=True, fields=[FIELD_KEY])
+    assert [m.path for m in enabled] == [("Kernel", "Add", 0, "Enabled"), ("Kernel", "Add", 1, "Enabled")]
+    assert editor.find("Lilu", fields=[FIELD_VALUE], scope=("Kernel", "Add", 1)) == []
+
+    assert [m.text for m in editor.find(r"^\w+Green\.kext$", regex=True)] == ["WhateverGreen.kext"]
+    with pytest.raises(re.error):
+        editor.find("(", regex=True)
+
+
+def test_index_updates_incrementally(editor):
+    """Testa que edições, remoções e undo atualizam o índice sem recriá-lo"""
+    rebuilds = []
+    original = PlistSearchIndex.rebuild
+    editor.search.rebuild = lambda data: (rebuilds.append(1), original(editor.search, data))
+
+    editor.set_at(("Kernel", "Add", 1, "Comment"), "AppleALC")
+    assert [m.path for m in editor.find("applealc")] == [("Kernel", "Add", 1, "Comment")]
+    assert editor.find("WEG") == []
+
+    editor.delete_at(("Kernel", "Add", 0))
+    assert editor.find("Lilu") == []
+    assert editor.find("WhateverGreen")[0].path[:3] == ("Kernel", "Add", 0)
+
+    editor.set_value("Misc.Boot.Timeout", 5)
+    assert [m.path for m in editor.find("Misc.Boot.Timeout", fields=["path"])] == [("Misc", "Boot", "Timeout")]
+
+    assert editor.undo() and editor.undo()
+    assert [m.path for m in editor.find("lilu.kext")] == [("Kernel", "Add", 0, "BundlePath")]
+    assert rebuilds == []
+    assert len(editor.search) == len(_fresh_index(editor.data))
+
+
+def test_replace_all_is_one_undo(editor):
+    """Testa substituição em massa (texto, regex e hex) como uma única entrada do histórico"""
+    entries = len(editor.history)
+    assert editor.replace_all(".kext", ".KEXT", scope=("Kernel",)) == 2
+    assert [k["BundlePath"] for k in editor.data["Kernel"]["Add"]] == ["Lilu.KEXT", "WhateverGreen.KEXT"]
+    assert len(editor.history) == entries + 1
+    assert editor.find(".KEXT", case_sensitive=True)
+
+    assert editor.undo()
+    assert [k["BundlePath"] for k in editor.data["Kernel"]["Add"]] == ["Lilu.kext", "WhateverGreen.kext"]
+    assert editor.find(".KEXT", case_sensitive=True) == []
+
+    assert editor.replace_all(r"keepsyms=(\d)", r"keepsyms=\1 debug=0x100", regex=True) == 1
+    boot_args = editor.data["NVRAM"]["Add"]["7C436110-AB2A-4BBB-A880-FE41995C9F82"]["boot-args"]
+    assert boot_args == "-v keepsyms=1 debug=0x100"
+
+    blob = editor.data["DeviceProperties"]["Add"]["PciRoot(0x0)/Pci(0x2,0x0)"]
+    assert editor.replace_all("9b3e", "923e") == 1
+    assert blob["device-id"] == b"\x92\x3e\x00\x00"
+    # Hex inválido não altera o blob
+    assert editor.replace_all("923e", "zz") == 0
+    # Chaves não são renomeadas
+    assert editor.replace_all("Enabled", "Disabled") == 0
+
+
+def _fresh_index(data):
+    index = PlistSearchIndex()
+    index.rebuild(data)
+    return index
+
+
+def test_hex_matches_respect_byte_boundaries():
+    """Testa que busca e substituição em hex não casam atravessando dois bytes"""
+    editor = PlistEditor()
+    editor.data = {"Blob": bytes.fromhex("1234"), "Other": bytes.fromhex("2312")}
+    editor._save_to_history()
+
+    assert [m.path for m in editor.find("23", fields=[FIELD_HEX])] == [("Other",)]
+    assert [m.path for m in editor.find("2.", regex=True, fields=[FIELD_HEX])] == [("Other",)]
+    assert editor.find("123", fields=[FIELD_HEX]) == []
+
+    assert editor.replace_all("23", "ff") == 1
+    assert editor.data == {"Blob": bytes.fromhex("1234"), "Other": bytes.fromhex("ff12")}
+    assert editor.replace_all("(..)", r"\1\1", regex=True, scope=("Blob",)) == 1
+    assert editor.data["Blob"] == bytes.fromhex("12123434")
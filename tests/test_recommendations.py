@@ -0,0 +1,109 @@
+"""
+Testes do índice de recomendações em memória
+"""
+
+import plistlib
+
+from sqlalchemy import event
+
+from uocm.db.database import get_database
+from uocm.db.models import HardwareProfile, KextInfo, SMBIOSProfile
+from uocm.db.recommendations import (
+    cpu_token,
+    get_recommendation_index,
+    pci_key,
+)
+from uocm.detector.models import AudioInfo, GPUInfo
+from uocm.engine_generator.efi_generator import EFIGenerator
+from uocm.engine_generator.modes import GenerationMode
+
+
+def _seed():
+    with get_database().session() as session:
+        smbios = SMBIOSProfile(name="iMac19,1", product_name="iMac19,1", serial_number_prefix="C02")
+        session.add(smbios)
+        session.flush()
+        alc = KextInfo(name="AppleALC", pci_ids=["8086:a348"], local_path="/kexts/AppleALC.kext")
+        rx = KextInfo(name="RadeonSensor", pci_ids=["1002"])
+        session.add_all([alc, rx])
+        session.flush()
+        session.add(HardwareProfile(
+            cpu_model="Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz",
+            recommended_smbios_id=smbios.id,
+            recommended_kexts=[alc.id, "CPUFriend"],
+        ))
+
+
+def test_tokens():
+    """Testa as chaves normalizadas de CPU e PCI"""
+    assert cpu_token("Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz") == "core i7 8700k"
+    assert cpu_token("Intel Core i7-8700K") == "core i7 8700k"
+    assert cpu_token("Apple M1") == "apple m1"
+    assert pci_key("0x8086", "0xA348") == "8086:a348"
+    assert pci_key("0x1002") == "1002"
+    assert pci_key(None, "0x1234") is None
+
+
+def test_index_lookups():
+    """Testa as consultas do índice e a resolução de ids de kexts"""
+    _seed()
+    index = get_recommendation_index()
+
+    assert index.smbios["iMac19,1"].serial_prefix == "C02"
+    profile = index.hardware_for_cpu("Intel Core i7-8700K")
+    assert profile.smbios.product_name == "iMac19,1"
+    assert profile.kexts == ("AppleALC", "CPUFriend")
+    assert index.hardware_for_cpu("Intel Core i7-8700") is None
+    assert index.kexts_for_device("0x8086", "0xa348") == ["AppleALC"]
+    assert index.kexts_for_device("0x1002", "0x67df") == ["RadeonSensor"]
+    assert index.kext_paths == {"AppleALC": "/kexts/AppleALC.kext"}
+
+
+def test_index_loaded_once_and_invalidated():
+    """Testa que o índice é reutilizado e recarregado após alterações no banco"""
+    _seed()
+    statements = []
+    engine = get_database().read_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        index = get_recommendation_index()
+        loads = len(statements)
+        assert get_recommendation_index() is index
+        assert len(statements) == loads
+
+        with get_database().session() as session:
+            session.add(SMBIOSProfile(name="MacPro7,1", product_name="MacPro7,1"))
+        reloaded = get_recommendation_index()
+        assert reloaded is not index
+        assert "MacPro7,1" in reloaded.smbios
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_generator_uses_index(temp_dir, sample_hardware_info):
+    """Testa SMBIOS e kexts do banco na geração, sem consultas LIKE"""
+    _seed()
+    sample_hardware_info.gpu = GPUInfo(model="Radeon RX 580", vendor="AMD", vendor_id="0x1002", device_id="0x67df")
+    sample_hardware_info.audio = AudioInfo(codec="ALC1220", vendor_id="0x8086", device_id="0xa348")
+
+    statements = []
+    engine = get_database().read_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        efi_path = EFIGenerator().generate_efi(sample_hardware_info, GenerationMode.STANDARD, temp_dir / "EFI1")
+        EFIGenerator().generate_efi(sample_hardware_info, GenerationMode.STANDARD, temp_dir / "EFI2")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert not any("LIKE" in statement for statement in statements)
+    # Três consultas na primeira geração, nenhuma na segunda
+    assert len(statements) == 3
+
+    with open(efi_path / "EFI" / "OC" / "config.plist", "rb") as f:
+        config = plistlib.load(f)
+    assert config["PlatformInfo"]["Generic"]["SystemProductName"] == "iMac19,1"
+    bundles = [entry["BundlePath"] for entry in config["Kernel"]["Add"]]
+    assert "RadeonSensor.kext" in bundles
+    assert bundles.count("CPUFriend.kext") == 1
@@ -0,0 +1,82 @@
+"""
+Testes de regressão do detector sobre o corpus de dumps de hardware
+"""
+
+import json
+import plistlib
+from pathlib import Path
+
+import pytest
+
+from uocm.detector import HardwareDetector
+from uocm.detector.replay import (
+    anonymise_ioreg_line,
+    anonymise_sp,
+    discover_dumps,
+    hardware_to_dict,
+    load_dump,
+)
+from uocm.engine_generator.batch import load_profiles
+from uocm.engine_generator.efi_generator import EFIGenerator
+from uocm.engine_generator.modes import GenerationMode
+
+CORPUS = Path(__file__).parent / "fixtures" / "hardware"
+DUMPS = discover_dumps(CORPUS)
+
+
+def test_corpus_is_not_empty():
+    """Testa que o corpus foi encontrado e todos os dumps têm resultado esperado"""
+    assert len(DUMPS) >= 3
+    assert all(dump.expected is not None for dump in DUMPS)
+
+
+@pytest.mark.parametrize("dump", DUMPS, ids=[d.name for d in DUMPS])
+def test_replay_matches_expected(dump):
+    """Testa a detecção de cada dump contra o expected.json"""
+    hardware = HardwareDetector.from_dump(dump.path).detect_all()
+    assert hardware_to_dict(hardware) == dump.load_expected()
+
+
+@pytest.mark.parametrize("dump", DUMPS, ids=[d.name for d in DUMPS])
+def test_replay_generates_efi(dump, temp_dir):
+    """Testa a geração de EFI a partir do hardware reproduzido"""
+    hardware = dump.detect()
+    efi_path = EFIGenerator().generate_efi(hardware, GenerationMode.STANDARD, temp_dir / dump.name)
+
+    with open(efi_path / "EFI" / "OC" / "config.plist", "rb") as f:
+        config = plistlib.load(f)
+    assert config["PlatformInfo"]["Generic"]["SystemProductName"]
+
+
+def test_batch_profiles_from_dumps(temp_dir):
+    """Testa perfis do lote apontando para dumps"""
+    profiles_path = temp_dir / "profiles.json"
+    profiles_path.write_text(json.dumps([{"dump": str(dump.path)} for dump in DUMPS]))
+
+    jobs = load_profiles(profiles_path)
+    assert [job.name for job in jobs] == [dump.name for dump in DUMPS]
+    assert jobs[0].hardware.chipset == DUMPS[0].load_expected()["chipset"]
+
+    with pytest.raises(ValueError):
+        profiles_path.write_text(json.dumps([{"dump": "inexistente"}]))
+        load_profiles(profiles_path)
+
+
+def test_anonymise():
+    """Testa a remoção de números de série e endereços MAC"""
+    sp = anonymise_sp([{"_items": [{"serial_number": "C02XK1ABJV3Q", "machine_model": "iMac19,1"}]}])
+    assert sp == [{"_items": [{"serial_number": "REDACTED", "machine_model": "iMac19,1"}]}]
+
+    assert anonymise_ioreg_line('  | |   "IOMACAddress" = <001122334455>\n') == '  | |   "IOMACAddress" = "REDACTED"\n'
+    line = '  | |   "vendor-id" = <86800000>\n'
+    assert anonymise_ioreg_line(line) == line
+
+    for dump in DUMPS:
+        text = dump.ioreg.read_text()
+        assert "IOMACAddress\" = <" not in text
+
+
+def test_load_dump_without_files(temp_dir):
+    """Testa erro ao abrir diretório sem dump"""
+    with pytest.raises(FileNotFoundError):
+        load_dump(temp_dir)
@@ -0,0 +1,58 @@
+"""
+Testes para o store de kexts/drivers endereçado por conteúdo
+"""
+
+import errno
+import os
+
+from uocm.kext_manager import store as store_module
+from uocm.kext_manager.store import ContentStore
+
+
+def _make_kext(path):
+    (path / "Contents" / "MacOS").mkdir(parents=True)
+    (path / "Contents" / "Info.plist").write_bytes(b"<plist/>")
+    (path / "Contents" / "MacOS" / path.stem).write_bytes(b"\xcf\xfa\xed\xfe" * 64)
+
+
+def test_store_deduplicates_and_links(temp_dir):
+    """Testa deduplicação por hash e materialização sem cópia"""
+    store = ContentStore(temp_dir / "store")
+    _make_kext(temp_dir / "src" / "Lilu.kext")
+    (temp_dir / "OpenRuntime.efi").write_bytes(b"driver")
+
+    tree_id = store.add_tree(temp_dir / "src" / "Lilu.kext", ref="kexts/Lilu")
+    assert store.add_tree(temp_dir / "src" / "Lilu.kext") == tree_id
+    store.add_file(temp_dir / "OpenRuntime.efi", ref="drivers/OpenRuntime.efi")
+    assert len([p for p in store.objects_path.rglob("*") if p.is_file()]) == 3
+
+    first = store.install("kexts/Lilu", temp_dir / "EFI1" / "Kexts")
+    second = store.install("kexts/Lilu", temp_dir / "EFI2" / "Kexts")
+    driver = store.install("drivers/OpenRuntime.efi", temp_dir / "EFI1" / "Drivers")
+
+    assert first == temp_dir / "EFI1" / "Kexts" / "Lilu.kext"
+    assert (second / "Contents" / "Info.plist").read_bytes() == b"<plist/>"
+    assert driver.read_bytes() == b"driver"
+    assert store.stats["copy"] == 0
+    if store.stats["hardlink"]:
+        binary = "Contents/MacOS/Lilu"
+        assert os.stat(first / binary).st_ino == os.stat(second / binary).st_ino
+
+    assert store.install("kexts/Missing", temp_dir / "EFI1" / "Kexts") is None
+
+
+def test_store_falls_back_to_copy(temp_dir, monkeypatch):
+    """Testa cópia quando o destino não suporta links (ex: FAT32)"""
+    store = ContentStore(temp_dir / "store")
+    _make_kext(temp_dir / "src" / "VirtualSMC.kext")
+    store.add_tree(temp_dir / "src" / "VirtualSMC.kext", ref="kexts/VirtualSMC")
+
+    def no_link(src, dst):
+        raise OSError(errno.EPERM, "Operation not permitted")
+
+    monkeypatch.setattr(store_module, "_reflink", lambda src, dst: False)
+    monkeypatch.setattr(store_module.os, "link", no_link)
+
+    kext = store.install("kexts/VirtualSMC", temp_dir / "EFI" / "Kexts")
+    assert store.stats == {"reflink": 0, "hardlink": 0, "copy": 2}
+    assert os.stat(kext / "Contents" / "Info.plist").st_mode & 0o777 == 0o644
@@ -48,3 +48,99 @@ def test_validation_error_info():
     assert d["path"] == "ACPI.Add"
     assert d["validator"] == "type"
 
+
+
+def test_validate_config_paths_incremental():
+    """Testa revalidação incremental limitada aos caminhos alterados."""
+    from universal_oc_manager.core.validator.schema_validator import validate_config_paths
+
+    schema = {
+        "type": "object",
+        "properties": {
+            "Kernel": {
+                "type": "object",
+                "properties": {
+                    "Add": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {"Enabled": {"type": "boolean"}},
+                        },
+                    }
+                },
+            },
+            "Misc": {"type": "object"},
+        },
+    }
+    config = {"Kernel": {"Add": [{"Enabled": True}, {"Enabled": "yes"}]}, "Misc": []}
+    errors = validate_config(config, schema)
+    assert {e.path for e in errors} == {"Kernel.Add.1.Enabled", "Misc"}
+
+    config["Kernel"]["Add"][1]["Enabled"] = False
+    errors = validate_config_paths(config, ["Kernel.Add.1.Enabled"], errors, schema)
+    assert [e.path for e in errors] == ["Misc"]
+
+    config["Kernel"]["Add"][0]["Enabled"] = 1
+    errors = validate_config_paths(config, ["Kernel.Add.0.Enabled"], errors, schema)
+    assert {e.path for e in errors} == {"Kernel.Add.0.Enabled", "Misc"}
+    assert {e.path for e in errors} == {e.path for e in validate_config(config, schema)}
+
+
+def test_validate_config_paths_resolves_refs_below_scope():
+    """Testa que $ref/$defs abaixo do escopo resolvem no schema inteiro."""
+    from universal_oc_manager.core.validator.schema_validator import validate_config_paths
+
+    schema = {
+        "$defs": {"flag": {"type": "boolean"}},
+        "type": "object",
+        "properties": {
+            "Kernel": {
+                "type": "object",
+                "properties": {"Quirks": {"type": "object", "properties": {"XhciPortLimit": {"$ref": "#/$defs/flag"}}}},
+            },
+        },
+    }
+    config = {"Kernel": {"Quirks": {"XhciPortLimit": True}}}
+    errors = validate_config(config, schema)
+    assert errors == []
+
+    config["Kernel"]["Quirks"]["XhciPortLimit"] = 1
+    errors = validate_config_paths(config, ["Kernel.Quirks.XhciPortLimit"], errors, schema)
+    assert [e.path for e in errors] == ["Kernel.Quirks.XhciPortLimit"]
+
+
+def test_schema_and_validator_are_cached(monkeypatch):
+    """Testa que o schema é lido uma vez e o validador só é recompilado com force_refresh."""
+    from universal_oc_manager.core.validator import schema_validator
+    from universal_oc_manager.infra.schemas import schema_manager
+
+    manager = schema_manager._SCHEMA_MANAGER
+    loads = []
+    real_load = manager._load_schema
+
+    def load(force_refresh):
+        loads.append(force_refresh)
+        return real_load(force_refresh)
+
+    monkeypatch.setattr(manager, "_load_schema", load)
+    monkeypatch.setattr(manager, "_fetch_official_schema", lambda: None)
+    schema_validator.clear_validator_cache()
+    manager._schema = None
+
+    validator = schema_validator.get_validator()
+    for _ in range(3):
+        validate_config({"ACPI": {}})
+    assert loads == [False]
+    assert schema_validator.get_validator() is validator
+    assert schema_manager.get_schema() is validator.schema
+
+    version = manager.version
+    schema_manager.get_schema(force_refresh=True)
+    assert loads == [False, True]
+    assert manager.version == version + 1
+    assert schema_validator.get_validator() is not validator
+
+    # Schemas explícitos também são compilados uma vez só
+    custom = {"type": "object", "required": ["Misc"]}
+    assert schema_validator.get_validator(custom) is schema_validator.get_validator(custom)
+    assert validate_config({}, custom)
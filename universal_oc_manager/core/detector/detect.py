@@ -4,6 +4,8 @@ import subprocess
 import json
 from typing import Any
 
+from uocm.detector.cpu_classifier import classify_cpu, normalize_brand
+
 
 @dataclass
 class HardwareProfile:
@@ -25,14 +27,27 @@ def _sp_json(datatype: str) -> dict[str, Any]:
         return {}
 
 
+def _cpu_brand() -> str | None:
+    try:
+        out = subprocess.check_output(["/usr/sbin/sysctl", "-n", "machdep.cpu.brand_string"], text=True)
+        return normalize_brand(out.strip()) or None
+    except Exception:
+        return None
+
+
 def detect_hardware() -> HardwareProfile:
     sp_hw = _sp_json("SPHardwareDataType")
-    cpu_name = None
+    cpu_name = _cpu_brand()
     try:
         items = sp_hw.get("SPHardwareDataType", [])
-        if items:
+        if items and not cpu_name:
             cpu_name = items[0].get("cpu_type") or items[0].get("machine_model")
     except Exception:
         pass
-    return HardwareProfile(cpu=cpu_name)
+    profile = HardwareProfile(cpu=cpu_name)
+    cpu_class = classify_cpu(cpu_name or "")
+    if cpu_class is not None:
+        profile.igpu = cpu_class.igpu
+        profile.smbios_suggestion = cpu_class.smbios
+    return profile
 
@@ -1,8 +1,11 @@
 from __future__ import annotations
+import threading
+from collections import OrderedDict
 from jsonschema import Draft202012Validator
-from typing import Any
+from typing import Any, Callable, Iterable
 from dataclasses import dataclass
-from ...infra.schemas.schema_manager import get_schema
+from uocm.plist_editor.scope import resolve_keys, scope_for
+from ...infra.schemas.schema_manager import get_versioned_schema
 
 
 @dataclass
@@ -22,20 +25,72 @@ class ValidationErrorInfo:
         }
 
 
+# Compiled validators: the OpenCore schema one is rebuilt when the schema
+# version changes; explicit schemas (tests, sub-schemas of incremental
+# revalidation) are kept by identity in a small LRU.
+_VALIDATOR_CACHE_SIZE = 64
+_validator_lock = threading.Lock()
+_default_validator: tuple[int, Draft202012Validator] | None = None
+_validators: OrderedDict[
+    tuple[int, int], tuple[dict[str, Any], Draft202012Validator | None, Draft202012Validator]
+] = OrderedDict()
+
+
+def get_validator(
+    schema: dict[str, Any] | None = None,
+    root: Draft202012Validator | None = None,
+) -> Draft202012Validator:
+    """Return a compiled validator for schema (default: the OpenCore schema).
+
+    With root, schema is a sub-schema of root.schema: the validator is derived
+    from root so that $ref/$defs still resolve against the whole schema.
+    """
+    global _default_validator
+    if schema is None:
+        version, schema = get_versioned_schema()
+        with _validator_lock:
+            if _default_validator is None or _default_validator[0] != version:
+                _default_validator = (version, Draft202012Validator(schema))
+            return _default_validator[1]
+
+    key = (id(schema), id(root))
+    with _validator_lock:
+        cached = _validators.get(key)
+        # Schema and root are kept in the entry, so their ids cannot be reused
+        if cached is not None and cached[0] is schema and cached[1] is root:
+            _validators.move_to_end(key)
+            return cached[2]
+        validator = Draft202012Validator(schema) if root is None else root.evolve(schema=schema)
+        _validators[key] = (schema, root, validator)
+        if len(_validators) > _VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+        return validator
+
+
+def clear_validator_cache() -> None:
+    global _default_validator
+    with _validator_lock:
+        _default_validator = None
+        _validators.clear()
+
+
 def validate_config(
-    config: dict[str, Any], schema: dict[str, Any] | None = None
+    config: dict[str, Any],
+    schema: dict[str, Any] | None = None,
+    cancelled: Callable[[], bool] | None = None,
 ) -> list[ValidationErrorInfo]:
     """Validate a config.plist against OpenCore schema.
     
-    Returns list of detailed errors (path, message, validator).
+    Returns list of detailed errors (path, message, validator). If `cancelled`
+    returns True between errors, the (partial) list is returned early and the
+    caller is expected to discard it.
     """
-    if schema is None:
-        schema = get_schema()
-
-    validator = Draft202012Validator(schema)
+    validator = get_validator(schema)
     errors: list[ValidationErrorInfo] = []
 
     for error in validator.iter_errors(config):
+        if cancelled is not None and cancelled():
+            break
         path = ".".join(str(x) for x in error.path) if error.path else "root"
         errors.append(
             ValidationErrorInfo(
@@ -49,6 +104,57 @@ def validate_config(
     return errors
 
 
+def _in_scope(error_path: str, prefix: str) -> bool:
+    if not prefix:
+        return True
+    return error_path == prefix or error_path.startswith(prefix + ".")
+
+
+def validate_config_paths(
+    config: dict[str, Any],
+    key_paths: Iterable[str],
+    previous_errors: list[ValidationErrorInfo] | None,
+    schema: dict[str, Any] | None = None,
+) -> list[ValidationErrorInfo]:
+    """Revalidate only the subtrees touched by key_paths (e.g. 'Kernel.Add.3.Enabled').
+
+    Errors outside the touched subtrees are carried over from previous_errors;
+    without a previous result the whole config is validated.
+    """
+    root = get_validator(schema)
+    if previous_errors is None:
+        return validate_config(config, root.schema)
+
+    scopes = {}
+    for key_path in key_paths:
+        scope, sub_schema, instance = scope_for(config, root.schema, resolve_keys(config, key_path))
+        scopes[scope] = (sub_schema, instance)
+
+    errors = list(previous_errors)
+    covered: list[tuple[str | int, ...]] = []
+    for scope in sorted(scopes, key=len):
+        if any(scope[: len(root)] == root for root in covered):
+            continue
+        covered.append(scope)
+        sub_schema, instance = scopes[scope]
+        prefix = ".".join(str(x) for x in scope)
+        errors = [e for e in errors if not _in_scope(e.path, prefix)]
+
+        validator = get_validator(sub_schema, root=root)
+        for error in validator.iter_errors(instance):
+            full_path = (*scope, *error.path)
+            errors.append(
+                ValidationErrorInfo(
+                    message=error.message,
+                    path=".".join(str(x) for x in full_path) if full_path else "root",
+                    validator=error.validator,
+                    value=error.instance,
+                )
+            )
+
+    return errors
+
+
 def validate_config_simple(config: dict[str, Any]) -> list[str]:
     """Simplified version: returns only error messages."""
     return [e.message for e in validate_config(config)]
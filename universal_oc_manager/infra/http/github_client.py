@@ -1,32 +1,104 @@
 from __future__ import annotations
+import hashlib
+import os
 import httpx
 from typing import Any
 from pathlib import Path
 
+from uocm.kext_manager.downloader import (
+    partial_validator,
+    remove_partial_validator,
+    store_partial_validator,
+)
+from uocm.kext_manager.http_cache import HTTPCache
+from ..settings.config import CONFIG
+
+_CHUNK_SIZE = 1024 * 1024
+
 
 class GitHubClient:
-    def __init__(self, token: str | None = None) -> None:
+    def __init__(
+        self,
+        token: str | None = None,
+        cache: HTTPCache | None = None,
+        offline: bool = False,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
         headers = {"Accept": "application/vnd.github+json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
-        self._client = httpx.Client(base_url="https://api.github.com", headers=headers, timeout=30)
-        self._raw_client = httpx.Client(timeout=30)
+        self._client = httpx.Client(
+            base_url="https://api.github.com", headers=headers, timeout=30, transport=transport
+        )
+        self._raw_client = httpx.Client(timeout=30, transport=transport)
+        self.cache = cache or HTTPCache(CONFIG.cache_dir / "http")
+        # Offline: responses are served only from the cache
+        self.offline = offline
 
     def get_release(self, owner: str, repo: str, tag: str | None = None) -> dict[str, Any]:
         if tag:
-            resp = self._client.get(f"/repos/{owner}/{repo}/releases/tags/{tag}")
+            path = f"/repos/{owner}/{repo}/releases/tags/{tag}"
         else:
-            resp = self._client.get(f"/repos/{owner}/{repo}/releases/latest")
+            path = f"/repos/{owner}/{repo}/releases/latest"
+        resp = self._cached_get(self._client, str(self._client.base_url.join(path)))
         resp.raise_for_status()
         return resp.json()
 
     def get_raw_file(self, owner: str, repo: str, path: str, branch: str = "master") -> bytes:
         url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}"
-        resp = self._raw_client.get(url)
+        resp = self._cached_get(self._raw_client, url)
         resp.raise_for_status()
         return resp.content
 
-    def download_asset(self, url: str, dest: Path) -> None:
-        resp = self._raw_client.get(url, follow_redirects=True)
-        resp.raise_for_status()
-        dest.write_bytes(resp.content)
+    def _cached_get(self, client: httpx.Client, url: str) -> httpx.Response:
+        """GET through the cache: conditional request, 304 served from disk."""
+        url = str(httpx.URL(url))
+        if self.offline:
+            cached = self.cache.cached_response(url)
+            self.cache.record(hit=cached is not None)
+            return cached or httpx.Response(504, request=httpx.Request("GET", url))
+
+        resp = client.get(url, headers=self.cache.conditional_headers(url))
+        if resp.status_code == 304:
+            cached = self.cache.cached_response(url, resp.request)
+            if cached is not None:
+                self.cache.record(hit=True)
+                return cached
+        self.cache.record(hit=False)
+        self.cache.store(url, resp)
+        return resp
+
+    def download_asset(self, url: str, dest: Path, sha256: str | None = None) -> None:
+        """Stream an asset to disk, resuming a previous partial download via Range.
+
+        The resume carries If-Range with the validator of the response that
+        started the .part, so a changed asset is downloaded again in full.
+        """
+        part = dest.with_name(dest.name + ".part")
+        hasher = hashlib.sha256()
+        offset = 0
+        validator = partial_validator(part)
+        if validator:
+            with part.open("rb") as fp:
+                for chunk in iter(lambda: fp.read(_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    offset += len(chunk)
+
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+        with self._raw_client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
+            if not (resp.status_code == 416 and offset):
+                resp.raise_for_status()
+                if offset and resp.status_code != 206:
+                    hasher, offset = hashlib.sha256(), 0
+                if not offset:
+                    store_partial_validator(part, resp)
+                with part.open("ab" if offset else "wb") as fp:
+                    for chunk in resp.iter_bytes(_CHUNK_SIZE):
+                        fp.write(chunk)
+                        hasher.update(chunk)
+
+        remove_partial_validator(part)
+        if sha256 and hasher.hexdigest() != sha256.lower():
+            part.unlink(missing_ok=True)
+            raise ValueError(f"SHA-256 mismatch for {dest.name}")
+        os.replace(part, dest)
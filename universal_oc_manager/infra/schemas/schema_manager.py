@@ -1,5 +1,6 @@
 from __future__ import annotations
 import json
+import threading
 from pathlib import Path
 from typing import Any
 from ..settings.config import CONFIG
@@ -16,6 +17,15 @@ class SchemaManager:
         self._cache_dir.mkdir(parents=True, exist_ok=True)
         self._github = GitHubClient()
         self._schema_path = self._cache_dir / "opencore_schema.json"
+        # Loaded once; `version` is bumped on every (re)load so that compiled
+        # validators know when to recompile
+        self._lock = threading.Lock()
+        self._schema: dict[str, Any] | None = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def _fetch_official_schema(self) -> dict[str, Any] | None:
         """Try to fetch official schema from OpenCorePkg (if available)."""
@@ -34,7 +44,22 @@ class SchemaManager:
             return None
 
     def get_schema(self, force_refresh: bool = False) -> dict[str, Any]:
-        """Return OpenCore schema (local cache or remote fetch)."""
+        """Return OpenCore schema, loaded once (local cache or remote fetch).
+
+        The returned dict is shared between callers and must not be mutated;
+        force_refresh reloads it and bumps `version`.
+        """
+        return self.get_versioned_schema(force_refresh)[1]
+
+    def get_versioned_schema(self, force_refresh: bool = False) -> tuple[int, dict[str, Any]]:
+        """Return (version, schema) as a consistent pair."""
+        with self._lock:
+            if self._schema is None or force_refresh:
+                self._schema = self._load_schema(force_refresh)
+                self._version += 1
+            return self._version, self._schema
+
+    def _load_schema(self, force_refresh: bool) -> dict[str, Any]:
         if not force_refresh and self._schema_path.exists():
             try:
                 with self._schema_path.open("r", encoding="utf-8") as fp:
@@ -93,3 +118,8 @@ def get_schema(force_refresh: bool = False) -> dict[str, Any]:
     """Helper function to get the schema."""
     return _SCHEMA_MANAGER.get_schema(force_refresh=force_refresh)
 
+
+def get_versioned_schema(force_refresh: bool = False) -> tuple[int, dict[str, Any]]:
+    """Helper function to get (schema version, schema)."""
+    return _SCHEMA_MANAGER.get_versioned_schema(force_refresh=force_refresh)
+
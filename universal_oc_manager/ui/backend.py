@@ -1,13 +1,19 @@
 from __future__ import annotations
-from PyQt6.QtCore import QObject, pyqtSlot, pyqtSignal, QUrl
+from PyQt6.QtCore import QObject, pyqtSlot, pyqtSignal, pyqtProperty, QUrl
 from pathlib import Path
 from typing import Any
+import copy
 import json
 from ..core.detector.detect import detect_hardware
 from ..core.engine.generator import generate_efi
 from ..core.plist.loader import load_plist, save_plist
-from ..core.validator.schema_validator import validate_config, ValidationErrorInfo
+from ..core.validator.schema_validator import (
+    validate_config,
+    validate_config_paths,
+    ValidationErrorInfo,
+)
 from ..infra.logging.logger import get_logger
+from .jobs import Job, JobQueue
 
 
 class AppController(QObject):
@@ -16,13 +22,36 @@ class AppController(QObject):
     validationErrorsChanged = pyqtSignal("QVariantList")  # List of errors (dicts)
     hardwareDetected = pyqtSignal("QVariantMap")  # Detected hardware profile
     efiGenerated = pyqtSignal(str)  # Path of generated EFI
+    validatingChanged = pyqtSignal(bool)  # A load/validation job is running
+    # Worker thread -> Qt thread hop for finished jobs (queued connection)
+    _jobFinished = pyqtSignal(object, object, object)
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = 2) -> None:
         super().__init__()
         self._logger = get_logger("uocm.ui")
         self._last_profile: dict[str, Any] | None = None
         self._current_config: dict[str, Any] | None = None
         self._current_config_path: Path | None = None
+        # Bumped whenever the current config is replaced or edited; workers get
+        # a snapshot, and a result for an older revision is dropped
+        self._config_revision = 0
+        # Errors of the last validation, the base for incremental revalidation
+        self._last_errors: list[ValidationErrorInfo] | None = None
+        # Loading and validation run off the Qt thread; only the latest job per
+        # document survives, and only the latest load may replace the document
+        self._jobs = JobQueue(max_workers=max_workers, name="uocm-validate")
+        self._load_job: Job | None = None
+        self._validating = False
+        self._jobFinished.connect(self._on_job_finished)
+
+    @pyqtProperty(bool, notify=validatingChanged)
+    def validating(self) -> bool:
+        return self._validating
+
+    @pyqtSlot()
+    def shutdown(self) -> None:
+        """Cancel pending jobs; running ones finish in the background."""
+        self._jobs.shutdown(wait=False)
 
     @pyqtSlot()
     def detectHardware(self) -> None:
@@ -42,34 +71,82 @@ class AppController(QObject):
         self.efiGenerated.emit(str(efi_path))
         self._logger.info(f"EFI generated at: {efi_path}")
 
-    @pyqtSlot(str, result="QVariantList")
-    def validateConfigFile(self, file_path: str) -> list[dict[str, Any]]:
-        """Validate a config.plist file and return list of errors (as dicts)."""
-        try:
-            path = Path(file_path)
-            if not path.exists():
-                return [{"message": f"File not found: {file_path}", "path": "", "validator": ""}]
-            config = load_plist(path)
-            self._current_config = config
-            self._current_config_path = path
-            errors = validate_config(config)
-            errors_dict = [e.to_dict() for e in errors]
-            self.validationErrorsChanged.emit(errors_dict)
-            return errors_dict
-        except Exception as e:
-            self._logger.error(f"Error validating config: {e}")
-            return [{"message": f"Validation error: {str(e)}", "path": "", "validator": ""}]
+    @pyqtSlot(str)
+    def validateConfigFile(self, file_path: str) -> None:
+        """Load and validate a config.plist file in the background.
+
+        The file becomes the current config; errors (as dicts) are emitted
+        through validationErrorsChanged.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            self.validationErrorsChanged.emit(
+                [{"message": f"File not found: {file_path}", "path": "", "validator": ""}]
+            )
+            return
+        self._submit_load(path)
+
+    @pyqtSlot()
+    def validateCurrentConfig(self) -> None:
+        """Validate the current config.plist in memory in the background."""
+        if self._current_config is None:
+            return
+        if self._load_job is not None:
+            # The pending load validates the document that is about to become current
+            return
+        # Snapshot: setConfigValue edits the live dict while the worker validates
+        self._submit(self._current_config_path, copy.deepcopy(self._current_config))
 
-    @pyqtSlot(result="QVariantList")
-    def validateCurrentConfig(self) -> list[dict[str, Any]]:
-        """Validate the current config.plist in memory."""
+    @pyqtSlot(str, str, result="QVariantList")
+    def setConfigValue(self, key_path: str, value_json: str) -> list[dict[str, Any]]:
+        """Set a value in the current config (e.g. 'Kernel.Add.3.Enabled') and
+        revalidate only the touched subtree."""
         if self._current_config is None:
             return []
-        errors = validate_config(self._current_config)
+        try:
+            value = json.loads(value_json)
+            touched = self._set_config_value(self._current_config, key_path, value)
+        except (json.JSONDecodeError, ValueError, TypeError, IndexError) as e:
+            return [{"message": f"Invalid value for {key_path}: {str(e)}", "path": key_path, "validator": ""}]
+        self._config_revision += 1
+
+        # A background load/validation of the previous state is stale now
+        self._cancel_jobs(self._document_key(self._current_config_path))
+        errors = validate_config_paths(self._current_config, [touched], self._last_errors)
+        self._last_errors = errors
         errors_dict = [e.to_dict() for e in errors]
         self.validationErrorsChanged.emit(errors_dict)
         return errors_dict
 
+    @staticmethod
+    def _set_config_value(config: dict[str, Any], key_path: str, value: Any) -> str:
+        """Set value at key_path, creating missing dicts; return the shallowest touched path."""
+        keys = key_path.split(".")
+        target: Any = config
+        touched: str | None = None
+        for depth, key in enumerate(keys):
+            last = depth == len(keys) - 1
+            if isinstance(target, list):
+                index = int(key)
+                if index == len(target):
+                    target.append(value if last else {})
+                    touched = touched or ".".join(keys[: depth + 1])
+                elif last:
+                    target[index] = value
+                if not last:
+                    target = target[index]
+            elif isinstance(target, dict):
+                if key not in target:
+                    touched = touched or ".".join(keys[: depth + 1])
+                    target[key] = value if last else {}
+                elif last:
+                    target[key] = value
+                if not last:
+                    target = target[key]
+            else:
+                raise TypeError(f"Cannot set '{key}' inside a {type(target).__name__}")
+        return touched or key_path
+
     @pyqtSlot(str, result="QVariantList")
     def validateConfigJSON(self, config_json: str) -> list[dict[str, Any]]:
         """Validate a config.plist passed as JSON string."""
@@ -86,16 +163,83 @@ class AppController(QObject):
 
     @pyqtSlot(str)
     def loadConfig(self, file_path: str) -> None:
-        """Load a config.plist file for editing."""
-        try:
-            path = Path(file_path)
+        """Load a config.plist file for editing (and validate it) in the background."""
+        self._submit_load(Path(file_path))
+
+    @staticmethod
+    def _document_key(path: Path | None) -> str:
+        return str(path) if path is not None else "<memory>"
+
+    def _submit_load(self, path: Path) -> None:
+        # A newer load replaces the document, so older loads are stale whatever their path
+        if self._load_job is not None and self._load_job.key != self._document_key(path):
+            self._cancel_jobs(self._load_job.key)
+        self._load_job = self._submit(path, None)
+
+    def _cancel_jobs(self, key: str) -> None:
+        self._jobs.cancel(key)
+        if self._load_job is not None and self._load_job.key == key:
+            self._load_job = None
+        self._update_validating()
+
+    def _submit(self, path: Path | None, config: dict[str, Any] | None) -> Job:
+        """Queue a load (config=None) and/or validation for the document at path."""
+        job = self._jobs.submit(
+            self._document_key(path),
+            self._run_job,
+            lambda job, result, error: self._jobFinished.emit(job, result, error),
+            payload=(path, config, self._config_revision),
+        )
+        self._update_validating()
+        return job
+
+    @staticmethod
+    def _run_job(job: Job) -> tuple[dict[str, Any], list[ValidationErrorInfo]]:
+        """Worker thread: must not touch controller state."""
+        path, config, _ = job.payload
+        if config is None:
             config = load_plist(path)
-            self._current_config = config
-            self._current_config_path = path
-            # Automatically validate after loading
-            self.validateCurrentConfig()
-        except Exception as e:
-            self._logger.error(f"Error loading config: {e}")
+            job.check()
+        errors = validate_config(config, cancelled=lambda: job.cancelled)
+        job.check()
+        return config, errors
+
+    def _on_job_finished(self, job: Job, result: Any, error: BaseException | None) -> None:
+        """Qt thread: apply the result of a job that is still the latest one."""
+        if not self._jobs.finish(job):
+            self._update_validating()
+            return
+        is_load = job.payload[1] is None
+        if is_load:
+            if job is not self._load_job:
+                self._update_validating()
+                return
+            self._load_job = None
+        try:
+            if error is not None:
+                self._logger.error(f"Error validating config: {error}")
+                self.validationErrorsChanged.emit(
+                    [{"message": f"Validation error: {str(error)}", "path": "", "validator": ""}]
+                )
+                return
+            config, errors = result
+            if is_load:
+                self._current_config = config
+                self._current_config_path = job.payload[0]
+                self._config_revision += 1
+            elif job.payload[2] != self._config_revision:
+                # The document was replaced or edited while this validation ran
+                return
+            self._last_errors = errors
+            self.validationErrorsChanged.emit([e.to_dict() for e in errors])
+        finally:
+            self._update_validating()
+
+    def _update_validating(self) -> None:
+        validating = self._jobs.pending() > 0
+        if validating != self._validating:
+            self._validating = validating
+            self.validatingChanged.emit(validating)
 
     @pyqtSlot(str, str, result=bool)
     def saveConfig(self, file_path: str | None = None, config_json: str | None = None) -> bool:
@@ -113,6 +257,9 @@ class AppController(QObject):
                 return False
 
             save_plist(path, config)
+            if config is not self._current_config:
+                self._last_errors = None
+                self._config_revision += 1
             self._current_config = config
             self._current_config_path = path
             return True
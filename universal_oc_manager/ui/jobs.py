@@ -0,0 +1,109 @@
+from __future__ import annotations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function to stop early once the job was superseded."""
+
+
+@dataclass(eq=False)
+class Job:
+    """One submission to a JobQueue; `key` identifies the document it works on."""
+    key: str
+    generation: int
+    payload: Any = None
+    future: Future | None = None
+    _cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self) -> None:
+        """Cooperative cancellation point for long job functions."""
+        if self.cancelled:
+            raise JobCancelled(self.key)
+
+
+JobCallback = Callable[[Job, Any, "BaseException | None"], None]
+
+
+class JobQueue:
+    """Thread pool that keeps only the latest job per key.
+
+    Submitting a job cancels the previous one for the same key: a job that has
+    not started is dropped, a running one sees `job.cancelled` and its result
+    is discarded. The callback runs on the worker thread, only for jobs that
+    are still the latest for their key when they finish.
+    """
+
+    def __init__(self, max_workers: int = 2, name: str = "uocm-jobs") -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._latest: dict[str, Job] = {}
+        self._generation = 0
+
+    def submit(self, key: str, fn: Callable[[Job], Any], callback: JobCallback, payload: Any = None) -> Job:
+        with self._lock:
+            self._generation += 1
+            job = Job(key, self._generation, payload)
+            previous = self._latest.get(key)
+            self._latest[key] = job
+        if previous is not None:
+            previous.cancel()
+        job.future = self._executor.submit(self._run, job, fn, callback)
+        return job
+
+    def is_latest(self, job: Job) -> bool:
+        with self._lock:
+            return self._latest.get(job.key) is job and not job.cancelled
+
+    def finish(self, job: Job) -> bool:
+        """Forget a delivered job; False if it was superseded meanwhile."""
+        with self._lock:
+            if self._latest.get(job.key) is not job or job.cancelled:
+                return False
+            del self._latest[job.key]
+            return True
+
+    def pending(self) -> int:
+        """Jobs submitted and not yet finished or cancelled."""
+        with self._lock:
+            return sum(1 for job in self._latest.values() if not job.cancelled)
+
+    def cancel(self, key: str | None = None) -> None:
+        """Cancel the latest job of `key` (or of every key)."""
+        with self._lock:
+            jobs = list(self._latest.values()) if key is None else [self._latest.get(key)]
+            for job in jobs:
+                if job is not None:
+                    self._latest.pop(job.key, None)
+        for job in jobs:
+            if job is not None:
+                job.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[[Job], Any], callback: JobCallback) -> None:
+        if job.cancelled:
+            return
+        result: Any = None
+        error: BaseException | None = None
+        try:
+            result = fn(job)
+        except JobCancelled:
+            return
+        except Exception as e:
+            error = e
+        if self.is_latest(job):
+            callback(job, result, error)
@@ -11,6 +11,8 @@ ApplicationWindow {
     title: "Universal OpenCore Manager"
 
     property var validationErrors: []
+    // Status exibido antes da validação, restaurado quando ela termina
+    property string statusBeforeValidation: ""
 
     // Conectar sinal do backend
     Connections {
@@ -18,6 +20,15 @@ ApplicationWindow {
         function onValidationErrorsChanged(errors) {
             validationErrors = errors
         }
+        function onValidatingChanged(validating) {
+            if (validating) {
+                statusBeforeValidation = statusText.text
+                statusText.text = qsTr("Validando...")
+            } else if (statusText.text === qsTr("Validando...")) {
+                // Só restaura se nenhum outro evento trocou o status nesse meio tempo
+                statusText.text = statusBeforeValidation
+            }
+        }
         function onHardwareDetected(profile) {
             statusText.text = `Hardware detectado: ${profile.cpu || "N/A"}`
         }
@@ -115,10 +126,8 @@ ApplicationWindow {
                         spacing: 8
                         Button {
                             text: "Validar Config Atual"
-                            onClicked: {
-                                var errors = backend.validateCurrentConfig()
-                                console.log("Erros encontrados:", errors.length)
-                            }
+                            // Resultado chega por onValidationErrorsChanged
+                            onClicked: backend.validateCurrentConfig()
                         }
                         Button {
                             text: "Carregar Exemplo"
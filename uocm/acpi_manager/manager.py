@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import plistlib
 
-from uocm.db.database import get_db_session
+from uocm.db.database import get_db_read_session
 from uocm.db.models import SSDTTemplate
 from uocm.core.config import Config
 
@@ -23,7 +23,7 @@ class ACPIManager:
     
     def get_available_templates(self) -> List[SSDTTemplate]:
         """Retorna lista de templates SSDT disponíveis"""
-        session = get_db_session()
+        session = get_db_read_session()
         try:
             return session.query(SSDTTemplate).all()
         finally:
@@ -36,7 +36,7 @@ class ACPIManager:
         parameters: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Gera SSDT a partir de template"""
-        session = get_db_session()
+        session = get_db_read_session()
         try:
             template = session.query(SSDTTemplate).filter(
                 SSDTTemplate.name == template_name
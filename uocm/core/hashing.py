@@ -0,0 +1,229 @@
+"""
+Hashing engine shared by OC Snapshot and the kext manager
+Motor de hashing compartilhado pelo OC Snapshot e pelo gerenciador de kexts
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Read buffer size (1 MB) / Tamanho do buffer de leitura (1 MB)
+CHUNK_SIZE = 1024 * 1024
+
+# Files from this size on are hashed through mmap
+# Arquivos a partir deste tamanho são lidos via mmap
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+KNOWN_HASHES_PATH = Path(__file__).parent / "opencore_hashes.json"
+
+
+@dataclass(frozen=True)
+class FileDigest:
+    """
+    MD5 and SHA-256 digests of a file
+    Digests MD5 e SHA-256 de um arquivo
+    """
+    md5: str
+    sha256: str
+    size: int
+
+
+def _digest_file(path: Path, size: int) -> FileDigest:
+    """
+    Computes MD5 and SHA-256 in a single read pass
+    Calcula MD5 e SHA-256 em uma única passada de leitura
+    """
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    for offset in range(0, len(view), CHUNK_SIZE):
+                        with view[offset:offset + CHUNK_SIZE] as chunk:
+                            md5.update(chunk)
+                            sha256.update(chunk)
+        else:
+            buffer = bytearray(CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                md5.update(view[:read])
+                sha256.update(view[:read])
+
+    return FileDigest(md5=md5.hexdigest(), sha256=sha256.hexdigest(), size=size)
+
+
+class DigestCache:
+    """
+    Digest cache keyed by (device, inode, mtime, size)
+    Cache de digests indexado por (dispositivo, inode, mtime, tamanho)
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, int, int, int], FileDigest] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hash_file(self, path: Path) -> FileDigest:
+        """
+        Returns the file digests, reusing them while the file is unchanged
+        Retorna os digests do arquivo, reaproveitando-os enquanto não mudar
+        """
+        stat = os.stat(path)
+        key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        digest = _digest_file(Path(path), stat.st_size)
+        with self._lock:
+            self._entries[key] = digest
+            self.misses += 1
+        return digest
+
+    def hash_files(
+        self,
+        paths: Iterable[Path],
+        max_workers: Optional[int] = None,
+    ) -> Dict[Path, FileDigest]:
+        """
+        Hashes several files in one batch (hashlib releases the GIL)
+        Calcula hashes de vários arquivos em lote (hashlib libera o GIL)
+        """
+        paths = list(paths)
+        if len(paths) <= 1:
+            return {path: self.hash_file(path) for path in paths}
+
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(paths, pool.map(self.hash_file, paths)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Global instance / Instância global
+_digest_cache = DigestCache()
+
+
+def hash_file(path: Path) -> FileDigest:
+    """
+    Helper function: digests of a file using the global cache
+    Função auxiliar: digests de um arquivo usando o cache global
+    """
+    return _digest_cache.hash_file(path)
+
+
+def hash_files(paths: Iterable[Path], max_workers: Optional[int] = None) -> Dict[Path, FileDigest]:
+    """
+    Helper function: batched digests using the global cache
+    Função auxiliar: digests em lote usando o cache global
+    """
+    return _digest_cache.hash_files(paths, max_workers)
+
+
+@dataclass(frozen=True)
+class KnownBinary:
+    """
+    Known OpenCore binary (OpenCore.efi, driver or tool)
+    Binário conhecido do OpenCore (OpenCore.efi, driver ou tool)
+    """
+    version: str
+    variant: str  # RELEASE, DEBUG
+    file: str  # Relative to EFI/OC, ex: "Drivers/OpenRuntime.efi"
+    md5: str
+    sha256: str
+
+
+class OpenCoreHashIndex:
+    """
+    Indexed database of known OpenCore binary hashes
+    Banco indexado de hashes de binários conhecidos do OpenCore
+    """
+
+    def __init__(self, entries: Optional[Iterable[KnownBinary]] = None):
+        self._by_md5: Dict[str, List[KnownBinary]] = {}
+        self._by_sha256: Dict[str, List[KnownBinary]] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, *paths: Path) -> "OpenCoreHashIndex":
+        """
+        Loads one or more JSON databases (defaults to the bundled one)
+        Carrega um ou mais bancos JSON (por padrão, o embutido)
+        """
+        index = cls()
+        for path in paths or (KNOWN_HASHES_PATH,):
+            if not Path(path).exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for item in data.get("entries", []):
+                index.add(KnownBinary(
+                    version=item["version"],
+                    variant=item.get("variant", "RELEASE"),
+                    file=item["file"],
+                    md5=item["md5"].lower(),
+                    sha256=item.get("sha256", "").lower(),
+                ))
+        return index
+
+    def add(self, entry: KnownBinary) -> None:
+        self._by_md5.setdefault(entry.md5, []).append(entry)
+        if entry.sha256:
+            self._by_sha256.setdefault(entry.sha256, []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_md5.values())
+
+    def lookup(self, digest: FileDigest) -> Optional[KnownBinary]:
+        """
+        Finds a known binary, preferring SHA-256 over MD5
+        Busca um binário conhecido, preferindo SHA-256 a MD5
+        """
+        matches = self._by_sha256.get(digest.sha256) or self._by_md5.get(digest.md5)
+        return matches[0] if matches else None
+
+    def identify_efi(
+        self,
+        oc_path: Path,
+        cache: Optional[DigestCache] = None,
+    ) -> Dict[str, Optional[KnownBinary]]:
+        """
+        Identifies OpenCore.efi, Drivers/*.efi and Tools/*.efi in one batched pass
+        Identifica OpenCore.efi, Drivers/*.efi e Tools/*.efi em uma passada em lote
+
+        Returns:
+            Map of path relative to EFI/OC -> known binary (or None)
+        """
+        files: List[Path] = []
+        opencore_efi = oc_path / "OpenCore.efi"
+        if opencore_efi.is_file():
+            files.append(opencore_efi)
+        for folder in ("Drivers", "Tools"):
+            if (oc_path / folder).is_dir():
+                files.extend(sorted((oc_path / folder).glob("*.efi")))
+
+        digests = (cache or _digest_cache).hash_files(files)
+        return {
+            path.relative_to(oc_path).as_posix(): self.lookup(digests[path])
+            for path in files
+        }
@@ -10,6 +10,7 @@ from uocm.db.models import (
     SSDTTemplate,
     EFISnapshot,
     Plugin,
+    AppMeta,
 )
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     "SSDTTemplate",
     "EFISnapshot",
     "Plugin",
+    "AppMeta",
 ]
 
@@ -2,35 +2,89 @@
 Gerenciamento de banco de dados SQLAlchemy
 """
 
+import threading
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
-from sqlalchemy.pool import StaticPool
 
 from uocm.core.config import Config
+from uocm.db.migrations import upgrade
 from uocm.db.models import Base
+from uocm.db.recommendations import reset_recommendations
+
+# Pragmas aplicados a cada conexão. WAL permite leituras simultâneas a uma
+# escrita; synchronous=NORMAL é seguro com WAL (só a última transação pode
+# se perder em queda de energia, sem corromper o banco).
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,  # 16 MB
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+BUSY_TIMEOUT = 30.0  # segundos esperando o lock de escrita de outro processo
+READ_POOL_SIZE = 4
+
+
+def _set_pragmas(engine: Engine, read_only: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
 
 
 class Database:
-    """Gerenciador de banco de dados"""
+    """
+    Gerenciador de banco de dados
+    
+    Usa duas engines sobre o mesmo arquivo: a de escrita tem uma única
+    conexão, então escritas de threads diferentes (UI, DetectionThread,
+    GenerationThread) são serializadas no pool em vez de disputarem o lock
+    do SQLite; a de leitura tem um pool de conexões somente leitura que, com
+    WAL, leem em paralelo sem esperar as escritas. Cada thread usa a própria
+    sessão (scoped_session), e uma conexão só é usada por uma thread por vez.
+    """
     
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or Config.get_db_path()
+        url = f"sqlite:///{self.db_path}"
+        connect_args = {"check_same_thread": False, "timeout": BUSY_TIMEOUT}
         self.engine = create_engine(
-            f"sqlite:///{self.db_path}",
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
+            url,
+            connect_args=connect_args,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=BUSY_TIMEOUT,
             echo=False,
         )
+        self.read_engine = create_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=READ_POOL_SIZE,
+            max_overflow=READ_POOL_SIZE,
+            echo=False,
+        )
+        _set_pragmas(self.engine, read_only=False)
+        _set_pragmas(self.read_engine, read_only=True)
+        
         self.session_factory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(self.session_factory)
+        self.read_session_factory = sessionmaker(bind=self.read_engine, autoflush=False)
+        self.ReadSession = scoped_session(self.read_session_factory)
     
     def init_db(self) -> None:
-        """Inicializa o banco de dados criando todas as tabelas"""
-        Base.metadata.create_all(self.engine)
+        """Inicializa o banco de dados criando as tabelas e aplicando migrações"""
+        upgrade(self.engine)
     
     def drop_db(self) -> None:
         """Remove todas as tabelas do banco de dados"""
@@ -50,20 +104,50 @@ class Database:
             session.close()
     
     def get_session(self) -> Session:
-        """Retorna uma nova sessão do banco de dados"""
+        """Retorna a sessão de leitura e escrita da thread atual"""
         return self.Session()
+    
+    def get_read_session(self) -> Session:
+        """Retorna a sessão somente leitura da thread atual"""
+        return self.ReadSession()
+    
+    @contextmanager
+    def read_session(self):
+        """Context manager para sessões somente leitura"""
+        session = self.ReadSession()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    def dispose(self, close: bool = True) -> None:
+        """
+        Libera as conexões das duas engines
+        
+        Args:
+            close: False em processos filhos após fork (não fecha as conexões do pai)
+        """
+        if close:
+            self.Session.remove()
+            self.ReadSession.remove()
+        self.engine.dispose(close=close)
+        self.read_engine.dispose(close=close)
 
 
 # Instância global do banco de dados
 _db: Optional[Database] = None
+_db_lock = threading.Lock()
 
 
 def get_database() -> Database:
     """Retorna a instância global do banco de dados"""
     global _db
     if _db is None:
-        _db = Database()
-        _db.init_db()
+        with _db_lock:
+            if _db is None:
+                db = Database()
+                db.init_db()
+                _db = db
     return _db
 
 
@@ -71,3 +155,23 @@ def get_db_session() -> Session:
     """Retorna uma sessão do banco de dados"""
     return get_database().get_session()
 
+
+def get_db_read_session() -> Session:
+    """Retorna uma sessão somente leitura do banco de dados"""
+    return get_database().get_read_session()
+
+
+def reset_database(after_fork: bool = False) -> None:
+    """
+    Descarta a instância global
+    
+    Args:
+        after_fork: True em processos filhos após fork (as conexões herdadas
+            pertencem ao processo pai e não são fechadas)
+    """
+    global _db
+    with _db_lock:
+        if _db is not None:
+            _db.dispose(close=not after_fork)
+        _db = None
+    reset_recommendations()
@@ -1,192 +1,232 @@
 """
 Inicialização do banco de dados com dados iniciais
+
+Os dados iniciais (perfis SMBIOS, kexts e templates SSDT) são gravados com
+um INSERT ... ON CONFLICT por tabela. Um carimbo com a versão do esquema e
+um hash dos dados fica na tabela app_meta: se estiver em dia, a
+inicialização só faz uma consulta.
 """
 
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import null
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
 from uocm.db.database import get_database
-from uocm.db.models import SMBIOSProfile, HardwareProfile, KextInfo, SSDTTemplate
+from uocm.db.migrations import SCHEMA_VERSION
+from uocm.db.models import AppMeta, SMBIOSProfile, KextInfo, SSDTTemplate
+from uocm.db.recommendations import invalidate_recommendations
+
+SEED_STAMP_KEY = "seed_version"
+
+# Perfis SMBIOS comuns
+SMBIOS_PROFILES: List[Dict[str, Any]] = [
+    dict(
+        name="MacBookPro15,1",
+        product_name="MacBookPro15,1",
+        serial_number_prefix="C02",
+        description="MacBook Pro 15\" 2018-2019 (Coffee Lake)",
+        recommended_cpu="Intel Core i7/i9 8th/9th Gen",
+        recommended_ram_min=16,
+    ),
+    dict(
+        name="MacBookPro15,2",
+        product_name="MacBookPro15,2",
+        serial_number_prefix="C02",
+        description="MacBook Pro 13\" 2018-2019 (Coffee Lake)",
+        recommended_cpu="Intel Core i5/i7 8th Gen",
+        recommended_ram_min=8,
+    ),
+    dict(
+        name="iMac20,1",
+        product_name="iMac20,1",
+        serial_number_prefix="C02",
+        description="iMac 27\" 2020 (Comet Lake)",
+        recommended_cpu="Intel Core i5/i7/i9 10th Gen",
+        recommended_ram_min=8,
+    ),
+    dict(
+        name="iMacPro1,1",
+        product_name="iMacPro1,1",
+        serial_number_prefix="C02",
+        description="iMac Pro 2017 (Xeon)",
+        recommended_cpu="Intel Xeon",
+        recommended_ram_min=32,
+    ),
+    dict(
+        name="Mac14,2",
+        product_name="Mac14,2",
+        serial_number_prefix="C02",
+        description="Mac Studio 2022 (M1 Ultra)",
+        recommended_cpu="Apple Silicon / Intel 12th+ Gen",
+        recommended_ram_min=16,
+    ),
+]
+
+# Kexts principais
+KEXTS: List[Dict[str, Any]] = [
+    dict(
+        name="Lilu",
+        display_name="Lilu",
+        version="1.6.0",
+        author="Acidanthera",
+        github_repo="acidanthera/Lilu",
+        description="Kext patcher base necessário para muitos outros kexts",
+        required=True,
+        category="System",
+    ),
+    dict(
+        name="VirtualSMC",
+        display_name="VirtualSMC",
+        version="1.3.0",
+        author="Acidanthera",
+        github_repo="acidanthera/VirtualSMC",
+        description="Emulador SMC para Hackintosh",
+        required=True,
+        category="System",
+    ),
+    dict(
+        name="WhateverGreen",
+        display_name="WhateverGreen",
+        version="1.6.0",
+        author="Acidanthera",
+        github_repo="acidanthera/WhateverGreen",
+        description="Driver unificado para GPUs",
+        required=True,
+        category="Graphics",
+    ),
+    dict(
+        name="AppleALC",
+        display_name="AppleALC",
+        version="1.8.0",
+        author="Acidanthera",
+        github_repo="acidanthera/AppleALC",
+        description="Driver de áudio",
+        required=False,
+        category="Audio",
+    ),
+    dict(
+        name="AirportItlwm",
+        display_name="AirportItlwm",
+        version="2.3.0",
+        author="OpenIntelWireless",
+        github_repo="OpenIntelWireless/itlwm",
+        description="Driver Wi-Fi para Intel",
+        required=False,
+        category="Network",
+        pci_ids=[
+            "8086:24fd", "8086:2526", "8086:2723", "8086:2725",
+            "8086:9df0", "8086:a370", "8086:02f0", "8086:06f0", "8086:a0f0",
+        ],
+    ),
+    dict(
+        name="AirportBrcmFixup",
+        display_name="AirportBrcmFixup",
+        version="2.1.0",
+        author="Acidanthera",
+        github_repo="acidanthera/AirportBrcmFixup",
+        description="Fix para chips Broadcom Wi-Fi/Bluetooth",
+        required=False,
+        category="Network",
+        pci_ids=["14e4:43a0", "14e4:43ba", "14e4:4331", "14e4:4353"],
+    ),
+    dict(
+        name="CPUFriend",
+        display_name="CPUFriend",
+        version="1.2.0",
+        author="Acidanthera",
+        github_repo="acidanthera/CPUFriend",
+        description="Gerenciamento de energia da CPU",
+        required=False,
+        category="Power",
+    ),
+]
+
+# Templates SSDT
+SSDT_TEMPLATES: List[Dict[str, Any]] = [
+    dict(
+        name="SSDT-PLUG",
+        display_name="SSDT-PLUG",
+        description="Habilita gerenciamento de energia nativo (XCPM)",
+        category="CPU",
+        required_kexts=["Lilu", "CPUFriend"],
+        source_url="https://dortania.github.io/Getting-Started-With-ACPI/",
+    ),
+    dict(
+        name="SSDT-PMC",
+        display_name="SSDT-PMC",
+        description="Habilita NVRAM nativo (300-series)",
+        category="System",
+        compatible_hardware=["Coffee Lake"],
+        source_url="https://dortania.github.io/Getting-Started-With-ACPI/",
+    ),
+    dict(
+        name="SSDT-USB-Reset",
+        display_name="SSDT-USB-Reset",
+        description="Reset USB para sistemas 300-series",
+        category="USB",
+        source_url="https://dortania.github.io/OpenCore-Post-Install/usb/",
+    ),
+]
+
+# Colunas de kexts que o KextManager atualiza a partir do GitHub (versão,
+# descrição, ...) não são sobrescritas em bancos já existentes
+_KEXT_SEED_COLUMNS = ("author", "required", "category", "pci_ids")
+
+
+def seed_stamp() -> str:
+    """Versão do esquema + hash dos dados iniciais (muda quando qualquer um muda)"""
+    data = json.dumps([SMBIOS_PROFILES, KEXTS, SSDT_TEMPLATES], sort_keys=True, ensure_ascii=False)
+    return f"{SCHEMA_VERSION}:{hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]}"
+
 
+def _upsert(session: Session, model: Any, rows: Sequence[Dict[str, Any]], update: Sequence[str] = ()) -> None:
+    """Um INSERT ... ON CONFLICT(name) para todas as linhas"""
+    now = datetime.utcnow()
+    columns = sorted({key for row in rows for key in row})
+    # Todas as linhas de um INSERT com vários VALUES precisam das mesmas colunas;
+    # as ausentes viram NULL do SQL (e não o null do JSON)
+    values = [{column: row.get(column, null()) for column in columns} for row in rows]
+    stmt = insert(model).values(values)
+    update = [column for column in (update or columns) if column != "name"]
+    set_ = {column: stmt.excluded[column] for column in update}
+    if "updated_at" in model.__table__.columns:
+        set_["updated_at"] = now
+    session.execute(stmt.on_conflict_do_update(index_elements=["name"], set_=set_))
 
-def init_database() -> None:
-    """Inicializa banco de dados com dados iniciais"""
+
+def init_database(force: bool = False) -> bool:
+    """
+    Inicializa banco de dados com dados iniciais
+    
+    Args:
+        force: Regravar os dados mesmo com o carimbo em dia
+    
+    Returns:
+        True se os dados foram gravados, False se o carimbo já estava em dia
+    """
     db = get_database()
-    session = db.get_session()
+    stamp = seed_stamp()
     
-    try:
-        # Perfis SMBIOS comuns
-        smbios_profiles = [
-            SMBIOSProfile(
-                name="MacBookPro15,1",
-                product_name="MacBookPro15,1",
-                serial_number_prefix="C02",
-                description="MacBook Pro 15\" 2018-2019 (Coffee Lake)",
-                recommended_cpu="Intel Core i7/i9 8th/9th Gen",
-                recommended_ram_min=16,
-            ),
-            SMBIOSProfile(
-                name="MacBookPro15,2",
-                product_name="MacBookPro15,2",
-                serial_number_prefix="C02",
-                description="MacBook Pro 13\" 2018-2019 (Coffee Lake)",
-                recommended_cpu="Intel Core i5/i7 8th Gen",
-                recommended_ram_min=8,
-            ),
-            SMBIOSProfile(
-                name="iMac20,1",
-                product_name="iMac20,1",
-                serial_number_prefix="C02",
-                description="iMac 27\" 2020 (Comet Lake)",
-                recommended_cpu="Intel Core i5/i7/i9 10th Gen",
-                recommended_ram_min=8,
-            ),
-            SMBIOSProfile(
-                name="iMacPro1,1",
-                product_name="iMacPro1,1",
-                serial_number_prefix="C02",
-                description="iMac Pro 2017 (Xeon)",
-                recommended_cpu="Intel Xeon",
-                recommended_ram_min=32,
-            ),
-            SMBIOSProfile(
-                name="Mac14,2",
-                product_name="Mac14,2",
-                serial_number_prefix="C02",
-                description="Mac Studio 2022 (M1 Ultra)",
-                recommended_cpu="Apple Silicon / Intel 12th+ Gen",
-                recommended_ram_min=16,
-            ),
-        ]
-        
-        for profile in smbios_profiles:
-            existing = session.query(SMBIOSProfile).filter(
-                SMBIOSProfile.name == profile.name
-            ).first()
-            if not existing:
-                session.add(profile)
-        
-        # Kexts principais
-        kexts = [
-            KextInfo(
-                name="Lilu",
-                display_name="Lilu",
-                version="1.6.0",
-                author="Acidanthera",
-                github_repo="acidanthera/Lilu",
-                description="Kext patcher base necessário para muitos outros kexts",
-                required=True,
-                category="System",
-            ),
-            KextInfo(
-                name="VirtualSMC",
-                display_name="VirtualSMC",
-                version="1.3.0",
-                author="Acidanthera",
-                github_repo="acidanthera/VirtualSMC",
-                description="Emulador SMC para Hackintosh",
-                required=True,
-                category="System",
-            ),
-            KextInfo(
-                name="WhateverGreen",
-                display_name="WhateverGreen",
-                version="1.6.0",
-                author="Acidanthera",
-                github_repo="acidanthera/WhateverGreen",
-                description="Driver unificado para GPUs",
-                required=True,
-                category="Graphics",
-            ),
-            KextInfo(
-                name="AppleALC",
-                display_name="AppleALC",
-                version="1.8.0",
-                author="Acidanthera",
-                github_repo="acidanthera/AppleALC",
-                description="Driver de áudio",
-                required=False,
-                category="Audio",
-            ),
-            KextInfo(
-                name="AirportItlwm",
-                display_name="AirportItlwm",
-                version="2.3.0",
-                author="OpenIntelWireless",
-                github_repo="OpenIntelWireless/itlwm",
-                description="Driver Wi-Fi para Intel",
-                required=False,
-                category="Network",
-            ),
-            KextInfo(
-                name="AirportBrcmFixup",
-                display_name="AirportBrcmFixup",
-                version="2.1.0",
-                author="Acidanthera",
-                github_repo="acidanthera/AirportBrcmFixup",
-                description="Fix para chips Broadcom Wi-Fi/Bluetooth",
-                required=False,
-                category="Network",
-            ),
-            KextInfo(
-                name="CPUFriend",
-                display_name="CPUFriend",
-                version="1.2.0",
-                author="Acidanthera",
-                github_repo="acidanthera/CPUFriend",
-                description="Gerenciamento de energia da CPU",
-                required=False,
-                category="Power",
-            ),
-        ]
+    with db.session() as session:
+        current = session.get(AppMeta, SEED_STAMP_KEY)
+        if current is not None and current.value == stamp and not force:
+            return False
         
-        for kext in kexts:
-            existing = session.query(KextInfo).filter(
-                KextInfo.name == kext.name
-            ).first()
-            if not existing:
-                session.add(kext)
-        
-        # Templates SSDT
-        ssdt_templates = [
-            SSDTTemplate(
-                name="SSDT-PLUG",
-                display_name="SSDT-PLUG",
-                description="Habilita gerenciamento de energia nativo (XCPM)",
-                category="CPU",
-                required_kexts=["Lilu", "CPUFriend"],
-                source_url="https://dortania.github.io/Getting-Started-With-ACPI/",
-            ),
-            SSDTTemplate(
-                name="SSDT-PMC",
-                display_name="SSDT-PMC",
-                description="Habilita NVRAM nativo (300-series)",
-                category="System",
-                compatible_hardware=["Coffee Lake"],
-                source_url="https://dortania.github.io/Getting-Started-With-ACPI/",
-            ),
-            SSDTTemplate(
-                name="SSDT-USB-Reset",
-                display_name="SSDT-USB-Reset",
-                description="Reset USB para sistemas 300-series",
-                category="USB",
-                source_url="https://dortania.github.io/OpenCore-Post-Install/usb/",
-            ),
-        ]
-        
-        for template in ssdt_templates:
-            existing = session.query(SSDTTemplate).filter(
-                SSDTTemplate.name == template.name
-            ).first()
-            if not existing:
-                session.add(template)
-        
-        session.commit()
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+        _upsert(session, SMBIOSProfile, SMBIOS_PROFILES)
+        _upsert(session, KextInfo, KEXTS, update=_KEXT_SEED_COLUMNS)
+        _upsert(session, SSDTTemplate, SSDT_TEMPLATES)
+        session.merge(AppMeta(key=SEED_STAMP_KEY, value=stamp))
+    
+    # Escritas pelo Core não passam pelos eventos do ORM
+    invalidate_recommendations()
+    return True
 
 
 if __name__ == "__main__":
-    init_database()
+    init_database(force=True)
     print("Banco de dados inicializado com dados iniciais!")
-
@@ -0,0 +1,66 @@
+"""
+Migrações do esquema do banco
+
+create_all só cria tabelas que não existem: colunas e índices declarados
+depois nos modelos precisam ser aplicados a bancos antigos. A versão do
+esquema fica em PRAGMA user_version; cada migração roda uma vez, em ordem,
+dentro de uma transação. As migrações são idempotentes, então também podem
+rodar sobre um banco recém-criado (versão 0).
+"""
+
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from uocm.db.models import Base
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """Adiciona as colunas (anuláveis) criadas depois da tabela"""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def _create_indexes(conn: Connection) -> None:
+    """Cria os índices declarados nos modelos"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# (versão, descrição, função) em ordem crescente de versão
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "kexts.pci_ids", _add_missing_columns),
+    (2, "índices de consulta", _create_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def upgrade(engine: Engine) -> int:
+    """
+    Cria as tabelas que faltam e aplica as migrações pendentes
+
+    Returns:
+        Versão do esquema após a atualização
+    """
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        for target, _description, migrate in MIGRATIONS:
+            if target > version:
+                migrate(conn)
+                # PRAGMA não aceita parâmetros; target é sempre um int da lista acima
+                conn.execute(text(f"PRAGMA user_version = {int(target)}"))
+                version = target
+    return version
@@ -42,7 +42,7 @@ class HardwareProfile(Base):
     __tablename__ = "hardware_profiles"
     
     id = Column(Integer, primary_key=True)
-    cpu_model = Column(String(100), nullable=False)
+    cpu_model = Column(String(100), nullable=False, index=True)
     cpu_vendor = Column(String(50))  # Intel, AMD
     gpu_model = Column(String(100))
     gpu_vendor = Column(String(50))  # Intel, AMD, NVIDIA
@@ -71,7 +71,7 @@ class KextInfo(Base):
     display_name = Column(String(200))
     version = Column(String(50))
     author = Column(String(100))
-    github_repo = Column(String(200))  # Formato: owner/repo
+    github_repo = Column(String(200), index=True)  # Formato: owner/repo
     github_release_tag = Column(String(100))
     download_url = Column(String(500))
     checksum_sha256 = Column(String(64))
@@ -81,8 +81,9 @@ class KextInfo(Base):
     compatible_macos = Column(JSON)  # Lista de versões do macOS compatíveis
     dependencies = Column(JSON)  # Lista de nomes de kexts dependentes
     conflicts = Column(JSON)  # Lista de nomes de kexts conflitantes
+    pci_ids = Column(JSON)  # Dispositivos suportados: "vvvv:dddd" ou "vvvv" (qualquer do fabricante)
     local_path = Column(String(500))  # Caminho local do kext
-    installed = Column(Boolean, default=False)
+    installed = Column(Boolean, default=False, index=True)
     installed_version = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -122,7 +123,7 @@ class EFISnapshot(Base):
     drivers = Column(JSON)  # Lista de drivers usados
     hardware_profile_id = Column(Integer, ForeignKey("hardware_profiles.id"))
     tags = Column(JSON)  # Tags para organização
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     hardware_profile = relationship("HardwareProfile")
 
@@ -146,3 +147,13 @@ class Plugin(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+
+
+class AppMeta(Base):
+    """Metadados do banco (chave/valor), ex: versão dos dados iniciais"""
+    
+    __tablename__ = "app_meta"
+    
+    key = Column(String(100), primary_key=True)
+    value = Column(String(200))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
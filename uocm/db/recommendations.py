@@ -0,0 +1,197 @@
+"""
+Índice em memória das recomendações do banco (SMBIOS, perfis de hardware e kexts)
+
+As tabelas de conhecimento são pequenas e mudam raramente, mas são
+consultadas em toda geração de EFI. O índice carrega tudo uma vez e
+responde por acesso a dict:
+
+- token normalizado da CPU -> perfil de hardware (com o SMBIOS recomendado)
+- nome -> perfil SMBIOS
+- "vvvv:dddd" (ou só "vvvv") -> kexts que suportam o dispositivo PCI
+- nome -> local_path dos kexts baixados
+
+Qualquer commit que altere SMBIOSProfile, HardwareProfile ou KextInfo
+invalida o índice; a próxima chamada a get_recommendation_index recarrega.
+Escritas feitas fora do ORM devem chamar invalidate_recommendations.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from uocm.db.models import HardwareProfile, KextInfo, SMBIOSProfile
+from uocm.detector.cpu_classifier import classify_cpu, normalize_brand
+
+_INDEXED_MODELS = (SMBIOSProfile, HardwareProfile, KextInfo)
+
+
+@dataclass(frozen=True)
+class SMBIOSEntry:
+    """Cópia de um SMBIOSProfile desacoplada da sessão"""
+    name: str
+    product_name: str
+    serial_prefix: str
+
+
+@dataclass(frozen=True)
+class HardwareEntry:
+    """Cópia de um HardwareProfile desacoplada da sessão"""
+    cpu_model: str
+    smbios: Optional[SMBIOSEntry]
+    kexts: Tuple[str, ...] = ()  # nomes dos kexts
+
+
+def cpu_token(name: str) -> str:
+    """
+    Chave de busca de uma CPU: família e número do modelo quando reconhecidos
+
+    'Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz' e 'Intel Core i7-8700K' dão
+    ambos 'core i7 8700k'.
+    """
+    cpu_class = classify_cpu(name)
+    if cpu_class is not None:
+        return f"{cpu_class.family} {cpu_class.model_number}".lower()
+    return normalize_brand(name).lower()
+
+
+def pci_key(vendor_id: Optional[str], device_id: Optional[str] = None) -> Optional[str]:
+    """'0x8086', '0x3e92' -> '8086:3e92' (ou '8086' sem device_id)"""
+    if not vendor_id:
+        return None
+    vendor = vendor_id.lower().replace("0x", "").zfill(4)
+    if not device_id:
+        return vendor
+    return f"{vendor}:{device_id.lower().replace('0x', '').zfill(4)}"
+
+
+@dataclass
+class RecommendationIndex:
+    """Tabelas de recomendação indexadas em dicts"""
+    smbios: Dict[str, SMBIOSEntry] = field(default_factory=dict)
+    hardware: Dict[str, HardwareEntry] = field(default_factory=dict)
+    kexts_by_pci: Dict[str, List[str]] = field(default_factory=dict)
+    kext_paths: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, session: Session) -> "RecommendationIndex":
+        """Lê as três tabelas (uma consulta cada)"""
+        index = cls()
+        by_id: Dict[int, SMBIOSEntry] = {}
+        for profile in session.query(SMBIOSProfile).all():
+            entry = SMBIOSEntry(
+                name=profile.name,
+                product_name=profile.product_name,
+                serial_prefix=profile.serial_number_prefix or "",
+            )
+            index.smbios[profile.name] = entry
+            by_id[profile.id] = entry
+
+        kext_names: Dict[int, str] = {}
+        for kext in session.query(KextInfo).order_by(KextInfo.id).all():
+            kext_names[kext.id] = kext.name
+            for pci_id in kext.pci_ids or ():
+                names = index.kexts_by_pci.setdefault(pci_id.lower(), [])
+                if kext.name not in names:
+                    names.append(kext.name)
+            if kext.local_path:
+                index.kext_paths[kext.name] = kext.local_path
+
+        # Em caso de perfis repetidos para a mesma CPU vale o primeiro (menor id)
+        for profile in session.query(HardwareProfile).order_by(HardwareProfile.id).all():
+            token = cpu_token(profile.cpu_model or "")
+            if not token or token in index.hardware:
+                continue
+            # recommended_kexts guarda ids de KextInfo (nomes também são aceitos)
+            index.hardware[token] = HardwareEntry(
+                cpu_model=profile.cpu_model,
+                smbios=by_id.get(profile.recommended_smbios_id),
+                kexts=tuple(
+                    kext_names.get(kext, str(kext)) if isinstance(kext, int) else kext
+                    for kext in profile.recommended_kexts or ()
+                ),
+            )
+        return index
+
+    def hardware_for_cpu(self, name: str) -> Optional[HardwareEntry]:
+        """Perfil de hardware cadastrado para a CPU"""
+        if not name:
+            return None
+        return self.hardware.get(cpu_token(name))
+
+    def kexts_for_device(self, vendor_id: Optional[str], device_id: Optional[str]) -> List[str]:
+        """Kexts do dispositivo PCI: os do id exato seguidos dos que aceitam qualquer id do fabricante"""
+        exact = self.kexts_by_pci.get(pci_key(vendor_id, device_id) or "", [])
+        vendor = self.kexts_by_pci.get(pci_key(vendor_id) or "", [])
+        return exact + [name for name in vendor if name not in exact]
+
+
+# Índice do processo e contador de alterações nas tabelas indexadas
+_lock = threading.RLock()
+_index: Optional[RecommendationIndex] = None
+_version = 0
+_index_version = -1
+
+
+def invalidate_recommendations() -> None:
+    """Marca o índice como desatualizado (recarregado no próximo acesso)"""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def get_recommendation_index(session: Optional[Session] = None) -> RecommendationIndex:
+    """
+    Retorna o índice do processo, carregando-o se necessário
+
+    Args:
+        session: Sessão a usar na carga (padrão: uma sessão própria)
+    """
+    global _index, _index_version
+    with _lock:
+        if _index is not None and _index_version == _version:
+            return _index
+        version = _version
+
+        if session is not None:
+            index = RecommendationIndex.load(session)
+        else:
+            from uocm.db.database import get_db_read_session
+            own_session = get_db_read_session()
+            try:
+                index = RecommendationIndex.load(own_session)
+            finally:
+                own_session.close()
+
+        _index, _index_version = index, version
+        return index
+
+
+def reset_recommendations() -> None:
+    """Descarta o índice (ex: ao trocar de banco)"""
+    global _index, _index_version
+    with _lock:
+        _index = None
+        _index_version = -1
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_on_flush(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _INDEXED_MODELS):
+            session.info["recommendations_changed"] = True
+            return
+
+
+# Invalida só no commit: antes dele as sessões de leitura ainda veem os dados antigos
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("recommendations_changed", False):
+        invalidate_recommendations()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("recommendations_changed", None)
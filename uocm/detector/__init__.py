@@ -4,6 +4,7 @@ Módulo de detecção de hardware
 
 from uocm.detector.hardware_detector import HardwareDetector
 from uocm.detector.models import HardwareInfo
+from uocm.detector.system_profiler import SystemProfilerCollector
 
-__all__ = ["HardwareDetector", "HardwareInfo"]
+__all__ = ["HardwareDetector", "HardwareInfo", "SystemProfilerCollector"]
 
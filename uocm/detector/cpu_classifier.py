@@ -0,0 +1,361 @@
+"""
+Classificação de CPUs por tabela (microarquitetura, iGPU e SMBIOS)
+
+O número do modelo é extraído do nome da CPU por expressões pré-compiladas
+e procurado em tabelas indexadas por (geração, segmento). Modelos que
+fogem da regra da geração (HEDT com sufixo K, Kaby Lake R, Zen 2 na série
+5000 mobile, ...) ficam em tabelas de exceções consultadas antes. Cada
+consulta é um acesso a dict; o resultado por nome é guardado em cache.
+
+Usado pelo detector do uocm, pelo EFIGenerator e pelo detector do
+universal_oc_manager.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CPUClass:
+    """Resultado da classificação de uma CPU"""
+    vendor: str  # Intel, AMD
+    family: str  # ex: "Core i7", "Xeon W", "Ryzen 7", "Ryzen Threadripper"
+    model_number: str  # ex: "8700K"
+    microarchitecture: str
+    segment: str  # desktop, mobile, hedt, server
+    igpu: Optional[str]
+    smbios: str
+    generation: Optional[int] = None
+
+
+# (microarquitetura, iGPU, SMBIOS, segmento)
+_Entry = Tuple[str, Optional[str], str, str]
+
+# Intel Core: (geração, classe do sufixo) -> entrada
+# Classes: "" desktop, "h" mobile de alto desempenho, "u" ultrabook,
+# "g" mobile com iGPU Iris (sufixo G1-G7), "x" HEDT
+_INTEL_CORE: Dict[Tuple[int, str], _Entry] = {
+    (2, ""): ("Sandy Bridge", "HD Graphics 3000", "iMac12,2", "desktop"),
+    (3, ""): ("Ivy Bridge", "HD Graphics 4000", "iMac13,2", "desktop"),
+    (4, ""): ("Haswell", "HD Graphics 4600", "iMac14,4", "desktop"),
+    (5, ""): ("Broadwell", "Iris Pro Graphics 6200", "iMac16,2", "desktop"),
+    (6, ""): ("Skylake", "HD Graphics 530", "iMac17,1", "desktop"),
+    (7, ""): ("Kaby Lake", "HD Graphics 630", "iMac18,3", "desktop"),
+    (8, ""): ("Coffee Lake", "UHD Graphics 630", "iMac19,1", "desktop"),
+    (9, ""): ("Coffee Lake", "UHD Graphics 630", "iMac19,1", "desktop"),
+    (10, ""): ("Comet Lake", "UHD Graphics 630", "iMac20,1", "desktop"),
+    (11, ""): ("Rocket Lake", "UHD Graphics 750", "iMac20,1", "desktop"),
+    (12, ""): ("Alder Lake", "UHD Graphics 770", "MacPro7,1", "desktop"),
+    (13, ""): ("Raptor Lake", "UHD Graphics 770", "MacPro7,1", "desktop"),
+    (14, ""): ("Raptor Lake", "UHD Graphics 770", "MacPro7,1", "desktop"),
+    (2, "h"): ("Sandy Bridge", "HD Graphics 3000", "MacBookPro8,2", "mobile"),
+    (3, "h"): ("Ivy Bridge", "HD Graphics 4000", "MacBookPro10,1", "mobile"),
+    (4, "h"): ("Haswell", "HD Graphics 4600", "MacBookPro11,1", "mobile"),
+    (5, "h"): ("Broadwell", "Iris Pro Graphics 6200", "MacBookPro12,1", "mobile"),
+    (6, "h"): ("Skylake", "HD Graphics 530", "MacBookPro13,3", "mobile"),
+    (7, "h"): ("Kaby Lake", "HD Graphics 630", "MacBookPro14,3", "mobile"),
+    (8, "h"): ("Coffee Lake", "UHD Graphics 630", "MacBookPro15,1", "mobile"),
+    (9, "h"): ("Coffee Lake", "UHD Graphics 630", "MacBookPro15,3", "mobile"),
+    (10, "h"): ("Comet Lake", "UHD Graphics 630", "MacBookPro16,1", "mobile"),
+    (11, "h"): ("Tiger Lake", "UHD Graphics", "MacBookPro16,2", "mobile"),
+    (12, "h"): ("Alder Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (13, "h"): ("Raptor Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (2, "u"): ("Sandy Bridge", "HD Graphics 3000", "MacBookAir4,2", "mobile"),
+    (3, "u"): ("Ivy Bridge", "HD Graphics 4000", "MacBookAir5,2", "mobile"),
+    (4, "u"): ("Haswell", "HD Graphics 5000", "MacBookAir6,2", "mobile"),
+    (5, "u"): ("Broadwell", "HD Graphics 6000", "MacBookAir7,2", "mobile"),
+    (6, "u"): ("Skylake", "HD Graphics 520", "MacBookPro13,1", "mobile"),
+    (7, "u"): ("Kaby Lake", "HD Graphics 620", "MacBookPro14,1", "mobile"),
+    (8, "u"): ("Whiskey Lake", "UHD Graphics 620", "MacBookPro15,2", "mobile"),
+    (10, "u"): ("Comet Lake", "UHD Graphics 620", "MacBookPro16,3", "mobile"),
+    (11, "u"): ("Tiger Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (12, "u"): ("Alder Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (13, "u"): ("Raptor Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (8, "g"): ("Kaby Lake-G", "HD Graphics 630", "MacBookPro14,3", "mobile"),
+    (10, "g"): ("Ice Lake", "Iris Plus Graphics", "MacBookAir9,1", "mobile"),
+    (11, "g"): ("Tiger Lake", "Iris Xe Graphics", "MacBookPro16,2", "mobile"),
+    (3, "x"): ("Sandy Bridge-E", None, "MacPro6,1", "hedt"),
+    (4, "x"): ("Ivy Bridge-E", None, "MacPro6,1", "hedt"),
+    (5, "x"): ("Haswell-E", None, "iMacPro1,1", "hedt"),
+    (6, "x"): ("Broadwell-E", None, "iMacPro1,1", "hedt"),
+    (7, "x"): ("Skylake-X", None, "iMacPro1,1", "hedt"),
+    (9, "x"): ("Skylake-X", None, "iMacPro1,1", "hedt"),
+    (10, "x"): ("Cascade Lake-X", None, "iMacPro1,1", "hedt"),
+}
+
+# Intel Core: número do modelo -> entrada (exceções à regra da geração)
+_INTEL_CORE_MODELS: Dict[str, _Entry] = {
+    **{m: _INTEL_CORE[(3, "x")] for m in ("3820", "3930K")},
+    **{m: _INTEL_CORE[(4, "x")] for m in ("4820K", "4930K")},
+    **{m: _INTEL_CORE[(5, "x")] for m in ("5820K", "5930K")},
+    **{m: _INTEL_CORE[(6, "x")] for m in ("6800K", "6850K")},
+    **{m: ("Kaby Lake-X", None, "iMac18,3", "hedt") for m in ("7640X", "7740X")},
+    **{
+        m: ("Kaby Lake R", "UHD Graphics 620", "MacBookPro15,2", "mobile")
+        for m in ("8130U", "8250U", "8350U", "8550U", "8650U")
+    },
+    **{
+        m: ("Coffee Lake", "Iris Plus Graphics 655", "MacBookPro15,2", "mobile")
+        for m in ("8257U", "8259U", "8279U", "8559U", "8569U")
+    },
+}
+
+# Intel Core Ultra: (série, classe do sufixo) -> entrada
+_INTEL_CORE_ULTRA: Dict[Tuple[int, str], _Entry] = {
+    (1, "h"): ("Meteor Lake", "Arc Graphics", "MacBookPro16,2", "mobile"),
+    (1, "u"): ("Meteor Lake", "Graphics", "MacBookPro16,2", "mobile"),
+    (2, "v"): ("Lunar Lake", "Arc Graphics 140V", "MacBookPro16,2", "mobile"),
+    (2, "h"): ("Arrow Lake", "Arc Graphics", "MacBookPro16,2", "mobile"),
+    (2, ""): ("Arrow Lake", "Graphics", "MacPro7,1", "desktop"),
+}
+
+# Xeon: (série, geração) -> entrada. Geração: versão (v2..v6) nas séries
+# E3/E5, dígito das centenas nas séries E, W e W-3000
+_XEON: Dict[Tuple[str, int], _Entry] = {
+    ("E3", 1): ("Sandy Bridge", "HD Graphics P3000", "iMac12,2", "server"),
+    ("E3", 2): ("Ivy Bridge", "HD Graphics P4000", "iMac13,2", "server"),
+    ("E3", 3): ("Haswell", "HD Graphics P4600", "iMac14,4", "server"),
+    ("E3", 4): ("Broadwell", "Iris Pro Graphics P6300", "iMac16,2", "server"),
+    ("E3", 5): ("Skylake", "HD Graphics P530", "iMac17,1", "server"),
+    ("E3", 6): ("Kaby Lake", "HD Graphics P630", "iMac18,3", "server"),
+    ("E5", 1): ("Sandy Bridge-EP", None, "MacPro6,1", "server"),
+    ("E5", 2): ("Ivy Bridge-EP", None, "MacPro6,1", "server"),
+    ("E5", 3): ("Haswell-EP", None, "iMacPro1,1", "server"),
+    ("E5", 4): ("Broadwell-EP", None, "iMacPro1,1", "server"),
+    ("E", 1): ("Coffee Lake", "UHD Graphics P630", "iMac19,1", "server"),
+    ("E", 2): ("Coffee Lake", "UHD Graphics P630", "iMac19,1", "server"),
+    ("W", 1): ("Skylake-W", None, "iMacPro1,1", "server"),
+    ("W", 2): ("Cascade Lake-W", None, "MacPro7,1", "server"),
+    ("W1", 2): ("Comet Lake", "UHD Graphics P630", "iMac20,1", "server"),
+    ("W1", 3): ("Rocket Lake", "UHD Graphics P750", "iMac20,1", "server"),
+    ("W3", 1): ("Skylake-W", None, "iMacPro1,1", "server"),
+    ("W3", 2): ("Cascade Lake-W", None, "MacPro7,1", "server"),
+    ("W3", 3): ("Ice Lake-SP", None, "MacPro7,1", "server"),
+}
+
+# AMD Ryzen: (série, segmento) -> (microarquitetura, iGPU)
+_AMD_RYZEN: Dict[Tuple[int, str], Tuple[str, Optional[str]]] = {
+    (1, "desktop"): ("Zen", None),
+    (2, "desktop"): ("Zen+", None),
+    (3, "desktop"): ("Zen 2", None),
+    (4, "desktop"): ("Zen 2", None),
+    (5, "desktop"): ("Zen 3", None),
+    (7, "desktop"): ("Zen 4", "Radeon Graphics"),
+    (8, "desktop"): ("Zen 4", "Radeon 780M"),
+    (9, "desktop"): ("Zen 5", "Radeon Graphics"),
+    (2, "apu"): ("Zen", "Radeon Vega"),
+    (3, "apu"): ("Zen+", "Radeon Vega"),
+    (4, "apu"): ("Zen 2", "Radeon Vega"),
+    (5, "apu"): ("Zen 3", "Radeon Vega"),
+    (8, "apu"): ("Zen 4", "Radeon 780M"),
+    (2, "mobile"): ("Zen", "Radeon Vega"),
+    (3, "mobile"): ("Zen+", "Radeon Vega"),
+    (4, "mobile"): ("Zen 2", "Radeon Vega"),
+    (5, "mobile"): ("Zen 3", "Radeon Vega"),
+    (6, "mobile"): ("Zen 3+", "Radeon 680M"),
+    (7, "mobile"): ("Zen 4", "Radeon 780M"),
+    (8, "mobile"): ("Zen 4", "Radeon 780M"),
+}
+
+# AMD Ryzen: exceções por número do modelo
+_AMD_RYZEN_MODELS: Dict[str, Tuple[str, Optional[str]]] = {
+    **{m: ("Zen 2", "Radeon Vega") for m in ("5300U", "5500U", "5700U")},
+    **{m: ("Zen+", None) for m in ("1600AF", "1200AF")},
+}
+
+# Threadripper: dígito da série -> microarquitetura
+_AMD_THREADRIPPER = {1: "Zen", 2: "Zen+", 3: "Zen 2", 5: "Zen 3", 7: "Zen 4", 9: "Zen 5"}
+
+# Ryzen 7000 mobile: terceiro dígito (e quarto, para 7x35) -> microarquitetura
+_AMD_MOBILE_7000 = {"2": "Zen 2", "3": "Zen 3", "35": "Zen 3+", "4": "Zen 4", "45": "Zen 4"}
+
+AMD_DESKTOP_SMBIOS = "MacPro7,1"
+AMD_MOBILE_SMBIOS = "MacBookPro16,3"
+
+
+
+def _smbios_by_microarchitecture() -> Dict[str, str]:
+    """SMBIOS por microarquitetura, preferindo a entrada desktop/HEDT"""
+    index: Dict[str, str] = {}
+    for table in (_INTEL_CORE_MODELS.values(), _XEON.values(), _INTEL_CORE.values()):
+        for arch, _igpu, smbios, segment in table:
+            if segment in ("desktop", "hedt") or arch not in index:
+                index[arch] = smbios
+    for arch in set(_AMD_THREADRIPPER.values()) | {a for a, _ in _AMD_RYZEN.values()}:
+        index[arch] = AMD_DESKTOP_SMBIOS
+    return index
+
+
+# Perfis que só informam a microarquitetura (ex: perfis do lote)
+SMBIOS_BY_MICROARCHITECTURE = _smbios_by_microarchitecture()
+
+_INTEL_CORE_RE = re.compile(r"\bi([3579])-(\d{3,5})([A-Z]{0,2}\d?)\b")
+_INTEL_CORE_ULTRA_RE = re.compile(r"\bUltra\s+[3579]\s+(\d)(\d{2})([A-Z]{0,2})\b")
+_XEON_RE = re.compile(
+    r"\bXeon\b.*?\b(?P<model>(?P<series>E[35]|E|W)-(?P<digits>\d{4})[A-Z]?(?:\s+v(?P<version>\d))?)\b"
+)
+_RYZEN_RE = re.compile(
+    r"\bRyzen\s+(?:(Threadripper)(?:\s+PRO)?|([3579]))(?:\s+PRO)?\s+(\d)(\d{3})([A-Z][A-Z0-9]{0,3})?\b"
+)
+_BRAND_NOISE_RE = re.compile(r"\((?:R|TM|tm)\)|\bCPU\b|\s+@.*$|\b\d+-Core Processor\b|\bProcessor\b")
+_FREQUENCY_RE = re.compile(r"@\s*([\d.]+)\s*GHz", re.IGNORECASE)
+
+_H_SUFFIXES = {"H", "HK", "HQ", "HS", "HX", "M", "MQ", "MX"}
+_U_SUFFIXES = {"U", "Y", "P"}
+_X_SUFFIXES = {"X", "XE"}
+
+
+def normalize_brand(brand: str) -> str:
+    """'Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz' -> 'Intel Core i7-8700K'"""
+    return " ".join(_BRAND_NOISE_RE.sub(" ", brand).split())
+
+
+def parse_frequency(brand: str) -> Optional[float]:
+    """Frequência base em GHz a partir do nome da CPU (ex: '@ 3.70GHz')"""
+    match = _FREQUENCY_RE.search(brand)
+    return float(match.group(1)) if match else None
+
+
+@lru_cache(maxsize=512)
+def classify_cpu(name: str) -> Optional[CPUClass]:
+    """
+    Classifica uma CPU pelo nome (brand string ou nome normalizado)
+
+    Returns:
+        CPUClass, ou None se o modelo não for reconhecido
+    """
+    if not name:
+        return None
+    name = normalize_brand(name)
+    return (
+        _classify_intel_core(name)
+        or _classify_intel_core_ultra(name)
+        or _classify_xeon(name)
+        or _classify_ryzen(name)
+    )
+
+
+def _intel_suffix_class(suffix: str) -> str:
+    if suffix in _X_SUFFIXES:
+        return "x"
+    if suffix in _H_SUFFIXES:
+        return "h"
+    if suffix in _U_SUFFIXES:
+        return "u"
+    if len(suffix) == 2 and suffix[0] == "G" and suffix[1].isdigit():
+        return "g"
+    if suffix == "G":
+        return "g"
+    return ""
+
+
+def _make(vendor: str, family: str, number: str, entry: _Entry, generation: Optional[int]) -> CPUClass:
+    arch, igpu, smbios, segment = entry
+    return CPUClass(
+        vendor=vendor,
+        family=family,
+        model_number=number,
+        microarchitecture=arch,
+        segment=segment,
+        igpu=igpu,
+        smbios=smbios,
+        generation=generation,
+    )
+
+
+def _classify_intel_core(name: str) -> Optional[CPUClass]:
+    match = _INTEL_CORE_RE.search(name)
+    if match is None:
+        return None
+    tier, digits, suffix = match.groups()
+    number = digits + suffix
+    family = f"Core i{tier}"
+
+    if len(digits) == 3:
+        generation = 1
+    elif len(digits) == 5 or digits[0] == "1":
+        generation = int(digits[:2])
+    else:
+        generation = int(digits[0])
+
+    entry = _INTEL_CORE_MODELS.get(number)
+    if entry is None:
+        entry = _INTEL_CORE.get((generation, _intel_suffix_class(suffix)))
+    if entry is None:
+        return None
+    if suffix in ("F", "KF"):
+        entry = (entry[0], None, entry[2], entry[3])
+    return _make("Intel", family, number, entry, generation)
+
+
+def _classify_intel_core_ultra(name: str) -> Optional[CPUClass]:
+    match = _INTEL_CORE_ULTRA_RE.search(name)
+    if match is None:
+        return None
+    series, rest, suffix = match.groups()
+    suffix_class = "v" if suffix == "V" else _intel_suffix_class(suffix)
+    if suffix_class == "g":
+        suffix_class = "u"
+    entry = _INTEL_CORE_ULTRA.get((int(series), suffix_class))
+    if entry is None:
+        return None
+    return _make("Intel", "Core Ultra", series + rest + suffix, entry, None)
+
+
+def _classify_xeon(name: str) -> Optional[CPUClass]:
+    match = _XEON_RE.search(name)
+    if match is None:
+        return None
+    series, digits = match.group("series"), match.group("digits")
+    if series in ("E3", "E5"):
+        key = (series, int(match.group("version") or 1))
+    elif series == "E":
+        key = ("E", int(digits[1]))
+    elif digits[0] in "13":
+        key = (f"W{digits[0]}", int(digits[1]))
+    else:
+        key = ("W", int(digits[1]))
+    entry = _XEON.get(key)
+    if entry is None:
+        return None
+    family = "Xeon W" if series == "W" else f"Xeon {series}"
+    return _make("Intel", family, match.group("model"), entry, None)
+
+
+def _classify_ryzen(name: str) -> Optional[CPUClass]:
+    match = _RYZEN_RE.search(name)
+    if match is None:
+        return None
+    threadripper, tier, series, rest, suffix = match.groups()
+    suffix = suffix or ""
+    number = series + rest + suffix
+    generation = int(series)
+
+    if threadripper:
+        arch = _AMD_THREADRIPPER.get(generation)
+        if arch is None:
+            return None
+        return _make("AMD", "Ryzen Threadripper", number, (arch, None, AMD_DESKTOP_SMBIOS, "hedt"), generation)
+
+    family = f"Ryzen {tier}"
+    if suffix.startswith(("U", "H")):
+        segment = "mobile"
+    elif suffix.startswith("G"):
+        segment = "apu"
+    else:
+        segment = "desktop"
+
+    known = _AMD_RYZEN_MODELS.get(number)
+    if known is None and segment == "mobile" and generation >= 7:
+        arch = _AMD_MOBILE_7000.get(rest[1:3]) or _AMD_MOBILE_7000.get(rest[1])
+        known = (arch, "Radeon Graphics") if arch else None
+    if known is None:
+        known = _AMD_RYZEN.get((generation, segment))
+    if known is None:
+        return None
+
+    arch, igpu = known
+    smbios = AMD_MOBILE_SMBIOS if segment == "mobile" else AMD_DESKTOP_SMBIOS
+    return _make("AMD", family, number, (arch, igpu, smbios, "mobile" if segment == "mobile" else "desktop"), generation)
@@ -2,24 +2,76 @@
 Detector de hardware para macOS
 """
 
-import subprocess
 import re
 import platform
-from typing import Optional, Dict, Any
+import subprocess
+from pathlib import Path
+from typing import Optional, Dict, Any, List
 
+from uocm.detector.cpu_classifier import classify_cpu, normalize_brand, parse_frequency
 from uocm.detector.models import HardwareInfo, CPUInfo, GPUInfo, AudioInfo, NetworkInfo
+from uocm.detector.ioreg import IORegIndex, read_ioreg
+from uocm.detector.system_profiler import SystemProfilerCollector
 from uocm.core.platform import Platform
 
+SYSCTL_COMMAND = ["sysctl", "machdep.cpu"]
+
+
+def parse_sysctl(text: str) -> Dict[str, str]:
+    """Saída do sysctl ('chave: valor' por linha) -> dict"""
+    values = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            values[key.strip()] = value.strip()
+    return values
+
 
 class HardwareDetector:
     """Detector de hardware usando system_profiler e IORegistryExplorer"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        collector: Optional[SystemProfilerCollector] = None,
+        ioreg_dump: Optional[Path] = None,
+        sysctl_dump: Optional[Path] = None,
+    ):
+        """
+        Args:
+            collector: Fonte dos dados do system_profiler (padrão: execução
+                ao vivo; use SystemProfilerCollector.from_file para um dump)
+            ioreg_dump: Saída salva do `ioreg -l -w0` (padrão: executar o
+                ioreg, exceto ao reproduzir um dump do system_profiler)
+            sysctl_dump: Saída salva do `sysctl machdep.cpu` (idem)
+        """
         self.system = platform.system()
-        self.can_detect = Platform.can_detect_hardware()
+        self.collector = collector or SystemProfilerCollector()
+        self.ioreg_dump = Path(ioreg_dump) if ioreg_dump else None
+        self.sysctl_dump = Path(sysctl_dump) if sysctl_dump else None
+        self.can_detect = (
+            Platform.can_detect_hardware()
+            or self.collector.is_replay
+            or self.ioreg_dump is not None
+            or self.sysctl_dump is not None
+        )
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+        self._pci: Optional[IORegIndex] = None
+        self._sysctl: Optional[Dict[str, str]] = None
+    
+    @classmethod
+    def from_dump(cls, path: Path) -> "HardwareDetector":
+        """Detector que reproduz um dump salvo (ver uocm.detector.replay)"""
+        from uocm.detector.replay import load_dump
+        return load_dump(path).detector()
     
     def detect_all(self) -> HardwareInfo:
         """Detecta todas as informações de hardware"""
+        # Uma coleta do system_profiler por detecção
+        self.collector.reset()
+        self._parsed = {}
+        self._pci = None
+        self._sysctl = None
+        
         if not self.can_detect:
             # Retornar informações mínimas para outras plataformas
             return HardwareInfo(
@@ -70,40 +122,36 @@ class HardwareDetector:
                 return CPUInfo(model="Unknown", vendor="Unknown")
             
             output = self._get_system_profiler("SPHardwareDataType")
+            sysctl = self._get_sysctl()
             
-            cpu_name = output.get("cpu_type", "Unknown")
-            cpu_cores = output.get("number_of_cores", 0)
-            cpu_threads = output.get("number_of_processors", 1) * cpu_cores
+            # O system_profiler não traz o número do modelo ("6-Core Intel Core i7")
+            brand = sysctl.get("machdep.cpu.brand_string", "")
+            cpu_name = normalize_brand(brand) if brand else output.get("cpu_type", "Unknown")
             
-            # Determinar vendor
-            vendor = "Intel"
-            if "AMD" in cpu_name or "Ryzen" in cpu_name:
-                vendor = "AMD"
+            # macOS usa number_processors (núcleos) e packages (soquetes)
+            cpu_cores = output.get("number_of_cores") or output.get("number_processors", 0)
+            cpu_threads = output.get("number_of_processors") or output.get("packages", 1)
+            cpu_threads *= cpu_cores
+            if sysctl.get("machdep.cpu.core_count", "").isdigit():
+                cpu_cores = int(sysctl["machdep.cpu.core_count"])
+            if sysctl.get("machdep.cpu.thread_count", "").isdigit():
+                cpu_threads = int(sysctl["machdep.cpu.thread_count"])
             
-            # Detectar microarquitetura Intel
-            microarchitecture = None
-            if vendor == "Intel":
-                if "Core i" in cpu_name:
-                    # Tentar detectar geração
-                    if "8th" in cpu_name or re.search(r"i[357]-8\d{3}", cpu_name):
-                        microarchitecture = "Coffee Lake"
-                    elif "9th" in cpu_name or re.search(r"i[357]-9\d{3}", cpu_name):
-                        microarchitecture = "Coffee Lake"
-                    elif "10th" in cpu_name or re.search(r"i[357]-10\d{3}", cpu_name):
-                        microarchitecture = "Comet Lake"
-                    elif "11th" in cpu_name or re.search(r"i[357]-11\d{3}", cpu_name):
-                        microarchitecture = "Tiger Lake"
-                    elif "12th" in cpu_name or re.search(r"i[357]-12\d{3}", cpu_name):
-                        microarchitecture = "Alder Lake"
-                    elif "13th" in cpu_name or re.search(r"i[357]-13\d{3}", cpu_name):
-                        microarchitecture = "Raptor Lake"
+            cpu_class = classify_cpu(cpu_name)
+            if cpu_class is not None:
+                vendor = cpu_class.vendor
+            elif "AMD" in cpu_name or "Ryzen" in cpu_name:
+                vendor = "AMD"
+            else:
+                vendor = "Intel"
             
             return CPUInfo(
                 model=cpu_name,
                 vendor=vendor,
                 cores=cpu_cores,
                 threads=cpu_threads,
-                microarchitecture=microarchitecture,
+                frequency=parse_frequency(brand),
+                microarchitecture=cpu_class.microarchitecture if cpu_class else None,
             )
         except Exception as e:
             return CPUInfo(model="Unknown", vendor="Intel")
@@ -114,35 +162,45 @@ class HardwareDetector:
             if not self.can_detect:
                 return None
             
+            gpu = None
             output = self._get_system_profiler("SPDisplaysDataType")
+            displays = self._sp_items(output, "displays")
+            if displays:
+                # Preferir a GPU dedicada
+                dedicated = [d for d in displays if "spdisplays_vram" in d]
+                gpu_data = (dedicated or displays)[0]
+                
+                gpu_name = gpu_data.get("sppci_model") or gpu_data.get("_name", "Unknown")
+                vram = self._parse_size_mb(gpu_data.get("spdisplays_vram"))
+                
+                # Determinar vendor
+                vendor = "Unknown"
+                if "Intel" in gpu_name or "Iris" in gpu_name:
+                    vendor = "Intel"
+                elif "AMD" in gpu_name or "Radeon" in gpu_name:
+                    vendor = "AMD"
+                elif "NVIDIA" in gpu_name or "GeForce" in gpu_name:
+                    vendor = "NVIDIA"
+                
+                gpu = GPUInfo(
+                    model=gpu_name,
+                    vendor=vendor,
+                    vram=vram,
+                )
             
-            if not output or "displays" not in output:
-                return None
-            
-            displays = output["displays"]
-            if not displays:
-                return None
-            
-            # Pegar primeira GPU
-            gpu_data = displays[0] if isinstance(displays, list) else displays
-            
-            gpu_name = gpu_data.get("_name", "Unknown")
-            vram = gpu_data.get("spdisplays_vram", 0)
-            
-            # Determinar vendor
-            vendor = "Unknown"
-            if "Intel" in gpu_name or "Iris" in gpu_name:
-                vendor = "Intel"
-            elif "AMD" in gpu_name or "Radeon" in gpu_name:
-                vendor = "AMD"
-            elif "NVIDIA" in gpu_name or "GeForce" in gpu_name:
-                vendor = "NVIDIA"
+            # IDs PCI via IORegistry (mesmo vendor, dedicada primeiro)
+            pci = self._get_pci_index()
+            devices = pci.gpus() if pci else []
+            if gpu is not None:
+                devices = [d for d in devices if d.vendor_name == gpu.vendor] or devices
+            if devices:
+                device = devices[0]
+                if gpu is None:
+                    gpu = GPUInfo(model=device.model or "Unknown", vendor=device.vendor_name)
+                gpu.vendor_id = f"0x{device.vendor_id:04x}"
+                gpu.device_id = f"0x{device.device_id:04x}"
             
-            return GPUInfo(
-                model=gpu_name,
-                vendor=vendor,
-                vram=vram,
-            )
+            return gpu
         except Exception:
             return None
     
@@ -152,9 +210,17 @@ class HardwareDetector:
             if not self.can_detect:
                 return None
             
-            output = self._get_system_profiler("SPAudioDataType")
-            # Parsing simplificado - melhorar com IORegistry
-            return AudioInfo()
+            audio = AudioInfo()
+            pci = self._get_pci_index()
+            if pci:
+                controllers = pci.hda_controllers()
+                # Controladora HDA da placa-mãe (não a HDMI da GPU)
+                onboard = [c for c in controllers if c.vendor_id in (0x8086, 0x1022)] or controllers
+                if onboard:
+                    audio.vendor_id = f"0x{onboard[0].vendor_id:04x}"
+                    audio.device_id = f"0x{onboard[0].device_id:04x}"
+                audio.codec = pci.codec_name()
+            return audio
         except Exception:
             return None
     
@@ -169,14 +235,13 @@ class HardwareDetector:
             wifi_model = None
             bluetooth_model = None
             
-            if "interfaces" in output:
-                interfaces = output["interfaces"]
-                for interface in interfaces:
-                    name = interface.get("_name", "")
-                    if "Wi-Fi" in name or "AirPort" in name:
-                        wifi_model = interface.get("spnetwork_hardware", "Unknown")
-                    elif "Bluetooth" in name:
-                        bluetooth_model = interface.get("spnetwork_hardware", "Unknown")
+            for interface in self._sp_items(output, "interfaces"):
+                name = interface.get("_name", "")
+                hardware = interface.get("spnetwork_hardware") or interface.get("hardware", "Unknown")
+                if "Wi-Fi" in name or "AirPort" in name:
+                    wifi_model = hardware
+                elif "Bluetooth" in name:
+                    bluetooth_model = hardware
             
             return NetworkInfo(
                 wifi_model=wifi_model,
@@ -191,16 +256,8 @@ class HardwareDetector:
             if not self.can_detect:
                 return None
             
-            # Tentar detectar via IORegistry
-            result = subprocess.run(
-                ["ioreg", "-l", "-w0"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            
-            # Parsing simplificado - melhorar
-            return None
+            pci = self._get_pci_index()
+            return pci.chipset() if pci else None
         except Exception:
             return None
     
@@ -211,7 +268,7 @@ class HardwareDetector:
                 return None
             
             output = self._get_system_profiler("SPHardwareDataType")
-            return output.get("model_identifier", None)
+            return output.get("model_identifier") or output.get("machine_model")
         except Exception:
             return None
     
@@ -232,32 +289,69 @@ class HardwareDetector:
         return None
     
     def _get_system_profiler(self, data_type: str) -> Dict[str, Any]:
-        """Executa system_profiler e retorna dados parseados"""
+        """Retorna dados parseados de um tipo do system_profiler (coletados uma vez)"""
         try:
             if not self.can_detect:
                 return {}
             
-            result = subprocess.run(
-                ["system_profiler", "-xml", data_type],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            
-            if result.returncode != 0:
-                return {}
-            
-            # Parse XML simplificado - usar plistlib para parsing completo
-            import plistlib
-            data = plistlib.loads(result.stdout.encode())
-            
-            if data and len(data) > 0:
-                return self._parse_sp_xml(data[0])
-            
-            return {}
+            if data_type not in self._parsed:
+                node = self.collector.get(data_type)
+                self._parsed[data_type] = self._parse_sp_xml(node) if node else {}
+            return self._parsed[data_type]
         except Exception as e:
             return {}
     
+    def _get_sysctl(self) -> Dict[str, str]:
+        """Valores de `sysctl machdep.cpu` (lidos uma vez por detecção)"""
+        if self._sysctl is None:
+            self._sysctl = {}
+            try:
+                if self.sysctl_dump is not None:
+                    text = self.sysctl_dump.read_text(encoding="utf-8")
+                elif not self.collector.is_replay:
+                    text = subprocess.run(
+                        SYSCTL_COMMAND, capture_output=True, text=True, timeout=5
+                    ).stdout
+                else:
+                    text = ""
+                self._sysctl = parse_sysctl(text)
+            except Exception:
+                pass
+        return self._sysctl
+    
+    def _get_pci_index(self) -> Optional[IORegIndex]:
+        """Dispositivos PCI do IORegistry (lidos uma vez por detecção)"""
+        if self._pci is None:
+            try:
+                if self.ioreg_dump is not None:
+                    self._pci = IORegIndex.from_file(self.ioreg_dump)
+                elif not self.collector.is_replay:
+                    self._pci = read_ioreg()
+            except Exception:
+                self._pci = None
+        return self._pci
+    
+    @staticmethod
+    def _sp_items(output: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+        """Items de um tipo do system_profiler (um item vem achatado pelo parse)"""
+        if not output:
+            return []
+        items = output.get(key) or output.get("items")
+        if items is None:
+            return [output] if "_name" in output else []
+        return items if isinstance(items, list) else [items]
+    
+    @staticmethod
+    def _parse_size_mb(value: Any) -> Optional[int]:
+        """'8 GB' / '1536 MB' -> MB (inteiros são mantidos)"""
+        if isinstance(value, int):
+            return value
+        match = re.search(r"(\d+)\s*(GB|MB)", str(value), re.IGNORECASE)
+        if not match:
+            return None
+        size = int(match.group(1))
+        return size * 1024 if match.group(2).upper() == "GB" else size
+    
     def _parse_sp_xml(self, node: Any) -> Dict[str, Any]:
         """Parse recursivo de nó do system_profiler"""
         result = {}
@@ -0,0 +1,287 @@
+"""
+Parser em streaming da saída do `ioreg -l -w0`
+
+A saída completa do IORegistry tem vários megabytes; aqui ela é lida linha
+a linha (do processo ou de um dump salvo) e apenas os dispositivos PCI são
+guardados, com vendor-id, device-id, class-code, caminho ACPI e modelo.
+Os IDs de codecs HDA (IOHDACodecVendorID) também são registrados, para
+identificar o codec de áudio.
+"""
+
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+IOREG_COMMAND = ["ioreg", "-l", "-w0"]
+
+# Vendors PCI / PCI vendors
+VENDOR_INTEL = 0x8086
+VENDOR_AMD = 0x1002
+VENDOR_AMD_CHIPSET = 0x1022
+VENDOR_NVIDIA = 0x10DE
+
+VENDOR_NAMES = {
+    VENDOR_INTEL: "Intel",
+    VENDOR_AMD: "AMD",
+    VENDOR_AMD_CHIPSET: "AMD",
+    VENDOR_NVIDIA: "NVIDIA",
+}
+
+# Classes PCI (base, subclasse) / PCI classes (base, subclass)
+CLASS_DISPLAY = 0x03
+CLASS_HDA = (0x04, 0x03)
+CLASS_ISA_BRIDGE = (0x06, 0x01)
+
+# Chipset pelo device-id da ponte LPC/eSPI do PCH
+CHIPSETS: Dict[Tuple[int, int], str] = {
+    # 100 series (Sunrise Point)
+    (VENDOR_INTEL, 0xA143): "H110",
+    (VENDOR_INTEL, 0xA144): "H170",
+    (VENDOR_INTEL, 0xA145): "Z170",
+    (VENDOR_INTEL, 0xA146): "Q170",
+    (VENDOR_INTEL, 0xA148): "B150",
+    (VENDOR_INTEL, 0xA14D): "QM170",
+    (VENDOR_INTEL, 0xA14E): "HM170",
+    # 200 series (Union Point) e X299
+    (VENDOR_INTEL, 0xA2C4): "H270",
+    (VENDOR_INTEL, 0xA2C5): "Z270",
+    (VENDOR_INTEL, 0xA2C6): "Q270",
+    (VENDOR_INTEL, 0xA2C8): "B250",
+    (VENDOR_INTEL, 0xA2C9): "Z370",
+    (VENDOR_INTEL, 0xA2D2): "X299",
+    # 300 series (Cannon Point)
+    (VENDOR_INTEL, 0xA303): "H310",
+    (VENDOR_INTEL, 0xA304): "H370",
+    (VENDOR_INTEL, 0xA305): "Z390",
+    (VENDOR_INTEL, 0xA306): "Q370",
+    (VENDOR_INTEL, 0xA308): "B360",
+    (VENDOR_INTEL, 0xA30C): "QM370",
+    (VENDOR_INTEL, 0xA30D): "HM370",
+    # 400 series (Comet Point)
+    (VENDOR_INTEL, 0x0684): "H470",
+    (VENDOR_INTEL, 0x0685): "Z490",
+    (VENDOR_INTEL, 0x0687): "Q470",
+    (VENDOR_INTEL, 0xA3C8): "B460",
+    (VENDOR_INTEL, 0xA3DA): "H410",
+    (VENDOR_INTEL, 0x068C): "QM480",
+    (VENDOR_INTEL, 0x068D): "HM470",
+    # 500 series (Tiger Point)
+    (VENDOR_INTEL, 0x4385): "Z590",
+    (VENDOR_INTEL, 0x4386): "H570",
+    (VENDOR_INTEL, 0x4387): "B560",
+    (VENDOR_INTEL, 0x4388): "H510",
+    # 600 / 700 series
+    (VENDOR_INTEL, 0x7A84): "Z690",
+    (VENDOR_INTEL, 0x7A86): "B660",
+    (VENDOR_INTEL, 0x7A87): "H610",
+    (VENDOR_INTEL, 0x7A04): "Z790",
+    (VENDOR_INTEL, 0x7A06): "B760",
+    # AMD: a FCH usa o mesmo ID em todos os chipsets AM4/AM5
+    (VENDOR_AMD_CHIPSET, 0x790E): "AMD FCH",
+}
+
+# Fabricantes de codecs HDA (16 bits altos de IOHDACodecVendorID)
+CODEC_VENDORS = {
+    0x10EC: "Realtek",
+    0x14F1: "Conexant",
+    0x111D: "IDT",
+    0x1106: "VIA",
+    0x8384: "SigmaTel",
+}
+
+# Propriedades guardadas; as demais linhas são descartadas sem parsing
+_PCI_KEYS = {"vendor-id", "device-id", "class-code", "acpi-path", "model", "pcidebug"}
+_CODEC_KEY = "IOHDACodecVendorID"
+_PCI_CLASS = "IOPCIDevice"
+
+
+@dataclass
+class PCIDevice:
+    """Dispositivo PCI encontrado no IORegistry"""
+    name: str  # ex: "GFX0@2"
+    vendor_id: Optional[int] = None
+    device_id: Optional[int] = None
+    class_code: Optional[int] = None  # 24 bits: base, subclasse, interface
+    acpi_path: Optional[str] = None
+    model: Optional[str] = None
+    location: Optional[str] = None  # bus:device:function (pcidebug)
+
+    @property
+    def base_class(self) -> Optional[int]:
+        return None if self.class_code is None else self.class_code >> 16
+
+    @property
+    def subclass(self) -> Optional[int]:
+        return None if self.class_code is None else (self.class_code >> 8) & 0xFF
+
+    @property
+    def vendor_name(self) -> str:
+        return VENDOR_NAMES.get(self.vendor_id, "Unknown")
+
+    @property
+    def pci_id(self) -> str:
+        """Identificador no formato vendor:device (ex: '8086:3e92')"""
+        return f"{self.vendor_id or 0:04x}:{self.device_id or 0:04x}"
+
+
+class IORegIndex:
+    """Dispositivos PCI indexados por classe e por (vendor, device)"""
+
+    def __init__(self, devices: Iterable[PCIDevice] = (), codecs: Iterable[int] = ()):
+        self.devices: List[PCIDevice] = []
+        self.codecs: List[int] = []
+        self._by_class: Dict[Tuple[int, int], List[PCIDevice]] = {}
+        self._by_id: Dict[Tuple[int, int], List[PCIDevice]] = {}
+        for device in devices:
+            self.add(device)
+        for codec in codecs:
+            self.add_codec(codec)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IORegIndex":
+        """Lê um dump salvo do `ioreg -l -w0`"""
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return parse_ioreg(f)
+
+    def add(self, device: PCIDevice) -> None:
+        self.devices.append(device)
+        if device.class_code is not None:
+            key = (device.base_class, device.subclass)
+            self._by_class.setdefault(key, []).append(device)
+        if device.vendor_id is not None and device.device_id is not None:
+            self._by_id.setdefault((device.vendor_id, device.device_id), []).append(device)
+
+    def add_codec(self, vendor_device: int) -> None:
+        if vendor_device and vendor_device not in self.codecs:
+            self.codecs.append(vendor_device)
+
+    def by_class(self, base: int, subclass: Optional[int] = None) -> List[PCIDevice]:
+        """Dispositivos de uma classe (e subclasse, se informada)"""
+        if subclass is not None:
+            return list(self._by_class.get((base, subclass), []))
+        return [d for (b, _), devices in self._by_class.items() if b == base for d in devices]
+
+    def find(self, vendor_id: int, device_id: int) -> List[PCIDevice]:
+        return list(self._by_id.get((vendor_id, device_id), []))
+
+    def gpus(self) -> List[PCIDevice]:
+        """Controladoras de vídeo, dedicadas primeiro"""
+        return sorted(self.by_class(CLASS_DISPLAY), key=lambda d: d.vendor_id == VENDOR_INTEL)
+
+    def hda_controllers(self) -> List[PCIDevice]:
+        return self.by_class(*CLASS_HDA)
+
+    def chipset(self) -> Optional[str]:
+        """Nome do chipset pela ponte LPC/eSPI (ou o ID PCI, se desconhecido)"""
+        for device in self.by_class(*CLASS_ISA_BRIDGE):
+            name = CHIPSETS.get((device.vendor_id, device.device_id))
+            if name:
+                return name
+            return f"{device.vendor_name} {device.pci_id}"
+        return None
+
+    def codec_name(self) -> Optional[str]:
+        """Nome do primeiro codec HDA (ex: 'ALC1220'), excluindo codecs HDMI"""
+        for codec in self.codecs:
+            vendor, device = codec >> 16, codec & 0xFFFF
+            if vendor in VENDOR_NAMES:
+                continue  # Codec HDMI/DP da GPU
+            if vendor == 0x10EC:
+                return f"ALC{device:x}"
+            return f"{CODEC_VENDORS.get(vendor, f'{vendor:04x}')} {device:04x}"
+        return None
+
+
+def parse_ioreg(lines: Iterable[str]) -> IORegIndex:
+    """Percorre a saída do ioreg guardando apenas o que é usado na detecção"""
+    index = IORegIndex()
+    current: Optional[PCIDevice] = None
+
+    for line in lines:
+        text = line.lstrip(" |")
+        if text.startswith("+-o "):
+            if current is not None:
+                index.add(current)
+            current = _parse_header(text)
+            continue
+        if not text.startswith('"'):
+            continue
+
+        end = text.find('"', 1)
+        key = text[1:end]
+        if key == _CODEC_KEY:
+            value = _parse_value(text[end + 1:])
+            if isinstance(value, int):
+                index.add_codec(value)
+        elif current is not None and key in _PCI_KEYS:
+            _apply(current, key, _parse_value(text[end + 1:]))
+
+    if current is not None:
+        index.add(current)
+    return index
+
+
+def read_ioreg(timeout: float = 10.0) -> IORegIndex:
+    """Executa o ioreg e faz o parsing enquanto a saída é produzida"""
+    process = subprocess.Popen(
+        IOREG_COMMAND,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+    )
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        return parse_ioreg(process.stdout)
+    finally:
+        timer.cancel()
+        process.stdout.close()
+        process.wait()
+
+
+def _parse_header(text: str) -> Optional[PCIDevice]:
+    """'+-o GFX0@2  <class IOPCIDevice, id ...>' -> PCIDevice (apenas PCI)"""
+    name, _, rest = text[4:].partition("  <class ")
+    class_name = rest.split(",", 1)[0]
+    if class_name != _PCI_CLASS:
+        return None
+    return PCIDevice(name=name.strip())
+
+
+def _apply(device: PCIDevice, key: str, value) -> None:
+    if key == "vendor-id" and isinstance(value, bytes):
+        device.vendor_id = int.from_bytes(value[:2], "little")
+    elif key == "device-id" and isinstance(value, bytes):
+        device.device_id = int.from_bytes(value[:2], "little")
+    elif key == "class-code" and isinstance(value, bytes):
+        device.class_code = int.from_bytes(value[:4], "little") & 0xFFFFFF
+    elif key == "acpi-path" and isinstance(value, str):
+        device.acpi_path = value
+    elif key == "model":
+        device.model = value.decode("utf-8", "replace").rstrip("\0") if isinstance(value, bytes) else value
+    elif key == "pcidebug" and isinstance(value, str):
+        device.location = value
+
+
+def _parse_value(raw: str):
+    """Valor de uma propriedade: <hex> -> bytes, <"txt"> / "txt" -> str, número -> int"""
+    value = raw.strip()
+    if value.startswith("="):
+        value = value[1:].strip()
+    if value.startswith('<"') and value.endswith('">'):
+        return value[2:-2]
+    if value.startswith("<") and value.endswith(">"):
+        try:
+            return bytes.fromhex(value[1:-1])
+        except ValueError:
+            return None
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    try:
+        return int(value, 0)
+    except ValueError:
+        return None
+
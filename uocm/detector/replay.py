@@ -0,0 +1,180 @@
+"""
+Reprodução offline de perfis de hardware
+
+Um dump é um diretório com a saída do system_profiler (system_profiler.xml
+ou .json), a saída do `ioreg -l -w0` (ioreg.txt), a do `sysctl machdep.cpu`
+(sysctl.txt) e, opcionalmente, o resultado esperado da detecção
+(expected.json). Com ele o HardwareDetector roda em qualquer plataforma, o
+que permite testes de regressão e perfis de desempenho da detecção e da
+geração de EFI fora do macOS.
+
+Dumps capturados com capture_dump têm números de série, UUIDs e endereços
+MAC removidos.
+"""
+
+import json
+import plistlib
+import re
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from uocm.detector.hardware_detector import SYSCTL_COMMAND, HardwareDetector
+from uocm.detector.ioreg import IOREG_COMMAND
+from uocm.detector.models import HardwareInfo
+from uocm.detector.system_profiler import SystemProfilerCollector
+
+SYSTEM_PROFILER_FILES = ("system_profiler.xml", "system_profiler.json")
+IOREG_FILE = "ioreg.txt"
+SYSCTL_FILE = "sysctl.txt"
+EXPECTED_FILE = "expected.json"
+
+REDACTED = "REDACTED"
+
+# Chaves com dados que identificam a máquina
+_SENSITIVE_SP_KEYS = {
+    "serial_number",
+    "platform_UUID",
+    "provisioning_UDID",
+    "serial_num",
+    "MAC Address",
+    "spairport_wireless_mac_address",
+    "device_address",
+}
+_SENSITIVE_IOREG_KEYS = (
+    "IOPlatformSerialNumber",
+    "IOPlatformUUID",
+    "IOMACAddress",
+    "serial-number",
+    "USB Serial Number",
+    "kUSBSerialNumberString",
+    "BD_ADDR",
+)
+_IOREG_SENSITIVE_LINE = re.compile(
+    r'^(?P<prefix>[ |]*"(?:%s)" = ).*$' % "|".join(re.escape(k) for k in _SENSITIVE_IOREG_KEYS)
+)
+
+
+@dataclass
+class HardwareDump:
+    """Dump de uma máquina salvo em disco"""
+    name: str
+    path: Path
+    system_profiler: Optional[Path] = None
+    ioreg: Optional[Path] = None
+    sysctl: Optional[Path] = None
+    expected: Optional[Path] = None
+
+    def detector(self) -> HardwareDetector:
+        """HardwareDetector que lê apenas os arquivos do dump"""
+        if self.system_profiler is not None:
+            collector = SystemProfilerCollector.from_file(self.system_profiler)
+        else:
+            collector = SystemProfilerCollector(nodes={}, source=self.path)
+        return HardwareDetector(collector=collector, ioreg_dump=self.ioreg, sysctl_dump=self.sysctl)
+
+    def detect(self) -> HardwareInfo:
+        return self.detector().detect_all()
+
+    def load_expected(self) -> Optional[Dict[str, Any]]:
+        if self.expected is None:
+            return None
+        with open(self.expected, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def load_dump(path: Path) -> HardwareDump:
+    """
+    Abre um diretório de dump
+
+    Raises:
+        FileNotFoundError: Se o diretório não tiver system_profiler nem ioreg
+    """
+    path = Path(path)
+    system_profiler = next(
+        (path / name for name in SYSTEM_PROFILER_FILES if (path / name).is_file()), None
+    )
+    ioreg = path / IOREG_FILE if (path / IOREG_FILE).is_file() else None
+    if system_profiler is None and ioreg is None:
+        raise FileNotFoundError(f"Nenhum dump de hardware em {path}")
+    sysctl = path / SYSCTL_FILE if (path / SYSCTL_FILE).is_file() else None
+    expected = path / EXPECTED_FILE if (path / EXPECTED_FILE).is_file() else None
+    return HardwareDump(
+        name=path.name,
+        path=path,
+        system_profiler=system_profiler,
+        ioreg=ioreg,
+        sysctl=sysctl,
+        expected=expected,
+    )
+
+
+def discover_dumps(root: Path) -> List[HardwareDump]:
+    """Todos os dumps dentro de root (um por subdiretório), em ordem de nome"""
+    dumps = []
+    for path in sorted(Path(root).iterdir()):
+        if path.is_dir():
+            try:
+                dumps.append(load_dump(path))
+            except FileNotFoundError:
+                continue
+    return dumps
+
+
+def hardware_to_dict(hardware: HardwareInfo) -> Dict[str, Any]:
+    """HardwareInfo sem raw_data, no formato de expected.json e dos perfis do lote"""
+    data = asdict(hardware)
+    data.pop("raw_data", None)
+    return data
+
+
+def anonymise_sp(node: Any) -> Any:
+    """Remove números de série, UUIDs e endereços MAC de dados do system_profiler"""
+    if isinstance(node, dict):
+        return {
+            key: REDACTED if key in _SENSITIVE_SP_KEYS else anonymise_sp(value)
+            for key, value in node.items()
+        }
+    if isinstance(node, list):
+        return [anonymise_sp(item) for item in node]
+    return node
+
+
+def anonymise_ioreg_line(line: str) -> str:
+    """Remove o valor de propriedades sensíveis de uma linha do ioreg"""
+    match = _IOREG_SENSITIVE_LINE.match(line.rstrip("\n"))
+    if match is None:
+        return line
+    return f'{match.group("prefix")}"{REDACTED}"\n'
+
+
+def capture_dump(dest: Path, timeout: float = 60.0) -> HardwareDump:
+    """
+    Captura system_profiler, ioreg e sysctl desta máquina (macOS) em dest, anonimizados
+
+    O expected.json não é gerado: ele deve ser revisado antes de entrar
+    no corpus de testes.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+
+    nodes = SystemProfilerCollector(timeout=timeout).collect()
+    with open(dest / SYSTEM_PROFILER_FILES[0], "wb") as f:
+        plistlib.dump(anonymise_sp(list(nodes.values())), f)
+
+    with subprocess.Popen(
+        IOREG_COMMAND,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+    ) as process, open(dest / IOREG_FILE, "w", encoding="utf-8") as f:
+        for line in process.stdout:
+            f.write(anonymise_ioreg_line(line))
+
+    # machdep.cpu não contém dados que identifiquem a máquina
+    sysctl = subprocess.run(SYSCTL_COMMAND, capture_output=True, text=True, timeout=timeout)
+    (dest / SYSCTL_FILE).write_text(sysctl.stdout, encoding="utf-8")
+
+    return load_dump(dest)
@@ -0,0 +1,161 @@
+"""
+Coleta do system_profiler em uma única execução, com cache
+
+Todos os tipos de dados são pedidos em um só `system_profiler -xml`; a
+saída é separada por `_dataType` e guardada até o fim da detecção. Tipos
+que faltarem na saída combinada são buscados individualmente, em paralelo.
+Uma coleta pode ser salva em disco e recarregada (XML do `-xml` ou JSON do
+`-json`), permitindo repetir a detecção fora do macOS.
+"""
+
+import json
+import plistlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+# Tipos usados pelo HardwareDetector
+DATA_TYPES = (
+    "SPHardwareDataType",
+    "SPDisplaysDataType",
+    "SPAudioDataType",
+    "SPNetworkDataType",
+    "SPUSBDataType",
+)
+
+SYSTEM_PROFILER = "system_profiler"
+
+
+def parse_dump(data: bytes) -> Dict[str, Dict[str, Any]]:
+    """
+    Separa uma saída do system_profiler por tipo de dado
+
+    Aceita o plist de `-xml` (lista de nós com `_dataType`) e o JSON de
+    `-json` (mapa tipo -> lista de items).
+
+    Returns:
+        Mapa tipo -> nó no formato do `-xml` ({"_dataType", "_items", ...})
+    """
+    stripped = data.lstrip()
+    if stripped.startswith(b"{"):
+        parsed = json.loads(stripped.decode("utf-8"))
+        return {
+            data_type: {"_dataType": data_type, "_items": items}
+            for data_type, items in parsed.items()
+            if isinstance(items, list)
+        }
+
+    parsed = plistlib.loads(data)
+    nodes = parsed if isinstance(parsed, list) else [parsed]
+    return {
+        node["_dataType"]: node
+        for node in nodes
+        if isinstance(node, dict) and "_dataType" in node
+    }
+
+
+class SystemProfilerCollector:
+    """Executa o system_profiler uma vez por detecção e guarda o resultado"""
+
+    def __init__(
+        self,
+        data_types: Iterable[str] = DATA_TYPES,
+        timeout: float = 60.0,
+        nodes: Optional[Dict[str, Dict[str, Any]]] = None,
+        source: Optional[Path] = None,
+    ):
+        """
+        Args:
+            data_types: Tipos coletados na execução combinada
+            timeout: Tempo máximo da execução (segundos)
+            nodes: Dados já coletados (ex: carregados de um dump)
+            source: Arquivo de onde os dados vieram (None = coleta ao vivo)
+        """
+        self.data_types = tuple(data_types)
+        self.timeout = timeout
+        self.source = Path(source) if source else None
+        self._nodes: Optional[Dict[str, Dict[str, Any]]] = nodes
+        self._lock = Lock()
+        self.runs = 0
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SystemProfilerCollector":
+        """Carrega um dump salvo (`system_profiler -xml` ou `-json`)"""
+        path = Path(path)
+        nodes = parse_dump(path.read_bytes())
+        return cls(data_types=nodes.keys(), nodes=nodes, source=path)
+
+    @property
+    def is_replay(self) -> bool:
+        """True quando os dados vêm de um dump, e não do sistema"""
+        return self.source is not None
+
+    def get(self, data_type: str) -> Optional[Dict[str, Any]]:
+        """Nó bruto de um tipo de dado (None se indisponível)"""
+        return self.collect().get(data_type)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Coleta todos os tipos (apenas na primeira chamada)"""
+        with self._lock:
+            if self._nodes is None:
+                self._nodes = self._run_combined()
+                missing = [t for t in self.data_types if t not in self._nodes]
+                if missing:
+                    self._nodes.update(self._run_each(missing))
+            return self._nodes
+
+    def reset(self) -> None:
+        """Descarta a coleta ao vivo, para a próxima detecção (dumps são mantidos)"""
+        if self.is_replay:
+            return
+        with self._lock:
+            self._nodes = None
+
+    def save(self, path: Path) -> Path:
+        """Salva a coleta como plist XML, no formato aceito por from_file"""
+        path = Path(path)
+        nodes = self.collect()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(plistlib.dumps(list(nodes.values())))
+        return path
+
+    def _run_combined(self) -> Dict[str, Dict[str, Any]]:
+        """Uma execução do system_profiler com todos os tipos"""
+        self.runs += 1
+        output = self._execute(self.data_types)
+        if output is None:
+            return {}
+        try:
+            return parse_dump(output)
+        except Exception:
+            return {}
+
+    def _run_each(self, data_types: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Execuções individuais, em paralelo, para os tipos restantes"""
+        nodes: Dict[str, Dict[str, Any]] = {}
+        self.runs += len(data_types)
+        with ThreadPoolExecutor(max_workers=len(data_types)) as executor:
+            outputs = executor.map(lambda t: self._execute([t]), data_types)
+            for output in outputs:
+                if output is None:
+                    continue
+                try:
+                    nodes.update(parse_dump(output))
+                except Exception:
+                    continue
+        return nodes
+
+    def _execute(self, data_types: Iterable[str]) -> Optional[bytes]:
+        try:
+            result = subprocess.run(
+                [SYSTEM_PROFILER, "-xml", *data_types],
+                capture_output=True,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout
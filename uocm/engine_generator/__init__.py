@@ -2,8 +2,9 @@
 Módulo gerador de EFI
 """
 
+from uocm.engine_generator.batch import BatchGenerator, BatchJob, load_profiles
 from uocm.engine_generator.efi_generator import EFIGenerator
 from uocm.engine_generator.modes import GenerationMode
 
-__all__ = ["EFIGenerator", "GenerationMode"]
+__all__ = ["BatchGenerator", "BatchJob", "EFIGenerator", "GenerationMode", "load_profiles"]
 
@@ -0,0 +1,305 @@
+"""
+Geração de EFIs em lote para vários perfis de hardware
+
+Lê perfis de hardware (JSON ou YAML), distribui cada combinação
+perfil x modo em um pool de processos e grava todos os EFIs junto com um
+manifest.json contendo status e tempo de cada geração. O template base e o
+mapa de kexts locais são carregados uma única vez no processo principal e
+repassados aos workers.
+
+Uso: python scripts/generate_batch.py perfis.yaml -o saida/ [--modes standard aggressive]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import yaml
+
+from uocm.core.config import Config
+from uocm.db.database import reset_database
+from uocm.detector.hardware_detector import HardwareDetector
+from uocm.detector.models import AudioInfo, CPUInfo, GPUInfo, HardwareInfo, NetworkInfo
+from uocm.engine_generator.efi_generator import EFIGenerator
+from uocm.engine_generator.modes import GenerationMode
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class BatchJob:
+    """Uma geração do lote: um perfil de hardware em um modo"""
+    name: str
+    hardware: HardwareInfo
+    mode: GenerationMode = GenerationMode.STANDARD
+    smbios_override: Optional[str] = None
+
+    @property
+    def output_name(self) -> str:
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", self.name).strip("_") or "profile"
+        return f"{safe_name}_{self.mode.value}"
+
+
+def hardware_from_dict(data: Dict[str, Any]) -> HardwareInfo:
+    """Cria HardwareInfo a partir de um perfil (dict) de JSON/YAML"""
+    if "cpu" not in data:
+        raise ValueError("Perfil sem seção 'cpu'")
+
+    def build(cls, section: str):
+        value = data.get(section)
+        if value is None:
+            return None
+        try:
+            return cls(**value)
+        except TypeError as e:
+            raise ValueError(f"Seção '{section}' inválida: {e}") from e
+
+    return HardwareInfo(
+        cpu=build(CPUInfo, "cpu"),
+        gpu=build(GPUInfo, "gpu"),
+        audio=build(AudioInfo, "audio"),
+        network=build(NetworkInfo, "network"),
+        chipset=data.get("chipset"),
+        motherboard=data.get("motherboard"),
+        ram_total_gb=data.get("ram_total_gb"),
+        storage=data.get("storage"),
+    )
+
+
+def load_profiles(
+    path: Path,
+    default_modes: Sequence[GenerationMode] = (GenerationMode.STANDARD,),
+) -> List[BatchJob]:
+    """
+    Carrega perfis de um arquivo JSON/YAML e expande em jobs
+
+    O arquivo pode ser uma lista de perfis ou um dict com a chave 'profiles'.
+    Cada perfil tem 'name', as seções de HardwareInfo ('cpu', 'gpu', ...) e,
+    opcionalmente, 'modes' e 'smbios'. Em vez das seções, 'dump' pode apontar
+    para um dump de hardware (ver uocm.detector.replay), relativo ao arquivo.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    profiles = data.get("profiles", []) if isinstance(data, dict) else data
+    if not isinstance(profiles, list):
+        raise ValueError(f"Formato de perfis inválido em {path}")
+
+    jobs: List[BatchJob] = []
+    for i, profile in enumerate(profiles):
+        dump = profile.get("dump")
+        name = profile.get("name") or (Path(dump).name if dump else f"profile{i + 1}")
+        try:
+            if dump:
+                hardware = _hardware_from_dump(path.parent / dump)
+            else:
+                hardware = hardware_from_dict(profile)
+        except ValueError as e:
+            raise ValueError(f"Perfil '{name}': {e}") from e
+
+        modes = [GenerationMode(m) for m in profile.get("modes", [])] or list(default_modes)
+        for mode in modes:
+            jobs.append(BatchJob(
+                name=name,
+                hardware=hardware,
+                mode=mode,
+                smbios_override=profile.get("smbios"),
+            ))
+    return jobs
+
+
+def unique_output_names(jobs: Sequence[BatchJob]) -> List[str]:
+    """Nome da pasta de saída de cada job, com sufixo _2, _3... em colisões"""
+    names: List[str] = []
+    # Sem diferenciar maiúsculas (sistemas de arquivos do macOS e Windows)
+    taken = set()
+    for job in jobs:
+        name = job.output_name
+        suffix = 2
+        while name.lower() in taken:
+            name = f"{job.output_name}_{suffix}"
+            suffix += 1
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _hardware_from_dump(path: Path) -> HardwareInfo:
+    try:
+        return HardwareDetector.from_dump(path).detect_all()
+    except FileNotFoundError as e:
+        raise ValueError(str(e)) from e
+
+
+# Gerador do processo worker (criado no initializer do pool)
+_worker_generator: Optional[EFIGenerator] = None
+
+
+def _init_worker(
+    app_path: str,
+    base_template: Dict[str, Any],
+    kext_paths: Dict[str, str],
+) -> None:
+    """Prepara o worker: Config, conexão própria com o banco e estado compartilhado"""
+    global _worker_generator
+    Config.set_app_path(Path(app_path))
+    # Conexões SQLite herdadas via fork não podem ser reutilizadas
+    reset_database(after_fork=True)
+    _worker_generator = EFIGenerator(base_template=base_template, kext_paths=kext_paths)
+
+
+def _run_job(job: BatchJob, output_path: str) -> Dict[str, Any]:
+    """Gera um EFI do lote (executado no worker)"""
+    generator = _worker_generator or EFIGenerator()
+    phases: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        generator.generate_efi(
+            job.hardware,
+            mode=job.mode,
+            output_path=Path(output_path),
+            smbios_override=job.smbios_override,
+            progress_callback=lambda phase, seconds: phases.__setitem__(phase, round(seconds, 4)),
+        )
+        error = None
+    except Exception as e:
+        error = str(e)
+
+    return _job_result(job, output_path, error, time.perf_counter() - start, phases, os.getpid())
+
+
+def _job_result(
+    job: BatchJob,
+    output_path: str,
+    error: Optional[str],
+    seconds: float = 0.0,
+    phases: Optional[Dict[str, float]] = None,
+    pid: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Entrada do manifest para um job"""
+    return {
+        "name": job.name,
+        "mode": job.mode.value,
+        "output": output_path,
+        "status": "error" if error else "ok",
+        "error": error,
+        "seconds": round(seconds, 4),
+        "phases": phases or {},
+        "pid": pid,
+    }
+
+
+class BatchGenerator:
+    """Gerador de EFIs em lote com pool de processos"""
+
+    def __init__(self, output_dir: Path, max_workers: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, jobs: Sequence[BatchJob]) -> Dict[str, Any]:
+        """
+        Gera todos os EFIs e grava o manifest
+
+        Returns:
+            Manifest com um resultado por job (na ordem dos jobs), tempos e totais
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+
+        # Estado compartilhado: template e mapa de kexts lidos uma única vez
+        shared = EFIGenerator()
+        base_template = shared._load_base_template()
+        kext_paths = shared.load_kext_paths()
+
+        outputs = [str(self.output_dir / name) for name in unique_output_names(jobs)]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        workers = max(1, min(self.max_workers, len(jobs)))
+
+        if workers == 1:
+            global _worker_generator
+            _worker_generator = EFIGenerator(base_template=base_template, kext_paths=kext_paths)
+            try:
+                for i, job in enumerate(jobs):
+                    results[i] = _run_job(job, outputs[i])
+            finally:
+                _worker_generator = None
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(Config.get_app_path()), base_template, kext_paths),
+            ) as pool:
+                futures = {
+                    pool.submit(_run_job, job, outputs[i]): i
+                    for i, job in enumerate(jobs)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        # Worker morto (BrokenProcessPool) ou job não serializável:
+                        # registra o erro e mantém os demais resultados no manifest
+                        results[i] = _job_result(jobs[i], outputs[i], f"{type(e).__name__}: {e}")
+
+        manifest = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "workers": workers,
+            "total_seconds": round(time.perf_counter() - start, 4),
+            "succeeded": sum(1 for r in results if r and r["status"] == "ok"),
+            "failed": sum(1 for r in results if r and r["status"] != "ok"),
+            "results": results,
+        }
+        with open(self.output_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        return manifest
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Gera EFIs em lote a partir de perfis de hardware")
+    parser.add_argument("profiles", type=Path, help="Arquivo de perfis (.json, .yaml)")
+    parser.add_argument("-o", "--output", type=Path, help="Pasta de saída (padrão: exports/batch_<data>)")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=[mode.value for mode in GenerationMode],
+        default=[GenerationMode.STANDARD.value],
+        help="Modos para perfis que não definem 'modes'",
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Número de processos")
+    args = parser.parse_args(argv)
+
+    Config.set_app_path(Path(__file__).parent.parent.parent)
+
+    try:
+        jobs = load_profiles(args.profiles, [GenerationMode(m) for m in args.modes])
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Erro ao carregar perfis: {e}", file=sys.stderr)
+        return 2
+
+    output = args.output or Config.get_exports_path() / f"batch_{datetime.now():%Y%m%d_%H%M%S}"
+    manifest = BatchGenerator(output, args.workers).run(jobs)
+
+    for result in manifest["results"]:
+        status = "OK" if result["status"] == "ok" else f"ERRO: {result['error']}"
+        print(f"{result['name']:<30} {result['mode']:<13} {result['seconds'] * 1000:>9.1f} ms  {status}")
+    print(
+        f"{manifest['succeeded']} gerados, {manifest['failed']} com erro, "
+        f"{manifest['total_seconds']:.2f} s com {manifest['workers']} processos"
+    )
+    print(f"Manifest: {Path(output) / MANIFEST_NAME}")
+    return 0 if manifest["failed"] == 0 else 1
@@ -0,0 +1,61 @@
+"""
+Contexto de uma geração de EFI
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from uocm.detector.models import HardwareInfo
+from uocm.engine_generator.modes import GenerationMode
+
+# Callback de progresso: (fase, segundos gastos na fase)
+PhaseCallback = Callable[[str, float], None]
+
+
+@dataclass
+class GenerationContext:
+    """
+    Estado de uma execução de generate_efi
+
+    Mantém uma única sessão do banco para toda a geração, memoiza as
+    recomendações (SMBIOS, kexts, drivers, SSDTs, quirks) e acumula o tempo
+    gasto em cada fase.
+    """
+    hardware: HardwareInfo
+    mode: GenerationMode
+    session: Session
+    smbios_override: Optional[str] = None
+    progress_callback: Optional[PhaseCallback] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    _memo: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def memoize(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Retorna o valor de key, calculando-o apenas na primeira chamada"""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mede o tempo de uma fase e notifica o callback de progresso"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            if self.progress_callback:
+                self.progress_callback(name, elapsed)
+
+
+def memoized(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator: calcula a recomendação uma vez por contexto (chave = nome do método)"""
+    @functools.wraps(method)
+    def wrapper(self, ctx: GenerationContext) -> Any:
+        return ctx.memoize(method.__name__, lambda: method(self, ctx))
+    return wrapper
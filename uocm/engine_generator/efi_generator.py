@@ -2,24 +2,42 @@
 Gerador automático de EFI/OpenCore
 """
 
+import copy
 import json
 import plistlib
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
+from uocm.detector.cpu_classifier import SMBIOS_BY_MICROARCHITECTURE, classify_cpu
 from uocm.detector.models import HardwareInfo
+from uocm.engine_generator.context import GenerationContext, PhaseCallback, memoized
 from uocm.engine_generator.modes import GenerationMode
 from uocm.core.config import Config
-from uocm.db.database import get_db_session
-from uocm.db.models import SMBIOSProfile, HardwareProfile, KextInfo, SSDTTemplate
+from uocm.db.database import get_db_read_session
+from uocm.db.recommendations import RecommendationIndex, get_recommendation_index
+from uocm.kext_manager.store import ContentStore
 
 
 class EFIGenerator:
     """Gerador automático de EFI baseado em hardware detectado"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        base_template: Optional[Dict[str, Any]] = None,
+        kext_paths: Optional[Dict[str, str]] = None,
+        store: Optional[ContentStore] = None,
+    ):
+        """
+        Args:
+            base_template: Template base já carregado (compartilhado em lote)
+            kext_paths: Mapa nome do kext -> local_path já consultado no banco
+            store: Store de kexts/drivers (padrão: data/store)
+        """
         self.templates_path = Config.get_templates_path()
+        self.store = store or ContentStore()
+        self._base_template = base_template
+        self._kext_paths = kext_paths
     
     def generate_efi(
         self,
@@ -27,6 +45,7 @@ class EFIGenerator:
         mode: GenerationMode = GenerationMode.STANDARD,
         output_path: Optional[Path] = None,
         smbios_override: Optional[str] = None,
+        progress_callback: Optional[PhaseCallback] = None,
     ) -> Path:
         """
         Gera uma estrutura EFI completa baseada no hardware detectado
@@ -36,6 +55,7 @@ class EFIGenerator:
             mode: Modo de geração (conservative/standard/aggressive)
             output_path: Caminho de saída (opcional)
             smbios_override: SMBIOS manual para usar (opcional)
+            progress_callback: Chamado ao fim de cada fase com (fase, segundos)
         
         Returns:
             Caminho para o EFI gerado
@@ -51,38 +71,62 @@ class EFIGenerator:
         for subdir in ["ACPI", "Kexts", "Drivers", "Tools", "Resources"]:
             (oc_path / subdir).mkdir(parents=True, exist_ok=True)
         
-        # Gerar config.plist
-        config_plist = self._generate_config_plist(hardware, mode, smbios_override)
-        config_path = oc_path / "config.plist"
-        with open(config_path, "wb") as f:
-            plistlib.dump(config_plist, f)
-        
-        # Copiar kexts necessários
-        kexts = self._get_recommended_kexts(hardware, mode)
-        self._install_kexts(kexts, oc_path / "Kexts")
-        
-        # Copiar drivers necessários
-        drivers = self._get_recommended_drivers(hardware, mode)
-        self._install_drivers(drivers, oc_path / "Drivers")
-        
-        # Gerar SSDTs necessários
-        ssdts = self._get_recommended_ssdts(hardware, mode)
-        self._generate_ssdts(ssdts, oc_path / "ACPI", hardware)
+        # Uma única sessão (somente leitura) do banco para toda a geração
+        session = get_db_read_session()
+        try:
+            ctx = GenerationContext(
+                hardware=hardware,
+                mode=mode,
+                session=session,
+                smbios_override=smbios_override,
+                progress_callback=progress_callback,
+            )
+            
+            # Resolver todas as recomendações uma única vez
+            with ctx.phase("recommendations"):
+                self._resolve_recommendations(ctx)
+            
+            # Gerar config.plist
+            with ctx.phase("config_plist"):
+                config_plist = self._generate_config_plist(ctx)
+                config_path = oc_path / "config.plist"
+                with open(config_path, "wb") as f:
+                    plistlib.dump(config_plist, f)
+            
+            # Copiar kexts necessários
+            with ctx.phase("kexts"):
+                self._install_kexts(ctx, oc_path / "Kexts")
+            
+            # Copiar drivers necessários
+            with ctx.phase("drivers"):
+                self._install_drivers(self._get_recommended_drivers(ctx), oc_path / "Drivers")
+            
+            # Gerar SSDTs necessários
+            with ctx.phase("ssdts"):
+                self._generate_ssdts(self._get_recommended_ssdts(ctx), oc_path / "ACPI", hardware)
+        finally:
+            session.close()
         
         return output_path
     
-    def _generate_config_plist(
-        self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
-        smbios_override: Optional[str],
-    ) -> Dict[str, Any]:
+    def _resolve_recommendations(self, ctx: GenerationContext) -> None:
+        """Calcula (e memoiza no contexto) SMBIOS, kexts, drivers, SSDTs e quirks"""
+        self._determine_smbios(ctx)
+        self._get_recommended_kexts(ctx)
+        self._get_recommended_drivers(ctx)
+        self._get_recommended_ssdts(ctx)
+        self._get_acpi_quirks(ctx)
+        self._get_boot_quirks(ctx)
+        self._get_kernel_quirks(ctx)
+        self._get_uefi_quirks(ctx)
+    
+    def _generate_config_plist(self, ctx: GenerationContext) -> Dict[str, Any]:
         """Gera o config.plist baseado no hardware"""
         # Carregar template base
         base_template = self._load_base_template()
         
         # Determinar SMBIOS
-        smbios = self._determine_smbios(hardware, smbios_override)
+        smbios = self._determine_smbios(ctx)
         
         # Configurar SMBIOS
         base_template["PlatformInfo"]["Generic"] = {
@@ -95,33 +139,42 @@ class EFIGenerator:
         }
         
         # Configurar ACPI
-        base_template["ACPI"]["Add"] = self._get_acpi_add_entries(hardware, mode)
-        base_template["ACPI"]["Patch"] = self._get_acpi_patches(hardware, mode)
-        base_template["ACPI"]["Quirks"] = self._get_acpi_quirks(hardware, mode)
+        base_template["ACPI"]["Add"] = self._get_acpi_add_entries(ctx)
+        base_template["ACPI"]["Patch"] = self._get_acpi_patches(ctx)
+        base_template["ACPI"]["Quirks"] = self._get_acpi_quirks(ctx)
         
         # Configurar Boot
-        base_template["Boot"]["Quirks"] = self._get_boot_quirks(hardware, mode)
+        base_template["Boot"]["Quirks"] = self._get_boot_quirks(ctx)
         
         # Configurar Kernel
-        base_template["Kernel"]["Add"] = self._get_kernel_add_entries(hardware, mode)
-        base_template["Kernel"]["Quirks"] = self._get_kernel_quirks(hardware, mode)
+        base_template["Kernel"]["Add"] = self._get_kernel_add_entries(ctx)
+        base_template["Kernel"]["Quirks"] = self._get_kernel_quirks(ctx)
         
         # Configurar UEFI
-        base_template["UEFI"]["Drivers"] = self._get_uefi_drivers(hardware, mode)
-        base_template["UEFI"]["Quirks"] = self._get_uefi_quirks(hardware, mode)
+        base_template["UEFI"]["Drivers"] = self._get_uefi_drivers(ctx)
+        base_template["UEFI"]["Quirks"] = self._get_uefi_quirks(ctx)
         
         return base_template
     
     def _load_base_template(self) -> Dict[str, Any]:
-        """Carrega template base do config.plist"""
-        template_path = self.templates_path / "config_base.plist"
-        
-        if template_path.exists():
-            with open(template_path, "rb") as f:
-                return plistlib.load(f)
+        """Carrega template base do config.plist (lido uma vez por instância)"""
+        if self._base_template is None:
+            template_path = self.templates_path / "config_base.plist"
+            
+            if template_path.exists():
+                with open(template_path, "rb") as f:
+                    self._base_template = plistlib.load(f)
+            else:
+                # Template mínimo se não existir arquivo
+                self._base_template = self._get_minimal_config()
         
-        # Template mínimo se não existir arquivo
-        return self._get_minimal_config()
+        return copy.deepcopy(self._base_template)
+    
+    def load_kext_paths(self) -> Dict[str, str]:
+        """Carrega o mapa nome -> local_path de todos os kexts baixados (do índice em memória)"""
+        if self._kext_paths is None:
+            self._kext_paths = dict(get_recommendation_index().kext_paths)
+        return self._kext_paths
     
     def _get_minimal_config(self) -> Dict[str, Any]:
         """Retorna configuração mínima válida do OpenCore"""
@@ -198,119 +251,108 @@ class EFIGenerator:
             },
         }
     
-    def _determine_smbios(
-        self,
-        hardware: HardwareInfo,
-        smbios_override: Optional[str],
-    ) -> Dict[str, str]:
+    @memoized
+    def _recommendations(self, ctx: GenerationContext) -> RecommendationIndex:
+        """Índice em memória do banco (recarregado apenas se o banco mudou)"""
+        return get_recommendation_index(ctx.session)
+    
+    @memoized
+    def _determine_smbios(self, ctx: GenerationContext) -> Dict[str, str]:
         """Determina o SMBIOS recomendado baseado no hardware"""
-        session = get_db_session()
-        try:
-            if smbios_override:
-                profile = session.query(SMBIOSProfile).filter(
-                    SMBIOSProfile.name == smbios_override
-                ).first()
-                if profile:
-                    return {
-                        "product_name": profile.product_name,
-                        "serial_prefix": profile.serial_number_prefix or "",
-                    }
-            
-            # Buscar perfil de hardware no banco
-            profile = session.query(HardwareProfile).filter(
-                HardwareProfile.cpu_model.like(f"%{hardware.cpu.model}%")
-            ).first()
-            
-            if profile and profile.recommended_smbios_id:
-                smbios = session.query(SMBIOSProfile).filter(
-                    SMBIOSProfile.id == profile.recommended_smbios_id
-                ).first()
-                if smbios:
-                    return {
-                        "product_name": smbios.product_name,
-                        "serial_prefix": smbios.serial_number_prefix or "",
-                    }
-            
-            # Fallback: recomendar baseado em CPU
-            if hardware.cpu.vendor == "Intel":
-                if "Coffee Lake" in (hardware.cpu.microarchitecture or ""):
-                    return {"product_name": "MacBookPro15,1", "serial_prefix": "C02"}
-                elif "Comet Lake" in (hardware.cpu.microarchitecture or ""):
-                    return {"product_name": "iMac20,1", "serial_prefix": "C02"}
-                elif "Alder Lake" in (hardware.cpu.microarchitecture or ""):
-                    return {"product_name": "Mac14,2", "serial_prefix": "C02"}
-            
-            # Default seguro
-            return {"product_name": "iMacPro1,1", "serial_prefix": "C02"}
-        finally:
-            session.close()
+        index = self._recommendations(ctx)
+        hardware = ctx.hardware
+        
+        if ctx.smbios_override:
+            profile = index.smbios.get(ctx.smbios_override)
+            if profile:
+                return {
+                    "product_name": profile.product_name,
+                    "serial_prefix": profile.serial_prefix,
+                }
+        
+        # Perfil de hardware cadastrado para a CPU
+        profile = index.hardware_for_cpu(hardware.cpu.model)
+        if profile and profile.smbios:
+            return {
+                "product_name": profile.smbios.product_name,
+                "serial_prefix": profile.smbios.serial_prefix,
+            }
+        
+        # Fallback: tabela de CPUs (modelo) ou microarquitetura informada
+        cpu_class = classify_cpu(hardware.cpu.model)
+        if cpu_class is not None:
+            return {"product_name": cpu_class.smbios, "serial_prefix": "C02"}
+        smbios = SMBIOS_BY_MICROARCHITECTURE.get(hardware.cpu.microarchitecture or "")
+        if smbios:
+            return {"product_name": smbios, "serial_prefix": "C02"}
+        
+        # Default seguro
+        return {"product_name": "iMacPro1,1", "serial_prefix": "C02"}
     
-    def _get_recommended_kexts(
-        self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
-    ) -> List[str]:
+    @memoized
+    def _get_recommended_kexts(self, ctx: GenerationContext) -> List[str]:
         """Retorna lista de kexts recomendados"""
-        session = get_db_session()
-        try:
-            kexts = []
-            
-            # Kexts essenciais sempre
-            kexts.extend(["Lilu", "VirtualSMC", "WhateverGreen"])
-            
-            # Kexts baseados em GPU
-            if hardware.gpu:
-                if hardware.gpu.vendor == "AMD":
-                    kexts.append("WhateverGreen")
-                elif hardware.gpu.vendor == "NVIDIA":
-                    # NVIDIA não suportado em versões recentes
-                    pass
-            
-            # Kexts de áudio
-            if hardware.audio:
-                kexts.append("AppleALC")
-            
-            # Kexts de rede
-            if hardware.network:
-                if hardware.network.wifi_model:
-                    # Detectar tipo de Wi-Fi e adicionar kext apropriado
-                    if "Intel" in (hardware.network.wifi_model or ""):
-                        kexts.append("AirportItlwm")
-                    elif "Broadcom" in (hardware.network.wifi_model or ""):
-                        kexts.append("AirportBrcmFixup")
-            
-            # Kexts baseados em CPU
-            if hardware.cpu.vendor == "Intel":
-                if "Coffee Lake" in (hardware.cpu.microarchitecture or ""):
-                    kexts.append("CPUFriend")
-            
-            # Modo agressivo adiciona mais kexts
-            if mode == GenerationMode.AGGRESSIVE:
-                kexts.extend(["USBInjectAll", "VoodooI2C"])
-            
-            return kexts
-        finally:
-            session.close()
+        hardware = ctx.hardware
+        kexts = []
+        
+        # Kexts essenciais sempre
+        kexts.extend(["Lilu", "VirtualSMC", "WhateverGreen"])
+        
+        # Kexts baseados em GPU
+        if hardware.gpu:
+            if hardware.gpu.vendor == "AMD":
+                kexts.append("WhateverGreen")
+            elif hardware.gpu.vendor == "NVIDIA":
+                # NVIDIA não suportado em versões recentes
+                pass
+        
+        # Kexts de áudio
+        if hardware.audio:
+            kexts.append("AppleALC")
+        
+        # Kexts de rede
+        if hardware.network:
+            if hardware.network.wifi_model:
+                # Detectar tipo de Wi-Fi e adicionar kext apropriado
+                if "Intel" in (hardware.network.wifi_model or ""):
+                    kexts.append("AirportItlwm")
+                elif "Broadcom" in (hardware.network.wifi_model or ""):
+                    kexts.append("AirportBrcmFixup")
+        
+        # Kexts baseados em CPU
+        if hardware.cpu.vendor == "Intel":
+            if "Coffee Lake" in (hardware.cpu.microarchitecture or ""):
+                kexts.append("CPUFriend")
+        
+        # Kexts cadastrados no banco para a CPU e para os dispositivos PCI
+        index = self._recommendations(ctx)
+        profile = index.hardware_for_cpu(hardware.cpu.model)
+        extra = list(profile.kexts) if profile else []
+        for device in (hardware.gpu, hardware.audio):
+            if device is not None:
+                extra.extend(index.kexts_for_device(device.vendor_id, device.device_id))
+        kexts.extend(name for name in dict.fromkeys(extra) if name not in kexts)
+        
+        # Modo agressivo adiciona mais kexts
+        if ctx.mode == GenerationMode.AGGRESSIVE:
+            kexts.extend(["USBInjectAll", "VoodooI2C"])
+        
+        return kexts
     
-    def _get_recommended_drivers(
-        self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
-    ) -> List[str]:
+    @memoized
+    def _get_recommended_drivers(self, ctx: GenerationContext) -> List[str]:
         """Retorna lista de drivers UEFI recomendados"""
         drivers = ["OpenRuntime.efi", "OpenCanopy.efi"]
         
-        if mode != GenerationMode.CONSERVATIVE:
+        if ctx.mode != GenerationMode.CONSERVATIVE:
             drivers.append("HfsPlus.efi")
         
         return drivers
     
-    def _get_recommended_ssdts(
-        self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
-    ) -> List[str]:
+    @memoized
+    def _get_recommended_ssdts(self, ctx: GenerationContext) -> List[str]:
         """Retorna lista de SSDTs recomendados"""
+        hardware = ctx.hardware
         ssdts = []
         
         if hardware.cpu.vendor == "Intel":
@@ -318,37 +360,35 @@ class EFIGenerator:
             if "Coffee Lake" in (hardware.cpu.microarchitecture or ""):
                 ssdts.append("SSDT-PMC")
         
-        if mode != GenerationMode.CONSERVATIVE:
+        if ctx.mode != GenerationMode.CONSERVATIVE:
             ssdts.append("SSDT-USB-Reset")
         
         return ssdts
     
-    def _install_kexts(self, kext_names: List[str], kexts_dir: Path) -> None:
-        """Instala kexts no diretório"""
-        session = get_db_session()
-        try:
-            for kext_name in kext_names:
-                kext = session.query(KextInfo).filter(
-                    KextInfo.name == kext_name
-                ).first()
-                
-                if kext and kext.local_path:
-                    kext_path = Path(kext.local_path)
-                    if kext_path.exists():
-                        # Copiar kext
-                        import shutil
-                        dest = kexts_dir / kext_path.name
-                        if kext_path.is_dir():
-                            shutil.copytree(kext_path, dest, dirs_exist_ok=True)
-                        else:
-                            shutil.copy2(kext_path, dest)
-        finally:
-            session.close()
+    def _install_kexts(self, ctx: GenerationContext, kexts_dir: Path) -> None:
+        """Instala kexts no diretório a partir do store (reflink/hardlink/cópia)"""
+        kext_names = self._get_recommended_kexts(ctx)
+        missing = [name for name in kext_names if self.store.resolve(f"kexts/{name}") is None]
+        
+        if missing:
+            if self._kext_paths is not None:
+                kext_paths = self._kext_paths
+            else:
+                kext_paths = self._recommendations(ctx).kext_paths
+            
+            # Importar no store kexts baixados antes de existir o store
+            for kext_name in missing:
+                local_path = kext_paths.get(kext_name)
+                if local_path and Path(local_path).is_dir():
+                    self.store.add_tree(Path(local_path), ref=f"kexts/{kext_name}")
+        
+        for kext_name in kext_names:
+            self.store.install(f"kexts/{kext_name}", kexts_dir)
     
     def _install_drivers(self, driver_names: List[str], drivers_dir: Path) -> None:
-        """Instala drivers UEFI no diretório"""
-        # Implementar busca e cópia de drivers
-        pass
+        """Instala drivers UEFI no diretório a partir do store"""
+        for driver_name in driver_names:
+            self.store.install(f"drivers/{driver_name}", drivers_dir)
     
     def _generate_ssdts(
         self,
@@ -362,12 +402,11 @@ class EFIGenerator:
     
     def _get_acpi_add_entries(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> List[Dict[str, Any]]:
         """Retorna entradas ACPI Add"""
         entries = []
-        ssdts = self._get_recommended_ssdts(hardware, mode)
+        ssdts = self._get_recommended_ssdts(ctx)
         
         for ssdt in ssdts:
             entries.append({
@@ -380,16 +419,15 @@ class EFIGenerator:
     
     def _get_acpi_patches(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> List[Dict[str, Any]]:
         """Retorna patches ACPI"""
         return []
     
+    @memoized
     def _get_acpi_quirks(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> Dict[str, bool]:
         """Retorna quirks ACPI"""
         return {
@@ -400,10 +438,10 @@ class EFIGenerator:
             "ResetLogoStatus": False,
         }
     
+    @memoized
     def _get_boot_quirks(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> Dict[str, bool]:
         """Retorna quirks de boot"""
         return {
@@ -429,12 +467,11 @@ class EFIGenerator:
     
     def _get_kernel_add_entries(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> List[Dict[str, Any]]:
         """Retorna entradas Kernel Add"""
         entries = []
-        kexts = self._get_recommended_kexts(hardware, mode)
+        kexts = self._get_recommended_kexts(ctx)
         
         for kext in kexts:
             entries.append({
@@ -450,10 +487,10 @@ class EFIGenerator:
         
         return entries
     
+    @memoized
     def _get_kernel_quirks(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> Dict[str, bool]:
         """Retorna quirks de kernel"""
         return {
@@ -475,21 +512,20 @@ class EFIGenerator:
             "PowerTimeoutKernelPanic": True,
             "SetApfsTrimTimeout": 0,
             "ThirdPartyDrives": True,
-            "XhciPortLimit": mode != GenerationMode.CONSERVATIVE,
+            "XhciPortLimit": ctx.mode != GenerationMode.CONSERVATIVE,
         }
     
     def _get_uefi_drivers(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> List[str]:
         """Retorna lista de drivers UEFI"""
-        return self._get_recommended_drivers(hardware, mode)
+        return self._get_recommended_drivers(ctx)
     
+    @memoized
     def _get_uefi_quirks(
         self,
-        hardware: HardwareInfo,
-        mode: GenerationMode,
+        ctx: GenerationContext,
     ) -> Dict[str, bool]:
         """Retorna quirks UEFI"""
         return {
@@ -4,6 +4,7 @@ Módulo gerenciador de Kexts
 
 from uocm.kext_manager.manager import KextManager
 from uocm.kext_manager.github_client import GitHubClient
+from uocm.kext_manager.store import ContentStore
 
-__all__ = ["KextManager", "GitHubClient"]
+__all__ = ["KextManager", "GitHubClient", "ContentStore"]
 
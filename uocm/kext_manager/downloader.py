@@ -0,0 +1,223 @@
+"""
+Downloads em streaming, retomáveis, com verificação de SHA-256
+
+O arquivo é gravado em <destino>.part em blocos enquanto o SHA-256 é
+calculado. Se a conexão cair, a próxima tentativa (ou uma nova chamada)
+retoma de onde parou com um cabeçalho Range; o hash dos bytes já gravados
+é recalculado a partir do disco. Só após a verificação o .part é renomeado
+para o destino.
+
+O validador da primeira resposta (ETag forte ou Last-Modified) fica em
+<destino>.part.validator e vai no If-Range da retomada: se o arquivo mudou
+no servidor, a resposta é 200 com o arquivo novo inteiro, em vez de um
+trecho emendado no .part do arquivo antigo. Sem validador, não há retomada.
+"""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import httpx
+
+# Bloco de leitura/gravação (1 MB) / Read/write chunk size (1 MB)
+CHUNK_SIZE = 1024 * 1024
+
+# Callback de progresso: (bytes recebidos, total ou None se desconhecido)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class ChecksumMismatchError(ValueError):
+    """SHA-256 do arquivo baixado difere do esperado"""
+
+
+def _validator_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + ".validator")
+
+
+def partial_validator(part_path: Path) -> Optional[str]:
+    """Validador (If-Range) do .part existente, ou None se não houver como retomar"""
+    if not part_path.exists():
+        return None
+    try:
+        return _validator_path(part_path).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def store_partial_validator(part_path: Path, response: httpx.Response) -> None:
+    """Guarda o validador da resposta que inicia um novo .part"""
+    etag = response.headers.get("ETag")
+    # If-Range só aceita ETag forte
+    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    path = _validator_path(part_path)
+    if validator:
+        path.write_text(validator, encoding="utf-8")
+    else:
+        path.unlink(missing_ok=True)
+
+
+def remove_partial_validator(part_path: Path) -> None:
+    _validator_path(part_path).unlink(missing_ok=True)
+
+
+@dataclass
+class DownloadRequest:
+    """Item da fila de downloads"""
+    url: str
+    dest: Path
+    sha256: Optional[str] = None
+    progress: Optional[ProgressCallback] = None
+
+
+class Downloader:
+    """Downloader em streaming com retomada via HTTP Range"""
+
+    def __init__(
+        self,
+        client: Union[httpx.AsyncClient, Callable[[], httpx.AsyncClient]],
+        max_concurrency: int = 3,
+        retries: int = 3,
+        chunk_size: int = CHUNK_SIZE,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Args:
+            client: Cliente HTTP, ou função que o retorna (ex: cliente
+                compartilhado recriado sob demanda pelo GitHubClient)
+            max_concurrency: Máximo de downloads simultâneos
+            retries: Tentativas extras após falhas de conexão
+            retry_delay: Espera inicial entre tentativas (dobra a cada falha)
+        """
+        self._client = client
+        self.retries = retries
+        self.chunk_size = chunk_size
+        self.retry_delay = retry_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client() if callable(self._client) else self._client
+
+    async def download(
+        self,
+        url: str,
+        dest: Path,
+        sha256: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Path:
+        """
+        Baixa url para dest
+
+        Raises:
+            ChecksumMismatchError: Se sha256 for informado e não conferir
+            httpx.HTTPError: Se o download falhar após todas as tentativas
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path = dest.with_name(dest.name + ".part")
+
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    digest = await self._fetch(url, part_path, progress)
+                    break
+                except httpx.TransportError:
+                    # Conexão interrompida: o .part fica para ser retomado
+                    if attempt == self.retries:
+                        raise
+                    await asyncio.sleep(min(self.retry_delay * 2 ** attempt, 10))
+
+        remove_partial_validator(part_path)
+        if sha256 and digest != sha256.lower():
+            part_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(
+                f"SHA-256 inválido para {dest.name}: esperado {sha256.lower()}, obtido {digest}"
+            )
+
+        os.replace(part_path, dest)
+        return dest
+
+    async def download_many(
+        self,
+        requests: Iterable[DownloadRequest],
+    ) -> Dict[Path, Union[Path, BaseException]]:
+        """
+        Baixa vários arquivos em paralelo (limitado por max_concurrency)
+
+        Returns:
+            Mapa destino -> caminho baixado ou exceção do item que falhou
+        """
+        requests = list(requests)
+        results = await asyncio.gather(
+            *(self.download(r.url, r.dest, r.sha256, r.progress) for r in requests),
+            return_exceptions=True,
+        )
+        return {Path(r.dest): result for r, result in zip(requests, results)}
+
+    async def _fetch(self, url: str, part_path: Path, progress: Optional[ProgressCallback]) -> str:
+        """Uma tentativa de download, retomando o .part existente. Retorna o SHA-256"""
+        hasher = hashlib.sha256()
+        offset = 0
+        validator = partial_validator(part_path)
+        if validator:
+            offset = self._hash_existing(part_path, hasher)
+
+        headers = {"Accept": "application/octet-stream"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        async with self.client.stream(
+            "GET", url, headers=headers, follow_redirects=True, timeout=60.0
+        ) as response:
+            if response.status_code == 416 and offset:
+                # .part já está completo (ou é inválido: a verificação decide)
+                return hasher.hexdigest()
+
+            response.raise_for_status()
+
+            if offset and response.status_code != 206:
+                # Servidor ignorou o Range ou o arquivo mudou (If-Range): recomeçar do zero
+                hasher = hashlib.sha256()
+                offset = 0
+            if not offset:
+                store_partial_validator(part_path, response)
+
+            total = self._total_size(response, offset)
+            received = offset
+            with open(part_path, "ab" if offset else "wb") as f:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    received += len(chunk)
+                    if progress:
+                        progress(received, total)
+
+        return hasher.hexdigest()
+
+    def _hash_existing(self, part_path: Path, hasher) -> int:
+        """Alimenta o hasher com os bytes já baixados e retorna o tamanho"""
+        size = 0
+        with open(part_path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+        return size
+
+    @staticmethod
+    def _total_size(response: httpx.Response, offset: int) -> Optional[int]:
+        content_range = response.headers.get("Content-Range")
+        if content_range and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                return int(total)
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            return int(length) + (offset if response.status_code == 206 else 0)
+        return None
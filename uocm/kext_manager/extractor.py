@@ -0,0 +1,133 @@
+"""
+Extração seletiva de bundles .kext de pacotes ZIP
+
+Lê apenas o diretório central do ZIP para localizar os bundles .kext de
+Release (ignorando Debug, .dSYM, __MACOSX e documentação) e grava somente
+os membros desses bundles diretamente no ContentStore, em uma passada.
+Pacotes com vários kexts (VirtualSMC, VoodooI2C, ...) têm todos os bundles
+registrados.
+"""
+
+import posixpath
+import stat
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional
+
+from uocm.kext_manager.store import ContentStore
+
+# Pastas ignoradas em qualquer nível / Folders skipped at any level
+_SKIPPED_PARTS = ("__MACOSX",)
+_SKIPPED_SUFFIXES = (".dSYM",)
+
+
+@dataclass
+class KextBundle:
+    """Bundle .kext encontrado em um pacote ZIP"""
+    name: str  # ex: "SMCProcessor.kext"
+    prefix: str  # caminho do bundle dentro do ZIP
+    debug: bool = False
+    members: List[zipfile.ZipInfo] = field(default_factory=list, repr=False)
+
+
+def _link_inside_bundle(rel_path: str, target: str) -> bool:
+    """Symlink relativo que, normalizado, continua dentro do bundle"""
+    if not target or target.startswith("/") or "\\" in target or "\x00" in target:
+        return False
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(rel_path), target))
+    return resolved != ".." and not resolved.startswith("../")
+
+
+def _is_debug(parts: Iterable[str]) -> bool:
+    return any(part.lower() == "debug" or "-debug" in part.lower() for part in parts)
+
+
+def find_kext_bundles(archive: zipfile.ZipFile) -> List[KextBundle]:
+    """
+    Lista os bundles .kext do ZIP pelo diretório central (sem extrair nada)
+
+    Plugins em Contents/PlugIns fazem parte do bundle pai. Quando o mesmo
+    bundle existe em Release e Debug, apenas o de Release é retornado.
+    """
+    bundles: Dict[str, KextBundle] = {}
+    for info in archive.infolist():
+        parts = PurePosixPath(info.filename).parts
+        if any(p in _SKIPPED_PARTS or p.endswith(_SKIPPED_SUFFIXES) for p in parts):
+            continue
+
+        # Bundle de nível mais alto no caminho
+        for i, part in enumerate(parts):
+            if part.endswith(".kext"):
+                prefix = "/".join(parts[:i + 1])
+                bundle = bundles.get(prefix)
+                if bundle is None:
+                    bundle = bundles[prefix] = KextBundle(
+                        name=part, prefix=prefix, debug=_is_debug(parts[:i + 1])
+                    )
+                if not info.is_dir():
+                    bundle.members.append(info)
+                break
+
+    # Preferir Release quando o mesmo bundle existe nas duas variantes
+    selected: Dict[str, KextBundle] = {}
+    for bundle in sorted(bundles.values(), key=lambda b: (b.debug, b.prefix.count("/"), b.prefix)):
+        selected.setdefault(bundle.name, bundle)
+    return sorted(
+        (b for b in selected.values() if b.members),
+        key=lambda b: b.prefix,
+    )
+
+
+def extract_kexts(
+    zip_path: Path,
+    store: ContentStore,
+    names: Optional[Iterable[str]] = None,
+    include_debug: bool = False,
+) -> Dict[str, str]:
+    """
+    Extrai bundles .kext do ZIP direto para o store
+
+    Args:
+        zip_path: Pacote ZIP baixado
+        store: Store de destino
+        names: Bundles desejados (ex: ["VirtualSMC.kext"]); None = todos
+        include_debug: Aceitar bundles de Debug quando não houver Release
+
+    Returns:
+        Mapa nome do bundle -> id da árvore no store, para cada bundle extraído
+    """
+    wanted = {n if n.endswith(".kext") else f"{n}.kext" for n in names} if names else None
+    trees: Dict[str, str] = {}
+
+    with zipfile.ZipFile(zip_path, "r") as archive:
+        for bundle in find_kext_bundles(archive):
+            if bundle.debug and not include_debug:
+                continue
+            if wanted is not None and bundle.name not in wanted:
+                continue
+
+            entries: List[Dict[str, Any]] = []
+            for info in bundle.members:
+                rel_path = info.filename[len(bundle.prefix) + 1:]
+                if not rel_path or ".." in PurePosixPath(rel_path).parts:
+                    continue
+                mode = info.external_attr >> 16
+                if stat.S_ISLNK(mode):
+                    target = archive.read(info).decode("utf-8", errors="replace")
+                    # Links absolutos ou que saem do bundle apontariam para fora do EFI
+                    if _link_inside_bundle(rel_path, target):
+                        entries.append({"path": rel_path, "link": target})
+                    continue
+                executable = bool(mode & 0o111)
+                with archive.open(info) as member:
+                    digest = store.add_stream(member, executable=executable)
+                entries.append({
+                    "path": rel_path,
+                    "sha256": digest,
+                    "mode": 0o755 if executable else 0o644,
+                })
+
+            trees[bundle.name] = store.add_tree_entries(bundle.name, entries)
+
+    return trees
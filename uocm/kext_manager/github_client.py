@@ -2,22 +2,156 @@
 Cliente GitHub para buscar informações de kexts
 """
 
+import asyncio
+import time
 import httpx
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 from datetime import datetime
 
+from uocm.core.config import Config
+from uocm.kext_manager.downloader import Downloader
+from uocm.kext_manager.http_cache import HTTPCache
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # httpx só negocia HTTP/2 com o pacote h2 (httpx[http2])
+    HTTP2_AVAILABLE = False
+
 
 class GitHubClient:
     """Cliente para API do GitHub"""
-    
+
     BASE_URL = "https://api.github.com"
-    
-    def __init__(self, token: Optional[str] = None):
+
+    # Esperas por rate limit acima deste valor (segundos) não são feitas
+    MAX_RATE_LIMIT_WAIT = 60.0
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_concurrency: int = 6,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[HTTPCache] = None,
+        offline: bool = False,
+    ):
+        """
+        Args:
+            token: Token da API (opcional, aumenta o rate limit)
+            max_concurrency: Máximo de requisições simultâneas
+            base_url: URL da API (ex: servidor local de testes)
+            transport: Transporte httpx alternativo (ex: httpx.MockTransport)
+            cache: Cache HTTP de respostas (padrão: data/cache/http)
+            offline: Responder apenas a partir do cache, sem acessar a rede
+        """
         self.token = token
-        self.headers = {}
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.headers = {"Accept": "application/vnd.github+json"}
         if token:
             self.headers["Authorization"] = f"token {token}"
-    
+
+        self.cache = cache or HTTPCache(Config.get_data_path() / "cache" / "http")
+        self.offline = offline
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Estado do rate limit (cabeçalhos X-RateLimit-*)
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartilhado (pool de conexões, HTTP/2 se disponível)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE and self._transport is None,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                timeout=30.0,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP compartilhado"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _api_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        GET na API respeitando concorrência máxima e rate limit
+
+        Usa requisições condicionais (ETag / Last-Modified): um 304 é
+        respondido com o corpo em cache e não consome a cota da API.
+        """
+        url = str(httpx.URL(f"{self.base_url}{path}", params=params))
+
+        if self.offline:
+            cached = self.cache.cached_response(url)
+            self.cache.record(hit=cached is not None)
+            return cached or httpx.Response(504, request=httpx.Request("GET", url))
+
+        headers = {**self.headers, **self.cache.conditional_headers(url)}
+        async with self._semaphore:
+            for attempt in range(2):
+                await self._wait_for_rate_limit()
+                response = await self.client.get(url, headers=headers)
+                self._update_rate_limit(response)
+
+                delay = self._retry_delay(response)
+                if delay is None or attempt == 1 or delay > self.MAX_RATE_LIMIT_WAIT:
+                    break
+                await asyncio.sleep(delay)
+
+        if response.status_code == 304:
+            cached = self.cache.cached_response(url, response.request)
+            if cached is not None:
+                self.cache.record(hit=True)
+                return cached
+        self.cache.record(hit=False)
+        self.cache.store(url, response)
+        return response
+
+    def _update_rate_limit(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.rate_limit_reset = float(reset)
+
+    def _retry_delay(self, response: httpx.Response) -> Optional[float]:
+        """Segundos até poder repetir uma resposta de rate limit (None se não for)"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        if self.rate_limit_remaining == 0 and self.rate_limit_reset is not None:
+            return max(0.0, self.rate_limit_reset - time.time())
+        return None
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Aguarda o reset se a cota acabou (até MAX_RATE_LIMIT_WAIT)"""
+        if self.rate_limit_remaining != 0 or self.rate_limit_reset is None:
+            return
+        delay = self.rate_limit_reset - time.time()
+        if 0 < delay <= self.MAX_RATE_LIMIT_WAIT:
+            await asyncio.sleep(delay)
+
     async def get_release(
         self,
         owner: str,
@@ -25,19 +159,34 @@ class GitHubClient:
         tag: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """Busca release de um repositório"""
-        async with httpx.AsyncClient() as client:
-            if tag:
-                url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases/tags/{tag}"
-            else:
-                url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases/latest"
-            
-            try:
-                response = await client.get(url, headers=self.headers, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception:
-                return None
-    
+        if tag:
+            path = f"/repos/{owner}/{repo}/releases/tags/{tag}"
+        else:
+            path = f"/repos/{owner}/{repo}/releases/latest"
+
+        try:
+            response = await self._api_get(path)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            return None
+
+    async def get_latest_releases(
+        self,
+        repos: Iterable[Tuple[str, str]],
+    ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Busca a última release de vários repositórios em paralelo
+
+        Returns:
+            Mapa (owner, repo) -> release (None em caso de erro), na ordem de repos
+        """
+        repos = list(repos)
+        releases = await asyncio.gather(
+            *(self.get_release(owner, repo) for owner, repo in repos)
+        )
+        return dict(zip(repos, releases))
+
     async def get_releases(
         self,
         owner: str,
@@ -45,17 +194,15 @@ class GitHubClient:
         per_page: int = 30,
     ) -> List[Dict[str, Any]]:
         """Busca todas as releases de um repositório"""
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases"
-            params = {"per_page": per_page}
-            
-            try:
-                response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception:
-                return []
-    
+        params = {"per_page": per_page}
+
+        try:
+            response = await self._api_get(f"/repos/{owner}/{repo}/releases", params=params)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            return []
+
     async def download_asset(
         self,
         owner: str,
@@ -64,35 +211,18 @@ class GitHubClient:
         save_path: str,
     ) -> bool:
         """Faz download de um asset de release"""
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases/assets/{asset_id}"
-            
-            try:
-                # Obter URL de download
-                response = await client.get(url, headers=self.headers, timeout=30.0)
-                response.raise_for_status()
-                asset_info = response.json()
-                download_url = asset_info.get("browser_download_url")
-                
-                if not download_url:
-                    return False
-                
-                # Download do arquivo
-                download_response = await client.get(
-                    download_url,
-                    headers={"Accept": "application/octet-stream"},
-                    timeout=60.0,
-                    follow_redirects=True,
-                )
-                download_response.raise_for_status()
-                
-                # Salvar arquivo
-                from pathlib import Path
-                Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(save_path, "wb") as f:
-                    f.write(download_response.content)
-                
-                return True
-            except Exception:
+        try:
+            # Obter URL de download
+            response = await self._api_get(f"/repos/{owner}/{repo}/releases/assets/{asset_id}")
+            response.raise_for_status()
+            asset_info = response.json()
+            download_url = asset_info.get("browser_download_url")
+
+            if not download_url:
                 return False
 
+            # Download do arquivo (streaming, retomável)
+            await Downloader(self.client).download(download_url, Path(save_path))
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,121 @@
+"""
+Cache HTTP em disco para requisições condicionais (ETag / Last-Modified)
+
+Cada URL vira um par de arquivos em cache_dir: <sha256>.json com os
+validadores e cabeçalhos relevantes e <sha256>.body com o corpo da resposta.
+Respostas 304 Not Modified são atendidas pelo corpo em cache.
+
+Usado pelos clientes GitHub do uocm e do universal_oc_manager; o modo
+offline fica em cada cliente.
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Cabeçalhos guardados junto com o corpo
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class HTTPCache:
+    """Cache de respostas HTTP indexado por URL"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Cabeçalhos If-None-Match / If-Modified-Since para a URL"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def cached_response(self, url: str, request: Optional[httpx.Request] = None) -> Optional[httpx.Response]:
+        """Reconstrói a resposta em cache (status 200), ou None se não houver"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return None
+        try:
+            body = self._body_path(url).read_bytes()
+        except OSError:
+            return None
+        return httpx.Response(
+            200,
+            headers=meta.get("headers", {}),
+            content=body,
+            request=request or httpx.Request("GET", url),
+        )
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """Guarda uma resposta 200 que tenha ETag ou Last-Modified"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {k: response.headers[k] for k in _STORED_HEADERS if k in response.headers},
+            "stored_at": time.time(),
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Corpo antes dos metadados: metadados sem corpo nunca são lidos
+        self._atomic_write(self._body_path(url), response.content)
+        self._atomic_write(self._meta_path(url), json.dumps(meta).encode("utf-8"))
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera os contadores"""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.iterdir():
+                if path.suffix in (".json", ".body"):
+                    path.unlink(missing_ok=True)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(url), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, url: str) -> Path:
+        return self.cache_dir / f"{self._key(url)}.json"
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / f"{self._key(url)}.body"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
@@ -2,48 +2,53 @@
 Gerenciador de Kexts com download, atualização e instalação
 """
 
-import zipfile
 import shutil
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-import hashlib
+from typing import Callable, List, Optional, Dict, Any
 
-from uocm.db.database import get_db_session
+from uocm.db.database import get_db_read_session, get_db_session
 from uocm.db.models import KextInfo
+from uocm.kext_manager.downloader import Downloader, DownloadRequest, ProgressCallback
 from uocm.kext_manager.github_client import GitHubClient
+from uocm.kext_manager.extractor import extract_kexts
+from uocm.kext_manager.store import TREE, ContentStore
 from uocm.core.config import Config
+from uocm.core.hashing import hash_file
 
 
 class KextManager:
     """Gerenciador de kexts com integração GitHub"""
     
-    def __init__(self):
-        self.github = GitHubClient()
+    # Kexts principais do catálogo (owner, repo)
+    KEXT_REPOS = [
+        ("acidanthera", "Lilu"),
+        ("acidanthera", "VirtualSMC"),
+        ("acidanthera", "WhateverGreen"),
+        ("acidanthera", "AppleALC"),
+        ("acidanthera", "AirportBrcmFixup"),
+        ("OpenIntelWireless", "itlwm"),
+        ("OpenIntelWireless", "AirportItlwm"),
+        ("acidanthera", "CPUFriend"),
+        ("acidanthera", "HibernationFixup"),
+        ("acidanthera", "NVMeFix"),
+        ("acidanthera", "RestrictEvents"),
+        ("acidanthera", "VoodooI2C"),
+    ]
+    
+    def __init__(self, github: Optional[GitHubClient] = None):
+        self.github = github or GitHubClient()
         self.kexts_dir = Config.get_data_path() / "kexts"
         self.kexts_dir.mkdir(parents=True, exist_ok=True)
+        self.store = ContentStore()
+        self.downloader = Downloader(lambda: self.github.client)
     
     async def update_kext_catalog(self) -> bool:
-        """Atualiza catálogo de kexts do GitHub"""
+        """Atualiza catálogo de kexts do GitHub (releases buscadas em paralelo)"""
+        releases = await self.github.get_latest_releases(self.KEXT_REPOS)
+        
         session = get_db_session()
         try:
-            # Lista de kexts principais (Acidanthera)
-            kexts_repos = [
-                ("acidanthera", "Lilu"),
-                ("acidanthera", "VirtualSMC"),
-                ("acidanthera", "WhateverGreen"),
-                ("acidanthera", "AppleALC"),
-                ("acidanthera", "AirportBrcmFixup"),
-                ("OpenIntelWireless", "itlwm"),
-                ("OpenIntelWireless", "AirportItlwm"),
-                ("acidanthera", "CPUFriend"),
-                ("acidanthera", "HibernationFixup"),
-                ("acidanthera", "NVMeFix"),
-                ("acidanthera", "RestrictEvents"),
-                ("acidanthera", "VoodooI2C"),
-            ]
-            
-            for owner, repo in kexts_repos:
-                release = await self.github.get_release(owner, repo)
+            for (owner, repo), release in releases.items():
                 if release:
                     await self._update_kext_info(session, owner, repo, release)
             
@@ -84,57 +89,117 @@ class KextManager:
         
         session.add(kext)
     
-    async def download_kext(self, kext_name: str) -> Optional[Path]:
-        """Faz download de um kext"""
+    async def download_kext(
+        self,
+        kext_name: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[Path]:
+        """Faz download de um kext (streaming, retomável, com verificação de SHA-256)"""
+        results = await self.download_kexts(
+            [kext_name],
+            progress=(lambda name, received, total: progress(received, total)) if progress else None,
+        )
+        return results.get(kext_name)
+    
+    async def download_kexts(
+        self,
+        kext_names: List[str],
+        progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+    ) -> Dict[str, Optional[Path]]:
+        """
+        Faz download de vários kexts em paralelo
+        
+        Args:
+            kext_names: Nomes dos kexts no catálogo
+            progress: Callback (kext, bytes recebidos, total) chamado durante o download
+        
+        Returns:
+            Mapa nome -> caminho do .kext instalado (None se falhou)
+        """
+        results: Dict[str, Optional[Path]] = {name: None for name in kext_names}
+        # Sessão curta: nenhuma sessão fica aberta durante o download (a engine
+        # de escrita tem uma conexão só e a sessão é compartilhada pela thread)
+        session = get_db_read_session()
+        try:
+            kexts = [
+                (kext.name, kext.download_url, kext.checksum_sha256)
+                for kext in session.query(KextInfo).filter(KextInfo.name.in_(kext_names)).all()
+                if kext.download_url
+            ]
+        finally:
+            session.close()
+        
+        requests = [
+            DownloadRequest(
+                url=url,
+                dest=self.kexts_dir / f"{name}.zip",
+                sha256=sha256,
+                progress=(lambda received, total, name=name: progress(name, received, total))
+                if progress else None,
+            )
+            for name, url, sha256 in kexts
+        ]
+        downloaded = await self.downloader.download_many(requests)
+        zips = {
+            name: zip_path
+            for name, _, _ in kexts
+            if isinstance(zip_path := downloaded.get(self.kexts_dir / f"{name}.zip"), Path)
+        }
+        if not zips:
+            return results
+        
         session = get_db_session()
         try:
-            kext = session.query(KextInfo).filter(KextInfo.name == kext_name).first()
-            if not kext or not kext.download_url:
-                return None
-            
-            # Download
-            zip_path = self.kexts_dir / f"{kext_name}.zip"
-            
-            # Extrair do download_url
-            if "/" in kext.github_repo:
-                owner, repo = kext.github_repo.split("/", 1)
-                # Simplificado - assumir que download_url já está correto
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(kext.download_url, timeout=60.0, follow_redirects=True)
-                    response.raise_for_status()
-                    with open(zip_path, "wb") as f:
-                        f.write(response.content)
-            
-            # Extrair ZIP
-            extract_dir = self.kexts_dir / kext_name
-            extract_dir.mkdir(exist_ok=True)
+            for kext in session.query(KextInfo).filter(KextInfo.name.in_(zips)).all():
+                try:
+                    results[kext.name] = self._install_downloaded(kext, zips[kext.name])
+                except Exception:
+                    continue
             
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Encontrar .kext dentro do ZIP extraído
-            kext_file = None
-            for item in extract_dir.rglob("*.kext"):
-                kext_file = item
-                break
-            
-            if kext_file:
-                kext.local_path = str(kext_file)
-                kext.installed = True
-                kext.installed_version = kext.version
-                session.commit()
-                return kext_file
-            
-            return None
+            session.commit()
+            return results
         except Exception:
-            return None
+            session.rollback()
+            return results
         finally:
             session.close()
     
+    def _install_downloaded(self, kext: KextInfo, zip_path: Path) -> Optional[Path]:
+        """Extrai os .kext de Release do ZIP para o store e atualiza o registro"""
+        bundles = extract_kexts(zip_path, self.store)
+        if not bundles:
+            return None
+        
+        # Registrar todos os bundles do pacote (ex: VirtualSMC + SMCProcessor)
+        for bundle_name, tree_id in bundles.items():
+            self.store.set_ref(f"kexts/{Path(bundle_name).stem}", TREE, tree_id)
+        
+        primary = f"{kext.name}.kext" if f"{kext.name}.kext" in bundles else next(iter(bundles))
+        self.store.set_ref(f"kexts/{kext.name}", TREE, bundles[primary])
+        
+        # Cópia local navegável (links para o store)
+        extract_dir = self.kexts_dir / kext.name
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        for bundle_name in bundles:
+            self.store.install(f"kexts/{Path(bundle_name).stem}", extract_dir)
+        
+        kext_file = extract_dir / primary
+        kext.local_path = str(kext_file)
+        kext.installed = True
+        kext.installed_version = kext.version
+        return kext_file
+    
+    def import_drivers(self, drivers_dir: Path) -> List[str]:
+        """Importa drivers UEFI (.efi) de uma pasta para o store (ex: X64/EFI/OC/Drivers)"""
+        imported = []
+        for driver_file in sorted(drivers_dir.glob("*.efi")):
+            self.store.add_file(driver_file, ref=f"drivers/{driver_file.name}")
+            imported.append(driver_file.name)
+        return imported
+    
     def get_installed_kexts(self) -> List[KextInfo]:
         """Retorna lista de kexts instalados"""
-        session = get_db_session()
+        session = get_db_read_session()
         try:
             return session.query(KextInfo).filter(KextInfo.installed == True).all()
         finally:
@@ -142,7 +207,7 @@ class KextManager:
     
     def get_available_kexts(self) -> List[KextInfo]:
         """Retorna lista de todos os kexts disponíveis"""
-        session = get_db_session()
+        session = get_db_read_session()
         try:
             return session.query(KextInfo).all()
         finally:
@@ -162,9 +227,5 @@ class KextManager:
     
     def calculate_checksum(self, file_path: Path) -> str:
         """Calcula checksum SHA256 de um arquivo"""
-        sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return hash_file(file_path).sha256
 
@@ -0,0 +1,268 @@
+"""
+Store local endereçado por conteúdo para kexts e drivers
+
+Cada arquivo é guardado uma única vez em objects/ pelo seu SHA-256. Bundles
+(.kext) viram árvores: um manifesto JSON com caminho, hash e modo de cada
+arquivo, também identificado pelo SHA-256 do manifesto. Refs nomeadas
+(ex: 'kexts/Lilu', 'drivers/OpenRuntime.efi') apontam para um objeto ou
+árvore.
+
+Ao materializar em EFI/OC/Kexts ou EFI/OC/Drivers, cada arquivo é clonado
+(reflink em APFS/Btrfs/XFS), ou ligado por hardlink no mesmo volume, ou
+copiado quando o destino não suporta links (ex: FAT32 da partição EFI).
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from uocm.core.config import Config
+from uocm.core.hashing import CHUNK_SIZE, hash_file
+
+BLOB = "blob"
+TREE = "tree"
+
+# Erros que indicam que o volume de destino não suporta o tipo de link
+_LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK, errno.EACCES}
+if hasattr(errno, "EOPNOTSUPP"):
+    _LINK_UNSUPPORTED.add(errno.EOPNOTSUPP)
+
+# ioctl FICLONE do Linux (Btrfs, XFS)
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clona src em dst (copy-on-write). Retorna False se não for suportado"""
+    if sys.platform == "darwin":
+        libc_path = ctypes.util.find_library("c")
+        if not libc_path:
+            return False
+        libc = ctypes.CDLL(libc_path, use_errno=True)
+        if not hasattr(libc, "clonefile"):
+            return False
+        return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+    if sys.platform.startswith("linux"):
+        import fcntl
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return True
+        except OSError:
+            try:
+                dst.unlink()
+            except OSError:
+                pass
+            return False
+
+    return False
+
+
+class ContentStore:
+    """Store de kexts e drivers indexado por SHA-256"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else Config.get_data_path() / "store"
+        self.objects_path = self.root / "objects"
+        self.trees_path = self.root / "trees"
+        self.refs_path = self.root / "refs"
+        # Método de materialização que funcionou por volume de destino (st_dev)
+        self._methods: Dict[int, str] = {}
+        self._lock = Lock()
+        self.stats = {"reflink": 0, "hardlink": 0, "copy": 0}
+
+    def add_file(self, path: Path, ref: Optional[str] = None) -> str:
+        """Guarda um arquivo (se ainda não existir) e retorna seu SHA-256"""
+        digest = hash_file(Path(path)).sha256
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(path, tmp_path)
+            # Objetos são somente leitura: hardlinks compartilham o inode
+            os.chmod(tmp_path, 0o555 if os.access(path, os.X_OK) else 0o444)
+            os.replace(tmp_path, object_path)
+        if ref:
+            self.set_ref(ref, BLOB, digest)
+        return digest
+
+    def add_tree(self, bundle_path: Path, ref: Optional[str] = None) -> str:
+        """Guarda um bundle (diretório) e retorna o SHA-256 do seu manifesto"""
+        bundle_path = Path(bundle_path)
+        entries: List[Dict[str, Any]] = []
+        for dirpath, dirnames, filenames in os.walk(bundle_path):
+            dirnames.sort()
+            current = Path(dirpath)
+            for name in sorted(filenames) + [d for d in dirnames if (current / d).is_symlink()]:
+                file_path = current / name
+                rel_path = file_path.relative_to(bundle_path).as_posix()
+                if file_path.is_symlink():
+                    entries.append({"path": rel_path, "link": os.readlink(file_path)})
+                    continue
+                entries.append({
+                    "path": rel_path,
+                    "sha256": self.add_file(file_path),
+                    "mode": 0o755 if os.access(file_path, os.X_OK) else 0o644,
+                })
+            if not dirnames and not filenames and current != bundle_path:
+                entries.append({"path": current.relative_to(bundle_path).as_posix(), "dir": True})
+
+        return self.add_tree_entries(bundle_path.name, entries, ref)
+
+    def add_stream(self, stream: BinaryIO, executable: bool = False) -> str:
+        """Guarda o conteúdo de um stream (ex: membro de um ZIP) sem passar por arquivo intermediário"""
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.objects_path / f".{uuid.uuid4().hex}.tmp"
+        hasher = hashlib.sha256()
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            digest = hasher.hexdigest()
+            object_path = self._object_path(digest)
+            if object_path.exists():
+                return digest
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(tmp_path, 0o555 if executable else 0o444)
+            os.replace(tmp_path, object_path)
+            return digest
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def add_tree_entries(
+        self,
+        name: str,
+        entries: List[Dict[str, Any]],
+        ref: Optional[str] = None,
+    ) -> str:
+        """Grava o manifesto de um bundle a partir de entradas já guardadas"""
+        manifest = json.dumps(
+            {"name": name, "entries": sorted(entries, key=lambda e: e["path"])},
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        tree_id = hashlib.sha256(manifest).hexdigest()
+        tree_path = self.trees_path / f"{tree_id}.json"
+        if not tree_path.exists():
+            self.trees_path.mkdir(parents=True, exist_ok=True)
+            tmp_path = tree_path.with_name(f".{tree_id}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(manifest)
+            os.replace(tmp_path, tree_path)
+        if ref:
+            self.set_ref(ref, TREE, tree_id)
+        return tree_id
+
+    def set_ref(self, ref: str, kind: str, object_id: str) -> None:
+        """Aponta uma ref nomeada para um objeto ou árvore"""
+        ref_path = self._ref_path(ref)
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ref_path.with_name(f".{ref_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(f"{kind} {object_id}\n", encoding="utf-8")
+        os.replace(tmp_path, ref_path)
+
+    def resolve(self, ref: str) -> Optional[Tuple[str, str]]:
+        """Retorna (tipo, id) de uma ref, ou None se não existir ou estiver quebrada"""
+        try:
+            kind, object_id = self._ref_path(ref).read_text(encoding="utf-8").split()
+        except (OSError, ValueError):
+            return None
+        if kind == TREE and (self.trees_path / f"{object_id}.json").exists():
+            return kind, object_id
+        if kind == BLOB and self._object_path(object_id).exists():
+            return kind, object_id
+        return None
+
+    def materialize(self, kind: str, object_id: str, dest: Path) -> Path:
+        """Recria um objeto (arquivo) ou árvore (bundle) em dest"""
+        dest = Path(dest)
+        if kind == BLOB:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            self._place(self._object_path(object_id), dest, 0o644)
+            return dest
+
+        with open(self.trees_path / f"{object_id}.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        dest.mkdir(parents=True, exist_ok=True)
+        for entry in manifest["entries"]:
+            target = dest / entry["path"]
+            if entry.get("dir"):
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if "link" in entry:
+                if target.is_symlink() or target.exists():
+                    target.unlink()
+                os.symlink(entry["link"], target)
+                continue
+            self._place(self._object_path(entry["sha256"]), target, entry.get("mode", 0o644))
+        return dest
+
+    def install(self, ref: str, dest_dir: Path) -> Optional[Path]:
+        """
+        Materializa a ref dentro de dest_dir
+
+        Árvores usam o nome original do bundle; arquivos, o último componente
+        da ref (ex: 'drivers/OpenRuntime.efi' -> dest_dir/OpenRuntime.efi).
+
+        Returns:
+            Caminho criado, ou None se a ref não existir
+        """
+        resolved = self.resolve(ref)
+        if resolved is None:
+            return None
+        kind, object_id = resolved
+        if kind == TREE:
+            with open(self.trees_path / f"{object_id}.json", "r", encoding="utf-8") as f:
+                name = json.load(f)["name"]
+        else:
+            name = ref.rsplit("/", 1)[-1]
+        return self.materialize(kind, object_id, Path(dest_dir) / name)
+
+    def _place(self, source: Path, target: Path, mode: int) -> None:
+        """Cria target a partir de source: reflink, hardlink ou cópia"""
+        if target.is_symlink() or target.exists():
+            target.unlink()
+
+        device = os.stat(target.parent).st_dev
+        method = self._methods.get(device)
+
+        if method in (None, "reflink") and _reflink(source, target):
+            os.chmod(target, mode)
+            self._record(device, "reflink")
+            return
+
+        if method in (None, "reflink", "hardlink"):
+            try:
+                os.link(source, target)
+                self._record(device, "hardlink")
+                return
+            except OSError as e:
+                if e.errno not in _LINK_UNSUPPORTED:
+                    raise
+
+        shutil.copyfile(source, target)
+        os.chmod(target, mode)
+        self._record(device, "copy")
+
+    def _record(self, device: int, method: str) -> None:
+        with self._lock:
+            self._methods[device] = method
+            self.stats[method] += 1
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_path / digest[:2] / digest
+
+    def _ref_path(self, ref: str) -> Path:
+        parts = [part for part in ref.split("/") if part not in ("", ".", "..")]
+        return self.refs_path.joinpath(*parts)
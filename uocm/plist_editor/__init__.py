@@ -5,5 +5,6 @@ Módulo editor visual de config.plist
 from uocm.plist_editor.editor import PlistEditor
 from uocm.plist_editor.validator import PlistValidator
 from uocm.plist_editor.oc_snapshot import OCSnapshot
+from uocm.plist_editor.search import PlistSearchIndex, SearchMatch
 
-__all__ = ["PlistEditor", "PlistValidator", "OCSnapshot"]
+__all__ = ["PlistEditor", "PlistValidator", "OCSnapshot", "PlistSearchIndex", "SearchMatch"]
@@ -0,0 +1,125 @@
+"""
+Exibição e edição de blobs `data` grandes (DeviceProperties, patches ACPI,
+EDID, firmware embutido) sem copiar nem codificar o blob inteiro
+
+A coluna Valor só precisa dos primeiros caracteres: preview_base64 codifica
+apenas os bytes que aparecem na tela. BlobPager divide o blob em páginas
+de PAGE_BYTES lidas por memoryview (sem cópia) para o visualizador hex.
+"""
+
+import base64
+import re
+import string
+from typing import List, Optional
+
+# Bytes por linha e por página do visualizador hex
+HEX_ROW_BYTES = 16
+PAGE_BYTES = 4096
+# Acima deste tamanho o blob é editado no visualizador hex, não na árvore
+INLINE_EDIT_LIMIT = 1024
+
+_PRINTABLE = frozenset(string.printable.encode()) - frozenset(b"\t\n\r\x0b\x0c")
+# Linha escrita por hexdump (sem a coluna ASCII): offset de 8 dígitos e bytes 'xx xx ...'
+_HEXDUMP_LINE = re.compile(r"[0-9A-Fa-f]{8}  ((?:[0-9A-Fa-f]{2} )*[0-9A-Fa-f]{2})")
+
+
+def preview_base64(value: bytes, chars: int) -> str:
+    """Primeiros `chars` caracteres do base64 do blob, codificando só o prefixo"""
+    # Cada 3 bytes viram 4 caracteres
+    prefix = memoryview(value)[:(chars + 3) // 4 * 3]
+    return base64.b64encode(prefix).decode()[:chars]
+
+
+def preview_hex(value: bytes, chars: int) -> str:
+    """Primeiros `chars` caracteres do hex do blob, codificando só o prefixo"""
+    return memoryview(value)[:(chars + 1) // 2].hex()[:chars]
+
+
+def hexdump(view: memoryview, offset: int = 0) -> str:
+    """Linhas 'offset  hex  |ascii|' de um trecho do blob"""
+    lines = []
+    for start in range(0, len(view), HEX_ROW_BYTES):
+        row = view[start:start + HEX_ROW_BYTES]
+        hex_part = row.hex(" ")
+        ascii_part = "".join(chr(b) if b in _PRINTABLE else "." for b in row)
+        lines.append(f"{offset + start:08x}  {hex_part:<{HEX_ROW_BYTES * 3 - 1}}  |{ascii_part}|")
+    return "\n".join(lines)
+
+
+def parse_hexdump(text: str) -> bytes:
+    """
+    Bytes de um texto no formato de hexdump (offset e coluna ASCII são ignorados)
+
+    Linhas só com hex (sem offset) também são aceitas; o offset só é removido
+    quando a linha segue exatamente o formato de hexdump.
+
+    Raises:
+        ValueError: Se houver hex inválido ou coluna ASCII sem offset
+    """
+    chunks: List[str] = []
+    for line in text.splitlines():
+        hex_part, ascii_column, _ = line.partition("|")
+        hex_part = hex_part.strip()
+        if not hex_part:
+            continue
+        match = _HEXDUMP_LINE.fullmatch(hex_part)
+        if match:
+            chunks.append(match.group(1))
+        elif ascii_column:
+            raise ValueError(f"Linha de hexdump inválida: {line!r}")
+        else:
+            chunks.append(hex_part)
+    return bytes.fromhex(" ".join(chunks))
+
+
+class BlobPager:
+    """Blob dividido em páginas para o visualizador/editor hex"""
+
+    def __init__(self, data: bytes, page_bytes: int = PAGE_BYTES):
+        self.data = data
+        self.page_bytes = page_bytes
+        self.modified = False
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.data) // self.page_bytes))
+
+    def page_of(self, offset: int) -> int:
+        """Página que contém um offset"""
+        return min(max(offset, 0) // self.page_bytes, self.page_count - 1)
+
+    def page(self, number: int) -> memoryview:
+        """Bytes de uma página (sem cópia)"""
+        start = number * self.page_bytes
+        return memoryview(self.data)[start:start + self.page_bytes]
+
+    def format_page(self, number: int) -> str:
+        """Hexdump de uma página"""
+        return hexdump(self.page(number), number * self.page_bytes)
+
+    def replace_page(self, number: int, data: bytes) -> bool:
+        """
+        Substitui os bytes de uma página (o tamanho pode mudar)
+
+        Returns:
+            True se o blob mudou
+        """
+        page = self.page(number)
+        if page == data:
+            return False
+        start = number * self.page_bytes
+        view = memoryview(self.data)
+        # join lê as fatias do memoryview direto, sem cópias intermediárias
+        self.data = b"".join((view[:start], data, view[start + len(page):]))
+        self.modified = True
+        return True
+
+    def find(self, needle: bytes, start: int = 0) -> Optional[int]:
+        """Offset da próxima ocorrência de `needle` a partir de `start`"""
+        if not needle:
+            return None
+        offset = self.data.find(needle, start)
+        return None if offset < 0 else offset
@@ -4,22 +4,51 @@ Editor visual de config.plist com validação em tempo real
 
 import plistlib
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from datetime import datetime
 
 from uocm.plist_editor.validator import PlistValidator
+from uocm.plist_editor.history import (
+    DEFAULT_HISTORY_BUDGET,
+    MISSING,
+    Change,
+    EditHistory,
+    HistoryEntry,
+    Key,
+    KeyPath,
+    apply_value,
+)
+from uocm.plist_editor.search import (
+    ALL_FIELDS,
+    REPLACEABLE_FIELDS,
+    PlistSearchIndex,
+    SearchMatch,
+)
+
+# Retorno de _old_value para caminhos que não podem ser editados (None é um
+# valor possível: set_value preenche arrays com None)
+_INVALID_PATH: Any = object()
 
 
 class PlistEditor:
     """Editor de config.plist com undo/redo e validação"""
     
-    def __init__(self, plist_path: Optional[Path] = None):
+    def __init__(
+        self,
+        plist_path: Optional[Path] = None,
+        history_budget_bytes: int = DEFAULT_HISTORY_BUDGET,
+    ):
         self.plist_path = plist_path
         self.validator = PlistValidator()
         self.data: Dict[str, Any] = {}
-        self.history: List[Dict[str, Any]] = []
-        self.history_index: int = -1
-        self.max_history = 50
+        self.history = EditHistory(history_budget_bytes)
+        # Caminhos alterados desde a última validação (validação incremental)
+        self._touched_paths: List[KeyPath] = []
+        self._full_validation_pending = True
+        # Caminhos alterados pela última edição/undo/redo (None: documento inteiro)
+        self.last_changed_paths: Optional[List[KeyPath]] = None
+        # Índice de busca, recriado em checkpoints e atualizado a cada edição
+        self.search = PlistSearchIndex()
     
     def load(self, path: Path) -> bool:
         """Carrega um config.plist"""
@@ -27,6 +56,7 @@ class PlistEditor:
             with open(path, "rb") as f:
                 self.data = plistlib.load(f)
             self.plist_path = path
+            self.history.clear()
             self._save_to_history()
             return True
         except Exception as e:
@@ -40,7 +70,7 @@ class PlistEditor:
         
         try:
             # Validar antes de salvar
-            is_valid, errors = self.validator.validate_dict(self.data)
+            is_valid, errors = self.validate()
             if not is_valid:
                 return False
             
@@ -74,82 +104,208 @@ class PlistEditor:
     
     def set_value(self, key_path: str, value: Any) -> bool:
         """Define valor por caminho de chave"""
+        # Garantir um estado base para o undo
+        if not len(self.history):
+            self._save_to_history()
+        
         keys = key_path.split(".")
         target = self.data
+        path: List[Key] = []
+        changes: List[Change] = []
         
         # Navegar até o penúltimo nível
         for key in keys[:-1]:
             if isinstance(target, dict):
                 if key not in target:
                     target[key] = {}
+                    changes.append(Change((*path, key), MISSING, {}))
+                path.append(key)
                 target = target[key]
             elif isinstance(target, list):
                 try:
                     index = int(key)
-                    if index >= len(target):
-                        target.extend([{}] * (index - len(target) + 1))
-                    target = target[index]
                 except ValueError:
-                    return False
+                    return self._rollback(changes)
+                while index >= len(target):
+                    changes.append(Change((*path, len(target)), MISSING, {}))
+                    target.append({})
+                path.append(index)
+                target = target[index]
             else:
-                return False
+                return self._rollback(changes)
         
         # Definir valor final
         final_key = keys[-1]
         if isinstance(target, dict):
+            changes.append(Change((*path, final_key), target.get(final_key, MISSING), value))
             target[final_key] = value
         elif isinstance(target, list):
             try:
                 index = int(final_key)
-                if index >= len(target):
-                    target.extend([None] * (index - len(target) + 1))
-                target[index] = value
             except ValueError:
-                return False
+                return self._rollback(changes)
+            while index > len(target):
+                changes.append(Change((*path, len(target)), MISSING, None))
+                target.append(None)
+            if index == len(target):
+                changes.append(Change((*path, index), MISSING, value))
+                target.append(value)
+            else:
+                changes.append(Change((*path, index), target[index], value))
+                target[index] = value
         else:
+            return self._rollback(changes)
+        
+        self.history.record(changes)
+        self.last_changed_paths = [change.path for change in changes]
+        self._touched_paths.extend(self.last_changed_paths)
+        self.search.update(self.data, self.last_changed_paths)
+        return True
+    
+    def resolve(self, path: KeyPath, default: Any = None) -> Any:
+        """Obtém valor por caminho já separado (ex: ('ACPI', 'Add', 0, 'Path'))"""
+        value: Any = self.data
+        for key in path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+    
+    def set_at(self, path: KeyPath, value: Any) -> bool:
+        """
+        Define o valor de um caminho já separado (chaves com '.' são aceitas)
+        
+        O container pai precisa existir; em arrays o índice precisa existir
+        ou ser o próximo (append).
+        """
+        return self.set_many([(path, value)])
+    
+    def set_many(self, values: Sequence[Tuple[KeyPath, Any]]) -> bool:
+        """
+        Define vários caminhos já separados como uma única entrada do histórico
+        
+        Um undo desfaz todas as alterações juntas (ex: replace_all). Se algum
+        caminho for inválido nada é alterado.
+        """
+        if not values:
             return False
+        if not len(self.history):
+            self._save_to_history()
+        changes: List[Change] = []
+        for path, value in values:
+            old = self._old_value(path)
+            if old is _INVALID_PATH:
+                return self._rollback(changes)
+            changes.append(Change(path, old, value))
+            apply_value(self.data, path, value)
         
-        self._save_to_history()
+        self.history.record(changes)
+        self.last_changed_paths = [change.path for change in changes]
+        self._touched_paths.extend(self.last_changed_paths)
+        self.search.update(self.data, self.last_changed_paths)
         return True
     
+    def delete_at(self, path: KeyPath) -> bool:
+        """Remove a chave (dict) ou o item (array) de um caminho"""
+        if not path:
+            return False
+        parent = self.resolve(path[:-1], MISSING)
+        key = path[-1]
+        if isinstance(parent, dict) and key in parent:
+            return self.set_at(path, MISSING)
+        if isinstance(parent, list) and isinstance(key, int) and 0 <= key < len(parent):
+            # O histórico não representa inserção no meio de um array: a
+            # alteração é gravada como a troca do array inteiro
+            return self.set_at(path[:-1], parent[:key] + parent[key + 1:])
+        return False
+    
+    def find(self, query: str, **options: Any) -> List[SearchMatch]:
+        """Busca chaves, caminhos e valores (opções de PlistSearchIndex.find)"""
+        options.setdefault("fields", ALL_FIELDS)
+        return self.search.find(self.data, query, **options)
+    
+    def replace_all(self, query: str, replacement: str, **options: Any) -> int:
+        """
+        Substitui em todos os valores encontrados como uma única edição
+        
+        Returns:
+            Número de valores alterados
+        """
+        options.setdefault("fields", REPLACEABLE_FIELDS)
+        values = self.search.replacements(self.data, query, replacement, **options)
+        if values and self.set_many(values):
+            return len(values)
+        return 0
+    
     def validate(self) -> tuple[bool, List[str]]:
         """Valida o config.plist atual"""
-        from typing import Tuple
+        self._touched_paths = []
+        self._full_validation_pending = False
         return self.validator.validate_dict(self.data)
     
+    def validate_incremental(self) -> tuple[bool, List[str]]:
+        """Revalida apenas os caminhos alterados desde a última validação"""
+        if self._full_validation_pending:
+            return self.validate()
+        
+        touched, self._touched_paths = self._touched_paths, []
+        return self.validator.validate_paths(self.data, touched)
+    
     def undo(self) -> bool:
         """Desfaz última alteração"""
-        if self.history_index > 0:
-            self.history_index -= 1
-            self.data = self._deep_copy(self.history[self.history_index])
+        if self.history.can_undo():
+            self._mark_touched(self.history.entries[self.history.index])
+            self.data = self.history.undo(self.data)
+            self._reindex()
             return True
         return False
     
     def redo(self) -> bool:
         """Refaz última alteração desfeita"""
-        if self.history_index < len(self.history) - 1:
-            self.history_index += 1
-            self.data = self._deep_copy(self.history[self.history_index])
+        if self.history.can_redo():
+            self._mark_touched(self.history.entries[self.history.index + 1])
+            self.data = self.history.redo(self.data)
+            self._reindex()
             return True
         return False
     
     def _save_to_history(self) -> None:
-        """Salva estado atual no histórico"""
-        # Remover estados futuros se houver
-        if self.history_index < len(self.history) - 1:
-            self.history = self.history[: self.history_index + 1]
-        
-        # Adicionar novo estado
-        self.history.append(self._deep_copy(self.data))
-        self.history_index = len(self.history) - 1
-        
-        # Limitar tamanho do histórico
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
-            self.history_index = len(self.history) - 1
-    
-    def _deep_copy(self, data: Any) -> Any:
-        """Cópia profunda de dados"""
-        import copy
-        return copy.deepcopy(data)
-
+        """Salva checkpoint completo do estado atual no histórico"""
+        self.history.checkpoint(self.data)
+        self._full_validation_pending = True
+        self.search.rebuild(self.data)
+    
+    def _mark_touched(self, entry: HistoryEntry) -> None:
+        """Registra caminhos alterados por uma entrada do histórico"""
+        if entry.is_checkpoint:
+            self._full_validation_pending = True
+            self.last_changed_paths = None
+        else:
+            self.last_changed_paths = [change.path for change in entry.changes]
+            self._touched_paths.extend(self.last_changed_paths)
+    
+    def _reindex(self) -> None:
+        """Atualiza o índice de busca após undo/redo"""
+        if self.last_changed_paths is None:
+            self.search.rebuild(self.data)
+        else:
+            self.search.update(self.data, self.last_changed_paths)
+    
+    def _old_value(self, path: KeyPath) -> Any:
+        """Valor atual de um caminho editável (MISSING se novo, _INVALID_PATH se inválido)"""
+        if not path:
+            return _INVALID_PATH
+        parent = self.resolve(path[:-1], MISSING)
+        key = path[-1]
+        if isinstance(parent, dict):
+            return parent.get(key, MISSING)
+        if isinstance(parent, list) and isinstance(key, int) and 0 <= key <= len(parent):
+            return parent[key] if key < len(parent) else MISSING
+        return _INVALID_PATH
+    
+    def _rollback(self, changes: List[Change]) -> bool:
+        """Reverte alterações parciais de um set_value que falhou"""
+        for change in reversed(changes):
+            apply_value(self.data, change.path, change.old)
+        return False
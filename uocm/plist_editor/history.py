@@ -0,0 +1,198 @@
+"""
+Histórico de undo/redo com compartilhamento estrutural
+
+Cada edição guarda apenas o caminho alterado e os valores antigo/novo,
+em vez de uma cópia completa do config.plist. Alterações em massa
+(load, OC Snapshot) continuam gravando um checkpoint completo.
+"""
+
+import copy
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Key = Union[str, int]
+KeyPath = Tuple[Key, ...]
+
+
+class _Missing:
+    """Marcador para chaves que não existiam antes/depois de uma alteração"""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+# Orçamento padrão de memória do histórico (16 MB)
+DEFAULT_HISTORY_BUDGET = 16 * 1024 * 1024
+
+
+@dataclass
+class Change:
+    """Alteração de um único caminho (ex: ('Kernel', 'Add', 3, 'Enabled'))"""
+    path: KeyPath
+    old: Any
+    new: Any
+
+
+@dataclass
+class HistoryEntry:
+    """Entrada do histórico: lista de alterações ou checkpoint completo"""
+    changes: List[Change] = field(default_factory=list)
+    snapshot: Optional[Dict[str, Any]] = None
+    size: int = 0
+
+    @property
+    def is_checkpoint(self) -> bool:
+        return self.snapshot is not None
+
+
+def estimate_size(value: Any) -> int:
+    """Estima o tamanho em bytes de um valor PLIST (percorre containers)"""
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return total
+
+
+def _frozen(value: Any) -> Any:
+    """Cópia isolada de containers; valores escalares são imutáveis e compartilhados"""
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+def apply_value(data: Dict[str, Any], path: KeyPath, value: Any) -> None:
+    """Define (ou remove, se MISSING) o valor em um caminho já resolvido"""
+    target: Any = data
+    for key in path[:-1]:
+        target = target[key]
+
+    final_key = path[-1]
+    if value is MISSING:
+        if isinstance(target, dict):
+            target.pop(final_key, None)
+        else:
+            del target[final_key]
+    elif isinstance(target, list) and final_key == len(target):
+        target.append(_frozen(value))
+    else:
+        target[final_key] = _frozen(value)
+
+
+class EditHistory:
+    """Histórico de edições limitado por orçamento de memória em bytes"""
+
+    def __init__(self, budget_bytes: int = DEFAULT_HISTORY_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries: List[HistoryEntry] = []
+        self.index: int = -1
+        self.total_size: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        """Limpa todo o histórico"""
+        self.entries = []
+        self.index = -1
+        self.total_size = 0
+
+    def checkpoint(self, data: Dict[str, Any]) -> None:
+        """Grava um checkpoint completo (usado após alterações em massa)"""
+        snapshot = copy.deepcopy(data)
+        self._push(HistoryEntry(snapshot=snapshot, size=estimate_size(snapshot)))
+
+    def record(self, changes: List[Change]) -> None:
+        """Grava uma edição incremental (apenas caminhos alterados)"""
+        if not changes:
+            return
+        if not self.entries:
+            raise RuntimeError("History has no base checkpoint")
+
+        frozen = [Change(c.path, c.old, _frozen(c.new)) for c in changes]
+        size = sum(
+            sys.getsizeof(c.path) + estimate_size(c.old) + estimate_size(c.new)
+            for c in frozen
+        )
+        self._push(HistoryEntry(changes=frozen, size=size))
+
+    def can_undo(self) -> bool:
+        return self.index > 0
+
+    def can_redo(self) -> bool:
+        return self.index < len(self.entries) - 1
+
+    def undo(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Desfaz a entrada atual e retorna o documento resultante"""
+        entry = self.entries[self.index]
+        self.index -= 1
+
+        if entry.is_checkpoint:
+            return self._rebuild(self.index)
+
+        for change in reversed(entry.changes):
+            apply_value(data, change.path, change.old)
+        return data
+
+    def redo(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Refaz a próxima entrada e retorna o documento resultante"""
+        self.index += 1
+        entry = self.entries[self.index]
+
+        if entry.is_checkpoint:
+            return copy.deepcopy(entry.snapshot)
+
+        for change in entry.changes:
+            apply_value(data, change.path, change.new)
+        return data
+
+    def _rebuild(self, index: int) -> Dict[str, Any]:
+        """Reconstrói o estado de um índice a partir do checkpoint anterior"""
+        base = index
+        while not self.entries[base].is_checkpoint:
+            base -= 1
+
+        data = copy.deepcopy(self.entries[base].snapshot)
+        for entry in self.entries[base + 1 : index + 1]:
+            for change in entry.changes:
+                apply_value(data, change.path, change.new)
+        return data
+
+    def _push(self, entry: HistoryEntry) -> None:
+        # Remover estados futuros se houver
+        if self.index < len(self.entries) - 1:
+            for dropped in self.entries[self.index + 1 :]:
+                self.total_size -= dropped.size
+            del self.entries[self.index + 1 :]
+
+        self.entries.append(entry)
+        self.total_size += entry.size
+        self.index = len(self.entries) - 1
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        """Descarta as entradas mais antigas até caber no orçamento"""
+        while self.total_size > self.budget_bytes and len(self.entries) > 2:
+            base = self.entries.pop(0)
+            self.total_size -= base.size
+            self.index -= 1
+
+            # A nova base precisa ser um checkpoint: aplicar a edição
+            # diretamente sobre o snapshot descartado (O(profundidade))
+            head = self.entries[0]
+            if not head.is_checkpoint:
+                for change in head.changes:
+                    apply_value(base.snapshot, change.path, change.new)
+                self.total_size += base.size - head.size
+                head.snapshot = base.snapshot
+                head.changes = []
+                head.size = base.size
@@ -0,0 +1,196 @@
+"""
+Scanner paralelo de kexts para o OC Snapshot
+
+Lê os Info.plist dos kexts (incluindo bundles em Contents/PlugIns) com um
+pool de threads e mantém um cache persistente dos metadados, indexado por
+(caminho, mtime, tamanho), para que snapshots repetidos de uma partição EFI
+só reprocessem os bundles alterados.
+"""
+
+import json
+import os
+import plistlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+CACHE_VERSION = 1
+
+
+class KextScanner:
+    """Scanner de bundles .kext com cache de metadados em arquivo"""
+
+    def __init__(self, cache_path: Optional[Path] = None, max_workers: Optional[int] = None):
+        self.cache_path = cache_path
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 4)
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self, kexts_path: Path) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Escaneia kexts e plugins
+
+        Returns:
+            Tuple de (kext_info_map, warnings). As chaves do mapa são os
+            BundlePath relativos à pasta Kexts (ex:
+            'VirtualSMC.kext/Contents/PlugIns/SMCProcessor.kext'), na ordem
+            pasta pai -> plugins, alfabética em cada nível.
+        """
+        cache = self._load_cache()
+        self.hits = 0
+        self.misses = 0
+        dirty = False
+        seen: Set[str] = set()
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        children: Dict[str, List[str]] = {}
+        warnings: List[str] = []
+
+        root = kexts_path.resolve()
+        top_level = sorted(
+            (d for d in kexts_path.iterdir() if d.is_dir() and d.suffix == ".kext"),
+            key=lambda d: d.name,
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending: Dict[Future, str] = {}
+            for kext_dir in top_level:
+                future = pool.submit(
+                    self._scan_bundle, kext_dir, self._cache_key(root, kext_dir.name), cache
+                )
+                pending[future] = kext_dir.name
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    bundle_path = pending.pop(future)
+                    info, plugins, cache_key, changed, error = future.result()
+
+                    if cache_key:
+                        seen.add(cache_key)
+                    if changed:
+                        dirty = True
+                    if error:
+                        warnings.append(f"Erro ao ler Info.plist de {bundle_path}: {error}")
+                    results[bundle_path] = info
+
+                    children[bundle_path] = []
+                    for plugin_dir in plugins:
+                        plugin_path = f"{bundle_path}/Contents/PlugIns/{plugin_dir.name}"
+                        children[bundle_path].append(plugin_path)
+                        future = pool.submit(
+                            self._scan_bundle, plugin_dir, self._cache_key(root, plugin_path), cache
+                        )
+                        pending[future] = plugin_path
+
+        # Montar o mapa na ordem determinística pai -> plugins
+        kext_info_map: Dict[str, Dict[str, Any]] = {}
+        stack = [kext_dir.name for kext_dir in reversed(top_level)]
+        while stack:
+            bundle_path = stack.pop()
+            info = results.get(bundle_path)
+            if info is not None:
+                kext_info_map[bundle_path] = info
+            stack.extend(reversed(children.get(bundle_path, [])))
+
+        # Remover do cache bundles desta pasta que não existem mais
+        prefix = str(root) + os.sep
+        stale = [key for key in cache if key.startswith(prefix) and key not in seen]
+        for key in stale:
+            del cache[key]
+
+        if dirty or stale:
+            self._save_cache()
+
+        return kext_info_map, warnings
+
+    @staticmethod
+    def _cache_key(root: Path, bundle_path: str) -> str:
+        return str(root / bundle_path / "Contents" / "Info.plist")
+
+    def _scan_bundle(
+        self,
+        kext_dir: Path,
+        cache_key: str,
+        cache: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Optional[Dict[str, Any]], List[Path], Optional[str], bool, Optional[str]]:
+        """Lê metadados de um bundle (executado no pool de threads)"""
+        plugins_dir = kext_dir / "Contents" / "PlugIns"
+        plugins: List[Path] = []
+        if plugins_dir.is_dir():
+            plugins = sorted(
+                (d for d in plugins_dir.iterdir() if d.is_dir() and d.suffix == ".kext"),
+                key=lambda d: d.name,
+            )
+
+        info_plist = kext_dir / "Contents" / "Info.plist"
+        try:
+            stat = info_plist.stat()
+        except OSError:
+            return None, plugins, None, False, None
+
+        cached = cache.get(cache_key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            with self._lock:
+                self.hits += 1
+            return self._to_info(cached, kext_dir), plugins, cache_key, False, None
+
+        try:
+            with open(info_plist, "rb") as f:
+                kext_info = plistlib.load(f)
+        except Exception as e:
+            return None, plugins, None, False, str(e)
+
+        libraries = kext_info.get("OSBundleLibraries", {})
+        record = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "bundle_id": kext_info.get("CFBundleIdentifier", ""),
+            "executable": kext_info.get("CFBundleExecutable", kext_dir.stem),
+            "libraries": {str(k): str(v) for k, v in libraries.items()}
+            if isinstance(libraries, dict) else {},
+        }
+        with self._lock:
+            cache[cache_key] = record
+            self.misses += 1
+        return self._to_info(record, kext_dir), plugins, cache_key, True, None
+
+    @staticmethod
+    def _to_info(record: Dict[str, Any], kext_dir: Path) -> Dict[str, Any]:
+        return {
+            "bundle_id": record["bundle_id"],
+            "executable": record["executable"],
+            "libraries": record["libraries"],
+            "path": kext_dir,
+        }
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Carrega o cache do disco (uma vez por instância)"""
+        if self._cache is not None:
+            return self._cache
+
+        self._cache = {}
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self._cache = data.get("entries", {})
+            except Exception:
+                pass
+        return self._cache
+
+    def _save_cache(self) -> None:
+        """Grava o cache de forma atômica"""
+        if not self.cache_path:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self._cache}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
@@ -3,82 +3,114 @@ Funcionalidade OC Snapshot inspirada no ProperTree
 Referência: https://github.com/corpnewt/ProperTree
 """
 
+import heapq
 import plistlib
-import hashlib
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from uocm.core.config import Config
+from uocm.core.hashing import KNOWN_HASHES_PATH, OpenCoreHashIndex, hash_file
+from uocm.plist_editor.kext_scanner import KextScanner
 
 
 class OCSnapshot:
     """Gerenciador de OC Snapshot"""
     
-    def __init__(self, oc_path: Path):
+    # Índice de hashes compartilhado, carregado sob demanda
+    _hash_index: Optional[OpenCoreHashIndex] = None
+    
+    def __init__(self, oc_path: Path, scanner: Optional[KextScanner] = None):
         self.oc_path = oc_path
+        self.scanner = scanner or KextScanner(Config.get_data_path() / "cache" / "kext_scan.json")
         self.acpi_path = oc_path / "ACPI"
         self.kexts_path = oc_path / "Kexts"
         self.drivers_path = oc_path / "Drivers"
         self.tools_path = oc_path / "Tools"
     
+    @property
+    def can_identify_versions(self) -> bool:
+        """
+        Se há hashes conhecidos para identificar versões
+        
+        O banco embutido só tem entradas quando gerado com
+        scripts/build_opencore_hashes.py; sem elas (e sem hashes locais do
+        usuário), as versões ficam sempre desconhecidas.
+        """
+        return len(self.hash_index) > 0
+    
     def get_opencore_version(self) -> Optional[str]:
-        """Obtém versão do OpenCore.efi via MD5 hash"""
+        """Obtém versão do OpenCore.efi via hash (None se desconhecida ou sem banco de hashes)"""
         opencore_efi = self.oc_path / "OpenCore.efi"
         
-        if not opencore_efi.exists():
+        if not opencore_efi.exists() or not self.can_identify_versions:
             return None
         
-        # Calcular MD5
-        md5_hash = self._calculate_md5(opencore_efi)
+        known = self.hash_index.lookup(hash_file(opencore_efi))
+        return known.version if known else None
+    
+    def get_component_versions(self) -> Dict[str, Optional[str]]:
+        """
+        Identifica versões de OpenCore.efi, Drivers e Tools em uma passada
         
-        # Mapeamento conhecido de hashes (exemplo - expandir com hashes reais)
-        known_hashes = {
-            # Adicionar hashes conhecidos do OpenCore
+        Vazio quando can_identify_versions é False (nenhum arquivo é lido).
+        """
+        if not self.can_identify_versions:
+            return {}
+        return {
+            path: f"{known.version} ({known.variant})" if known else None
+            for path, known in self.hash_index.identify_efi(self.oc_path).items()
         }
-        
-        return known_hashes.get(md5_hash, None)
+    
+    @property
+    def hash_index(self) -> OpenCoreHashIndex:
+        """Banco de hashes conhecidos (embutido + hashes locais do usuário)"""
+        if OCSnapshot._hash_index is None:
+            OCSnapshot._hash_index = OpenCoreHashIndex.load(
+                KNOWN_HASHES_PATH,
+                Config.get_data_path() / "opencore_hashes.json",
+            )
+        return OCSnapshot._hash_index
     
     def _calculate_md5(self, file_path: Path) -> str:
         """Calcula MD5 de um arquivo"""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return hash_file(file_path).md5
     
     def snapshot_acpi(self, clean: bool = False, existing_add: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
         """Snapshot de arquivos ACPI"""
         if not self.acpi_path.exists():
             return []
         
-        entries = [] if clean else (existing_add or [])
+        entries = [] if clean else list(existing_add or [])
         aml_files = sorted(self.acpi_path.glob("*.aml"))
         
+        # Índice Path -> entrada existente (primeira ocorrência)
+        by_path = self._index_entries(entries, "Path")
+        
         for aml_file in aml_files:
-            # Verificar se já existe
-            existing = None
-            if not clean:
-                existing = next(
-                    (e for e in entries if e.get("Path") == aml_file.name),
-                    None
-                )
-            
-            if existing:
-                entry = existing
-            else:
+            if aml_file.name not in by_path:
                 entry = {
                     "Enabled": True,
                     "Path": aml_file.name,
                     "Comment": f"{aml_file.stem} - Auto-snapshot",
                 }
                 entries.append(entry)
+                by_path[aml_file.name] = entry
         
         # Remover entradas de arquivos que não existem mais
         if not clean:
-            existing_paths = {e.get("Path") for e in entries}
             current_paths = {f.name for f in aml_files}
             entries = [e for e in entries if e.get("Path") in current_paths]
         
         return entries
     
+    @staticmethod
+    def _index_entries(entries: List[Dict[str, Any]], key: str) -> Dict[Any, Dict[str, Any]]:
+        """Indexa entradas por uma chave, mantendo a primeira ocorrência"""
+        index: Dict[Any, Dict[str, Any]] = {}
+        for entry in entries:
+            index.setdefault(entry.get(key), entry)
+        return index
+    
     def snapshot_kexts(
         self,
         clean: bool = False,
@@ -88,37 +120,10 @@ class OCSnapshot:
         if not self.kexts_path.exists():
             return [], []
         
-        entries = [] if clean else (existing_add or [])
-        kext_dirs = sorted([
-            d for d in self.kexts_path.iterdir()
-            if d.is_dir() and d.suffix == ".kext"
-        ], key=lambda x: x.name)
+        entries = [] if clean else list(existing_add or [])
         
-        kext_info_map = {}
-        warnings = []
-        
-        # Carregar informações de todos os kexts
-        for kext_dir in kext_dirs:
-            info_plist = kext_dir / "Contents" / "Info.plist"
-            if not info_plist.exists():
-                continue
-            
-            try:
-                with open(info_plist, "rb") as f:
-                    kext_info = plistlib.load(f)
-                
-                bundle_id = kext_info.get("CFBundleIdentifier", "")
-                executable = kext_info.get("CFBundleExecutable", kext_dir.stem)
-                os_bundle_libraries = kext_info.get("OSBundleLibraries", {})
-                
-                kext_info_map[kext_dir.name] = {
-                    "bundle_id": bundle_id,
-                    "executable": executable,
-                    "libraries": os_bundle_libraries,
-                    "path": kext_dir,
-                }
-            except Exception as e:
-                warnings.append(f"Erro ao ler Info.plist de {kext_dir.name}: {e}")
+        # Carregar informações de todos os kexts e plugins (em paralelo, com cache)
+        kext_info_map, warnings = self.scanner.scan(self.kexts_path)
         
         # Verificar duplicações de CFBundleIdentifier
         bundle_ids = {}
@@ -133,95 +138,128 @@ class OCSnapshot:
                 bundle_ids[bundle_id] = name
         
         # Ordenar kexts por dependências
-        sorted_kexts = self._sort_kexts_by_dependencies(kext_info_map)
+        sorted_kexts, cycles = self._sort_kexts_by_dependencies(kext_info_map)
+        for cycle in cycles:
+            warnings.append(
+                "Dependência circular entre kexts: " + " -> ".join(cycle + [cycle[0]])
+            )
+        
+        # Índice BundlePath -> entrada existente (primeira ocorrência)
+        by_bundle_path = self._index_entries(entries, "BundlePath")
         
-        # Criar/atualizar entradas
+        # Criar entradas para kexts novos
         for kext_name in sorted_kexts:
-            info = kext_info_map[kext_name]
-            
-            # Verificar se já existe
-            existing = None
-            if not clean:
-                existing = next(
-                    (e for e in entries if e.get("BundlePath") == kext_name),
-                    None
-                )
+            if kext_name in by_bundle_path:
+                continue
             
-            if existing:
-                # Atualizar entrada existente
-                entry = existing
-            else:
-                # Criar nova entrada
-                entry = {
-                    "Arch": "Any",
-                    "BundlePath": kext_name,
-                    "Enabled": True,
-                    "ExecutablePath": f"Contents/MacOS/{info['executable']}",
-                    "PlistPath": "Contents/Info.plist",
-                    "Comment": f"{Path(kext_name).stem} - Auto-snapshot",
-                    "MinKernel": "",
-                    "MaxKernel": "",
-                }
-                entries.append(entry)
+            info = kext_info_map[kext_name]
+            entry = {
+                "Arch": "Any",
+                "BundlePath": kext_name,
+                "Enabled": True,
+                "ExecutablePath": f"Contents/MacOS/{info['executable']}",
+                "PlistPath": "Contents/Info.plist",
+                "Comment": f"{Path(kext_name).stem} - Auto-snapshot",
+                "MinKernel": "",
+                "MaxKernel": "",
+            }
+            entries.append(entry)
+            by_bundle_path[kext_name] = entry
         
         # Remover entradas de kexts que não existem mais
         if not clean:
-            existing_paths = {e.get("BundlePath") for e in entries}
-            current_paths = set(kext_info_map.keys())
-            entries = [e for e in entries if e.get("BundlePath") in current_paths]
+            entries = [e for e in entries if e.get("BundlePath") in kext_info_map]
         
         return entries, warnings
     
-    def _sort_kexts_by_dependencies(self, kext_info_map: Dict[str, Dict]) -> List[str]:
-        """Ordena kexts por dependências (topological sort)"""
-        sorted_kexts = []
-        visited = set()
-        temp_visited = set()
-        
-        def visit(kext_name: str):
-            if kext_name in temp_visited:
-                # Dependência circular detectada
-                return
-            if kext_name in visited:
-                return
-            
-            temp_visited.add(kext_name)
-            
-            # Visitar dependências primeiro
-            info = kext_info_map.get(kext_name, {})
-            libraries = info.get("libraries", {})
-            
-            for lib_bundle_id in libraries.keys():
-                # Encontrar kext que fornece esta biblioteca
-                for other_name, other_info in kext_info_map.items():
-                    if other_info.get("bundle_id") == lib_bundle_id:
-                        visit(other_name)
-                        break
-            
-            temp_visited.remove(kext_name)
-            visited.add(kext_name)
-            sorted_kexts.append(kext_name)
+    def _sort_kexts_by_dependencies(
+        self,
+        kext_info_map: Dict[str, Dict[str, Any]],
+    ) -> Tuple[List[str], List[List[str]]]:
+        """
+        Ordena kexts por dependências (algoritmo de Kahn)
         
-        for kext_name in kext_info_map.keys():
-            if kext_name not in visited:
-                visit(kext_name)
+        Returns:
+            Tuple de (kexts_ordenados, ciclos). Kexts presos em ciclos de
+            dependência são anexados ao final, na ordem original.
+        """
+        names = list(kext_info_map.keys())
+        position = {name: i for i, name in enumerate(names)}
         
-        return sorted_kexts
+        # Índice CFBundleIdentifier -> kext (primeira ocorrência)
+        providers: Dict[str, str] = {}
+        for name in names:
+            bundle_id = kext_info_map[name].get("bundle_id")
+            if bundle_id:
+                providers.setdefault(bundle_id, name)
+        
+        # Arestas: dependência -> dependentes
+        dependencies: Dict[str, Set[str]] = {name: set() for name in names}
+        dependents: Dict[str, List[str]] = {name: [] for name in names}
+        for name in names:
+            for lib_bundle_id in kext_info_map[name].get("libraries", {}) or {}:
+                provider = providers.get(lib_bundle_id)
+                if provider and provider != name and provider not in dependencies[name]:
+                    dependencies[name].add(provider)
+                    dependents[provider].append(name)
+        
+        in_degree = {name: len(deps) for name, deps in dependencies.items()}
+        ready = [position[name] for name in names if in_degree[name] == 0]
+        heapq.heapify(ready)
+        
+        sorted_kexts: List[str] = []
+        while ready:
+            name = names[heapq.heappop(ready)]
+            sorted_kexts.append(name)
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(ready, position[dependent])
+        
+        if len(sorted_kexts) == len(names):
+            return sorted_kexts, []
+        
+        # Kexts restantes dependem (direta ou indiretamente) de um ciclo
+        remaining = [name for name in names if in_degree[name] > 0]
+        remaining_set = set(remaining)
+        cycles: List[List[str]] = []
+        seen: Set[str] = set()
+        
+        for start in remaining:
+            if start in seen:
+                continue
+            walk: List[str] = []
+            on_walk: Dict[str, int] = {}
+            node = start
+            while node not in on_walk and node not in seen:
+                on_walk[node] = len(walk)
+                walk.append(node)
+                node = min(
+                    (d for d in dependencies[node] if d in remaining_set),
+                    key=position.__getitem__,
+                )
+            if node in on_walk:
+                cycles.append(walk[on_walk[node]:])
+            seen.update(walk)
+        
+        return sorted_kexts + remaining, cycles
     
     def snapshot_drivers(self, clean: bool = False, existing_drivers: Optional[List[str]] = None) -> List[str]:
         """Snapshot de drivers UEFI"""
         if not self.drivers_path.exists():
             return []
         
-        drivers = [] if clean else (existing_drivers or [])
+        drivers = [] if clean else list(existing_drivers or [])
         driver_files = sorted(self.drivers_path.glob("*.efi"))
         
         current_drivers = {f.name for f in driver_files}
+        known_drivers = set(drivers)
         
         # Adicionar drivers novos
         for driver_file in driver_files:
-            if driver_file.name not in drivers:
+            if driver_file.name not in known_drivers:
                 drivers.append(driver_file.name)
+                known_drivers.add(driver_file.name)
         
         # Remover drivers que não existem mais
         if not clean:
@@ -238,21 +276,14 @@ class OCSnapshot:
         if not self.tools_path.exists():
             return []
         
-        tools = [] if clean else (existing_tools or [])
+        tools = [] if clean else list(existing_tools or [])
         tool_files = sorted(self.tools_path.glob("*.efi"))
         
+        # Índice Path -> entrada existente (primeira ocorrência)
+        by_path = self._index_entries(tools, "Path")
+        
         for tool_file in tool_files:
-            # Verificar se já existe
-            existing = None
-            if not clean:
-                existing = next(
-                    (e for e in tools if e.get("Path") == tool_file.name),
-                    None
-                )
-            
-            if existing:
-                entry = existing
-            else:
+            if tool_file.name not in by_path:
                 entry = {
                     "Arguments": "",
                     "Auxiliary": False,
@@ -262,10 +293,10 @@ class OCSnapshot:
                     "Path": tool_file.name,
                 }
                 tools.append(entry)
+                by_path[tool_file.name] = entry
         
         # Remover entradas de tools que não existem mais
         if not clean:
-            existing_paths = {e.get("Path") for e in tools}
             current_paths = {f.name for f in tool_files}
             tools = [e for e in tools if e.get("Path") in current_paths]
         
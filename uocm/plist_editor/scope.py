@@ -0,0 +1,93 @@
+"""
+Escopo da revalidação incremental de um config.plist
+
+Dado o caminho de uma chave alterada, encontra a menor subárvore cujo
+resultado de validação pode ter mudado e o sub-schema que se aplica a ela.
+A subárvore deve ser validada com `validador_raiz.evolve(schema=sub_schema)`,
+para que $ref/$defs continuem resolvendo no schema inteiro.
+
+Usado pelo PlistValidator do uocm e por validate_config_paths do
+universal_oc_manager.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from uocm.plist_editor.history import Key, KeyPath
+
+# Palavras-chave cujo resultado depende da subárvore inteira (Draft 7 e
+# 2020-12); a revalidação incremental não pode descer abaixo de um schema
+# que use alguma delas
+HOLISTIC_KEYWORDS = frozenset({
+    "$ref", "$dynamicRef", "allOf", "anyOf", "oneOf", "not", "if", "then", "else",
+    "dependencies", "dependentRequired", "dependentSchemas", "contains", "uniqueItems",
+    "const", "enum", "unevaluatedProperties", "unevaluatedItems", "prefixItems",
+})
+
+
+def resolve_keys(data: Any, key_path: Union[str, KeyPath]) -> KeyPath:
+    """Converte 'Kernel.Add.3' em ('Kernel', 'Add', 3) seguindo os dados"""
+    if isinstance(key_path, tuple):
+        return key_path
+    keys: List[Key] = []
+    for key in key_path.split("."):
+        if isinstance(data, list):
+            index = int(key)
+            keys.append(index)
+            data = data[index] if -len(data) <= index < len(data) else None
+        else:
+            keys.append(key)
+            data = data.get(key) if isinstance(data, dict) else None
+    return tuple(keys)
+
+
+def child_schema(schema: Dict[str, Any], key: Key) -> Optional[Dict[str, Any]]:
+    """Sub-schema aplicado a uma chave/índice, se determinável"""
+    if isinstance(key, int):
+        items = schema.get("items")
+        return items if isinstance(items, dict) else None
+
+    properties = schema.get("properties", {})
+    if key in properties:
+        return properties[key]
+    if schema.get("patternProperties"):
+        return None
+    additional = schema.get("additionalProperties")
+    return additional if isinstance(additional, dict) else None
+
+
+def scope_for(
+    data: Dict[str, Any], schema: Dict[str, Any], keys: KeyPath
+) -> Tuple[KeyPath, Dict[str, Any], Any]:
+    """
+    Menor subárvore que precisa ser revalidada após alterar `keys`
+
+    O escopo é o container pai da chave alterada (para revalidar required,
+    additionalProperties etc.), limitado ao primeiro ancestral cujo schema
+    depende da subárvore inteira ou cujo sub-schema não é determinável.
+
+    Returns:
+        (caminho do escopo, sub-schema, valor da subárvore)
+    """
+    scope: List[Key] = []
+    chain: List[Tuple[Dict[str, Any], Any]] = [(schema, data)]
+    for key in keys[:-1]:
+        current, instance = chain[-1]
+        if HOLISTIC_KEYWORDS.intersection(current):
+            break
+        child = child_schema(current, key)
+        if not isinstance(child, dict):
+            break
+        if isinstance(instance, dict) and key in instance:
+            instance = instance[key]
+        elif isinstance(instance, list) and isinstance(key, int) and -len(instance) <= key < len(instance):
+            instance = instance[key]
+        else:
+            break
+        scope.append(key)
+        chain.append((child, instance))
+
+    # O próprio escopo precisa admitir validação isolada
+    if scope and HOLISTIC_KEYWORDS.intersection(chain[-1][0]):
+        scope.pop()
+        chain.pop()
+    return tuple(scope), chain[-1][0], chain[-1][1]
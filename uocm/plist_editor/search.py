@@ -0,0 +1,462 @@
+"""
+Índice de busca sobre o documento do editor de config.plist
+
+Cada nó do documento vira algumas linhas de texto: a chave, o caminho
+(ex: 'Kernel.Add.0.Comment') e o valor como texto; blobs `data` aparecem
+em hex e em base64. As linhas ficam em três estruturas:
+
+- um dicionário caminho -> linhas, atualizado por subárvore a cada edição;
+- um índice invertido texto normalizado -> linhas, para buscas exatas;
+- um corpus único com todas as linhas, onde buscas por substring rodam com
+  str.find (em C) em vez de um loop Python por nó.
+
+Blobs maiores que BLOB_TEXT_BYTES só têm o início em texto; buscas que
+são hex válido também procuram os bytes no blob inteiro com bytes.find. Nas
+visões em hex só contam ocorrências alinhadas a bytes (offset par).
+
+Edições não recriam o corpus: as linhas antigas dos caminhos alterados são
+ignoradas e as novas ficam em uma lista pendente, percorrida à parte, até
+passarem de COMPACT_THRESHOLD. Expressões regulares são avaliadas linha a
+linha.
+"""
+
+import base64
+import datetime
+import gc
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+from uocm.plist_editor.history import MISSING, Key, KeyPath
+
+FIELD_KEY = "key"
+FIELD_PATH = "path"
+FIELD_VALUE = "value"
+FIELD_HEX = "hex"
+FIELD_BASE64 = "base64"
+
+ALL_FIELDS = (FIELD_KEY, FIELD_PATH, FIELD_VALUE, FIELD_HEX, FIELD_BASE64)
+# Campos que replace_all sabe reescrever (strings e blobs em hex)
+REPLACEABLE_FIELDS = (FIELD_VALUE, FIELD_HEX)
+
+# Caminhos editados desde a última montagem do corpus antes de recriá-lo
+COMPACT_THRESHOLD = 2048
+# Bytes de cada blob convertidos para as visões em hex/base64
+BLOB_TEXT_BYTES = 4096
+
+_Line = Tuple[KeyPath, str, str]
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    """Ocorrência de uma busca: caminho do nó, campo e texto do campo"""
+    path: KeyPath
+    field: str
+    text: str
+
+
+def path_text(path: KeyPath) -> str:
+    """Caminho no formato de PlistEditor.get_value (ex: 'ACPI.Add.0.Path')"""
+    return ".".join(map(str, path))
+
+
+def value_lines(value: Any) -> List[Tuple[str, str]]:
+    """Textos pesquisáveis do valor de um nó (containers não têm valor)"""
+    if isinstance(value, (dict, list)):
+        return []
+    if isinstance(value, bytes):
+        view = memoryview(value)[:BLOB_TEXT_BYTES]
+        return [(FIELD_HEX, view.hex()), (FIELD_BASE64, base64.b64encode(view).decode())]
+    if isinstance(value, datetime.datetime):
+        return [(FIELD_VALUE, value.isoformat())]
+    return [(FIELD_VALUE, str(value))]
+
+
+def compile_query(query: str, regex: bool = False, case_sensitive: bool = False) -> Pattern:
+    """
+    Compila a busca como expressão regular
+
+    Raises:
+        re.error: Se a expressão regular for inválida
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def _hex_bytes(query: str) -> Optional[bytes]:
+    """Bytes de uma busca em hex (ex: '9B3E0000', '0x9b3e', '9b 3e'), ou None"""
+    text = query.strip().replace(" ", "")
+    if text[:2].lower() == "0x":
+        text = text[2:]
+    if not text or len(text) % 2:
+        return None
+    try:
+        return bytes.fromhex(text)
+    except ValueError:
+        return None
+
+
+def _hex_matches(pattern: Pattern, text: str, pos: int = 0) -> Iterable["re.Match[str]"]:
+    """
+    Ocorrências de pattern em um texto hex que começam e terminam em limite
+    de byte (offset par); as desalinhadas atravessariam dois bytes
+    """
+    while pos <= len(text):
+        match = pattern.search(text, pos)
+        if match is None:
+            return
+        if match.start() % 2 or match.end() % 2:
+            pos = match.start() + 1
+            continue
+        yield match
+        pos = match.end() + (match.end() == match.start())
+
+
+def _hex_sub(pattern: Pattern, repl: Any, text: str) -> str:
+    """pattern.sub sobre um texto hex, só nas ocorrências alinhadas a bytes"""
+    parts = []
+    last = 0
+    for match in _hex_matches(pattern, text):
+        parts.append(text[last:match.start()])
+        parts.append(repl(match) if callable(repl) else match.expand(repl))
+        last = match.end()
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _in_scope(path: KeyPath, scope: KeyPath) -> bool:
+    return path[:len(scope)] == scope
+
+
+def _resolve(data: Any, path: KeyPath) -> Any:
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return MISSING
+    return data
+
+
+class PlistSearchIndex:
+    """Índice de busca incremental sobre um documento PLIST"""
+
+    def __init__(self):
+        self._data: Optional[Dict[str, Any]] = None
+        # Linhas por caminho, na ordem em que foram indexadas
+        self._lines: Dict[KeyPath, List[Tuple[str, str]]] = {}
+        # Filhos indexados de cada container (para remover subárvores)
+        self._children: Dict[KeyPath, List[KeyPath]] = {}
+        # Blobs maiores que BLOB_TEXT_BYTES (referência, sem cópia)
+        self._blobs: Dict[KeyPath, bytes] = {}
+        # Índice invertido: texto em minúsculas -> (caminho, campo), em ordem de indexação
+        self._exact: Dict[str, Dict[Tuple[KeyPath, str], None]] = {}
+        # Corpus: linhas na ordem, início de cada uma e texto concatenado
+        self._order: List[_Line] = []
+        self._starts: List[int] = []
+        self._corpus: Optional[str] = None
+        self._corpus_lower: Optional[str] = None
+        # Caminhos cujas linhas no corpus estão desatualizadas / indexados depois dele
+        self._stale: Set[KeyPath] = set()
+        self._pending: Dict[KeyPath, None] = {}
+
+    def __len__(self) -> int:
+        return sum(len(lines) for lines in self._lines.values())
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        """Indexa o documento inteiro (load, checkpoint)"""
+        self._data = data
+        self._lines = {}
+        self._children = {}
+        self._blobs = {}
+        self._exact = {}
+        self._invalidate_corpus()
+        # Milhares de tuplas pequenas: o coletor de ciclos só atrasaria a indexação
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._index_subtree((), data)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def update(self, data: Dict[str, Any], paths: Iterable[KeyPath]) -> None:
+        """
+        Reindexa as subárvores alteradas
+
+        Args:
+            data: Documento atual (se for outro objeto, o índice é recriado)
+            paths: Caminhos alterados (ex: Change.path de cada alteração)
+        """
+        if data is not self._data:
+            self.rebuild(data)
+            return
+        for path in paths:
+            path = tuple(path)
+            if not path:
+                self.rebuild(data)
+                return
+            self._remove_subtree(path)
+            value = _resolve(data, path)
+            parent = self._children.get(path[:-1])
+            if value is MISSING or parent is None:
+                # Nó removido, ou pai ainda não indexado (será indexado junto com ele)
+                continue
+            parent.append(path)
+            self._index_subtree(path, value)
+
+    def find(
+        self,
+        data: Dict[str, Any],
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        whole: bool = False,
+        fields: Sequence[str] = ALL_FIELDS,
+        scope: KeyPath = (),
+        limit: Optional[int] = None,
+    ) -> List[SearchMatch]:
+        """
+        Busca no documento
+
+        Args:
+            data: Documento atual (PlistEditor.data)
+            query: Texto ou expressão regular
+            regex: Interpretar query como expressão regular
+            case_sensitive: Diferenciar maiúsculas/minúsculas
+            whole: Exigir que o campo inteiro seja igual à query
+            fields: Campos a considerar (FIELD_KEY, FIELD_VALUE, FIELD_HEX, ...)
+            scope: Limitar a busca à subárvore desse caminho
+            limit: Número máximo de resultados
+
+        Raises:
+            re.error: Se regex=True e a expressão for inválida
+        """
+        if data is not self._data:
+            self.rebuild(data)
+        if not query:
+            return []
+
+        if regex:
+            lines = self._regex_lines(compile_query(query, True, case_sensitive), whole)
+        elif whole:
+            lines = self._exact_lines(query, case_sensitive)
+        else:
+            lines = self._substring_lines(query, case_sensitive)
+
+        wanted = set(fields)
+        results = []
+        for path, field, text in lines:
+            if field in wanted and _in_scope(path, scope):
+                results.append(SearchMatch(path, field, text))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def replacements(
+        self,
+        data: Dict[str, Any],
+        query: str,
+        replacement: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        whole: bool = False,
+        fields: Sequence[str] = REPLACEABLE_FIELDS,
+        scope: KeyPath = (),
+    ) -> List[Tuple[KeyPath, Any]]:
+        """
+        Novos valores para um replace_all (sem alterar o documento)
+
+        Só valores são reescritos: strings pelo texto e blobs `data` pela
+        visão em hex (o resultado precisa continuar sendo hex válido).
+        Chaves não são renomeadas.
+        """
+        fields = [field for field in fields if field in REPLACEABLE_FIELDS]
+        matches = self.find(
+            data, query, regex=regex, case_sensitive=case_sensitive,
+            whole=whole, fields=fields, scope=scope,
+        )
+        pattern = compile_query(query, regex, case_sensitive)
+        if whole:
+            pattern = re.compile(rf"\A(?:{pattern.pattern})\Z", pattern.flags)
+        # Sem regex, a substituição é literal (sem grupos nem escapes)
+        repl: Any = replacement if regex else (lambda match: replacement)
+
+        values: Dict[KeyPath, Any] = {}
+        for match in matches:
+            if match.path in values:
+                continue
+            current = _resolve(data, match.path)
+            if match.field == FIELD_VALUE and isinstance(current, str):
+                new_value: Any = pattern.sub(repl, current)
+            elif match.field == FIELD_HEX and isinstance(current, bytes):
+                try:
+                    new_value = bytes.fromhex(_hex_sub(pattern, repl, current.hex()))
+                except ValueError:
+                    continue
+            else:
+                continue
+            if new_value != current:
+                values[match.path] = new_value
+        return list(values.items())
+
+    # Indexação
+
+    def _index_subtree(self, path: KeyPath, value: Any) -> None:
+        all_lines = self._lines
+        all_children = self._children
+        exact = self._exact
+        blobs = self._blobs
+        pending = self._pending if self._corpus is not None else None
+
+        def visit(node_path: KeyPath, text: str, node: Any) -> None:
+            lines: List[Tuple[str, str]] = []
+            if node_path:
+                key = node_path[-1]
+                if not isinstance(key, int):
+                    lines.append((FIELD_KEY, key))
+                lines.append((FIELD_PATH, text))
+
+            items: Optional[Iterable[Tuple[Key, Any]]] = None
+            if isinstance(node, dict):
+                items = node.items()
+            elif isinstance(node, list):
+                items = enumerate(node)
+            else:
+                lines.extend(value_lines(node))
+                if isinstance(node, bytes) and len(node) > BLOB_TEXT_BYTES:
+                    blobs[node_path] = node
+
+            all_lines[node_path] = lines
+            if pending is not None:
+                pending[node_path] = None
+            for field, line in lines:
+                exact.setdefault(line.lower(), {})[(node_path, field)] = None
+
+            if items is not None:
+                prefix = f"{text}." if node_path else ""
+                children = all_children[node_path] = []
+                for key, child in items:
+                    child_path = node_path + (key,)
+                    children.append(child_path)
+                    visit(child_path, f"{prefix}{key}", child)
+
+        visit(path, path_text(path), value)
+
+    def _remove_subtree(self, path: KeyPath) -> None:
+        if path not in self._lines:
+            return
+        parent = self._children.get(path[:-1])
+        if parent is not None:
+            parent.remove(path)
+        stack = [path]
+        tracking = self._corpus is not None
+        while stack:
+            node_path = stack.pop()
+            if tracking:
+                self._stale.add(node_path)
+                self._pending.pop(node_path, None)
+            self._blobs.pop(node_path, None)
+            for field, text in self._lines.pop(node_path, ()):
+                entries = self._exact.get(text.lower())
+                if entries is not None:
+                    entries.pop((node_path, field), None)
+                    if not entries:
+                        del self._exact[text.lower()]
+            stack.extend(self._children.pop(node_path, ()))
+
+    # Consultas
+
+    def _invalidate_corpus(self) -> None:
+        self._corpus = None
+        self._corpus_lower = None
+        self._stale = set()
+        self._pending = {}
+
+    def _ensure_corpus(self, case_sensitive: bool) -> str:
+        if self._corpus is not None and len(self._stale) + len(self._pending) > COMPACT_THRESHOLD:
+            self._invalidate_corpus()
+        if self._corpus is None:
+            self._order = [
+                (path, field, text)
+                for path, lines in self._lines.items()
+                for field, text in lines
+            ]
+            # Uma linha por campo; '\n' dentro de valores não pode separar linhas
+            texts = [text.replace("\n", " ") for _, _, text in self._order]
+            self._starts = [0, *accumulate(len(text) + 1 for text in texts)][:-1]
+            self._corpus = "\n".join(texts)
+        if case_sensitive:
+            return self._corpus
+        if self._corpus_lower is None:
+            self._corpus_lower = self._corpus.lower()
+        return self._corpus_lower
+
+    def _substring_lines(self, query: str, case_sensitive: bool) -> List[_Line]:
+        corpus = self._ensure_corpus(case_sensitive)
+        needle = query if case_sensitive else query.lower()
+        if "\n" in needle:
+            return []
+        lines = []
+        starts = self._starts
+        stale = self._stale
+        position = corpus.find(needle)
+        while position != -1:
+            line = bisect_right(starts, position) - 1
+            if self._order[line][0] not in stale:
+                lines.append(self._order[line])
+            # Próxima ocorrência a partir da linha seguinte
+            if line + 1 >= len(starts):
+                break
+            position = corpus.find(needle, starts[line + 1])
+
+        for line in self._pending_lines():
+            text = line[2] if case_sensitive else line[2].lower()
+            if needle in text.replace("\n", " "):
+                lines.append(line)
+
+        # Em hex, só valem ocorrências alinhadas a bytes ('23' não está em 12 34)
+        hex_pattern = compile_query(query, case_sensitive=case_sensitive)
+        lines = [
+            line for line in lines
+            if line[1] != FIELD_HEX or next(_hex_matches(hex_pattern, line[2]), None) is not None
+        ]
+
+        # Blobs grandes: o texto cobre só o início, os bytes são procurados inteiros
+        needle_bytes = _hex_bytes(query) if self._blobs else None
+        if needle_bytes:
+            found = {line[0] for line in lines if line[1] == FIELD_HEX}
+            for path, blob in self._blobs.items():
+                if path not in found and blob.find(needle_bytes) >= 0:
+                    hex_text = next(text for field, text in self._lines[path] if field == FIELD_HEX)
+                    lines.append((path, FIELD_HEX, hex_text))
+        return lines
+
+    def _exact_lines(self, query: str, case_sensitive: bool) -> List[_Line]:
+        entries = self._exact.get(query.lower(), ())
+        lines = []
+        for path, field in entries:
+            for line_field, text in self._lines[path]:
+                if line_field == field and (not case_sensitive or text == query):
+                    lines.append((path, field, text))
+        return lines
+
+    def _regex_lines(self, pattern: Pattern, whole: bool) -> List[_Line]:
+        self._ensure_corpus(True)
+
+        def test(text: str, field: str) -> bool:
+            if whole:
+                return pattern.fullmatch(text) is not None
+            if field == FIELD_HEX:
+                return next(_hex_matches(pattern, text), None) is not None
+            return pattern.search(text) is not None
+        stale = self._stale
+        lines = [line for line in self._order if line[0] not in stale and test(line[2], line[1])]
+        lines.extend(line for line in self._pending_lines() if test(line[2], line[1]))
+        return lines
+
+    def _pending_lines(self) -> Iterable[_Line]:
+        for path in self._pending:
+            for field, text in self._lines[path]:
+                yield path, field, text
@@ -5,16 +5,54 @@ Validador de config.plist baseado em schema OpenCore
 import plistlib
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple as TupleType
+from typing import Dict, List, Any, Iterable, Optional, Tuple as TupleType, Union
 
 import jsonschema
 
+from uocm.plist_editor.scope import resolve_keys, scope_for
+
+
+def _is_plist_string(checker: Any, instance: Any) -> bool:
+    """Tipo string do schema: aceita str e data (bytes) nativos do plistlib"""
+    return isinstance(instance, (str, bytes))
+
+
+# Validador Draft 7 que entende os tipos nativos do plistlib, dispensando
+# a conversão do documento inteiro para JSON antes de cada validação
+PlistDraft7Validator = jsonschema.validators.extend(
+    jsonschema.Draft7Validator,
+    type_checker=jsonschema.Draft7Validator.TYPE_CHECKER.redefine(
+        "string", _is_plist_string
+    ),
+)
+
+
+ErrorPath = TupleType[Union[str, int], ...]
+
 
 class PlistValidator:
     """Validador de config.plist usando schema OpenCore"""
     
+    # Validadores compilados compartilhados entre instâncias (chave: schema serializado)
+    _compiled: Dict[str, jsonschema.protocols.Validator] = {}
+    
     def __init__(self):
         self.schema = self._load_opencore_schema()
+        self._validator = self._compile(self.schema)
+        self._sub_validators: Dict[int, jsonschema.protocols.Validator] = {}
+        # Erros da última validação, usados como base da validação incremental
+        self._error_cache: Optional[List[TupleType[ErrorPath, str]]] = None
+    
+    @classmethod
+    def _compile(cls, schema: Dict[str, Any]) -> jsonschema.protocols.Validator:
+        """Compila o schema uma única vez por conteúdo"""
+        key = json.dumps(schema, sort_keys=True)
+        validator = cls._compiled.get(key)
+        if validator is None:
+            PlistDraft7Validator.check_schema(schema)
+            validator = PlistDraft7Validator(schema)
+            cls._compiled[key] = validator
+        return validator
     
     def validate(self, plist_path: Path) -> TupleType[bool, List[str]]:
         """
@@ -26,36 +64,79 @@ class PlistValidator:
         try:
             with open(plist_path, "rb") as f:
                 plist_data = plistlib.load(f)
-            
-            # Converter para JSON para validação
-            json_data = self._plist_to_json(plist_data)
-            
-            # Validar schema
-            validator = jsonschema.Draft7Validator(self.schema)
-            errors = list(validator.iter_errors(json_data))
-            
-            if errors:
-                error_messages = [self._format_error(e) for e in errors]
-                return False, error_messages
-            
-            return True, []
         except Exception as e:
             return False, [f"Erro ao validar: {str(e)}"]
+        
+        return self.validate_dict(plist_data)
     
     def validate_dict(self, plist_dict: Dict[str, Any]) -> TupleType[bool, List[str]]:
         """Valida um dicionário de config.plist"""
         try:
-            json_data = self._plist_to_json(plist_dict)
-            validator = jsonschema.Draft7Validator(self.schema)
-            errors = list(validator.iter_errors(json_data))
-            
-            if errors:
-                error_messages = [self._format_error(e) for e in errors]
-                return False, error_messages
+            self._error_cache = [
+                (tuple(e.path), e.message) for e in self._validator.iter_errors(plist_dict)
+            ]
+        except Exception as e:
+            self._error_cache = None
+            return False, [f"Erro ao validar: {str(e)}"]
+        
+        return self._cached_result()
+    
+    def validate_paths(
+        self,
+        plist_dict: Dict[str, Any],
+        key_paths: Iterable[Union[str, ErrorPath]],
+    ) -> TupleType[bool, List[str]]:
+        """
+        Revalida apenas as subárvores afetadas pelos caminhos alterados
+        
+        Os caminhos podem ser strings (ex: 'Kernel.Add.3.Enabled') ou tuplas
+        já resolvidas. Os erros são mesclados ao resultado da última validação;
+        sem validação anterior, o documento inteiro é validado.
+        """
+        if self._error_cache is None:
+            return self.validate_dict(plist_dict)
+        
+        try:
+            scopes = {}
+            for key_path in key_paths:
+                scope, schema, instance = scope_for(
+                    plist_dict, self.schema, resolve_keys(plist_dict, key_path)
+                )
+                scopes[scope] = (schema, instance)
+            # Escopos contidos em outro escopo já são cobertos por ele
+            roots: List[ErrorPath] = []
+            for scope in sorted(scopes, key=len):
+                if not any(scope[: len(root)] == root for root in roots):
+                    roots.append(scope)
             
-            return True, []
+            for scope in roots:
+                schema, instance = scopes[scope]
+                self._error_cache = [
+                    (path, message)
+                    for path, message in self._error_cache
+                    if path[: len(scope)] != scope
+                ]
+                for error in self._sub_validator(schema).iter_errors(instance):
+                    self._error_cache.append(((*scope, *error.path), error.message))
         except Exception as e:
+            self._error_cache = None
             return False, [f"Erro ao validar: {str(e)}"]
+        
+        return self._cached_result()
+    
+    def _cached_result(self) -> TupleType[bool, List[str]]:
+        errors = self._error_cache or []
+        if errors:
+            return False, [self._format_path(path, message) for path, message in errors]
+        return True, []
+    
+    def _sub_validator(self, schema: Dict[str, Any]) -> jsonschema.protocols.Validator:
+        """Validador para um sub-schema, reaproveitando a compilação do schema raiz"""
+        validator = self._sub_validators.get(id(schema))
+        if validator is None:
+            validator = self._validator.evolve(schema=schema)
+            self._sub_validators[id(schema)] = validator
+        return validator
     
     def _load_opencore_schema(self) -> Dict[str, Any]:
         """Carrega schema OpenCore"""
@@ -77,19 +158,7 @@ class PlistValidator:
             "additionalProperties": False,
         }
     
-    def _plist_to_json(self, data: Any) -> Any:
-        """Converte dados PLIST para JSON compatível"""
-        if isinstance(data, dict):
-            return {k: self._plist_to_json(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._plist_to_json(item) for item in data]
-        elif isinstance(data, bytes):
-            return data.hex()
-        else:
-            return data
-    
-    def _format_error(self, error: jsonschema.ValidationError) -> str:
-        """Formata mensagem de erro"""
-        path = " -> ".join(str(p) for p in error.path)
-        return f"{path}: {error.message}"
+    def _format_path(self, path: ErrorPath, message: str) -> str:
+        """Formata mensagem de erro a partir de um caminho"""
+        return f"{' -> '.join(str(p) for p in path)}: {message}"
 
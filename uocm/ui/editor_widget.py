@@ -4,6 +4,7 @@ Widget editor de config.plist inspirado no ProperTree
 
 import plistlib
 import hashlib
+import re
 import base64
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
@@ -13,24 +14,26 @@ from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
+    QAbstractItemView,
     QLabel,
     QPushButton,
     QLineEdit,
+    QCheckBox,
     QMenu,
     QMessageBox,
     QFileDialog,
     QDialog,
     QDialogButtonBox,
     QTextEdit,
+    QPlainTextEdit,
     QComboBox,
     QSplitter,
     QHeaderView,
     QToolBar,
     QStatusBar,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QMimeData
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QMimeData, QModelIndex
 from PyQt6.QtGui import (
     QKeySequence,
     QShortcut,
@@ -39,12 +42,24 @@ from PyQt6.QtGui import (
     QDrag,
     QDropEvent,
     QColor,
+    QFontDatabase,
 )
 
 from uocm.plist_editor.editor import PlistEditor
 from uocm.plist_editor.validator import PlistValidator
 from uocm.plist_editor.oc_snapshot import OCSnapshot
+from uocm.plist_editor.blob import BlobPager, parse_hexdump
+from uocm.plist_editor.search import (
+    FIELD_BASE64,
+    FIELD_HEX,
+    FIELD_KEY,
+    FIELD_PATH,
+    FIELD_VALUE,
+    SearchMatch,
+    path_text,
+)
 from uocm.core.config import Config
+from uocm.ui.plist_model import COLUMN_VALUE, PathRole, PlistTreeModel, is_large_blob
 
 
 class ValueType(Enum):
@@ -58,38 +73,43 @@ class ValueType(Enum):
     DICT = "dict"
 
 
-class PlistTreeWidget(QTreeWidget):
-    """Widget de árvore para exibir e editar PLIST"""
+class PlistTreeView(QTreeView):
+    """View de árvore para exibir e editar PLIST (dados em PlistTreeModel)"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setHeaderLabels(["Chave", "Tipo", "Valor"])
-        self.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
-        self.setDefaultDropAction(Qt.DropAction.MoveAction)
-        self.setSelectionMode(QTreeWidget.SelectionMode.ExtendedSelection)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.EditKeyPressed
+        )
         self.setAlternatingRowColors(True)
-        
-        # Configurar colunas
-        header = self.header()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        # Todas as linhas têm a mesma altura: a view não mede linha por linha
+        self.setUniformRowHeights(True)
         
         # Estilo
         self.setStyleSheet("""
-            QTreeWidget {
+            QTreeView {
                 background-color: rgba(40, 40, 40, 240);
                 border: 1px solid rgba(255, 255, 255, 0.1);
                 border-radius: 6px;
                 selection-background-color: rgba(0, 122, 255, 0.3);
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 4px;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: rgba(0, 122, 255, 0.3);
             }
         """)
+    
+    def setModel(self, model) -> None:
+        super().setModel(model)
+        
+        # Configurar colunas
+        header = self.header()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
 
 
 class ValueConverterDialog(QDialog):
@@ -168,13 +188,134 @@ class ValueConverterDialog(QDialog):
         return self.output_text.toPlainText()
 
 
+class HexEditorDialog(QDialog):
+    """Visualizador/editor hex paginado para blobs `data` grandes"""
+    
+    def __init__(self, parent=None, data: bytes = b"", title: str = ""):
+        super().__init__(parent)
+        self.setWindowTitle(f"Editor Hex - {title}" if title else "Editor Hex")
+        self.setMinimumSize(700, 500)
+        self.pager = BlobPager(data)
+        self.current_page = 0
+        
+        layout = QVBoxLayout(self)
+        
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+        
+        # Uma página por vez: o blob inteiro nunca vira texto
+        self.hex_text = QPlainTextEdit()
+        self.hex_text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.hex_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.hex_text)
+        
+        # Navegação
+        nav_layout = QHBoxLayout()
+        
+        self.prev_button = QPushButton("< Anterior")
+        self.prev_button.clicked.connect(lambda: self.show_page(self.current_page - 1))
+        nav_layout.addWidget(self.prev_button)
+        
+        self.next_button = QPushButton("Próxima >")
+        self.next_button.clicked.connect(lambda: self.show_page(self.current_page + 1))
+        nav_layout.addWidget(self.next_button)
+        
+        nav_layout.addWidget(QLabel("Offset:"))
+        self.offset_edit = QLineEdit()
+        self.offset_edit.setPlaceholderText("0x0")
+        self.offset_edit.returnPressed.connect(self._go_to_offset)
+        nav_layout.addWidget(self.offset_edit)
+        
+        nav_layout.addWidget(QLabel("Buscar hex:"))
+        self.find_edit = QLineEdit()
+        self.find_edit.returnPressed.connect(self._find_next)
+        nav_layout.addWidget(self.find_edit)
+        
+        layout.addLayout(nav_layout)
+        
+        # Botões
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        
+        self._find_offset = 0
+        self.show_page(0)
+    
+    def show_page(self, number: int) -> bool:
+        """Mostra uma página (gravando as edições da página atual antes)"""
+        if not 0 <= number < self.pager.page_count or not self._commit_page():
+            return False
+        self.current_page = number
+        self.hex_text.setPlainText(self.pager.format_page(number))
+        self.hex_text.document().setModified(False)
+        
+        start = number * self.pager.page_bytes
+        end = start + len(self.pager.page(number))
+        self.info_label.setText(
+            f"{len(self.pager)} bytes - página {number + 1} de {self.pager.page_count} "
+            f"(0x{start:x}-0x{max(end - 1, start):x})"
+        )
+        self.prev_button.setEnabled(number > 0)
+        self.next_button.setEnabled(number < self.pager.page_count - 1)
+        return True
+    
+    def _commit_page(self) -> bool:
+        """Grava o texto editado da página atual no blob"""
+        if not self.hex_text.document().isModified():
+            return True
+        try:
+            data = parse_hexdump(self.hex_text.toPlainText())
+        except ValueError as e:
+            QMessageBox.warning(self, "Erro", f"Hex inválido: {str(e)}")
+            return False
+        self.pager.replace_page(self.current_page, data)
+        self.hex_text.document().setModified(False)
+        return True
+    
+    def _go_to_offset(self) -> None:
+        try:
+            offset = int(self.offset_edit.text().strip(), 0)
+        except ValueError:
+            return
+        self.show_page(self.pager.page_of(offset))
+    
+    def _find_next(self) -> None:
+        try:
+            needle = bytes.fromhex(self.find_edit.text().replace("0x", ""))
+        except ValueError:
+            QMessageBox.warning(self, "Erro", "Busca deve ser hex (ex: 9B3E0000)")
+            return
+        if not self._commit_page():
+            return
+        offset = self.pager.find(needle, self._find_offset)
+        if offset is None and self._find_offset:
+            offset = self.pager.find(needle, 0)
+        if offset is None:
+            self.info_label.setText("Nenhum resultado")
+            return
+        self._find_offset = offset + 1
+        self.show_page(self.pager.page_of(offset))
+    
+    def accept(self) -> None:
+        if self._commit_page():
+            super().accept()
+    
+    def get_data(self) -> bytes:
+        """Blob resultante"""
+        return self.pager.data
+
+
 class FindReplaceDialog(QDialog):
     """Diálogo de busca e substituição"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, find_text: str = ""):
         super().__init__(parent)
         self.setWindowTitle("Buscar e Substituir")
         self.setMinimumSize(400, 200)
+        self.replace_requested = False
         
         layout = QVBoxLayout(self)
         
@@ -182,7 +323,8 @@ class FindReplaceDialog(QDialog):
         find_label = QLabel("Buscar:")
         layout.addWidget(find_label)
         
-        self.find_edit = QLineEdit()
+        self.find_edit = QLineEdit(find_text)
+        self.find_edit.selectAll()
         layout.addWidget(self.find_edit)
         
         # Substituir
@@ -193,17 +335,40 @@ class FindReplaceDialog(QDialog):
         layout.addWidget(self.replace_edit)
         
         # Opções
-        self.keys_check = QLabel("Buscar em chaves")
-        self.values_check = QLabel("Buscar em valores")
+        self.keys_check = QCheckBox("Buscar em chaves")
+        self.keys_check.setChecked(True)
+        layout.addWidget(self.keys_check)
+        
+        self.values_check = QCheckBox("Buscar em valores (data em hex e base64)")
+        self.values_check.setChecked(True)
+        layout.addWidget(self.values_check)
+        
+        self.regex_check = QCheckBox("Expressão regular")
+        layout.addWidget(self.regex_check)
+        
+        self.case_check = QCheckBox("Diferenciar maiúsculas/minúsculas")
+        layout.addWidget(self.case_check)
+        
+        self.whole_check = QCheckBox("Valor inteiro")
+        layout.addWidget(self.whole_check)
+        
+        self.selection_check = QCheckBox("Somente no item selecionado")
+        layout.addWidget(self.selection_check)
         
         # Botões
-        buttons = QDialogButtonBox(
-            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
-        )
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel)
+        find_button = buttons.addButton("Buscar", QDialogButtonBox.ButtonRole.AcceptRole)
+        find_button.setDefault(True)
+        replace_button = buttons.addButton("Substituir Tudo", QDialogButtonBox.ButtonRole.ActionRole)
+        replace_button.clicked.connect(self._replace_all)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
+    def _replace_all(self) -> None:
+        self.replace_requested = True
+        self.accept()
+    
     def get_find_text(self) -> str:
         """Retorna texto a buscar"""
         return self.find_edit.text()
@@ -211,6 +376,20 @@ class FindReplaceDialog(QDialog):
     def get_replace_text(self) -> str:
         """Retorna texto de substituição"""
         return self.replace_edit.text()
+    
+    def get_options(self) -> Dict[str, Any]:
+        """Opções de busca no formato de PlistEditor.find/replace_all"""
+        fields: List[str] = []
+        if self.keys_check.isChecked():
+            fields += [FIELD_KEY, FIELD_PATH]
+        if self.values_check.isChecked():
+            fields += [FIELD_VALUE, FIELD_HEX, FIELD_BASE64]
+        return {
+            "fields": fields,
+            "regex": self.regex_check.isChecked(),
+            "case_sensitive": self.case_check.isChecked(),
+            "whole": self.whole_check.isChecked(),
+        }
 
 
 class EditorWidget(QWidget):
@@ -221,6 +400,10 @@ class EditorWidget(QWidget):
         self.editor = PlistEditor()
         self.validator = PlistValidator()
         self.current_plist_path: Optional[Path] = None
+        # Última busca (F3 avança pelos resultados)
+        self._search_text = ""
+        self._search_results: List[SearchMatch] = []
+        self._search_position = -1
         self._setup_ui()
         self._setup_shortcuts()
         self._setup_context_menu()
@@ -278,6 +461,11 @@ class EditorWidget(QWidget):
         find_action.triggered.connect(self._find_replace)
         toolbar.addAction(find_action)
         
+        find_next_action = QAction("Próximo", self)
+        find_next_action.setShortcut(QKeySequence.StandardKey.FindNext)
+        find_next_action.triggered.connect(self._find_next)
+        toolbar.addAction(find_next_action)
+        
         toolbar.addSeparator()
         
         oc_snapshot_action = QAction("OC Snapshot", self)
@@ -300,9 +488,11 @@ class EditorWidget(QWidget):
         splitter = QSplitter(Qt.Orientation.Horizontal)
         
         # Árvore PLIST
-        self.tree = PlistTreeWidget()
-        self.tree.itemDoubleClicked.connect(self._edit_item)
-        self.tree.itemChanged.connect(self._item_changed)
+        self.model = PlistTreeModel(self.editor, self)
+        self.model.dataChanged.connect(self._data_changed)
+        self.tree = PlistTreeView()
+        self.tree.setModel(self.model)
+        self.tree.doubleClicked.connect(self._item_double_clicked)
         splitter.addWidget(self.tree)
         
         # Painel de detalhes (opcional)
@@ -357,17 +547,17 @@ class EditorWidget(QWidget):
     
     def _show_context_menu(self, position) -> None:
         """Mostra menu contextual"""
-        item = self.tree.itemAt(position)
+        item = self.tree.indexAt(position)
         menu = QMenu(self)
         
-        if item:
+        if item.isValid():
             # Adicionar item
             add_action = menu.addAction("Adicionar Item")
             add_action.triggered.connect(lambda: self._add_item(item))
             
             # Editar
             edit_action = menu.addAction("Editar")
-            edit_action.triggered.connect(lambda: self._edit_item(item, 0))
+            edit_action.triggered.connect(lambda: self._edit_item(item))
             
             menu.addSeparator()
             
@@ -385,6 +575,10 @@ class EditorWidget(QWidget):
             convert_action = menu.addAction("Converter Valor...")
             convert_action.triggered.connect(lambda: self._convert_value(item))
             
+            if isinstance(self.editor.resolve(item.data(PathRole)), bytes):
+                hex_action = menu.addAction("Editar em Hex...")
+                hex_action.triggered.connect(lambda: self._edit_blob(item))
+            
             menu.addSeparator()
             
             # Templates OpenCore
@@ -432,66 +626,18 @@ class EditorWidget(QWidget):
                 f"Erro ao carregar arquivo: {plist_path}"
             )
     
-    def _populate_tree(self, parent: Optional[QTreeWidgetItem] = None, data: Optional[Dict[str, Any]] = None) -> None:
-        """Popula árvore com dados PLIST"""
-        if data is None:
-            data = self.editor.data
-        
-        if parent is None:
-            self.tree.clear()
-            parent = self.tree.invisibleRootItem()
-        
-        if isinstance(data, dict):
-            for key, value in data.items():
-                item = QTreeWidgetItem(parent)
-                item.setText(0, str(key))
-                item.setData(0, Qt.ItemDataRole.UserRole, key)
-                
-                if isinstance(value, dict):
-                    item.setText(1, "dict")
-                    self._populate_tree(item, value)
-                elif isinstance(value, list):
-                    item.setText(1, "array")
-                    self._populate_tree(item, value)
-                elif isinstance(value, bool):
-                    item.setText(1, "boolean")
-                    item.setText(2, str(value))
-                elif isinstance(value, int):
-                    item.setText(1, "integer")
-                    item.setText(2, str(value))
-                elif isinstance(value, bytes):
-                    item.setText(1, "data")
-                    item.setText(2, base64.b64encode(value).decode()[:50] + "...")
-                else:
-                    item.setText(1, "string")
-                    item.setText(2, str(value))
-                
-                item.setExpanded(True)
-        
-        elif isinstance(data, list):
-            for i, value in enumerate(data):
-                item = QTreeWidgetItem(parent)
-                item.setText(0, f"[{i}]")
-                item.setData(0, Qt.ItemDataRole.UserRole, i)
-                
-                if isinstance(value, dict):
-                    item.setText(1, "dict")
-                    self._populate_tree(item, value)
-                elif isinstance(value, list):
-                    item.setText(1, "array")
-                    self._populate_tree(item, value)
-                elif isinstance(value, bool):
-                    item.setText(1, "boolean")
-                    item.setText(2, str(value))
-                elif isinstance(value, int):
-                    item.setText(1, "integer")
-                    item.setText(2, str(value))
-                elif isinstance(value, bytes):
-                    item.setText(1, "data")
-                    item.setText(2, base64.b64encode(value).decode()[:50] + "...")
-                else:
-                    item.setText(1, "string")
-                    item.setText(2, str(value))
+    def _populate_tree(self) -> None:
+        """Recria a árvore a partir de PlistEditor.data (documento trocado por inteiro)"""
+        self.model.reset()
+        # Seções de primeiro nível abertas; o resto é criado ao expandir
+        self.tree.expandToDepth(0)
+    
+    def _refresh_tree(self) -> None:
+        """Atualiza só as linhas alteradas pela última edição/undo/redo"""
+        if self.editor.last_changed_paths is None:
+            self._populate_tree()
+        else:
+            self.model.refresh_paths(self.editor.last_changed_paths)
     
     def _open_file(self) -> None:
         """Abre arquivo PLIST"""
@@ -527,47 +673,112 @@ class EditorWidget(QWidget):
     def _undo(self) -> None:
         """Desfaz última alteração"""
         if self.editor.undo():
-            self._populate_tree()
+            self._refresh_tree()
             self.status_label.setText("Operação desfeita")
     
     def _redo(self) -> None:
         """Refaz última alteração"""
         if self.editor.redo():
-            self._populate_tree()
+            self._refresh_tree()
             self.status_label.setText("Operação refeita")
     
     def _find_replace(self) -> None:
         """Busca e substitui"""
-        dialog = FindReplaceDialog(self)
-        if dialog.exec():
-            find_text = dialog.get_find_text()
-            replace_text = dialog.get_replace_text()
-            # Implementar busca e substituição
-            self.status_label.setText(f"Buscando: {find_text}")
-    
-    def _edit_item(self, item: QTreeWidgetItem, column: int) -> None:
-        """Edita item selecionado"""
-        if column == 2:  # Coluna de valor
-            # Permitir edição inline
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-            self.tree.editItem(item, column)
-    
-    def _item_changed(self, item: QTreeWidgetItem, column: int) -> None:
-        """Callback quando item é alterado"""
-        if column == 2:
-            # Atualizar dados PLIST
-            new_value = item.text(column)
-            # Implementar atualização
-            self._save_to_history()
-    
-    def _add_item(self, parent_item: Optional[QTreeWidgetItem]) -> None:
+        dialog = FindReplaceDialog(self, self._search_text)
+        if not dialog.exec():
+            return
+        find_text = dialog.get_find_text()
+        if not find_text:
+            return
+        options = dialog.get_options()
+        if dialog.selection_check.isChecked() and self.tree.currentIndex().isValid():
+            options["scope"] = self.tree.currentIndex().data(PathRole)
+        
+        try:
+            if dialog.replace_requested:
+                self.replace_all(find_text, dialog.get_replace_text(), **options)
+            else:
+                self.find(find_text, **options)
+        except re.error as e:
+            QMessageBox.warning(self, "Erro", f"Expressão regular inválida: {str(e)}")
+    
+    def find(self, text: str, **options: Any) -> int:
+        """Busca no documento e seleciona o primeiro resultado"""
+        self._search_text = text
+        # Um resultado por linha da árvore, mesmo que chave e valor casem
+        seen = set()
+        self._search_results = []
+        for match in self.editor.find(text, **options):
+            if match.path not in seen:
+                seen.add(match.path)
+                self._search_results.append(match)
+        self._search_position = -1
+        
+        if not self._search_results:
+            self.status_label.setText(f"Nenhum resultado para: {text}")
+            return 0
+        self._find_next()
+        return len(self._search_results)
+    
+    def _find_next(self) -> None:
+        """Seleciona o próximo resultado da última busca"""
+        if not self._search_results:
+            return
+        self._search_position = (self._search_position + 1) % len(self._search_results)
+        match = self._search_results[self._search_position]
+        index = self.model.index_for_path(match.path)
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
+            self.tree.scrollTo(index)
+        self.status_label.setText(
+            f"Resultado {self._search_position + 1} de {len(self._search_results)}: "
+            f"{match.text[:80]}"
+        )
+    
+    def replace_all(self, text: str, replacement: str, **options: Any) -> int:
+        """Substitui em todos os valores encontrados (um único undo)"""
+        count = self.editor.replace_all(text, replacement, **options)
+        if count:
+            self._refresh_tree()
+        self._search_results = []
+        self.status_label.setText(f"{count} valor(es) substituído(s)")
+        return count
+    
+    def _edit_item(self, index: QModelIndex) -> None:
+        """Edita o valor do item selecionado"""
+        if is_large_blob(self.editor.resolve(index.data(PathRole))):
+            self._edit_blob(index)
+        else:
+            self.tree.edit(index.siblingAtColumn(COLUMN_VALUE))
+    
+    def _item_double_clicked(self, index: QModelIndex) -> None:
+        """Blobs grandes não são editáveis na árvore: abre o editor hex"""
+        if is_large_blob(self.editor.resolve(index.data(PathRole))):
+            self._edit_blob(index)
+    
+    def _edit_blob(self, index: QModelIndex) -> None:
+        """Abre o editor hex paginado para um valor `data`"""
+        path = index.data(PathRole)
+        value = self.editor.resolve(path)
+        if not isinstance(value, bytes):
+            return
+        dialog = HexEditorDialog(self, value, path_text(path))
+        if dialog.exec() and dialog.pager.modified:
+            if self.editor.set_at(path, dialog.get_data()):
+                self.model.refresh_paths([path])
+    
+    def _data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex) -> None:
+        """Callback quando um valor é alterado (já gravado no histórico pelo modelo)"""
+        self.status_label.setText("Valor alterado")
+    
+    def _add_item(self, parent_index: Optional[QModelIndex]) -> None:
         """Adiciona novo item"""
         # Implementar adição de item
         pass
     
     def _copy(self) -> None:
         """Copia item selecionado"""
-        selected_items = self.tree.selectedItems()
+        selected_items = self.tree.selectionModel().selectedRows()
         if selected_items:
             # Implementar cópia
             self.status_label.setText(f"{len(selected_items)} item(s) copiado(s)")
@@ -579,7 +790,7 @@ class EditorWidget(QWidget):
     
     def _delete_selected(self) -> None:
         """Deleta itens selecionados"""
-        selected_items = self.tree.selectedItems()
+        selected_items = self.tree.selectionModel().selectedRows()
         if selected_items:
             reply = QMessageBox.question(
                 self,
@@ -588,25 +799,43 @@ class EditorWidget(QWidget):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                for item in selected_items:
-                    parent = item.parent() or self.tree.invisibleRootItem()
-                    parent.removeChild(item)
-                self._save_to_history()
+                self.delete_rows(selected_items)
+    
+    def delete_rows(self, indexes: List[QModelIndex]) -> None:
+        """Remove as linhas do documento (uma entrada de histórico por linha)"""
+        def rows(index: QModelIndex) -> Tuple[int, ...]:
+            chain = []
+            while index.isValid():
+                chain.append(index.row())
+                index = index.parent()
+            return tuple(reversed(chain))
+        
+        # Últimas linhas (e filhos antes dos pais) primeiro: os índices de
+        # arrays anteriores continuam válidos
+        targets = sorted(((rows(index), index.data(PathRole)) for index in indexes), reverse=True)
+        for _, path in targets:
+            if self.editor.delete_at(path):
+                self.model.refresh_paths([path])
+        self.status_label.setText(f"{len(targets)} item(s) deletado(s)")
     
     def _delete_item(self) -> None:
         """Deleta item do menu contextual"""
-        item = self.tree.currentItem()
-        if item:
+        if self.tree.currentIndex().isValid():
             self._delete_selected()
     
-    def _convert_value(self, item: QTreeWidgetItem) -> None:
+    def _convert_value(self, index: QModelIndex) -> None:
         """Abre diálogo de conversão de valor"""
-        current_value = item.text(2)
+        if is_large_blob(self.editor.resolve(index.data(PathRole))):
+            # Não copiar o blob inteiro (em base64) para o conversor
+            self._edit_blob(index)
+            return
+        value_index = index.siblingAtColumn(COLUMN_VALUE)
+        current_value = value_index.data(Qt.ItemDataRole.EditRole)
         dialog = ValueConverterDialog(self, current_value)
         if dialog.exec():
             converted = dialog.get_converted_value()
-            item.setText(2, converted)
-            self._save_to_history()
+            if not self.model.setData(value_index, converted):
+                QMessageBox.warning(self, "Erro", "Valor convertido incompatível com o tipo do item.")
     
     def _add_template(self, section: str, subsection: str) -> None:
         """Adiciona template OpenCore"""
@@ -20,11 +20,22 @@ from uocm.engine_generator import EFIGenerator, GenerationMode
 from uocm.ui.detector_widget import DetectorWidget
 
 
+# Rótulos das fases de EFIGenerator.generate_efi
+PHASE_LABELS = {
+    "recommendations": "Recomendações (SMBIOS, kexts, drivers, SSDTs, quirks)",
+    "config_plist": "config.plist",
+    "kexts": "Kexts",
+    "drivers": "Drivers",
+    "ssdts": "SSDTs",
+}
+
+
 class GenerationThread(QThread):
     """Thread para geração de EFI"""
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     progress = pyqtSignal(str)
+    phase_finished = pyqtSignal(str, float)  # fase, segundos
     
     def __init__(self, generator, hardware, mode, output_path):
         super().__init__()
@@ -40,10 +51,17 @@ class GenerationThread(QThread):
                 self.hardware,
                 self.mode,
                 self.output_path,
+                progress_callback=self._on_phase_finished,
             )
             self.finished.emit(str(efi_path))
         except Exception as e:
             self.error.emit(str(e))
+    
+    def _on_phase_finished(self, phase: str, seconds: float) -> None:
+        """Repassa o tempo de cada fase para a interface"""
+        self.phase_finished.emit(phase, seconds)
+        label = PHASE_LABELS.get(phase, phase)
+        self.progress.emit(f"{label}: {seconds * 1000:.1f} ms")
 
 
 class GeneratorWidget(QWidget):
@@ -0,0 +1,390 @@
+"""
+Modelo Qt preguiçoso sobre PlistEditor.data
+
+Em vez de criar um QTreeWidgetItem por nó do config.plist, o modelo só cria
+os nós que a view pede: index() de uma linha visível, e as linhas de um
+container só quando ele é expandido, em lotes de FETCH_BATCH (fetchMore).
+Os valores não são copiados: cada nó guarda o caminho e lê o valor de
+editor.data ao ser exibido.
+
+Blobs `data` só têm codificado o trecho exibido (preview_base64); os
+maiores que INLINE_EDIT_LIMIT não são editáveis na árvore e abrem o
+visualizador hex paginado.
+
+Edições passam pelo PlistEditor (set_at/delete_at, com histórico) e
+atualizam apenas as linhas afetadas; refresh_paths faz o mesmo após
+undo/redo. reset() só é necessário quando o documento inteiro é trocado
+(load, OC Snapshot, undo de um checkpoint).
+"""
+
+import base64
+import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from uocm.plist_editor.blob import INLINE_EDIT_LIMIT, preview_base64
+from uocm.plist_editor.editor import PlistEditor
+from uocm.plist_editor.history import Key, KeyPath
+
+COLUMNS = ("Chave", "Tipo", "Valor")
+COLUMN_KEY, COLUMN_TYPE, COLUMN_VALUE = range(3)
+
+# Linhas criadas por vez ao expandir/rolar arrays e dicts grandes
+FETCH_BATCH = 256
+# Caracteres do valor exibidos na coluna Valor
+PREVIEW_CHARS = 50
+
+PathRole = Qt.ItemDataRole.UserRole + 1
+
+
+def type_name(value: Any) -> str:
+    """Nome do tipo PLIST de um valor"""
+    if isinstance(value, dict):
+        return "dict"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "real"
+    if isinstance(value, bytes):
+        return "data"
+    if isinstance(value, datetime.datetime):
+        return "date"
+    return "string"
+
+
+def preview(value: Any) -> str:
+    """Texto da coluna Valor"""
+    if isinstance(value, dict):
+        return f"{len(value)} chave(s)"
+    if isinstance(value, list):
+        return f"{len(value)} item(s)"
+    if isinstance(value, bytes):
+        # Só o prefixo visível é codificado, mesmo em blobs de megabytes
+        text = preview_base64(value, PREVIEW_CHARS)
+        if (len(value) + 2) // 3 * 4 > PREVIEW_CHARS:
+            text += f"... ({len(value)} bytes)"
+        return text
+    return str(value)
+
+
+def is_large_blob(value: Any) -> bool:
+    """Blob editado no visualizador hex em vez de na árvore"""
+    return isinstance(value, bytes) and len(value) > INLINE_EDIT_LIMIT
+
+
+def parse_value(text: str, current: Any) -> Any:
+    """
+    Converte o texto editado para o tipo do valor atual
+
+    Raises:
+        ValueError: Se o texto não for válido para o tipo
+    """
+    if isinstance(current, bool):
+        lowered = text.strip().lower()
+        if lowered in ("true", "yes", "1"):
+            return True
+        if lowered in ("false", "no", "0"):
+            return False
+        raise ValueError(f"Booleano inválido: {text}")
+    if isinstance(current, int):
+        text = text.strip()
+        return int(text, 16) if text.lower().startswith("0x") else int(text)
+    if isinstance(current, float):
+        return float(text)
+    if isinstance(current, bytes):
+        text = text.strip()
+        if text.lower().startswith("0x"):
+            return bytes.fromhex(text[2:])
+        return base64.b64decode(text, validate=True)
+    if isinstance(current, datetime.datetime):
+        return datetime.datetime.fromisoformat(text.strip())
+    return text
+
+
+def _row_of(keys: Optional[List[Key]], key: Key) -> Optional[int]:
+    """Linha de uma chave (em arrays a chave já é a linha)"""
+    if keys is None:
+        return None
+    if isinstance(key, int) and not isinstance(key, bool):
+        return key if 0 <= key < len(keys) and keys[key] == key else None
+    try:
+        return keys.index(key)
+    except ValueError:
+        return None
+
+
+class _Node:
+    """Nó da árvore: caminho no documento e filhos já criados"""
+    __slots__ = ("parent", "row", "path", "keys", "children", "fetched")
+
+    def __init__(self, parent: Optional["_Node"], row: int, path: KeyPath):
+        self.parent = parent
+        self.row = row
+        self.path = path
+        # Chaves do container (lista de chaves de dict ou range de array), lidas na primeira vez
+        self.keys: Optional[List[Key]] = None
+        self.children: Dict[int, "_Node"] = {}
+        self.fetched = 0
+
+    def forget(self) -> None:
+        """Descarta filhos e chaves (o container mudou de estrutura)"""
+        self.keys = None
+        self.children = {}
+        self.fetched = 0
+
+
+class PlistTreeModel(QAbstractItemModel):
+    """Modelo de árvore de três colunas (chave, tipo, valor) sobre um PlistEditor"""
+
+    def __init__(self, editor: PlistEditor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self._root = _Node(None, 0, ())
+
+    # Estrutura
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _keys(self, node: _Node) -> List[Key]:
+        if node.keys is None:
+            value = self.editor.resolve(node.path)
+            if isinstance(value, dict):
+                node.keys = list(value.keys())
+            elif isinstance(value, list):
+                node.keys = list(range(len(value)))
+            else:
+                node.keys = []
+        return node.keys
+
+    def _child(self, node: _Node, row: int) -> _Node:
+        child = node.children.get(row)
+        if child is None:
+            child = _Node(node, row, (*node.path, self._keys(node)[row]))
+            node.children[row] = child
+        return child
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if not (0 <= row < node.fetched and 0 <= column < len(COLUMNS)):
+            return QModelIndex()
+        return self.createIndex(row, column, self._child(node, row))
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return self._node(parent).fetched
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(COLUMNS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.column() > 0:
+            return False
+        value = self.editor.resolve(self._node(parent).path)
+        return isinstance(value, (dict, list)) and len(value) > 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.fetched < len(self._keys(node))
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self._node(parent)
+        total = len(self._keys(node))
+        count = min(FETCH_BATCH, total - node.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+
+    # Dados
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == PathRole:
+            return node.path
+        if role == Qt.ItemDataRole.UserRole:
+            return node.path[-1]
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        column = index.column()
+        if column == COLUMN_KEY:
+            key = node.path[-1]
+            return f"[{key}]" if isinstance(key, int) else str(key)
+        value = self.editor.resolve(node.path)
+        if column == COLUMN_TYPE:
+            return type_name(value)
+        if role == Qt.ItemDataRole.ToolTipRole and isinstance(value, bytes):
+            return f"{len(value)} bytes"
+        if role == Qt.ItemDataRole.EditRole:
+            if isinstance(value, bytes):
+                return base64.b64encode(value).decode()
+            if isinstance(value, datetime.datetime):
+                return value.isoformat()
+            return str(value)
+        return preview(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == COLUMN_VALUE:
+            value = self.editor.resolve(index.internalPointer().path)
+            if not isinstance(value, (dict, list)) and not is_large_blob(value):
+                flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or index.column() != COLUMN_VALUE or role != Qt.ItemDataRole.EditRole:
+            return False
+        path = index.internalPointer().path
+        current = self.editor.resolve(path)
+        if isinstance(current, (dict, list)):
+            return False
+        try:
+            new_value = parse_value(str(value), current)
+        except ValueError:
+            return False
+        if new_value == current and type(new_value) is type(current):
+            return False
+        if not self.editor.set_at(path, new_value):
+            return False
+        self._row_changed(index.internalPointer())
+        return True
+
+    # Atualizações
+
+    def index_for_path(self, path: KeyPath, column: int = 0) -> QModelIndex:
+        """Índice de um caminho, criando as linhas necessárias (ex: resultado de busca)"""
+        node = self._root
+        parent = QModelIndex()
+        for key in path:
+            row = _row_of(self._keys(node), key)
+            if row is None:
+                return QModelIndex()
+            while node.fetched <= row:
+                self.fetchMore(parent)
+            node = self._child(node, row)
+            parent = self.createIndex(row, 0, node)
+        return parent.siblingAtColumn(column) if column else parent
+
+    def delete(self, index: QModelIndex) -> bool:
+        """Remove a linha do documento (com histórico) e da view"""
+        if not index.isValid():
+            return False
+        node = index.internalPointer()
+        if not self.editor.delete_at(node.path):
+            return False
+        self.refresh_paths([node.path])
+        return True
+
+    def reset(self) -> None:
+        """Recria a árvore (documento trocado por inteiro)"""
+        self.beginResetModel()
+        self._root = _Node(None, 0, ())
+        self.endResetModel()
+
+    def refresh_paths(self, paths: Optional[Iterable[KeyPath]]) -> None:
+        """
+        Atualiza as linhas afetadas por alterações nesses caminhos
+
+        Args:
+            paths: Caminhos alterados (ex: editor.last_changed_paths); None recria tudo
+        """
+        if paths is None:
+            self.reset()
+            return
+        for path in paths:
+            self._refresh_path(tuple(path))
+
+    def _find_node(self, path: KeyPath) -> Optional[_Node]:
+        """Nó já criado para o caminho (None se a view nunca chegou até ele)"""
+        node = self._root
+        for key in path:
+            row = _row_of(node.keys, key)
+            child = None if row is None else node.children.get(row)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def _refresh_path(self, path: KeyPath) -> None:
+        if not path:
+            self.reset()
+            return
+        parent = self._find_node(path[:-1])
+        if parent is None or parent.keys is None:
+            # Ninguém exibiu este container ainda: será lido quando for expandido
+            return
+
+        value = self.editor.resolve(path[:-1])
+        if isinstance(value, dict):
+            current = list(value.keys())
+        elif isinstance(value, list):
+            current = list(range(len(value)))
+        else:
+            current = []
+
+        if current != parent.keys:
+            # Estrutura do container mudou (chave adicionada/removida)
+            self._rebuild(parent)
+            return
+
+        row = _row_of(parent.keys, path[-1])
+        child = None if row is None else parent.children.get(row)
+        if child is not None:
+            self._row_changed(child)
+
+    def _node_index(self, node: _Node) -> QModelIndex:
+        return QModelIndex() if node is self._root else self.createIndex(node.row, 0, node)
+
+    def _rebuild(self, node: _Node) -> None:
+        """Recria os filhos de um nó mantendo o nó (e sua expansão) na view"""
+        index = self._node_index(node)
+        if node.fetched:
+            self.beginRemoveRows(index, 0, node.fetched - 1)
+            node.forget()
+            self.endRemoveRows()
+        else:
+            node.forget()
+        total = len(self._keys(node))
+        if total:
+            count = min(FETCH_BATCH, total)
+            self.beginInsertRows(index, 0, count - 1)
+            node.fetched = count
+            self.endInsertRows()
+        if node is not self._root:
+            self._emit_row(node)
+
+    def _row_changed(self, node: _Node) -> None:
+        """Valor de uma linha trocado: recria os filhos se for container"""
+        if node.keys is not None:
+            self._rebuild(node)
+        else:
+            self._emit_row(node)
+
+    def _emit_row(self, node: _Node) -> None:
+        first = self.createIndex(node.row, 0, node)
+        self.dataChanged.emit(first, first.siblingAtColumn(len(COLUMNS) - 1))